@@ -0,0 +1 @@
+"""Performance benchmarks for the consolidation pipeline (pytest-benchmark)."""
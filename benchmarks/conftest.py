@@ -0,0 +1,125 @@
+"""
+Shared fixtures for the performance benchmarks.
+
+Inputs are built with scripts/generate_synthetic_corpus.py at fixed seeds,
+so every run (and every machine) measures the same data. Sizes can be
+overridden with BENCHMARK_SIZES and BENCHMARK_PROJECTS (see sizes.py).
+"""
+
+import itertools
+import shutil
+import sys
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.generate_synthetic_corpus import (  # noqa: E402
+    CorpusConfig,
+    CorpusGenerator,
+    generate_corpus,
+)
+from src.consolidation_app.parser import (  # noqa: E402
+    ErrorEntry,
+    parse_errors_and_fixes,
+    parse_fix_repo,
+)
+
+SEED = 20250101
+
+
+@pytest.fixture(scope="session")
+def project_corpus(tmp_path_factory):
+    """Factory: path of a single project with `size` session and fix_repo entries."""
+    cache: Dict[int, Path] = {}
+
+    def build(size: int) -> Path:
+        if size not in cache:
+            root = tmp_path_factory.mktemp(f"corpus-{size}")
+            config = CorpusConfig(
+                projects=1,
+                entries=size,
+                entries_jitter=0.0,
+                fix_repo_entries=size,
+                coding_tips_entries=max(1, size // 10),
+                seed=SEED,
+            )
+            generate_corpus(root, config)
+            cache[size] = root / "project-0000"
+        return cache[size]
+
+    return build
+
+
+@pytest.fixture(scope="session")
+def parsed_corpus(project_corpus):
+    """Factory: (session entries, fix_repo entries) of project_corpus(size)."""
+    cache: Dict[int, Tuple[List[ErrorEntry], List[ErrorEntry]]] = {}
+
+    def build(size: int) -> Tuple[List[ErrorEntry], List[ErrorEntry]]:
+        if size not in cache:
+            errors_fixes = project_corpus(size) / ".errors_fixes"
+            cache[size] = (
+                parse_errors_and_fixes(errors_fixes / "errors_and_fixes.md"),
+                parse_fix_repo(errors_fixes / "fix_repo.md"),
+            )
+        return cache[size]
+
+    return build
+
+
+@pytest.fixture(scope="session")
+def fix_variants():
+    """Factory: `count` entries with one signature and near-duplicate fixes."""
+
+    def build(count: int) -> List[ErrorEntry]:
+        generator = CorpusGenerator(CorpusConfig(seed=SEED))
+        source = generator.new_error()
+        variants = [source]
+        for _ in range(count - 1):
+            variant = generator.near_duplicate(source)
+            variants.append(replace(variant, error_signature=source.error_signature))
+        return variants
+
+    return build
+
+
+@pytest.fixture(scope="session")
+def corpus_template(tmp_path_factory):
+    """Factory: pristine multi-project corpus to copy before each end-to-end round."""
+    cache: Dict[int, Path] = {}
+
+    def build(projects: int) -> Path:
+        if projects not in cache:
+            root = tmp_path_factory.mktemp(f"template-{projects}")
+            config = CorpusConfig(
+                projects=projects,
+                entries=50,
+                fix_repo_entries=200,
+                coding_tips_entries=20,
+                seed=SEED,
+            )
+            generate_corpus(root, config)
+            (root / "manifest.json").unlink()
+            cache[projects] = root
+        return cache[projects]
+
+    return build
+
+
+@pytest.fixture
+def fresh_copy(tmp_path):
+    """Function copying a corpus template to a new directory (one per round)."""
+    rounds = itertools.count()
+
+    def copy(template: Path) -> Path:
+        target = tmp_path / f"run-{next(rounds)}"
+        shutil.copytree(template, target)
+        return target
+
+    return copy
@@ -0,0 +1,18 @@
+"""Data sizes the benchmarks are parametrized over (overridable via ENV)."""
+
+import os
+from typing import List
+
+
+def _sizes(env_key: str, default: str) -> List[int]:
+    return [int(x) for x in os.getenv(env_key, default).split(",") if x.strip()]
+
+
+# Entries per file for the per-stage benchmarks
+ENTRY_SIZES = _sizes("BENCHMARK_SIZES", "100,1000,10000")
+
+# Projects for the end-to-end consolidate_all_projects benchmark
+PROJECT_COUNTS = _sizes("BENCHMARK_PROJECTS", "10,100")
+
+# Fixes sharing one signature (merge_fixes compares them pairwise)
+VARIANT_COUNTS = [10, 50, 200]
@@ -0,0 +1,26 @@
+"""Benchmarks for exact deduplication and fuzzy fix merging."""
+
+import pytest
+
+from benchmarks.sizes import ENTRY_SIZES, VARIANT_COUNTS
+from src.consolidation_app.deduplicator import deduplicate_errors_exact
+from src.consolidation_app.merger import merge_fixes
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.mark.benchmark(group="deduplicate_errors_exact")
+@pytest.mark.parametrize("size", ENTRY_SIZES)
+def test_deduplicate_errors_exact(benchmark, parsed_corpus, size):
+    new_entries, existing_entries = parsed_corpus(size)
+    new_errors = [e for e in new_entries if not e.is_process_issue]
+    result = benchmark(deduplicate_errors_exact, new_errors, existing_entries)
+    assert len(result) >= len(existing_entries)
+
+
+@pytest.mark.benchmark(group="merge_fixes")
+@pytest.mark.parametrize("count", VARIANT_COUNTS)
+def test_merge_fixes(benchmark, fix_variants, count):
+    entries = fix_variants(count)
+    result = benchmark(merge_fixes, entries)
+    assert 1 <= len(result) <= count
@@ -0,0 +1,24 @@
+"""End-to-end benchmark of consolidate_all_projects over multi-project corpora."""
+
+import pytest
+
+from benchmarks.sizes import PROJECT_COUNTS
+from src.consolidation_app.main import consolidate_all_projects
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.mark.benchmark(group="consolidate_all_projects")
+@pytest.mark.parametrize("projects", PROJECT_COUNTS)
+def test_consolidate_all_projects(benchmark, corpus_template, fresh_copy, projects):
+    template = corpus_template(projects)
+
+    # The run clears errors_and_fixes.md, so every round gets its own copy (not timed)
+    def setup():
+        return (fresh_copy(template),), {}
+
+    result = benchmark.pedantic(
+        consolidate_all_projects, setup=setup, rounds=5, iterations=1
+    )
+    assert result.ok_count == projects
+    assert result.all_ok
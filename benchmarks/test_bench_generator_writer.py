@@ -0,0 +1,58 @@
+"""Benchmarks for markdown generation and the atomic file writers."""
+
+import pytest
+
+from benchmarks.sizes import ENTRY_SIZES
+from src.consolidation_app.generator import (
+    generate_coding_tips_markdown,
+    generate_fix_repo_markdown,
+)
+from src.consolidation_app.writer import (
+    clear_errors_and_fixes,
+    write_coding_tips,
+    write_fix_repo,
+)
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.mark.benchmark(group="generate_fix_repo_markdown")
+@pytest.mark.parametrize("size", ENTRY_SIZES)
+def test_generate_fix_repo_markdown(benchmark, parsed_corpus, size):
+    _, existing = parsed_corpus(size)
+    markdown = benchmark(generate_fix_repo_markdown, existing)
+    assert markdown.startswith("# Fix Repository")
+
+
+@pytest.mark.benchmark(group="generate_coding_tips_markdown")
+@pytest.mark.parametrize("size", ENTRY_SIZES)
+def test_generate_coding_tips_markdown(benchmark, parsed_corpus, size):
+    new_entries, _ = parsed_corpus(size)
+    markdown = benchmark(generate_coding_tips_markdown, new_entries)
+    assert markdown.startswith("# Coding Tips")
+
+
+@pytest.mark.benchmark(group="write_fix_repo")
+@pytest.mark.parametrize("size", ENTRY_SIZES)
+def test_write_fix_repo(benchmark, parsed_corpus, tmp_path, size):
+    _, existing = parsed_corpus(size)
+    benchmark(write_fix_repo, tmp_path, existing)
+    assert (tmp_path / ".errors_fixes" / "fix_repo.md").is_file()
+
+
+@pytest.mark.benchmark(group="write_coding_tips")
+@pytest.mark.parametrize("size", ENTRY_SIZES)
+def test_write_coding_tips(benchmark, parsed_corpus, tmp_path, size):
+    new_entries, _ = parsed_corpus(size)
+    benchmark(write_coding_tips, tmp_path, new_entries)
+    assert (tmp_path / ".errors_fixes" / "coding_tips.md").is_file()
+
+
+@pytest.mark.benchmark(group="clear_errors_and_fixes")
+def test_clear_errors_and_fixes(benchmark, tmp_path):
+    (tmp_path / ".errors_fixes").mkdir()
+    (tmp_path / ".errors_fixes" / "errors_and_fixes.md").write_text(
+        "# Log\n", encoding="utf-8"
+    )
+    benchmark(clear_errors_and_fixes, tmp_path)
+    assert (tmp_path / ".errors_fixes" / "errors_and_fixes.md").is_file()
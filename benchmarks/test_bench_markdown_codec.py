@@ -0,0 +1,55 @@
+"""Benchmarks for the shared markdown codec and a render/parse round trip."""
+
+import pytest
+
+from benchmarks.sizes import ENTRY_SIZES
+from src.consolidation_app.generator import generate_fix_repo_markdown
+from src.consolidation_app.markdown_codec import (
+    clear_caches,
+    decode_metadata,
+    decode_tags,
+    escape_header,
+    format_tags,
+    format_timestamp,
+    unescape_header,
+)
+from src.consolidation_app.parser import parse_fix_repo
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.mark.benchmark(group="fix_repo_round_trip")
+@pytest.mark.parametrize("size", ENTRY_SIZES)
+def test_fix_repo_round_trip(benchmark, parsed_corpus, tmp_path, size):
+    _, existing = parsed_corpus(size)
+    path = tmp_path / "fix_repo.md"
+
+    def round_trip():
+        path.write_text(generate_fix_repo_markdown(existing), encoding="utf-8")
+        return parse_fix_repo(path)
+
+    entries = benchmark(round_trip)
+    assert len(entries) == size
+
+
+@pytest.mark.benchmark(group="markdown_codec")
+@pytest.mark.parametrize("cached", [False, True], ids=["cold", "warm"])
+def test_codec_fields(benchmark, parsed_corpus, cached):
+    _, existing = parsed_corpus(ENTRY_SIZES[-1])
+
+    def encode_decode():
+        if not cached:
+            clear_caches()
+        for entry in existing:
+            unescape_header(escape_header(entry.error_signature))
+            decode_tags(format_tags(entry.tags))
+            format_timestamp(entry.timestamp)
+
+    benchmark(encode_decode)
+
+
+@pytest.mark.benchmark(group="markdown_codec")
+def test_decode_metadata(benchmark, parsed_corpus):
+    _, existing = parsed_corpus(ENTRY_SIZES[0])
+    blocks = generate_fix_repo_markdown(existing).split("\n## ")
+    benchmark(lambda: [decode_metadata(block) for block in blocks])
@@ -0,0 +1,24 @@
+"""Benchmarks for parsing errors_and_fixes.md and fix_repo.md."""
+
+import pytest
+
+from benchmarks.sizes import ENTRY_SIZES
+from src.consolidation_app.parser import parse_errors_and_fixes, parse_fix_repo
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.mark.benchmark(group="parse_errors_and_fixes")
+@pytest.mark.parametrize("size", ENTRY_SIZES)
+def test_parse_errors_and_fixes(benchmark, project_corpus, size):
+    path = project_corpus(size) / ".errors_fixes" / "errors_and_fixes.md"
+    entries = benchmark(parse_errors_and_fixes, path)
+    assert len(entries) == size
+
+
+@pytest.mark.benchmark(group="parse_fix_repo")
+@pytest.mark.parametrize("size", ENTRY_SIZES)
+def test_parse_fix_repo(benchmark, project_corpus, size):
+    path = project_corpus(size) / ".errors_fixes" / "fix_repo.md"
+    entries = benchmark(parse_fix_repo, path)
+    assert len(entries) == size
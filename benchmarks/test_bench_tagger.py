@@ -0,0 +1,28 @@
+"""Benchmarks for rule-based tag generation (per entry and batched)."""
+
+import pytest
+
+from benchmarks.sizes import ENTRY_SIZES
+from src.consolidation_app.tagger import apply_tags_to_entries, generate_tags_rule_based
+
+pytest.importorskip("pytest_benchmark")
+
+
+def _tag_each(entries):
+    return [generate_tags_rule_based(entry) for entry in entries]
+
+
+@pytest.mark.benchmark(group="generate_tags_rule_based")
+@pytest.mark.parametrize("size", ENTRY_SIZES)
+def test_generate_tags_rule_based(benchmark, parsed_corpus, size):
+    new_entries, _ = parsed_corpus(size)
+    tags = benchmark(_tag_each, new_entries)
+    assert len(tags) == len(new_entries)
+
+
+@pytest.mark.benchmark(group="apply_tags_to_entries")
+@pytest.mark.parametrize("size", ENTRY_SIZES)
+def test_apply_tags_to_entries(benchmark, parsed_corpus, size):
+    new_entries, _ = parsed_corpus(size)
+    tagged = benchmark(apply_tags_to_entries, new_entries)
+    assert len(tagged) == len(new_entries)
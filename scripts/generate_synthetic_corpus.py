@@ -0,0 +1,587 @@
+# File: scripts/generate_synthetic_corpus.py
+# Description: Generate seeded synthetic project trees (.errors_fixes/) for scale testing the consolidation pipeline
+# Version: 1.0
+# Usage: python scripts/generate_synthetic_corpus.py <output_dir> [--projects 1000] [--entries 50] [--seed 42]
+#        python scripts/generate_synthetic_corpus.py corpus --fix-repo-entries 100000 --projects 1 --duplicate-rate 0.3
+
+"""
+Synthetic corpus generator.
+
+Creates <output_dir>/<project>/.errors_fixes/ with errors_and_fixes.md,
+fix_repo.md and coding_tips.md in the formats the parser reads. The share
+of exact duplicates (same signature, type, file and fix), near-duplicate
+variants (reworded signature, edited fix), process issues and the size of
+fix code blocks are configurable. Output depends only on the arguments:
+the same seed always produces byte-identical files, so benchmark runs on
+regenerated corpora are comparable.
+
+A manifest.json with the parameters and counts is written next to the projects.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import random
+import sys
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.consolidation_app.generator import (  # noqa: E402
+    format_code_block,
+    format_tags,
+    format_timestamp,
+    generate_coding_tips_markdown,
+    generate_fix_repo_markdown,
+)
+from src.consolidation_app.parser import ErrorEntry  # noqa: E402
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+logger = logging.getLogger(__name__)
+
+# Fixed epoch so timestamps (and therefore files) do not depend on the clock
+_BASE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+_TIME_SPAN_DAYS = 365
+
+_ERRORS_AND_FIXES_HEADER = """# Errors and Fixes Log
+
+> **Note**: This file is processed daily by the consolidation app at 2 AM.
+> `### Error:` entries → fix_repo.md; `### Agent Process Issue:` entries → coding_tips.md. Contents are then cleared (file is kept).
+
+"""
+
+_ERROR_TEMPLATES: Dict[str, List[str]] = {
+    "KeyError": ["'{name}'", "missing key '{name}' in {module} payload"],
+    "TypeError": [
+        "unsupported operand type(s) for +: 'int' and '{kind}'",
+        "{name}() missing 1 required positional argument: '{arg}'",
+        "'NoneType' object is not subscriptable",
+    ],
+    "AttributeError": [
+        "'{kind}' object has no attribute '{name}'",
+        "module '{module}' has no attribute '{name}'",
+    ],
+    "ValueError": [
+        "invalid literal for int() with base 10: '{name}'",
+        "too many values to unpack (expected {count})",
+    ],
+    "ImportError": ["cannot import name '{name}' from '{module}'"],
+    "ModuleNotFoundError": ["No module named '{module}'"],
+    "FileNotFoundError": ["[Errno 2] No such file or directory: '{path}'"],
+    "IndexError": ["list index out of range"],
+    "ConnectionError": [
+        "HTTPConnectionPool(host='{module}', port={count}): Max retries exceeded"
+    ],
+    "TimeoutError": ["{module} request timed out after {count}s"],
+    "AssertionError": ["expected {count} items, got {other}"],
+    "PermissionError": ["[Errno 13] Permission denied: '{path}'"],
+}
+
+_NAMES = [
+    "user_id",
+    "config",
+    "session",
+    "payload",
+    "items",
+    "token",
+    "path",
+    "result",
+    "handler",
+    "cache",
+]
+_KINDS = ["str", "dict", "list", "NoneType", "Response", "Path", "int"]
+_MODULES = [
+    "api",
+    "db",
+    "auth",
+    "worker",
+    "scheduler",
+    "storage",
+    "billing",
+    "search",
+    "ui",
+    "cli",
+]
+_DIRS = ["src", "app", "lib", "services", "backend", "core"]
+_EXTENSIONS = [".py"] * 6 + [".ts", ".js"]
+_TAG_POOL = [
+    "python",
+    "typescript",
+    "backend",
+    "frontend",
+    "database",
+    "api",
+    "testing",
+    "async",
+    "config",
+    "io",
+]
+
+_PROCESS_ISSUES = [
+    (
+        "Ran tests before installing dependencies",
+        "Install dependencies before running the test suite.",
+    ),
+    (
+        "Edited generated files instead of the source template",
+        "Change the template, then regenerate.",
+    ),
+    ("Committed without running the linter", "Run the linter before every commit."),
+    (
+        "Used absolute paths in configuration",
+        "Use paths relative to the project root in configuration.",
+    ),
+    ("Ignored failing type checks", "Treat type-check failures as build failures."),
+    (
+        "Retried a flaky command without reading the error",
+        "Read the full error output before retrying.",
+    ),
+    (
+        "Modified the lockfile by hand",
+        "Update the lockfile only through the package manager.",
+    ),
+    (
+        "Skipped migrations when changing models",
+        "Create a migration for every model change.",
+    ),
+]
+_PROCESS_CATEGORIES = ["agent-process", "testing", "tooling", "workflow", "git"]
+
+_CODE_LINES = [
+    "value = data.get({q}{name}{q})",
+    "if {name} is None:",
+    "    return default",
+    "{name} = {module}.load({q}{path}{q})",
+    "for item in {name}:",
+    "    process(item)",
+    "result = int({name}) if {name} else 0",
+    "logger.debug({q}{module}: %s{q}, {name})",
+    "with open({q}{path}{q}, encoding={q}utf-8{q}) as f:",
+    "    content = f.read()",
+    "try:",
+    "    {name} = fetch({name})",
+    "except {module_cls}Error:",
+    "    {name} = None",
+]
+
+
+@dataclass(frozen=True)
+class CorpusConfig:
+    """Parameters of a synthetic corpus (all part of the manifest)."""
+
+    projects: int = 10
+    entries: int = 50
+    entries_jitter: float = 0.5
+    fix_repo_entries: int = 100
+    coding_tips_entries: int = 20
+    duplicate_rate: float = 0.2
+    near_duplicate_rate: float = 0.2
+    process_ratio: float = 0.1
+    fix_lines_min: int = 3
+    fix_lines_max: int = 20
+    seed: int = 42
+
+
+class CorpusGenerator:
+    """Seeded generator of ErrorEntry objects and project files."""
+
+    def __init__(self, config: CorpusConfig) -> None:
+        self.config = config
+        self.rng = random.Random(config.seed)
+        # Distinct errors generated so far; duplicates and variants are drawn from here
+        self._pool: List[ErrorEntry] = []
+        self.counts = {
+            "errors": 0,
+            "process_issues": 0,
+            "duplicates": 0,
+            "near_duplicates": 0,
+        }
+
+    # Entry factories -----------------------------------------------------
+
+    def _timestamp(self) -> datetime:
+        seconds = self.rng.randrange(_TIME_SPAN_DAYS * 24 * 3600)
+        return _BASE_TIME + timedelta(seconds=seconds)
+
+    def _fill(self, template: str) -> str:
+        rng = self.rng
+        module = rng.choice(_MODULES)
+        return template.format(
+            name=rng.choice(_NAMES),
+            kind=rng.choice(_KINDS),
+            module=module,
+            module_cls=module.capitalize(),
+            arg=rng.choice(_NAMES),
+            path=f"{rng.choice(_DIRS)}/{module}/{rng.choice(_NAMES)}.json",
+            count=rng.randint(2, 9),
+            other=rng.randint(10, 99),
+            q='"',
+        )
+
+    def _fix_code(self) -> str:
+        cfg = self.config
+        length = self.rng.randint(
+            cfg.fix_lines_min, max(cfg.fix_lines_min, cfg.fix_lines_max)
+        )
+        return "\n".join(
+            self._fill(self.rng.choice(_CODE_LINES)) for _ in range(length)
+        )
+
+    def new_error(self) -> ErrorEntry:
+        rng = self.rng
+        error_type = rng.choice(sorted(_ERROR_TEMPLATES))
+        message = self._fill(rng.choice(_ERROR_TEMPLATES[error_type]))
+        module = rng.choice(_MODULES)
+        file_path = f"{rng.choice(_DIRS)}/{module}/{rng.choice(_NAMES)}{rng.choice(_EXTENSIONS)}"
+        entry = ErrorEntry(
+            error_signature=f"{error_type}: {message}",
+            error_type=error_type,
+            file=file_path,
+            line=rng.randint(1, 800),
+            fix_code=self._fix_code(),
+            explanation=f"Guard {module} against {error_type.lower()} by validating inputs first.",
+            result="✅ Solved",
+            success_count=rng.randint(1, 5),
+            tags=sorted(rng.sample(_TAG_POOL, rng.randint(1, 3))),
+            timestamp=self._timestamp(),
+            is_process_issue=False,
+        )
+        self._pool.append(entry)
+        return entry
+
+    def duplicate(self, source: ErrorEntry) -> ErrorEntry:
+        """Same signature, type, file and fix (merged by exact dedup)."""
+        return replace(source, timestamp=self._timestamp(), success_count=1)
+
+    def near_duplicate(self, source: ErrorEntry) -> ErrorEntry:
+        """Reworded signature and/or edited fix (only AI dedup can match it)."""
+        rng = self.rng
+        signature = source.error_signature
+        variant = rng.randrange(3)
+        if variant == 0:
+            signature = f"{signature} (line {rng.randint(1, 800)})"
+        elif variant == 1:
+            signature = signature.replace("'", '"')
+        else:
+            signature = (
+                signature.rstrip(".") + " during " + rng.choice(_MODULES) + " startup"
+            )
+        fix_code = source.fix_code
+        if rng.random() < 0.5:
+            fix_code = f"# {rng.choice(['guard', 'fix', 'workaround'])} for {source.error_type}\n{fix_code}"
+        return replace(
+            source,
+            error_signature=signature,
+            fix_code=fix_code,
+            line=rng.randint(1, 800),
+            timestamp=self._timestamp(),
+            success_count=1,
+        )
+
+    def process_issue(self) -> ErrorEntry:
+        rng = self.rng
+        description, rule = rng.choice(_PROCESS_ISSUES)
+        category = rng.choice(_PROCESS_CATEGORIES)
+        return ErrorEntry(
+            error_signature=description,
+            error_type="agent-process",
+            file="",
+            line=0,
+            fix_code=rule,
+            explanation=f"{description} in {rng.choice(_MODULES)}; {rule[0].lower()}{rule[1:]}",
+            result="✅ Documented",
+            success_count=0,
+            tags=[category, "agent-process"],
+            timestamp=self._timestamp(),
+            is_process_issue=True,
+        )
+
+    def session_entry(self) -> ErrorEntry:
+        """Next entry of an errors_and_fixes.md log, following the configured mix."""
+        cfg = self.config
+        roll = self.rng.random()
+        if roll < cfg.process_ratio:
+            self.counts["process_issues"] += 1
+            return self.process_issue()
+        self.counts["errors"] += 1
+        if self._pool:
+            roll = self.rng.random()
+            if roll < cfg.duplicate_rate:
+                self.counts["duplicates"] += 1
+                return self.duplicate(self.rng.choice(self._pool))
+            if roll < cfg.duplicate_rate + cfg.near_duplicate_rate:
+                self.counts["near_duplicates"] += 1
+                return self.near_duplicate(self.rng.choice(self._pool))
+        return self.new_error()
+
+    def entry_count(self) -> int:
+        cfg = self.config
+        spread = int(cfg.entries * cfg.entries_jitter)
+        return max(0, cfg.entries + self.rng.randint(-spread, spread))
+
+
+def render_errors_and_fixes(entries: List[ErrorEntry]) -> str:
+    """Render entries as an errors_and_fixes.md session log."""
+    lines = [_ERRORS_AND_FIXES_HEADER.rstrip("\n"), ""]
+    by_day: Dict[str, List[ErrorEntry]] = {}
+    for entry in sorted(entries, key=lambda e: e.timestamp):
+        by_day.setdefault(entry.timestamp.date().isoformat(), []).append(entry)
+    for day, day_entries in by_day.items():
+        lines += [f"## {day} Session", ""]
+        for entry in day_entries:
+            lines += (
+                _render_process_issue(entry)
+                if entry.is_process_issue
+                else _render_error(entry)
+            )
+    return "\n".join(lines).rstrip() + "\n"
+
+
+def _render_error(entry: ErrorEntry) -> List[str]:
+    return [
+        f"### Error: {entry.error_signature}",
+        "",
+        f"**Timestamp:** {format_timestamp(entry.timestamp)}  ",
+        f"**File:** `{entry.file}`  ",
+        f"**Line:** {entry.line}  ",
+        f"**Error Type:** `{entry.error_type}`  ",
+        f"**Tags:** {format_tags(entry.tags)}",
+        "",
+        "**Error Context:**",
+        "```",
+        "Traceback (most recent call last):",
+        f'  File "{entry.file}", line {entry.line}, in handler',
+        f"{entry.error_signature}",
+        "```",
+        "",
+        "**Fix Applied:**",
+        format_code_block(entry.fix_code),
+        "",
+        f"**Explanation:** {entry.explanation}",
+        "",
+        f"**Result:** {entry.result}  ",
+        f"**Success Count:** {entry.success_count}  ",
+        "**Test Command:** `task test`  ",
+        "**Test Result:** All tests passed",
+        "",
+        "---",
+        "",
+    ]
+
+
+def _render_process_issue(entry: ErrorEntry) -> List[str]:
+    return [
+        f"### Agent Process Issue: {entry.error_signature}",
+        "",
+        f"**Timestamp:** {format_timestamp(entry.timestamp)}  ",
+        f"**Issue Type:** `{entry.error_type}`  ",
+        f"**Tags:** {format_tags(entry.tags)}",
+        "",
+        "**Issue Description:**",
+        entry.explanation,
+        "",
+        "**Rule Established:**",
+        entry.fix_code,
+        "",
+        f"**Result:** {entry.result}",
+        "",
+        "---",
+        "",
+    ]
+
+
+def _render_history(markdown_fn, entries: List[ErrorEntry], empty_header: str) -> str:
+    # The generators stamp empty files with the current time; keep output reproducible
+    if not entries:
+        return empty_header.format(timestamp=format_timestamp(_BASE_TIME))
+    return markdown_fn(entries) + "\n"
+
+
+_EMPTY_FIX_REPO = (
+    "# Fix Repository\n\n> **Last Updated:** {timestamp}  \n> **Total Entries:** 0  \n"
+    "> **Consolidated from:** 0 projects\n\n---\n"
+)
+_EMPTY_CODING_TIPS = "# Coding Tips - Agent Process Rules\n\n> **Last Updated:** {timestamp}  \n> **Total Rules:** 0  \n\n---\n"
+
+
+def generate_corpus(output_dir: Path, config: CorpusConfig) -> Dict[str, object]:
+    """
+    Write a synthetic corpus and return its manifest.
+
+    Args:
+        output_dir: Directory to create projects in (created if missing).
+        config: Corpus parameters.
+
+    Returns:
+        Manifest dict (parameters and generated counts), also written to
+        output_dir/manifest.json.
+    """
+    generator = CorpusGenerator(config)
+    width = max(4, len(str(config.projects)))
+    totals = {"session_entries": 0, "fix_repo_entries": 0, "coding_tips_entries": 0}
+
+    for index in range(config.projects):
+        errors_fixes_dir = output_dir / f"project-{index:0{width}d}" / ".errors_fixes"
+        errors_fixes_dir.mkdir(parents=True, exist_ok=True)
+
+        history = [generator.new_error() for _ in range(config.fix_repo_entries)]
+        tips = [generator.process_issue() for _ in range(config.coding_tips_entries)]
+        session = [generator.session_entry() for _ in range(generator.entry_count())]
+
+        _write(
+            errors_fixes_dir / "errors_and_fixes.md", render_errors_and_fixes(session)
+        )
+        _write(
+            errors_fixes_dir / "fix_repo.md",
+            _render_history(generate_fix_repo_markdown, history, _EMPTY_FIX_REPO),
+        )
+        _write(
+            errors_fixes_dir / "coding_tips.md",
+            _render_history(generate_coding_tips_markdown, tips, _EMPTY_CODING_TIPS),
+        )
+        totals["session_entries"] += len(session)
+        totals["fix_repo_entries"] += len(history)
+        totals["coding_tips_entries"] += len(tips)
+
+    manifest: Dict[str, object] = {
+        "config": asdict(config),
+        "counts": {**totals, **generator.counts},
+    }
+    _write(output_dir / "manifest.json", json.dumps(manifest, indent=2) + "\n")
+    return manifest
+
+
+def _write(path: Path, content: str) -> None:
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(content)
+
+
+def _rate(value: str) -> float:
+    rate = float(value)
+    if not 0.0 <= rate <= 1.0:
+        raise argparse.ArgumentTypeError(f"rate must be between 0 and 1, got {value}")
+    return rate
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    defaults = CorpusConfig()
+    parser = argparse.ArgumentParser(
+        description="Generate a seeded synthetic corpus of .errors_fixes/ projects."
+    )
+    parser.add_argument(
+        "output_dir", type=Path, help="Directory to create the projects in"
+    )
+    parser.add_argument(
+        "--projects", type=int, default=defaults.projects, help="Number of projects"
+    )
+    parser.add_argument(
+        "--entries",
+        type=int,
+        default=defaults.entries,
+        help="Mean errors_and_fixes.md entries per project",
+    )
+    parser.add_argument(
+        "--entries-jitter",
+        type=_rate,
+        default=defaults.entries_jitter,
+        help="Relative spread of entries per project (0 = exactly --entries)",
+    )
+    parser.add_argument(
+        "--fix-repo-entries",
+        type=int,
+        default=defaults.fix_repo_entries,
+        help="Existing fix_repo.md entries per project",
+    )
+    parser.add_argument(
+        "--coding-tips-entries",
+        type=int,
+        default=defaults.coding_tips_entries,
+        help="Existing coding_tips.md rules per project",
+    )
+    parser.add_argument(
+        "--duplicate-rate",
+        type=_rate,
+        default=defaults.duplicate_rate,
+        help="Share of errors that are exact duplicates",
+    )
+    parser.add_argument(
+        "--near-duplicate-rate",
+        type=_rate,
+        default=defaults.near_duplicate_rate,
+        help="Share of errors that are near-duplicate variants",
+    )
+    parser.add_argument(
+        "--process-ratio",
+        type=_rate,
+        default=defaults.process_ratio,
+        help="Share of entries that are process issues",
+    )
+    parser.add_argument(
+        "--fix-lines-min",
+        type=int,
+        default=defaults.fix_lines_min,
+        help="Minimum fix code lines",
+    )
+    parser.add_argument(
+        "--fix-lines-max",
+        type=int,
+        default=defaults.fix_lines_max,
+        help="Maximum fix code lines",
+    )
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="Random seed")
+    args = parser.parse_args(argv)
+    if args.duplicate_rate + args.near_duplicate_rate > 1.0:
+        parser.error("--duplicate-rate + --near-duplicate-rate must not exceed 1")
+    if (
+        min(
+            args.projects, args.entries, args.fix_repo_entries, args.coding_tips_entries
+        )
+        < 0
+    ):
+        parser.error("counts must not be negative")
+    if not 1 <= args.fix_lines_min <= args.fix_lines_max:
+        parser.error("need 1 <= --fix-lines-min <= --fix-lines-max")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    config = CorpusConfig(
+        projects=args.projects,
+        entries=args.entries,
+        entries_jitter=args.entries_jitter,
+        fix_repo_entries=args.fix_repo_entries,
+        coding_tips_entries=args.coding_tips_entries,
+        duplicate_rate=args.duplicate_rate,
+        near_duplicate_rate=args.near_duplicate_rate,
+        process_ratio=args.process_ratio,
+        fix_lines_min=args.fix_lines_min,
+        fix_lines_max=args.fix_lines_max,
+        seed=args.seed,
+    )
+    try:
+        manifest = generate_corpus(args.output_dir, config)
+    except OSError as e:
+        logger.error(f"Failed to write corpus to {args.output_dir}: {e}")
+        return 1
+    counts = manifest["counts"]
+    logger.info(
+        f"Generated {config.projects} projects in {args.output_dir}: "
+        f"{counts['session_entries']} session entries, {counts['fix_repo_entries']} fix_repo entries"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
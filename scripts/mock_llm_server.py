@@ -0,0 +1,586 @@
+# File: scripts/mock_llm_server.py
+# Description: Local stub LLM server (Ollama/OpenAI/Anthropic shapes) with latency, failures and record/replay
+# Version: 1.0
+# Usage: python scripts/mock_llm_server.py [--port 11435] [--latency uniform:0.05,0.2] [--failure-rate 0.05]
+#        python scripts/mock_llm_server.py --record session.jsonl --upstream http://localhost:11434
+#        python scripts/mock_llm_server.py --replay session.jsonl
+
+"""
+Stub LLM server for offline, reproducible runs of the AI modules.
+
+Endpoints (same request/response shapes as the real APIs):
+- POST /api/generate          Ollama (stream true/false, format, system)
+- POST /v1/chat/completions   OpenAI (response_format, system message)
+- POST /v1/messages           Anthropic (system blocks, forced tool use)
+
+Point llm_client at it with OLLAMA_BASE_URL=http://127.0.0.1:PORT,
+OPENAI_BASE_URL=http://127.0.0.1:PORT/v1 or ANTHROPIC_BASE_URL=http://127.0.0.1:PORT.
+
+Responses are deterministic functions of the request: similarity prompts get
+a Jaccard score of the two signatures, tagging prompts get tags derived from
+the entry, rule prompts get one rule per issue type. Latency is drawn from a
+seeded distribution and a configurable share of requests fail.
+
+Record mode proxies every request to a real upstream and appends the
+exchange to a JSONL file; replay mode serves those recorded responses.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import random
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+logger = logging.getLogger(__name__)
+
+OLLAMA_PATH = "/api/generate"
+OPENAI_PATH = "/v1/chat/completions"
+ANTHROPIC_PATH = "/v1/messages"
+
+# Request fields that don't change the response (excluded from replay keys)
+_VOLATILE_FIELDS = ("stream", "keep_alive")
+
+# Headers forwarded to the upstream in record mode
+_FORWARDED_HEADERS = ("Authorization", "x-api-key", "anthropic-version", "Content-Type")
+
+
+class LatencyModel:
+    """
+    Seeded latency distribution parsed from a spec string.
+
+    Specs: "none", "fixed:S", "uniform:LOW,HIGH", "normal:MEAN,STDDEV",
+    "lognormal:MU,SIGMA" (seconds; negative samples are clamped to 0).
+    """
+
+    def __init__(self, spec: str = "none", seed: int = 0) -> None:
+        self.spec = spec
+        kind, _, args = spec.partition(":")
+        self.kind = kind.strip().lower()
+        try:
+            self.params = [float(x) for x in args.split(",") if x.strip()]
+        except ValueError as e:
+            raise ValueError(f"Invalid latency spec: {spec!r}") from e
+        expected = {"none": 0, "fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+        if self.kind not in expected or len(self.params) != expected[self.kind]:
+            raise ValueError(f"Invalid latency spec: {spec!r}")
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        with self._lock:
+            if self.kind == "fixed":
+                value = self.params[0]
+            elif self.kind == "uniform":
+                value = self._rng.uniform(*self.params)
+            elif self.kind == "normal":
+                value = self._rng.gauss(*self.params)
+            elif self.kind == "lognormal":
+                value = self._rng.lognormvariate(*self.params)
+            else:
+                value = 0.0
+        return max(0.0, value)
+
+
+@dataclass
+class MockConfig:
+    """Behaviour of the stub server."""
+
+    latency: str = "none"
+    failure_rate: float = 0.0
+    failure_status: int = 503
+    seed: int = 0
+    record_path: Optional[Path] = None
+    upstream: Optional[str] = None
+    replay_path: Optional[Path] = None
+    stream_chunk_chars: int = 16
+    # Filled in by MockLLMServer
+    requests_served: int = field(default=0, init=False)
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def request_key(path: str, body: Dict[str, Any]) -> str:
+    """Replay key: endpoint plus request body without volatile fields."""
+    stable = {k: v for k, v in body.items() if k not in _VOLATILE_FIELDS}
+    raw = path + "\n" + json.dumps(stable, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _request_text(path: str, body: Dict[str, Any]) -> Tuple[str, str]:
+    """Return (system, prompt) text of a request in any of the three shapes."""
+    if path == OLLAMA_PATH:
+        return str(body.get("system") or ""), str(body.get("prompt") or "")
+    messages = body.get("messages") or []
+    system_parts: List[str] = []
+    prompt_parts: List[str] = []
+    system = body.get("system")
+    if isinstance(system, str):
+        system_parts.append(system)
+    elif isinstance(system, list):
+        system_parts.extend(
+            str(block.get("text", "")) for block in system if isinstance(block, dict)
+        )
+    for message in messages:
+        content = message.get("content", "")
+        if isinstance(content, list):
+            content = "\n".join(
+                str(b.get("text", "")) for b in content if isinstance(b, dict)
+            )
+        (system_parts if message.get("role") == "system" else prompt_parts).append(
+            str(content)
+        )
+    return "\n".join(system_parts), "\n".join(prompt_parts)
+
+
+def _field_values(text: str, label: str) -> List[str]:
+    """Values of '<label>: value' lines (optionally '- ' prefixed)."""
+    pattern = re.compile(rf"^(?:- )?{re.escape(label)}:\s*(.*)$", re.MULTILINE)
+    return [m.group(1).strip() for m in pattern.finditer(text)]
+
+
+def _words(text: str) -> set[str]:
+    return set(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def deterministic_response(system: str, prompt: str) -> Any:
+    """
+    Response for a request: a dict for JSON tasks, otherwise plain text.
+
+    The task is recognised from the same markers the real prompts contain.
+    """
+    text = system + "\n" + prompt
+    if "Error Entry 2:" in prompt:
+        signatures = _field_values(prompt, "Error Signature")
+        types = _field_values(prompt, "Error Type")
+        if len(signatures) >= 2:
+            a = _words(signatures[0]) | _words(types[0] if types else "")
+            b = _words(signatures[1]) | _words(types[1] if len(types) > 1 else "")
+            score = len(a & b) / len(a | b) if a | b else 1.0
+        else:
+            score = 0.0
+        return {
+            "similarity": round(score, 2),
+            "reason": "Mock Jaccard similarity of signatures.",
+        }
+    if "Rules to merge:" in prompt:
+        titles: List[str] = []
+        for line in prompt.splitlines():
+            if line.startswith("{"):
+                try:
+                    title = json.loads(line).get("title", "")
+                except ValueError:
+                    continue
+                if title and title not in titles:
+                    titles.append(title)
+        return {"rules": [_mock_rule(title) for title in titles[:5]]}
+    if "Process issues in this group:" in prompt:
+        issue_types = _field_values(prompt, "Issue Type") or ["General"]
+        return {"rules": [_mock_rule(f"Avoid {issue_types[0]} issues")]}
+    if "Error Entry Details:" in prompt or "context tags" in text:
+        types = _field_values(prompt, "Error Type")
+        files = _field_values(prompt, "File")
+        tags = ["mock"]
+        if types and _slug(types[0]):
+            tags.append(_slug(types[0]))
+        if files and "." in files[0]:
+            tags.append(files[0].rsplit(".", 1)[-1].lower())
+        return {"tags": tags}
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:12]
+    return f"Mock response {digest}"
+
+
+def _mock_rule(title: str) -> Dict[str, Any]:
+    return {
+        "title": title,
+        "rule": f"{title}.",
+        "why": "Generated by the mock LLM server.",
+        "examples_good": ["Follows the rule."],
+        "examples_bad": ["Violates the rule."],
+        "related_errors": [],
+    }
+
+
+def build_payload(
+    path: str, body: Dict[str, Any], content: Any, system: str, prompt: str
+) -> Dict[str, Any]:
+    """Wrap content in the provider's (non-streaming) response shape."""
+    text = content if isinstance(content, str) else json.dumps(content)
+    input_tokens = _estimate_tokens(system + prompt)
+    output_tokens = _estimate_tokens(text)
+    model = body.get("model", "mock")
+    if path == OLLAMA_PATH:
+        return {
+            "model": model,
+            "response": text,
+            "done": True,
+            "prompt_eval_count": input_tokens,
+            "eval_count": output_tokens,
+        }
+    if path == OPENAI_PATH:
+        return {
+            "id": "mock-chatcmpl",
+            "object": "chat.completion",
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": input_tokens,
+                "completion_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+                "prompt_tokens_details": {"cached_tokens": 0},
+            },
+        }
+    tools = body.get("tools") or []
+    if tools and not isinstance(content, str):
+        blocks = [
+            {
+                "type": "tool_use",
+                "id": "mock-tool",
+                "name": tools[0].get("name", "respond"),
+                "input": content,
+            }
+        ]
+    else:
+        blocks = [{"type": "text", "text": text}]
+    return {
+        "id": "mock-msg",
+        "type": "message",
+        "model": model,
+        "content": blocks,
+        "usage": {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": 0,
+        },
+    }
+
+
+class _Recorder:
+    """Append-only JSONL store of request/response exchanges."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def append(
+        self, path: str, body: Dict[str, Any], status: int, response: Dict[str, Any]
+    ) -> None:
+        record = {
+            "key": request_key(path, body),
+            "path": path,
+            "request": body,
+            "status": status,
+            "response": response,
+        }
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def load_replay(path: Path) -> Dict[str, Tuple[int, Dict[str, Any]]]:
+    """Load recorded exchanges keyed by request_key (last one wins)."""
+    table: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                table[record["key"]] = (record.get("status", 200), record["response"])
+    return table
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_MockHTTPServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(
+        self, format: str, *args: Any
+    ) -> None:  # noqa: A002 - stdlib signature
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_ollama_stream(
+        self, payload: Dict[str, Any], generation_delay: float
+    ) -> None:
+        """Send an Ollama response as NDJSON chunks (chunked transfer encoding).
+
+        The first chunk goes out immediately; generation_delay is spent
+        before the rest, as if the model were still generating.
+        """
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        text = payload.get("response", "")
+        size = max(1, self.server.config.stream_chunk_chars)
+        pieces = [text[i : i + size] for i in range(0, len(text), size)] or [""]
+        try:
+            for index, piece in enumerate(pieces):
+                if index == 1 and generation_delay:
+                    time.sleep(generation_delay)
+                chunk = {
+                    "model": payload.get("model"),
+                    "response": piece,
+                    "done": False,
+                }
+                self._write_chunk(json.dumps(chunk) + "\n")
+            done = {k: v for k, v in payload.items() if k != "response"}
+            done.update({"response": "", "done": True})
+            self._write_chunk(json.dumps(done) + "\n")
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # Client closed early (stop-at-JSON); that is the point of streaming
+            logger.debug("Client closed stream early")
+
+    def _write_chunk(self, text: str) -> None:
+        data = text.encode("utf-8")
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_POST(self) -> None:  # noqa: N802 - stdlib naming
+        path = self.path.split("?", 1)[0]
+        if path not in (OLLAMA_PATH, OPENAI_PATH, ANTHROPIC_PATH):
+            self._send_json(404, {"error": f"unknown endpoint {path}"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": "invalid JSON body"})
+            return
+
+        server = self.server
+        config = server.config
+        with server.lock:
+            config.requests_served += 1
+            fail = server.failure_rng.random() < config.failure_rate
+
+        delay = server.latency.sample()
+        # Split latency: a third before the first token, the rest while "generating"
+        first_token_delay = delay / 3
+        generation_delay = delay - first_token_delay
+        time.sleep(first_token_delay)
+        if fail:
+            time.sleep(generation_delay)
+            self._send_json(config.failure_status, {"error": "injected failure"})
+            return
+
+        status, payload = self._resolve(path, body)
+        if status != 200:
+            self._send_json(status, payload)
+            return
+        if path == OLLAMA_PATH and body.get("stream", True):
+            self._send_ollama_stream(payload, generation_delay)
+            return
+        time.sleep(generation_delay)
+        self._send_json(status, payload)
+
+    def _resolve(self, path: str, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """Response from replay table, upstream (record mode) or the stub."""
+        server = self.server
+        if server.replay is not None:
+            hit = server.replay.get(request_key(path, body))
+            if hit is None:
+                return 404, {"error": "no recorded response for this request"}
+            return hit
+        if server.config.upstream:
+            return self._proxy(path, body)
+        system, prompt = _request_text(path, body)
+        return 200, build_payload(
+            path, body, deterministic_response(system, prompt), system, prompt
+        )
+
+    def _proxy(self, path: str, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        import requests
+
+        upstream_body = dict(body)
+        if path == OLLAMA_PATH:
+            upstream_body["stream"] = (
+                False  # record whole responses; re-streamed locally
+            )
+        headers = {
+            h: self.headers[h] for h in _FORWARDED_HEADERS if self.headers.get(h)
+        }
+        url = self.server.config.upstream.rstrip("/") + path
+        try:
+            response = requests.post(
+                url, json=upstream_body, headers=headers, timeout=300
+            )
+            status, payload = response.status_code, response.json()
+        except (requests.RequestException, ValueError) as e:
+            return 502, {"error": f"upstream request failed: {e}"}
+        if self.server.recorder is not None:
+            self.server.recorder.append(path, body, status, payload)
+        return status, payload
+
+
+class _MockHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], config: MockConfig) -> None:
+        super().__init__(address, _Handler)
+        self.config = config
+        self.lock = threading.Lock()
+        self.latency = LatencyModel(config.latency, seed=config.seed)
+        self.failure_rng = random.Random(config.seed + 1)
+        self.recorder = _Recorder(config.record_path) if config.record_path else None
+        self.replay = load_replay(config.replay_path) if config.replay_path else None
+
+
+class MockLLMServer:
+    """
+    Stub server running in a background thread (for tests and benchmarks).
+
+    Example:
+        with MockLLMServer(MockConfig(latency="fixed:0.01")) as server:
+            os.environ["OLLAMA_BASE_URL"] = server.url
+    """
+
+    def __init__(
+        self,
+        config: Optional[MockConfig] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.config = config or MockConfig()
+        self._httpd = _MockHTTPServer((host, port), self.config)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockLLMServer":
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="mock-llm", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Local stub LLM server (Ollama/OpenAI/Anthropic)."
+    )
+    parser.add_argument(
+        "--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)"
+    )
+    parser.add_argument("--port", type=int, default=11435, help="Port (default: 11435)")
+    parser.add_argument(
+        "--latency",
+        default="none",
+        help="Latency distribution: none, fixed:S, uniform:LO,HI, normal:MEAN,SD, lognormal:MU,SIGMA",
+    )
+    parser.add_argument(
+        "--failure-rate",
+        type=float,
+        default=0.0,
+        help="Share of requests that fail (0-1)",
+    )
+    parser.add_argument(
+        "--failure-status",
+        type=int,
+        default=503,
+        help="HTTP status for injected failures",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Seed for latency and failure sampling"
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--record",
+        type=Path,
+        help="Proxy to --upstream and append exchanges to this JSONL file",
+    )
+    mode.add_argument(
+        "--replay", type=Path, help="Serve responses recorded in this JSONL file"
+    )
+    parser.add_argument(
+        "--upstream",
+        help="Upstream base URL for --record (e.g. http://localhost:11434)",
+    )
+    args = parser.parse_args(argv)
+    if args.record and not args.upstream:
+        parser.error("--record requires --upstream")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    try:
+        config = MockConfig(
+            latency=args.latency,
+            failure_rate=args.failure_rate,
+            failure_status=args.failure_status,
+            seed=args.seed,
+            record_path=args.record,
+            upstream=args.upstream,
+            replay_path=args.replay,
+        )
+        server = MockLLMServer(config, host=args.host, port=args.port)
+    except (ValueError, OSError) as e:
+        logger.error(f"Could not start mock LLM server: {e}")
+        return 1
+
+    logger.info(f"Mock LLM server listening on {server.url}")
+    logger.info(f"  OLLAMA_BASE_URL={server.url}")
+    logger.info(f"  OPENAI_BASE_URL={server.url}/v1")
+    logger.info(f"  ANTHROPIC_BASE_URL={server.url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down")
+    finally:
+        server._httpd.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
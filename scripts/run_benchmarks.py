@@ -0,0 +1,122 @@
+# File: scripts/run_benchmarks.py
+# Description: Run the benchmarks/ suite, save JSON baselines and fail on per-stage regressions
+# Version: 1.0
+# Usage: python scripts/run_benchmarks.py                       # run and print timings
+#        python scripts/run_benchmarks.py --save main           # store a baseline
+#        python scripts/run_benchmarks.py --compare --threshold 15 [-- -k parse]
+
+"""
+Thin wrapper around pytest-benchmark for the benchmarks/ suite.
+
+Baselines are pytest-benchmark JSON files under benchmarks/baselines/
+(one subdirectory per machine/interpreter). --compare checks the run against
+the latest baseline (or a given one) and exits non-zero when any benchmark's
+statistic is more than --threshold percent slower; every stage/size pair is
+its own benchmark, so the failure names the stage that regressed.
+"""
+
+import argparse
+import subprocess  # nosec B404 - only invokes the current interpreter's pytest
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+project_root = Path(__file__).resolve().parent.parent
+BENCHMARKS_DIR = project_root / "benchmarks"
+BASELINES_DIR = BENCHMARKS_DIR / "baselines"
+
+DEFAULT_THRESHOLD = 10.0
+DEFAULT_STAT = "median"
+STATS = ("min", "max", "mean", "median", "stddev", "iqr")
+
+
+def build_pytest_command(args: argparse.Namespace) -> List[str]:
+    """Return the pytest command line for the parsed arguments."""
+    command = [
+        sys.executable,
+        "-m",
+        "pytest",
+        str(BENCHMARKS_DIR),
+        "-c",
+        str(BENCHMARKS_DIR / "pytest.ini"),
+        f"--benchmark-storage=file://{args.storage.resolve()}",
+    ]
+    if args.save:
+        command.append(f"--benchmark-save={args.save}")
+    if args.compare is not None:
+        command.append(
+            "--benchmark-compare"
+            if args.compare == "latest"
+            else f"--benchmark-compare={args.compare}"
+        )
+        command.append(f"--benchmark-compare-fail={args.stat}:{args.threshold:g}%")
+    if args.json:
+        command.append(f"--benchmark-json={args.json}")
+    command.extend(args.pytest_args)
+    return command
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Run pipeline benchmarks; save baselines or compare against one.",
+        epilog="Arguments after -- are passed to pytest (e.g. -- -k parse).",
+    )
+    parser.add_argument(
+        "--save", metavar="NAME", help="Save results as a baseline named NAME"
+    )
+    parser.add_argument(
+        "--compare",
+        nargs="?",
+        const="latest",
+        metavar="ID",
+        help="Compare with a saved baseline (default: the latest) and fail on regressions",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Allowed slowdown per benchmark in percent (default: {DEFAULT_THRESHOLD:g})",
+    )
+    parser.add_argument(
+        "--stat",
+        choices=STATS,
+        default=DEFAULT_STAT,
+        help=f"Statistic compared against the baseline (default: {DEFAULT_STAT})",
+    )
+    parser.add_argument(
+        "--json", type=Path, help="Also write this run's results to a JSON file"
+    )
+    parser.add_argument(
+        "--storage",
+        type=Path,
+        default=BASELINES_DIR,
+        help="Baseline directory (default: benchmarks/baselines)",
+    )
+    argv = list(sys.argv[1:] if argv is None else argv)
+    pytest_args: List[str] = []
+    if "--" in argv:
+        split = argv.index("--")
+        argv, pytest_args = argv[:split], argv[split + 1 :]
+    args = parser.parse_args(argv)
+    if args.threshold <= 0:
+        parser.error("--threshold must be positive")
+    args.pytest_args = pytest_args
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    try:
+        import pytest_benchmark  # noqa: F401
+    except ImportError:
+        print("pytest-benchmark is not installed: pip install -r requirements-dev.txt")
+        return 2
+    command = build_pytest_command(args)
+    print("Running:", " ".join(command))
+    return subprocess.call(
+        command, cwd=project_root
+    )  # nosec B603 - fixed interpreter and arguments
+
+
+if __name__ == "__main__":
+    sys.exit(main())
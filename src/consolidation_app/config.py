@@ -10,21 +10,19 @@ ENV overrides YAML when both exist. Validates required vars, paths, schedule, th
 from __future__ import annotations
 
 import os
-import re
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
 from dotenv import load_dotenv
 
+from src.consolidation_app.scheduler import DEFAULT_SCHEDULE, CronSchedule
+
 load_dotenv()
 
 # Default config file path (relative to cwd)
 DEFAULT_CONFIG_PATH = Path("consolidation_config.yaml")
 
-# Cron pattern: 5 fields (min hour dom month dow), e.g. "0 2 * * *"
-CRON_PATTERN = re.compile(r"^\s*\S+\s+\S+\s+\S+\s+\S+\s+\S+\s*$")
-
 
 def _env(key: str, default: str | None = None) -> str | None:
     """Get environment variable; return default if unset or empty."""
@@ -53,8 +51,12 @@ def _load_yaml_config(path: Path) -> dict[str, Any]:
 
 
 def _cron_ok(schedule: str) -> bool:
-    """Check schedule has 5 cron-like fields (min hour dom month dow)."""
-    return bool(CRON_PATTERN.match(schedule))
+    """Check schedule is a valid cron expression (min hour dom month dow)."""
+    try:
+        CronSchedule.parse(schedule)
+    except ValueError:
+        return False
+    return True
 
 
 @dataclass
@@ -72,7 +74,7 @@ class ConsolidationConfig:
     llm_model_deduplication: str | None = None
     llm_model_tagging: str | None = None
     llm_model_rule_extraction: str | None = None
-    consolidation_schedule: str = "0 2 * * *"
+    consolidation_schedule: str = DEFAULT_SCHEDULE
     similarity_threshold: float = 0.85
     llm_api_key: str | None = None
     extra_projects: list[str] = field(default_factory=list)
@@ -122,7 +124,7 @@ def _merge_from_yaml(
     rule = env_rule or models.get("rule_extraction")
     rule = str(rule).strip() if rule else None
 
-    schedule = env_schedule or cons.get("schedule") or "0 2 * * *"
+    schedule = env_schedule or cons.get("schedule") or DEFAULT_SCHEDULE
     schedule = str(schedule).strip()
 
     th = env_threshold or cons.get("similarity_threshold")
@@ -13,6 +13,7 @@ from __future__ import annotations
 import logging
 from typing import List
 
+from src.consolidation_app.instrumentation import count
 from src.consolidation_app.parser import ErrorEntry
 
 logger = logging.getLogger(__name__)
@@ -48,6 +49,7 @@ def deduplicate_errors_exact(
 
     if not existing_entries:
         logger.debug("No existing entries, returning all new entries")
+        count("dedup.new", len(new_entries))
         return new_entries.copy()
 
     # Build lookup dict for existing entries: (signature, type, file) -> index in result
@@ -103,6 +105,9 @@ def deduplicate_errors_exact(
         variant_count,
         new_count,
     )
+    count("dedup.merged", merged_count)
+    count("dedup.variant", variant_count)
+    count("dedup.new", new_count)
     return consolidated
 
 
@@ -11,7 +11,6 @@ Falls back to exact match deduplication if LLM fails.
 
 from __future__ import annotations
 
-import json
 import logging
 from typing import List
 
@@ -19,8 +18,10 @@ from src.consolidation_app.deduplicator import (
     deduplicate_errors_exact,
     merge_entries,
 )
-from src.consolidation_app.llm_client import call_llm
+from src.consolidation_app.llm_client import call_llm, get_model_for_task
 from src.consolidation_app.parser import ErrorEntry
+from src.consolidation_app.prompt_budget import PromptField, build_prompt
+from src.consolidation_app.structured_output import parse_json_object
 
 logger = logging.getLogger(__name__)
 
@@ -28,9 +29,63 @@ logger = logging.getLogger(__name__)
 DEFAULT_SIMILARITY_THRESHOLD = 0.85
 
 
+def _entry_fields(prefix: str, entry: ErrorEntry) -> List[PromptField]:
+    """Prompt fields describing one entry; signature and type are kept longest."""
+    return [
+        PromptField(
+            f"{prefix}.signature", entry.error_signature, priority=3, min_tokens=32
+        ),
+        PromptField(
+            f"{prefix}.error_type", entry.error_type, priority=3, min_tokens=16
+        ),
+        PromptField(f"{prefix}.file", entry.file, priority=2, min_tokens=16),
+        PromptField(
+            f"{prefix}.context", entry.explanation or "N/A", priority=1, min_tokens=64
+        ),
+        PromptField(
+            f"{prefix}.fix", entry.fix_code or "N/A", priority=0, min_tokens=32
+        ),
+    ]
+
+
+# Stable instructions sent as the system prompt; identical for every pair so
+# providers can serve them from their prompt cache
+_SIMILARITY_SYSTEM = """Compare two error entries and determine if they represent the same underlying error.
+
+Analyze if these errors are semantically similar (represent the same underlying issue, even if wording differs).
+
+Respond with a JSON object in this exact format:
+{
+    "similarity": 0.95,
+    "reason": "Both errors are FileNotFoundError when trying to open a config file, just different file paths"
+}
+
+Similarity score should be:
+- 0.9-1.0: Same error (different wording, same root cause)
+- 0.7-0.89: Similar error (related but different root cause)
+- 0.0-0.69: Different errors
+
+Only respond with the JSON object, no additional text."""
+
+# Response schema passed to the provider's native JSON mode
+_SIMILARITY_SCHEMA = {
+    "title": "similarity",
+    "type": "object",
+    "properties": {
+        "similarity": {"type": "number", "minimum": 0, "maximum": 1},
+        "reason": {"type": "string"},
+    },
+    "required": ["similarity"],
+}
+
+
 def _build_similarity_prompt(entry1: ErrorEntry, entry2: ErrorEntry) -> str:
     """
-    Build LLM prompt for comparing two error entries.
+    Build the variable part of the LLM prompt for comparing two error entries.
+
+    Instructions live in _SIMILARITY_SYSTEM. Entry fields are packed into the
+    deduplication token budget (see prompt_budget) instead of being cut at
+    fixed lengths.
 
     Args:
         entry1: First error entry to compare.
@@ -39,39 +94,32 @@ def _build_similarity_prompt(entry1: ErrorEntry, entry2: ErrorEntry) -> str:
     Returns:
         Formatted prompt string for LLM.
     """
-    prompt = f"""Compare these two error entries and determine if they represent the same underlying error.
 
-Error Entry 1:
-- Error Signature: {entry1.error_signature}
-- Error Type: {entry1.error_type}
-- File: {entry1.file}
+    def render(f: dict[str, str]) -> str:
+        return f"""Error Entry 1:
+- Error Signature: {f["e1.signature"]}
+- Error Type: {f["e1.error_type"]}
+- File: {f["e1.file"]}
 - Line: {entry1.line}
-- Error Context: {entry1.explanation[:500] if entry1.explanation else "N/A"}
-- Fix Code: {entry1.fix_code[:300] if entry1.fix_code else "N/A"}
+- Error Context: {f["e1.context"]}
+- Fix Code: {f["e1.fix"]}
 
 Error Entry 2:
-- Error Signature: {entry2.error_signature}
-- Error Type: {entry2.error_type}
-- File: {entry2.file}
+- Error Signature: {f["e2.signature"]}
+- Error Type: {f["e2.error_type"]}
+- File: {f["e2.file"]}
 - Line: {entry2.line}
-- Error Context: {entry2.explanation[:500] if entry2.explanation else "N/A"}
-- Fix Code: {entry2.fix_code[:300] if entry2.fix_code else "N/A"}
-
-Analyze if these errors are semantically similar (represent the same underlying issue, even if wording differs).
-
-Respond with a JSON object in this exact format:
-{{
-    "similarity": 0.95,
-    "reason": "Both errors are FileNotFoundError when trying to open a config file, just different file paths"
-}}
-
-Similarity score should be:
-- 0.9-1.0: Same error (different wording, same root cause)
-- 0.7-0.89: Similar error (related but different root cause)
-- 0.0-0.69: Different errors
-
-Only respond with the JSON object, no additional text."""
-    return prompt
+- Error Context: {f["e2.context"]}
+- Fix Code: {f["e2.fix"]}"""
+
+    model = get_model_for_task("deduplication")
+    return build_prompt(
+        render,
+        _entry_fields("e1", entry1) + _entry_fields("e2", entry2),
+        task="deduplication",
+        model=model,
+        system=_SIMILARITY_SYSTEM,
+    )
 
 
 def calculate_similarity(entry1: ErrorEntry, entry2: ErrorEntry) -> float:
@@ -99,29 +147,14 @@ def calculate_similarity(entry1: ErrorEntry, entry2: ErrorEntry) -> float:
 
     try:
         # Call LLM with task="deduplication" to use task-specific model if configured
-        response = call_llm(prompt, task="deduplication")
-
-        # Parse JSON response
-        response = response.strip()
-        # Remove markdown code blocks if present
-        if response.startswith("```"):
-            lines = response.split("\n")
-            response = "\n".join(lines[1:-1]) if len(lines) > 2 else response
-        response = response.strip()
-
-        try:
-            result = json.loads(response)
-        except json.JSONDecodeError as e:
-            # Try to extract JSON from response if wrapped in text
-            import re
-
-            json_match = re.search(r"\{[^{}]*\"similarity\"[^{}]*\}", response)
-            if json_match:
-                result = json.loads(json_match.group(0))
-            else:
-                raise ValueError(
-                    f"Could not parse JSON from LLM response: {response[:200]}"
-                ) from e
+        response = call_llm(
+            prompt,
+            task="deduplication",
+            system=_SIMILARITY_SYSTEM,
+            stop_at_json=True,
+            response_schema=_SIMILARITY_SCHEMA,
+        )
+        result = parse_json_object(response, _SIMILARITY_SCHEMA)
 
         similarity = float(result.get("similarity", 0.0))
         reason = result.get("reason", "No reason provided")
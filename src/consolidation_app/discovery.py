@@ -2,9 +2,18 @@
 
 from __future__ import annotations
 
+import fnmatch
+import json
 import logging
+import os
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from itertools import chain
 from pathlib import Path
+from typing import Iterable, Iterator, Sequence
 
 # Import bootstrap function from scripts
 # We need to add the scripts directory to the path temporarily
@@ -20,6 +29,31 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+_ERRORS_FIXES_DIR = ".errors_fixes"
+_TARGET_FILE = Path(_ERRORS_FIXES_DIR) / "errors_and_fixes.md"
+
+# Directory levels below the root that are searched (1 = immediate subdirectories)
+DEFAULT_MAX_DEPTH = 1
+DEFAULT_WORKERS = 8
+
+# Directories modified this recently are listed again on the next walk
+_RACY_MTIME_NS = 2_000_000_000
+
+# Directory names never searched for projects (fnmatch globs)
+DEFAULT_IGNORE: tuple[str, ...] = (
+    "node_modules",
+    ".git",
+    ".hg",
+    ".svn",
+    ".venv",
+    "venv",
+    "__pycache__",
+    ".tox",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+)
+
 
 def _validate_extra_project_path(path_str: str) -> bool:
     """
@@ -54,34 +88,493 @@ def _validate_extra_project_path(path_str: str) -> bool:
     return True
 
 
+def _get_int_env(key: str, default: int, minimum: int) -> int:
+    raw = os.getenv(key)
+    try:
+        return max(minimum, int(raw)) if raw else default
+    except ValueError:
+        logger.warning(f"Invalid {key}={raw!r}, using {default}")
+        return default
+
+
+def _ignore_patterns(ignore: Sequence[str] | None) -> tuple[str, ...]:
+    """Default ignore globs plus DISCOVERY_IGNORE (or the given globs)."""
+    if ignore is None:
+        raw = os.getenv("DISCOVERY_IGNORE", "")
+        ignore = [p.strip() for p in raw.split(",") if p.strip()]
+    return DEFAULT_IGNORE + tuple(ignore)
+
+
+def _is_ignored(name: str, patterns: Sequence[str]) -> bool:
+    return any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+
+
+@dataclass
+class DirState:
+    """Cached listing of one directory, valid while its mtime is unchanged."""
+
+    mtime: int
+    children: list[str] = field(default_factory=list)
+    project: bool = False
+    errors_dir: bool = False
+
+
+class DiscoveryCache:
+    """
+    Persistent record of the last walk: per directory its mtime, the
+    subdirectories to search and whether it is a project.
+
+    Adding, removing or renaming an entry changes a directory's mtime, so a
+    directory with an unchanged mtime is not listed again; known projects
+    are not stat'ed at all (the consolidation checks their file anyway).
+    The cache is tied to the root, max_depth and ignore globs it was built
+    with and starts empty when any of them differ.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    @classmethod
+    def from_env(cls) -> DiscoveryCache | None:
+        """Cache at DISCOVERY_CACHE_PATH (None if unset)."""
+        path = os.getenv("DISCOVERY_CACHE_PATH")
+        return cls(Path(path).expanduser()) if path else None
+
+    @staticmethod
+    def _key(root_path: Path, max_depth: int, patterns: Sequence[str]) -> dict:
+        return {
+            "version": DiscoveryCache.VERSION,
+            "root": str(root_path.resolve()),
+            "max_depth": max_depth,
+            "ignore": list(patterns),
+        }
+
+    def load(
+        self, root_path: Path, max_depth: int, patterns: Sequence[str]
+    ) -> dict[str, DirState]:
+        """Directory states of the last walk with the same settings ({} if none)."""
+        if not self.path.is_file():
+            return {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("key") != self._key(root_path, max_depth, patterns):
+                logger.info(
+                    f"Discovery cache {self.path} is for other settings; rescanning"
+                )
+                return {}
+            return {rel: DirState(**state) for rel, state in data["dirs"].items()}
+        except (OSError, ValueError, TypeError, KeyError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable discovery cache {self.path}: {e}")
+            return {}
+
+    def save(
+        self,
+        root_path: Path,
+        max_depth: int,
+        patterns: Sequence[str],
+        dirs: dict[str, DirState],
+    ) -> None:
+        """Write the walk's directory states atomically (temp file + rename)."""
+        data = {
+            "key": self._key(root_path, max_depth, patterns),
+            "dirs": {rel: asdict(state) for rel, state in sorted(dirs.items())},
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.path.with_name(f".{self.path.name}.tmp")
+            temp_file.write_text(json.dumps(data), encoding="utf-8")
+            temp_file.replace(self.path)
+        except OSError as e:
+            logger.warning(f"Could not write discovery cache {self.path}: {e}")
+
+
+class _WalkState:
+    """Previous and current directory states of one cached walk."""
+
+    def __init__(self, root_path: Path, previous: dict[str, DirState]) -> None:
+        self.root_path = root_path
+        self.previous = previous
+        self.current: dict[str, DirState] = {}
+        self.listed = 0
+        self.reused = 0
+        self._lock = threading.Lock()
+
+    def key(self, directory: Path) -> str:
+        return directory.relative_to(self.root_path).as_posix()
+
+    def record(self, key: str, state: DirState, *, reused: bool) -> None:
+        with self._lock:
+            self.current[key] = state
+            if reused:
+                self.reused += 1
+            else:
+                self.listed += 1
+
+
+def _list_dir(directory: Path, leaf: bool, patterns: Sequence[str]) -> DirState | None:
+    """
+    Fresh DirState of directory (mtime 0; set by the caller when caching).
+
+    Entries come from one os.scandir(); the DirEntry type info avoids a stat
+    per child, and errors_and_fixes.md is only stat'ed when .errors_fixes
+    exists. Leaf directories are not listed: a single stat decides.
+    """
+    if leaf:
+        project = (directory / _TARGET_FILE).is_file()
+        return DirState(mtime=0, project=project, errors_dir=project)
+
+    try:
+        with os.scandir(directory) as it:
+            names = sorted(entry.name for entry in it if entry.is_dir())
+    except PermissionError as e:
+        logger.warning(f"Permission denied while scanning {directory}: {e}")
+        return None
+    except OSError as e:
+        logger.warning(f"Cannot scan {directory}: {e}")
+        return None
+
+    errors_dir = _ERRORS_FIXES_DIR in names
+    return DirState(
+        mtime=0,
+        children=[
+            name
+            for name in names
+            if name != _ERRORS_FIXES_DIR and not _is_ignored(name, patterns)
+        ],
+        project=errors_dir and (directory / _TARGET_FILE).is_file(),
+        errors_dir=errors_dir,
+    )
+
+
+def _dir_state(
+    directory: Path,
+    leaf: bool,
+    patterns: Sequence[str],
+    state: _WalkState | None,
+) -> DirState | None:
+    """DirState of directory, from the cache when its mtime is unchanged."""
+    if state is None:
+        return _list_dir(directory, leaf, patterns)
+
+    key = state.key(directory)
+    previous = state.previous.get(key)
+    # Known projects are trusted; the root is always checked (it is searched
+    # even when it is a project itself)
+    if previous is not None and previous.project and key != ".":
+        state.record(key, previous, reused=True)
+        return previous
+
+    try:
+        mtime = os.stat(directory).st_mtime_ns
+    except OSError as e:
+        logger.warning(f"Cannot stat {directory}: {e}")
+        return None
+
+    if previous is not None and previous.mtime == mtime:
+        current = previous
+        if current.errors_dir and not current.project:
+            # errors_and_fixes.md may have appeared inside an existing .errors_fixes/
+            current = replace(current, project=(directory / _TARGET_FILE).is_file())
+        state.record(key, current, reused=True)
+        return current
+
+    current = _list_dir(directory, leaf, patterns)
+    if current is None:
+        return None
+    if leaf and not current.project:
+        # Unlisted leaf: remember an empty .errors_fixes/ (see above)
+        current.errors_dir = (directory / _ERRORS_FIXES_DIR).is_dir()
+    # A directory changed within the mtime granularity may change again
+    # unnoticed; do not trust its mtime next time
+    recent = time.time_ns() - mtime < _RACY_MTIME_NS
+    current.mtime = -1 if recent else mtime
+    state.record(key, current, reused=False)
+    return current
+
+
+def _walk(
+    directory: Path,
+    depth: int,
+    max_depth: int,
+    patterns: Sequence[str],
+    state: _WalkState | None = None,
+) -> Iterator[Path]:
+    """
+    Yield projects at or below directory (which is at `depth` below the root).
+
+    A project's subdirectories are not searched.
+    """
+    current = _dir_state(directory, depth >= max_depth, patterns, state)
+    if current is None:
+        return
+    if current.project:
+        yield directory
+        return
+    if depth >= max_depth:
+        return
+    for name in current.children:
+        yield from _walk(directory / name, depth + 1, max_depth, patterns, state)
+
+
+def _scan_root(
+    root_path: Path,
+    max_depth: int,
+    patterns: Sequence[str],
+    workers: int,
+    state: _WalkState | None = None,
+) -> Iterator[Path]:
+    """Yield projects below root_path, walking top-level directories in parallel."""
+    root_state = _dir_state(root_path, False, patterns, state)
+    if root_state is None:
+        return
+    top = [root_path / name for name in root_state.children]
+
+    def _subtree(directory: Path) -> list[Path]:
+        return list(_walk(directory, 1, max_depth, patterns, state))
+
+    found = 0
+    if workers <= 1 or len(top) <= 1:
+        for directory in top:
+            for project in _subtree(directory):
+                found += 1
+                yield project
+    else:
+        # Ordered map: results stream per top-level directory in name order
+        with ThreadPoolExecutor(
+            max_workers=min(workers, len(top)), thread_name_prefix="discovery"
+        ) as pool:
+            for projects in pool.map(_subtree, top):
+                for project in projects:
+                    found += 1
+                    yield project
+    logger.info(
+        f"Checked root + {len(top)} top-level directories (max depth {max_depth}), "
+        f"found {found} project(s)"
+    )
+
+
+def _resolve_extra_projects(extra_projects: list[str]) -> list[Path]:
+    """Validate, resolve and (if needed) bootstrap extra project paths."""
+    projects: list[Path] = []
+    logger.info(f"Processing {len(extra_projects)} extra projects")
+    for extra_path_str in extra_projects:
+        try:
+            # Validate path string before processing
+            if not _validate_extra_project_path(extra_path_str):
+                logger.warning(
+                    f"Invalid or suspicious extra project path: {extra_path_str} (skipping)"
+                )
+                continue
+
+            # Resolve the path (normalizes and makes absolute)
+            extra_path = Path(extra_path_str).resolve()
+
+            # Check if it exists
+            if not extra_path.exists():
+                logger.warning(
+                    f"Extra project path does not exist: {extra_path_str} (skipping)"
+                )
+                continue
+
+            if not extra_path.is_dir():
+                logger.warning(
+                    f"Extra project path is not a directory: {extra_path_str} (skipping)"
+                )
+                continue
+
+            # Check if errors_and_fixes.md exists
+            # Optimize: Use is_file() which checks both existence and type in one call
+            errors_fixes_file = extra_path / ".errors_fixes" / "errors_and_fixes.md"
+
+            if not errors_fixes_file.is_file():
+                logger.info(
+                    f"errors_and_fixes.md not found in {extra_path}, bootstrapping..."
+                )
+
+                # Auto-bootstrap if bootstrap function is available
+                if bootstrap_project is None:
+                    logger.error(
+                        "Bootstrap function not available. Cannot auto-bootstrap project. "
+                        "Please run bootstrap_errors_fixes.py manually."
+                    )
+                    raise ValueError(
+                        f"Cannot bootstrap {extra_path_str}: bootstrap function unavailable"
+                    )
+
+                try:
+                    # Bootstrap with update_gitignore=False to avoid modifying gitignore
+                    # during consolidation (this is an internal operation)
+                    bootstrap_project(extra_path, update_gitignore_flag=False)
+                    logger.info(f"Successfully bootstrapped project: {extra_path}")
+                except Exception as e:
+                    logger.error(
+                        f"Failed to bootstrap project {extra_path}: {e}",
+                        exc_info=True,
+                    )
+                    raise ValueError(
+                        f"Failed to bootstrap {extra_path_str}: {e}"
+                    ) from e
+
+            # Add to projects list
+            projects.append(extra_path)
+            logger.debug(f"Added extra project: {extra_path}")
+
+        except (ValueError, PermissionError, OSError) as e:
+            logger.error(f"Error processing extra project {extra_path_str}: {e}")
+            raise
+        except Exception as e:
+            logger.error(
+                f"Unexpected error processing extra project {extra_path_str}: {e}",
+                exc_info=True,
+            )
+            raise ValueError(f"Invalid extra project path: {extra_path_str}") from e
+    return projects
+
+
+def iter_projects(
+    root_path: Path,
+    extra_projects: list[str] | None = None,
+    *,
+    max_depth: int | None = None,
+    ignore: Sequence[str] | None = None,
+    workers: int | None = None,
+    cache: DiscoveryCache | None = None,
+    rescan: bool = False,
+) -> Iterator[Path]:
+    """
+    Stream projects with .errors_fixes/errors_and_fixes.md as they are found.
+
+    root_path and extra_projects are validated before this returns (so
+    errors are raised by the call, not during iteration); the directory
+    walk itself is lazy. Yields root_path itself if it is a project, then
+    projects below it (depth-first, in name order per top-level directory),
+    then extra_projects, each path once.
+
+    Args:
+        root_path: Root directory to scan.
+        extra_projects: Optional project paths outside the scan root;
+            bootstrapped if errors_and_fixes.md is missing.
+        max_depth: How many directory levels below root to search
+            (default: DISCOVERY_MAX_DEPTH or 1, immediate subdirectories).
+        ignore: Extra directory-name globs to skip (default: DISCOVERY_IGNORE),
+            on top of DEFAULT_IGNORE.
+        workers: Threads walking top-level directories
+            (default: DISCOVERY_WORKERS or 8; 1 disables).
+        cache: Discovery cache (default: DISCOVERY_CACHE_PATH, if set).
+            Directories whose mtime is unchanged since the last walk are
+            not listed again; the cache is rewritten when the walk finishes.
+        rescan: Ignore the cache contents and walk everything.
+
+    Raises:
+        FileNotFoundError: If root_path does not exist
+        NotADirectoryError: If root_path is not a directory
+        ValueError: If extra_projects contains invalid paths
+    """
+    if not root_path.exists():
+        error_msg = f"Root path does not exist: {root_path}"
+        logger.error(error_msg)
+        raise FileNotFoundError(error_msg)
+
+    if not root_path.is_dir():
+        error_msg = f"Root path is not a directory: {root_path}"
+        logger.error(error_msg)
+        raise NotADirectoryError(error_msg)
+
+    if max_depth is None:
+        max_depth = _get_int_env("DISCOVERY_MAX_DEPTH", DEFAULT_MAX_DEPTH, 1)
+    if workers is None:
+        workers = _get_int_env("DISCOVERY_WORKERS", DEFAULT_WORKERS, 1)
+    patterns = _ignore_patterns(ignore)
+    extras = _resolve_extra_projects(extra_projects) if extra_projects else []
+    if cache is None:
+        cache = DiscoveryCache.from_env()
+    state = None
+    if cache is not None:
+        previous = {} if rescan else cache.load(root_path, max_depth, patterns)
+        state = _WalkState(root_path, previous)
+
+    def _generate() -> Iterator[Path]:
+        logger.info(f"Discovering projects from root: {root_path}")
+        seen: set[Path] = set()
+        # Root itself may be a project (testing/single-project scenarios)
+        candidates: Iterable[Path] = (
+            [root_path] if (root_path / _TARGET_FILE).is_file() else []
+        )
+        try:
+            for project in chain(
+                candidates, _scan_root(root_path, max_depth, patterns, workers, state)
+            ):
+                # Only resolve found projects (resolve() is slow on Docker mounts)
+                resolved = project.resolve()
+                if resolved not in seen:
+                    seen.add(resolved)
+                    logger.debug(f"Found project: {resolved}")
+                    yield resolved
+        except Exception as e:
+            logger.error(
+                f"Unexpected error during project discovery: {e}", exc_info=True
+            )
+            # Continue with extra_projects even if scan fails
+        else:
+            if cache is not None and state is not None:
+                cache.save(root_path, max_depth, patterns, state.current)
+                logger.info(
+                    f"Discovery cache: {state.reused} directories reused, "
+                    f"{state.listed} (re)scanned"
+                )
+        for project in extras:
+            if project not in seen:
+                seen.add(project)
+                yield project
+
+    return _generate()
+
+
 def discover_projects(
-    root_path: Path, extra_projects: list[str] | None = None
+    root_path: Path,
+    extra_projects: list[str] | None = None,
+    *,
+    max_depth: int | None = None,
+    ignore: Sequence[str] | None = None,
+    workers: int | None = None,
+    cache: DiscoveryCache | None = None,
+    rescan: bool = False,
 ) -> list[Path]:
     """
     Discover all projects with .errors_fixes/errors_and_fixes.md files.
 
     This function searches for projects in two ways:
-    1. Checks immediate subdirectories of root_path (non-recursive)
-       - Each subdirectory is expected to be a project
+    1. Walks subdirectories of root_path up to max_depth levels
+       (DISCOVERY_MAX_DEPTH, default 1 = immediate subdirectories only)
        - Looks for .errors_fixes/errors_and_fixes.md at the project root level
+       - Does not descend into projects or ignored directories
+         (node_modules, .git, .venv, ... plus DISCOVERY_IGNORE globs)
     2. Processes extra_projects list (paths outside the scan root)
 
     For extra_projects, if errors_and_fixes.md is missing, the function will
     automatically bootstrap the project (create the .errors_fixes/ folder structure).
 
+    See iter_projects() to stream projects while the walk is still running.
+
     Args:
         root_path: Root directory containing project subdirectories.
-                  Each immediate subdirectory is checked for .errors_fixes/errors_and_fixes.md
         extra_projects: Optional list of project paths (strings) to include.
                        These paths are resolved and checked. If errors_and_fixes.md
                        is missing, bootstrap is called automatically.
+        max_depth: Directory levels below root to search (default: DISCOVERY_MAX_DEPTH or 1).
+        ignore: Extra directory-name globs to skip (default: DISCOVERY_IGNORE).
+        workers: Threads walking top-level directories (default: DISCOVERY_WORKERS or 8).
+        cache: Discovery cache (default: DISCOVERY_CACHE_PATH, if set).
+        rescan: Ignore the cache contents and walk everything.
 
     Returns:
         List of project root paths (deduplicated)
 
     Raises:
         FileNotFoundError: If root_path does not exist
-        PermissionError: If root_path cannot be accessed
+        NotADirectoryError: If root_path is not a directory
         ValueError: If extra_projects contains invalid paths
 
     Example:
@@ -90,150 +583,16 @@ def discover_projects(
         >>> print(projects)
         [Path('/projects/proj1'), Path('/projects/proj2')]
     """
-    # Validate root_path
-    if not root_path.exists():
-        error_msg = f"Root path does not exist: {root_path}"
-        logger.error(error_msg)
-        raise FileNotFoundError(error_msg)
-
-    if not root_path.is_dir():
-        error_msg = f"Root path is not a directory: {root_path}"
-        logger.error(error_msg)
-        raise NotADirectoryError(error_msg)
-
-    logger.info(f"Discovering projects from root: {root_path}")
-
-    projects: list[Path] = []
-
-    target_file = Path(".errors_fixes") / "errors_and_fixes.md"
-
-    # Step 0: Check if root_path itself is a project (for testing/single-project scenarios)
-    # In production, C:\Projects contains project folders, but we support root being a project too
-    root_errors_fixes_path = root_path / target_file
-    if root_errors_fixes_path.is_file():
-        projects.append(root_path.resolve())
-        logger.debug(f"Found project at root: {root_path}")
-
-    # Step 1: Discover projects by checking immediate subdirectories only
-    # Each subdirectory under root_path is expected to be a project
-    # with .errors_fixes/errors_and_fixes.md at the project root level
-    try:
-        logger.debug(f"Checking immediate subdirectories of {root_path} for projects")
-
-        checked_count = 0
-
-        # Iterate over immediate subdirectories only (not recursive)
-        for item in root_path.iterdir():
-            if not item.is_dir():
-                continue
-
-            checked_count += 1
-            # Optimize: Avoid resolve() until we know we have a project
-            # This reduces slow Docker mount calls when checking many directories
-            # Only resolve when we actually find a project with .errors_fixes/
-
-            # Optimize: Use is_file() which checks both existence and type in one call
-            # This reduces file system operations on Docker mounts (from 2 calls to 1)
-            errors_fixes_path = item / target_file
-            if errors_fixes_path.is_file():
-                # Only resolve when we actually have a project (reduces resolve() calls)
-                projects.append(item.resolve())
-                logger.debug(f"Found project: {item}")
-            else:
-                logger.debug(f"Skipping {item.name}: missing {target_file}")
-
-        logger.info(
-            f"Checked root + {checked_count} subdirectories, found {len(projects)} project(s)"
+    projects = list(
+        iter_projects(
+            root_path,
+            extra_projects,
+            max_depth=max_depth,
+            ignore=ignore,
+            workers=workers,
+            cache=cache,
+            rescan=rescan,
         )
-    except PermissionError as e:
-        logger.warning(f"Permission denied while scanning {root_path}: {e}")
-        # Continue with extra_projects even if scan fails
-    except Exception as e:
-        logger.error(f"Unexpected error during project discovery: {e}", exc_info=True)
-        # Continue with extra_projects even if scan fails
-
-    # Step 2: Process extra_projects list
-    if extra_projects:
-        logger.info(f"Processing {len(extra_projects)} extra projects")
-        for extra_path_str in extra_projects:
-            try:
-                # Validate path string before processing
-                if not _validate_extra_project_path(extra_path_str):
-                    logger.warning(
-                        f"Invalid or suspicious extra project path: {extra_path_str} (skipping)"
-                    )
-                    continue
-
-                # Resolve the path (normalizes and makes absolute)
-                extra_path = Path(extra_path_str).resolve()
-
-                # Check if it exists
-                if not extra_path.exists():
-                    logger.warning(
-                        f"Extra project path does not exist: {extra_path_str} (skipping)"
-                    )
-                    continue
-
-                if not extra_path.is_dir():
-                    logger.warning(
-                        f"Extra project path is not a directory: {extra_path_str} (skipping)"
-                    )
-                    continue
-
-                # Check if errors_and_fixes.md exists
-                # Optimize: Use is_file() which checks both existence and type in one call
-                errors_fixes_file = extra_path / ".errors_fixes" / "errors_and_fixes.md"
-
-                if not errors_fixes_file.is_file():
-                    logger.info(
-                        f"errors_and_fixes.md not found in {extra_path}, bootstrapping..."
-                    )
-
-                    # Auto-bootstrap if bootstrap function is available
-                    if bootstrap_project is None:
-                        logger.error(
-                            "Bootstrap function not available. Cannot auto-bootstrap project. "
-                            "Please run bootstrap_errors_fixes.py manually."
-                        )
-                        raise ValueError(
-                            f"Cannot bootstrap {extra_path_str}: bootstrap function unavailable"
-                        )
-
-                    try:
-                        # Bootstrap with update_gitignore=False to avoid modifying gitignore
-                        # during consolidation (this is an internal operation)
-                        bootstrap_project(extra_path, update_gitignore_flag=False)
-                        logger.info(f"Successfully bootstrapped project: {extra_path}")
-                    except Exception as e:
-                        logger.error(
-                            f"Failed to bootstrap project {extra_path}: {e}",
-                            exc_info=True,
-                        )
-                        raise ValueError(
-                            f"Failed to bootstrap {extra_path_str}: {e}"
-                        ) from e
-
-                # Add to projects list
-                projects.append(extra_path)
-                logger.debug(f"Added extra project: {extra_path}")
-
-            except (ValueError, PermissionError, OSError) as e:
-                logger.error(f"Error processing extra project {extra_path_str}: {e}")
-                raise
-            except Exception as e:
-                logger.error(
-                    f"Unexpected error processing extra project {extra_path_str}: {e}",
-                    exc_info=True,
-                )
-                raise ValueError(f"Invalid extra project path: {extra_path_str}") from e
-
-    # Step 3: Deduplicate projects
-    # Use dict.fromkeys() to preserve order while removing duplicates
-    unique_projects = list(dict.fromkeys(projects))
-
-    logger.info(
-        f"Discovery complete: {len(unique_projects)} unique projects found "
-        f"(from {len(projects)} total entries)"
     )
-
-    return unique_projects
+    logger.info(f"Discovery complete: {len(projects)} unique projects found")
+    return projects
@@ -1,152 +1,345 @@
-"""Generate consolidated markdown for fix_repo and coding tips."""
+"""Generate consolidated markdown for fix_repo and coding tips.
+
+Documents are produced as a stream of chunks (iter_*_markdown, render_*),
+so writers can stream them to a file without building the whole document
+in memory; generate_*_markdown join the chunks into one string.
+
+fix_repo.md sections (one per error signature) are rendered through a
+SectionCache keyed by the group's entries, so a run that changed
+a few signatures re-renders only those sections and splices the cached
+text of all others into the document.
+"""
 
 from __future__ import annotations
 
 import logging
-from collections import defaultdict
+import os
+import threading
+from collections import OrderedDict, defaultdict
 from datetime import datetime, timezone
-from typing import Iterable, List
-
+from operator import attrgetter
+from typing import Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from src.consolidation_app.instrumentation import count
+from src.consolidation_app.markdown_codec import (
+    escape_header,
+    format_date,
+    format_tags,
+    format_timestamp,
+)
 from src.consolidation_app.parser import ErrorEntry
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_RENDER_CACHE_SIZE = 4096
+
+# (signature, rendered fields and tags of each entry in order); see section_key()
+SectionKey = Tuple[str, Tuple[tuple, ...], Tuple[Tuple[str, ...], ...]]
+
+# Entry fields a fix_repo.md section is rendered from (besides tags)
+_rendered_fields = attrgetter(
+    "error_type",
+    "file",
+    "fix_code",
+    "explanation",
+    "result",
+    "success_count",
+    "timestamp",
+)
+_entry_tags = attrgetter("tags")
+
+
+class SectionCache:
+    """Bounded LRU of rendered fix_repo.md sections, keyed by section_key()."""
+
+    def __init__(self, max_size: int = DEFAULT_RENDER_CACHE_SIZE) -> None:
+        self.max_size = max(0, max_size)
+        self.hits = 0
+        self.misses = 0
+        self._sections: OrderedDict[SectionKey, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "SectionCache":
+        """Cache of RENDER_CACHE_SIZE sections (default 4096; 0 disables it)."""
+        raw = os.getenv("RENDER_CACHE_SIZE")
+        try:
+            size = int(raw) if raw else DEFAULT_RENDER_CACHE_SIZE
+        except ValueError:
+            logger.warning(
+                "Invalid RENDER_CACHE_SIZE=%r, using %d", raw, DEFAULT_RENDER_CACHE_SIZE
+            )
+            size = DEFAULT_RENDER_CACHE_SIZE
+        return cls(size)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sections)
+
+    def get(self, key: SectionKey) -> Optional[str]:
+        with self._lock:
+            text = self._sections.get(key)
+            if text is None:
+                self.misses += 1
+                return None
+            self._sections.move_to_end(key)
+            self.hits += 1
+            return text
+
+    def put(self, key: SectionKey, text: str) -> None:
+        if self.max_size == 0:
+            return
+        with self._lock:
+            self._sections[key] = text
+            self._sections.move_to_end(key)
+            while len(self._sections) > self.max_size:
+                self._sections.popitem(last=False)
+
+
+_section_cache: Optional[SectionCache] = None
+_section_cache_lock = threading.Lock()
+
+
+def get_section_cache() -> SectionCache:
+    """Return the process-wide section cache (kept warm across daemon runs)."""
+    global _section_cache
+    with _section_cache_lock:
+        if _section_cache is None:
+            _section_cache = SectionCache.from_env()
+        return _section_cache
+
+
+def reset_section_cache() -> SectionCache:
+    """Drop all cached sections and return the new, empty cache."""
+    global _section_cache
+    with _section_cache_lock:
+        _section_cache = SectionCache.from_env()
+        return _section_cache
+
+
+def section_key(signature: str, group: List[ErrorEntry]) -> SectionKey:
+    """Return the cache key of a section: its signature and rendered entry fields, in order.
+
+    The key is a tuple, so lookups use its hash and then compare it exactly
+    (no collisions); building it is much cheaper than rendering the section
+    or hashing the entries with entry_fingerprint. Order is kept because
+    fixes with equal success counts are rendered in input order.
+    """
+    return (
+        signature,
+        tuple(map(_rendered_fields, group)),
+        tuple(map(tuple, map(_entry_tags, group))),
+    )
+
+
+def generate_fix_repo_markdown(
+    entries: Iterable[ErrorEntry], *, cache: Optional[SectionCache] = None
+) -> str:
+    """Return markdown that showcases fixes grouped by signature.
 
-def generate_fix_repo_markdown(entries: Iterable[ErrorEntry]) -> str:
-    """Return markdown that showcases fixes grouped by signature."""
+    Sections are taken from cache (default: get_section_cache()) when their
+    group is unchanged and rendered (and cached) otherwise.
+    """
+
+    return "".join(iter_fix_repo_markdown(entries, cache=cache))
+
+
+def iter_fix_repo_markdown(
+    entries: Iterable[ErrorEntry], *, cache: Optional[SectionCache] = None
+) -> Iterator[str]:
+    """Yield the fix_repo.md document in chunks (header, then one per section)."""
 
     clean_entries = [entry for entry in entries if not entry.is_process_issue]
     logger.debug("Generating fix_repo markdown for %d entries", len(clean_entries))
     header_lines = _build_fix_repo_header(clean_entries)
     if not clean_entries:
         logger.debug("No error entries to generate, returning header only")
-        return "\n".join(header_lines)
+        yield "\n".join(header_lines)
+        return
+
+    yield from _rstrip_chunks(
+        _join_chunks(
+            "\n".join(header_lines),
+            _iter_fix_repo_sections(clean_entries, cache or get_section_cache()),
+        )
+    )
+
+
+def render_fix_repo(
+    entries: Iterable[ErrorEntry], fp: TextIO, *, cache: Optional[SectionCache] = None
+) -> int:
+    """Write fix_repo.md markdown to fp chunk by chunk; returns characters written."""
+
+    return _write_chunks(iter_fix_repo_markdown(entries, cache=cache), fp)
 
-    body: List[str] = []
-    grouped = _group_by_signature(clean_entries)
+
+def _iter_fix_repo_sections(
+    entries: List[ErrorEntry], cache: SectionCache
+) -> Iterator[str]:
+    """Yield the text of each signature section in document order."""
+
+    grouped = _group_by_signature(entries)
     logger.debug("Grouped into %d unique error signatures", len(grouped))
+    rendered = 0
     for signature, group in sorted(grouped.items(), key=lambda item: item[0] or ""):
-        # Escape markdown special characters in header
-        escaped_signature = _escape_markdown_header(signature or "Untitled Error")
-        body.append(f"## {escaped_signature}")
-        first_seen = min(entry.timestamp for entry in group)
-        last_updated = max(entry.timestamp for entry in group)
-        all_tags = sorted({tag for entry in group for tag in entry.tags})
+        key = section_key(signature or "", group)
+        text = cache.get(key)
+        if text is None:
+            text = "\n".join(_render_fix_repo_section(signature, group))
+            cache.put(key, text)
+            rendered += 1
+        yield text
+    count("render.sections", len(grouped))
+    count("render.sections_rendered", rendered)
+
+
+def _render_fix_repo_section(signature: str, group: List[ErrorEntry]) -> List[str]:
+    """Return the lines of one `## signature` section (ends with "---", "")."""
+
+    # Escape markdown special characters in header
+    escaped_signature = escape_header(signature or "Untitled Error")
+    body = [f"## {escaped_signature}"]
+    first_seen = min(entry.timestamp for entry in group)
+    last_updated = max(entry.timestamp for entry in group)
+    all_tags = sorted({tag for entry in group for tag in entry.tags})
+    body.append("")
+    body.append(f"**Tags:** {format_tags(all_tags)}")
+    body.append(f"**First Seen:** {format_date(first_seen)}")
+    body.append(f"**Last Updated:** {format_date(last_updated)}")
+    body.append(f"**Total Occurrences:** {len(group)}")
+    body.append("")
+    for idx, entry in enumerate(
+        sorted(group, key=lambda item: item.success_count, reverse=True), start=1
+    ):
+        # Note: v1 uses error_type as fix description; future versions may extract description
+        body.append(
+            f"### Fix {idx}: {entry.error_type or 'Fix'} (Success Count: {entry.success_count})"
+        )
         body.append("")
-        body.append(f"**Tags:** {format_tags(all_tags)}")
-        body.append(f"**First Seen:** {_format_date(first_seen)}")
-        body.append(f"**Last Updated:** {_format_date(last_updated)}")
-        body.append(f"**Total Occurrences:** {len(group)}")
+        body.append("**Code:**")
+        body.append(format_code_block(entry.fix_code or ""))
         body.append("")
-        for idx, entry in enumerate(
-            sorted(group, key=lambda item: item.success_count, reverse=True), start=1
-        ):
-            # Note: v1 uses error_type as fix description; future versions may extract description
-            body.append(
-                f"### Fix {idx}: {entry.error_type or 'Fix'} (Success Count: {entry.success_count})"
-            )
-            body.append("")
-            body.append("**Code:**")
-            body.append(format_code_block(entry.fix_code or ""))
-            body.append("")
-            body.append(
-                f"**Why this works:** {entry.explanation or 'Describes why the fix succeeds.'}"
-            )
-            body.append(f"**Result:** {entry.result or 'Unknown'}")
-            # Note: v1 uses file path; future versions may extract project name
-            body.append(f"**Projects:** {entry.file or 'Unknown'}")
-            body.append(f"**Last Updated:** {format_timestamp(entry.timestamp)}")
-            body.append("")
-        body.append("---")
+        body.append(
+            f"**Why this works:** {entry.explanation or 'Describes why the fix succeeds.'}"
+        )
+        body.append(f"**Result:** {entry.result or 'Unknown'}")
+        # Note: v1 uses file path; future versions may extract project name
+        body.append(f"**Projects:** {entry.file or 'Unknown'}")
+        body.append(f"**Last Updated:** {format_timestamp(entry.timestamp)}")
         body.append("")
-
-    return "\n".join(header_lines + body).rstrip()
+    body.append("---")
+    body.append("")
+    return body
 
 
 def generate_coding_tips_markdown(entries: Iterable[ErrorEntry]) -> str:
     """Return markdown that documents agent process rules."""
 
+    return "".join(iter_coding_tips_markdown(entries))
+
+
+def iter_coding_tips_markdown(entries: Iterable[ErrorEntry]) -> Iterator[str]:
+    """Yield the coding_tips.md document in chunks (header, then one per category)."""
+
     issues = [entry for entry in entries if entry.is_process_issue]
     logger.debug("Generating coding_tips markdown for %d process issues", len(issues))
     header_lines = _build_coding_tips_header(issues)
     if not issues:
         logger.debug("No process issues to generate, returning header only")
-        return "\n".join(header_lines)
+        yield "\n".join(header_lines)
+        return
 
-    sections: List[str] = []
     grouped = _group_by_category(issues)
     logger.debug("Grouped into %d categories", len(grouped))
-    for category, items in sorted(grouped.items(), key=lambda item: item[0]):
-        # Escape markdown special characters in category header
-        escaped_category = _escape_markdown_header(category or "General")
-        sections.append(f"## {escaped_category}")
+    sections = (
+        "\n".join(_render_coding_tips_section(category, items))
+        for category, items in sorted(grouped.items(), key=lambda item: item[0])
+    )
+    yield from _rstrip_chunks(_join_chunks("\n".join(header_lines), sections))
+
+
+def render_coding_tips(entries: Iterable[ErrorEntry], fp: TextIO) -> int:
+    """Write coding_tips.md markdown to fp chunk by chunk; returns characters written."""
+
+    return _write_chunks(iter_coding_tips_markdown(entries), fp)
+
+
+def _render_coding_tips_section(category: str, items: List[ErrorEntry]) -> List[str]:
+    """Return the lines of one `## category` section (ends with "---", "")."""
+
+    # Escape markdown special characters in category header
+    escaped_category = escape_header(category or "General")
+    sections = [f"## {escaped_category}", ""]
+    for entry in items:
+        # Escape markdown special characters in rule title
+        escaped_rule = escape_header(entry.error_signature or entry.error_type)
+        sections.append(f"### Rule: {escaped_rule}")
         sections.append("")
-        for entry in items:
-            # Escape markdown special characters in rule title
-            escaped_rule = _escape_markdown_header(
-                entry.error_signature or entry.error_type
-            )
-            sections.append(f"### Rule: {escaped_rule}")
-            sections.append("")
-            sections.append(
-                f"**Why:** {entry.explanation or entry.fix_code or 'Rule rationale pending.'}"
-            )
-            sections.append("")
-            sections.append("**Examples:**")
-            # Note: v1 generates single good/bad example; future versions may aggregate multiple
-            sections.append(
-                f"- ✅ {entry.explanation or entry.error_signature or 'Follows the rule.'}"
-            )
-            sections.append(
-                f"- ❌ {entry.result or 'Rule violation observed in agent session.'}"
-            )
-            sections.append("")
-            sections.append("**Related Errors:**")
-            related_signature = entry.error_signature or entry.error_type or "Unknown"
-            # Note: v1 uses success_count; future versions may track occurrence count separately
-            sections.append(
-                f"- `{entry.error_type or 'rule'}`: {related_signature} (success count: {entry.success_count})"
-            )
-            sections.append("")
-        sections.append("---")
+        sections.append(
+            f"**Why:** {entry.explanation or entry.fix_code or 'Rule rationale pending.'}"
+        )
+        sections.append("")
+        sections.append("**Examples:**")
+        # Note: v1 generates single good/bad example; future versions may aggregate multiple
+        sections.append(
+            f"- ✅ {entry.explanation or entry.error_signature or 'Follows the rule.'}"
+        )
+        sections.append(
+            f"- ❌ {entry.result or 'Rule violation observed in agent session.'}"
+        )
         sections.append("")
+        sections.append("**Related Errors:**")
+        related_signature = entry.error_signature or entry.error_type or "Unknown"
+        # Note: v1 uses success_count; future versions may track occurrence count separately
+        sections.append(
+            f"- `{entry.error_type or 'rule'}`: {related_signature} (success count: {entry.success_count})"
+        )
+        sections.append("")
+    sections.append("---")
+    sections.append("")
+    return sections
 
-    return "\n".join(header_lines + sections).rstrip()
 
+def _join_chunks(header: str, sections: Iterable[str]) -> Iterator[str]:
+    """Yield header and sections separated by newlines, like "\\n".join()."""
 
-def format_code_block(code: str, language: str = "python") -> str:
-    """Return a fenced code block, even when the snippet is empty."""
-
-    cleaned = code.rstrip()
-    if not cleaned:
-        return f"```{language}\n\n```"
-    return f"```{language}\n{cleaned}\n```"
+    yield header
+    for section in sections:
+        yield "\n"
+        yield section
 
 
-def format_tags(tags: List[str]) -> str:
-    """Return markdown-safe representation of tag collections.
+def _rstrip_chunks(chunks: Iterable[str]) -> Iterator[str]:
+    """Yield chunks whose concatenation is that of chunks, right-stripped.
 
-    Escapes backticks in tags to prevent markdown injection.
+    Trailing whitespace of a chunk is held back until a later chunk shows
+    it is not the end of the document.
     """
 
-    if not tags:
-        return "None"
-    # Escape backticks in tags to prevent markdown breaking
-    escaped_tags = [tag.replace("`", r"\`") for tag in tags]
-    return ", ".join(f"`{escaped_tag}`" for escaped_tag in escaped_tags)
+    pending = ""
+    for chunk in chunks:
+        stripped = chunk.rstrip()
+        if stripped:
+            yield pending + stripped if pending else stripped
+            pending = chunk[len(stripped) :]
+        else:
+            pending += chunk
+
 
+def _write_chunks(chunks: Iterable[str], fp: TextIO) -> int:
+    written = 0
+    for chunk in chunks:
+        written += fp.write(chunk)
+    return written
 
-def format_timestamp(dt: datetime) -> str:
-    """Serialize timestamps into UTC ISO8601 strings.
 
-    Assumes naive datetimes are UTC (v1 limitation).
-    """
+def format_code_block(code: str, language: str = "python") -> str:
+    """Return a fenced code block, even when the snippet is empty."""
 
-    if not dt.tzinfo:
-        logger.debug("Naive datetime encountered, assuming UTC: %s", dt)
-    aware = dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
-    iso = aware.astimezone(timezone.utc).replace(microsecond=0).isoformat()
-    return iso.replace("+00:00", "Z")
+    cleaned = code.rstrip()
+    if not cleaned:
+        return f"```{language}\n\n```"
+    return f"```{language}\n{cleaned}\n```"
 
 
 def _build_fix_repo_header(entries: List[ErrorEntry]) -> List[str]:
@@ -205,35 +398,3 @@ def _group_by_category(entries: List[ErrorEntry]) -> dict[str, List[ErrorEntry]]
             key = entry.error_type or "General"
         grouped[key].append(entry)
     return grouped
-
-
-def _format_date(dt: datetime) -> str:
-    """Return the YYYY-MM-DD portion of an ISO timestamp."""
-
-    return format_timestamp(dt).split("T")[0]
-
-
-def _escape_markdown_header(text: str) -> str:
-    """Escape markdown special characters in header text.
-
-    Prevents markdown injection in error signatures and category names.
-    Escapes: #, *, [, ], (, ), <, >, `, _, ~
-    """
-    # Escape markdown special characters that could break headers
-    replacements = {
-        "#": r"\#",
-        "*": r"\*",
-        "[": r"\[",
-        "]": r"\]",
-        "(": r"\(",
-        ")": r"\)",
-        "<": r"\<",
-        ">": r"\>",
-        "`": r"\`",
-        "_": r"\_",
-        "~": r"\~",
-    }
-    escaped = text
-    for char, replacement in replacements.items():
-        escaped = escaped.replace(char, replacement)
-    return escaped
@@ -0,0 +1,309 @@
+# instrumentation.py
+# Per-stage timers, counters, cProfile and Chrome-trace output (Phase 4).
+# v1.0
+
+"""
+Lightweight instrumentation for the consolidation pipeline.
+
+Stages (parse, dedup, tag, generate, write, clear) are timed with the
+stage() context manager and attributed to the project entered with
+Instrumentation.project(); counters are added with count(). Totals are kept
+per project and per run and logged at the end of each. The run total is its
+wall-clock time (see finish()); projects run concurrently in the pipeline, so
+the sum of project times is reported separately and may exceed it.
+
+Opt-in extras:
+- profile_dir: one cProfile dump (<project>.prof, readable with pstats) and a
+  text summary per project.
+- trace_file: Chrome trace JSON (chrome://tracing, Perfetto) with one span
+  per project and stage.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import hashlib
+import io
+import json
+import logging
+import os
+import pstats
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Functions listed in the per-project text profile summary
+_PROFILE_SUMMARY_LIMIT = 30
+
+
+@dataclass
+class StageStats:
+    """Accumulated time of one stage."""
+
+    seconds: float = 0.0
+    calls: int = 0
+
+
+@dataclass
+class ProjectTimings:
+    """Stage times and counters of one project (or of the whole run)."""
+
+    stages: Dict[str, StageStats] = field(default_factory=dict)
+    counters: Dict[str, int] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    def add_stage(self, name: str, seconds: float) -> None:
+        stats = self.stages.setdefault(name, StageStats())
+        stats.seconds += seconds
+        stats.calls += 1
+
+    def add_count(self, name: str, value: int) -> None:
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "seconds": round(self.seconds, 6),
+            "stages": {
+                name: {"seconds": round(s.seconds, 6), "calls": s.calls}
+                for name, s in self.stages.items()
+            },
+            "counters": dict(self.counters),
+        }
+
+    def format_stages(self) -> str:
+        """One-line 'stage=0.123s' summary, slowest first."""
+        ordered = sorted(
+            self.stages.items(), key=lambda item: item[1].seconds, reverse=True
+        )
+        return (
+            " ".join(f"{name}={stats.seconds:.3f}s" for name, stats in ordered) or "-"
+        )
+
+
+def _profile_name(project: str) -> str:
+    """File-system safe, collision-free name for a project's profile."""
+    base = re.sub(r"[^A-Za-z0-9_.-]+", "_", Path(project).name) or "project"
+    digest = hashlib.sha1(project.encode("utf-8")).hexdigest()[
+        :8
+    ]  # nosec B324 - not security related
+    return f"{base}-{digest}"
+
+
+class Instrumentation:
+    """Run-level collector of stage timings, counters, profiles and trace spans."""
+
+    def __init__(
+        self, profile_dir: Optional[Path] = None, trace_file: Optional[Path] = None
+    ) -> None:
+        self.profile_dir = profile_dir
+        self.trace_file = trace_file
+        self.run = ProjectTimings()
+        self.projects: Dict[str, ProjectTimings] = {}
+        # Sum of per-project times (exceeds wall time when projects overlap)
+        self.project_seconds = 0.0
+        self._events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+
+    def _current(self) -> Optional[ProjectTimings]:
+        name = getattr(self._local, "project", None)
+        return self.projects.get(name) if name is not None else None
+
+    def _span(
+        self, name: str, category: str, start: float, seconds: float, **args: Any
+    ) -> None:
+        if self.trace_file is None:
+            return
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": round((start - self._origin) * 1_000_000, 3),
+            "dur": round(seconds * 1_000_000, 3),
+            "pid": self._pid,
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self._events.append(event)
+
+    @contextmanager
+    def project(self, name: str, log: bool = True) -> Iterator[ProjectTimings]:
+        """
+        Attribute stages and counters inside the block to project `name`.
+
+        May be entered several times per project (e.g. once per pipeline
+        stage); times add up. log=False skips the per-project timings line.
+        """
+        with self._lock:
+            timings = self.projects.setdefault(name, ProjectTimings())
+        previous = getattr(self._local, "project", None)
+        self._local.project = name
+        profiler = cProfile.Profile() if self.profile_dir is not None else None
+        start = time.perf_counter()
+        if profiler is not None:
+            try:
+                profiler.enable()
+            except ValueError as e:  # another profiler is already active
+                logger.warning("Profiling disabled for %s: %s", name, e)
+                profiler = None
+        try:
+            yield timings
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            seconds = time.perf_counter() - start
+            self._local.project = previous
+            timings.seconds += seconds
+            with self._lock:
+                self.project_seconds += seconds
+            self._span(Path(name).name or name, "project", start, seconds, path=name)
+            if profiler is not None:
+                self._dump_profile(name, profiler)
+            if log:
+                logger.info(
+                    "Project %s timings: total=%.3fs %s",
+                    name,
+                    timings.seconds,
+                    timings.format_stages(),
+                )
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the block as stage `name` of the current project (and the run)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            current = self._current()
+            with self._lock:
+                self.run.add_stage(name, seconds)
+                if current is not None:
+                    current.add_stage(name, seconds)
+            self._span(name, "stage", start, seconds)
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Add value to counter `name` of the current project and the run."""
+        current = self._current()
+        with self._lock:
+            self.run.add_count(name, value)
+            if current is not None:
+                current.add_count(name, value)
+
+    def _dump_profile(self, name: str, profiler: cProfile.Profile) -> None:
+        assert self.profile_dir is not None
+        stem = _profile_name(name)
+        try:
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(str(self.profile_dir / f"{stem}.prof"))
+            summary = io.StringIO()
+            stats = pstats.Stats(profiler, stream=summary)
+            stats.sort_stats("cumulative").print_stats(_PROFILE_SUMMARY_LIMIT)
+            (self.profile_dir / f"{stem}.txt").write_text(
+                f"# {name}\n{summary.getvalue()}", encoding="utf-8"
+            )
+        except OSError as e:
+            logger.error("Could not write profile for %s: %s", name, e)
+
+    def finish(self) -> float:
+        """Record the wall-clock time since this run started as its total."""
+        seconds = time.perf_counter() - self._origin
+        with self._lock:
+            self.run.seconds = seconds
+        return seconds
+
+    def report(self) -> Dict[str, Any]:
+        """Run totals and per-project timings."""
+        with self._lock:
+            return {
+                "run": {
+                    **self.run.to_dict(),
+                    "project_seconds": round(self.project_seconds, 6),
+                },
+                "projects": {name: t.to_dict() for name, t in self.projects.items()},
+            }
+
+    def log_summary(self, slowest: int = 5) -> None:
+        """Log run-level stage totals and the slowest projects."""
+        logger.info(
+            "Run timings: total=%.3fs projects=%.3fs %s",
+            self.run.seconds,
+            self.project_seconds,
+            self.run.format_stages(),
+        )
+        if self.run.counters:
+            logger.info(
+                "Run counters: %s",
+                " ".join(f"{k}={v}" for k, v in sorted(self.run.counters.items())),
+            )
+        ranked = sorted(
+            self.projects.items(), key=lambda item: item[1].seconds, reverse=True
+        )
+        for name, timings in ranked[:slowest]:
+            logger.info(
+                "Slow project %s: %.3fs (%s)",
+                name,
+                timings.seconds,
+                timings.format_stages(),
+            )
+
+    def write_trace(self) -> None:
+        """Write collected spans as Chrome trace JSON (if trace_file is set)."""
+        if self.trace_file is None:
+            return
+        with self._lock:
+            events = sorted(self._events, key=lambda e: e["ts"])
+        payload = {"traceEvents": events, "displayTimeUnit": "ms"}
+        path = self.trace_file
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp = path.with_suffix(".tmp")
+            temp.write_text(json.dumps(payload) + "\n", encoding="utf-8")
+            temp.replace(path)
+            logger.info("Trace written to %s (%d spans)", path, len(events))
+        except OSError as e:
+            logger.error("Could not write trace %s: %s", path, e)
+
+
+_instrumentation = Instrumentation()
+_instrumentation_lock = threading.Lock()
+
+
+def get_instrumentation() -> Instrumentation:
+    """Return the instrumentation of the current run."""
+    with _instrumentation_lock:
+        return _instrumentation
+
+
+def reset_instrumentation(
+    profile_dir: Optional[Path] = None, trace_file: Optional[Path] = None
+) -> Instrumentation:
+    """Start a new run's instrumentation and return it."""
+    global _instrumentation
+    with _instrumentation_lock:
+        _instrumentation = Instrumentation(
+            profile_dir=profile_dir, trace_file=trace_file
+        )
+        return _instrumentation
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time the block as stage `name` of the current run's instrumentation."""
+    with get_instrumentation().stage(name):
+        yield
+
+
+def count(name: str, value: int = 1) -> None:
+    """Add to counter `name` of the current run's instrumentation."""
+    get_instrumentation().count(name, value)
@@ -0,0 +1,158 @@
+# journal.py
+# Crash-safe run journal for checkpoint/resume (Phase 5).
+# v1.0
+
+"""
+Append-only JSONL journal of a consolidation run.
+
+Every completed write step of a project (fix_repo written, coding_tips
+written, errors_and_fixes cleared) is appended as one JSON line and fsync'd
+before the run moves on, so after a crash (OOM, container restart, LLM hang)
+the journal says exactly which projects were finished.
+
+With resume, a run continues the previous, unfinished run: projects whose
+errors_and_fixes.md was cleared are skipped, and a project that crashed
+between its writes only repeats the steps not yet done (re-writing an
+already-merged fix_repo.md would count its fixes twice). A journal whose
+run finished, or that belongs to another root, is started afresh.
+
+Records: {"event": "run_started" | "step" | "run_finished", "run": id,
+"ts": unix time, ...}; step records add "project" and "step".
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Optional, Set, TextIO
+
+logger = logging.getLogger(__name__)
+
+STEP_FIX_REPO = "fix_repo"
+STEP_CODING_TIPS = "coding_tips"
+STEP_CLEARED = "cleared"
+STEPS = (STEP_FIX_REPO, STEP_CODING_TIPS, STEP_CLEARED)
+
+
+class RunJournal:
+    """fsync'd per-project step log of one run (optionally resuming the last)."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.run_id = ""
+        self.resumed = False
+        self._steps: Dict[str, Set[str]] = {}
+        self._file: Optional[TextIO] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional["RunJournal"]:
+        """Journal at RUN_JOURNAL (None if unset)."""
+        path = os.getenv("RUN_JOURNAL")
+        return cls(Path(path).expanduser()) if path else None
+
+    def start(self, root: Path, *, resume: bool = False) -> "RunJournal":
+        """
+        Open the journal for a run over root.
+
+        With resume, the steps of an unfinished previous run over the same
+        root are loaded and the journal is appended to; otherwise (or if
+        there is nothing to resume) it is truncated.
+        """
+        root_text = str(root.resolve())
+        previous = self._load(root_text) if resume else None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if previous is not None:
+            self.run_id, self._steps = previous
+            self.resumed = True
+            self._file = self.path.open("a", encoding="utf-8")
+            done = sum(1 for steps in self._steps.values() if STEP_CLEARED in steps)
+            logger.info(
+                "Resuming run %s from %s: %d project(s) already completed",
+                self.run_id,
+                self.path,
+                done,
+            )
+        else:
+            self.run_id = uuid.uuid4().hex[:12]
+            self._steps = {}
+            self._file = self.path.open("w", encoding="utf-8")
+            self._append({"event": "run_started", "root": root_text})
+        return self
+
+    def _load(self, root_text: str) -> Optional[tuple[str, Dict[str, Set[str]]]]:
+        """(run id, steps per project) of an unfinished run over root, else None."""
+        if not self.path.is_file():
+            logger.info("No run journal at %s; starting a new run", self.path)
+            return None
+        run_id: Optional[str] = None
+        finished = False
+        steps: Dict[str, Set[str]] = {}
+        with self.path.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn last line of a crashed run
+                    continue
+                event = record.get("event")
+                if event == "run_started":
+                    if record.get("root") != root_text:
+                        logger.warning(
+                            "Run journal %s is for %s, not %s; starting a new run",
+                            self.path,
+                            record.get("root"),
+                            root_text,
+                        )
+                        return None
+                    run_id, finished, steps = record.get("run"), False, {}
+                elif event == "step" and record.get("run") == run_id:
+                    steps.setdefault(record["project"], set()).add(record["step"])
+                elif event == "run_finished" and record.get("run") == run_id:
+                    finished = True
+        if run_id is None or finished:
+            logger.info("Last run in %s finished; starting a new run", self.path)
+            return None
+        return run_id, steps
+
+    def _append(self, record: dict) -> None:
+        record = {**record, "run": self.run_id, "ts": round(time.time(), 3)}
+        line = json.dumps(record, sort_keys=True) + "\n"
+        with self._lock:
+            if self._file is None:
+                raise RuntimeError("RunJournal.start() was not called")
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def steps(self, project: Path) -> Set[str]:
+        """Steps already completed for project in this run."""
+        with self._lock:
+            return set(self._steps.get(str(project), ()))
+
+    def completed(self, project: Path) -> bool:
+        """True if project finished (errors_and_fixes.md cleared) in this run."""
+        return STEP_CLEARED in self.steps(project)
+
+    def record(self, project: Path, step: str) -> None:
+        """Durably record that step is done for project."""
+        if step not in STEPS:
+            raise ValueError(f"Unknown journal step: {step!r}")
+        self._append({"event": "step", "project": str(project), "step": step})
+        with self._lock:
+            self._steps.setdefault(str(project), set()).add(step)
+
+    def finish(self, *, ok: bool) -> None:
+        """Close the journal; an ok run is marked finished (nothing to resume)."""
+        if self._file is None:
+            return
+        if ok:
+            self._append({"event": "run_finished"})
+        with self._lock:
+            self._file.close()
+            self._file = None
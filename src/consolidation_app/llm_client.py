@@ -13,14 +13,30 @@ Version: 1.0
 
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
 import os
+import threading
 import time
-from typing import Optional
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import requests
 from dotenv import load_dotenv
 
+from src.consolidation_app.prompt_budget import estimate_tokens
+from src.consolidation_app.resilience import (
+    DEFAULT_FAILURE_THRESHOLD,
+    DEFAULT_RESET_TIMEOUT,
+    CircuitBreaker,
+    LLMUnavailableError,
+    RunDeadline,
+    backoff_delay,
+)
+from src.consolidation_app.single_flight import SingleFlight
+from src.consolidation_app.usage_ledger import LLMBudgetExceededError, get_ledger
+
 # Load environment variables
 load_dotenv()
 
@@ -29,14 +45,293 @@ logger = logging.getLogger(__name__)
 # Default configuration
 DEFAULT_OLLAMA_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 DEFAULT_OLLAMA_MODEL = "qwen2.5-coder:14b"
-DEFAULT_OPENAI_MODEL = "gpt-4"
+DEFAULT_OPENAI_MODEL = "gpt-4o"
 DEFAULT_ANTHROPIC_MODEL = "claude-3-opus-20240229"
+DEFAULT_OPENAI_BASE_URL = "https://api.openai.com/v1"
+DEFAULT_ANTHROPIC_BASE_URL = "https://api.anthropic.com"
+
+# OpenAI models without structured outputs (json_schema response_format):
+# JSON-mode models get json_object, legacy gpt-4 snapshots support neither
+_OPENAI_JSON_MODE_MODELS = ("gpt-4-turbo", "gpt-4-1106", "gpt-4-0125", "gpt-3.5-turbo")
+_OPENAI_NO_JSON_MODELS = ("gpt-4", "gpt-4-0314", "gpt-4-0613", "gpt-4-32k")
+
+# How long Ollama keeps the model (and its prompt KV cache) loaded between calls
+DEFAULT_OLLAMA_KEEP_ALIVE = "30m"
 
 # Retry configuration
 MAX_RETRIES = 3
-RETRY_DELAY = 1.0  # seconds
+RETRY_DELAY = 1.0  # seconds (first retry; doubles per attempt, jittered)
 TIMEOUT = 120  # seconds
 
+SUPPORTED_PROVIDERS = ("ollama", "openai", "anthropic")
+
+_PROVIDER_DEFAULT_MODELS = {
+    "ollama": DEFAULT_OLLAMA_MODEL,
+    "openai": DEFAULT_OPENAI_MODEL,
+    "anthropic": DEFAULT_ANTHROPIC_MODEL,
+}
+
+
+def _get_float_env(key: str, default: Optional[float]) -> Optional[float]:
+    """Read a float from the environment, falling back to default if unset/invalid."""
+    raw = os.getenv(key)
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        logger.warning(f"Invalid {key}={raw!r}, using {default}")
+        return default
+
+
+# Per-provider circuit breakers (shared by all threads)
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+# Identical concurrent calls share one in-flight request
+_inflight: SingleFlight[str] = SingleFlight()
+
+# Wall-clock budget for the LLM calls of the current run (LLM_RUN_DEADLINE_SECONDS)
+_run_deadline = RunDeadline(_get_float_env("LLM_RUN_DEADLINE_SECONDS", None))
+
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    """Return the circuit breaker for a provider (created on first use)."""
+    with _breakers_lock:
+        breaker = _breakers.get(provider)
+        if breaker is None:
+            threshold = _get_float_env(
+                "LLM_CIRCUIT_FAILURE_THRESHOLD", DEFAULT_FAILURE_THRESHOLD
+            )
+            breaker = CircuitBreaker(
+                provider,
+                failure_threshold=int(threshold),
+                reset_timeout=_get_float_env(
+                    "LLM_CIRCUIT_RESET_SECONDS", DEFAULT_RESET_TIMEOUT
+                ),
+            )
+            _breakers[provider] = breaker
+        return breaker
+
+
+def reset_circuit_breakers() -> None:
+    """Forget all provider failure history (breakers are rebuilt from ENV)."""
+    with _breakers_lock:
+        _breakers.clear()
+
+
+def start_run_deadline(seconds: Optional[float] = None) -> None:
+    """
+    Start the per-run LLM deadline.
+
+    Args:
+        seconds: Budget in seconds; defaults to LLM_RUN_DEADLINE_SECONDS
+                 (no deadline when unset).
+    """
+    if seconds is None:
+        seconds = _get_float_env("LLM_RUN_DEADLINE_SECONDS", None)
+    _run_deadline.start(seconds)
+
+
+def _attempt_timeout(timeout: float) -> float:
+    """Per-attempt request timeout, capped by the time left in the run."""
+    remaining = _run_deadline.remaining()
+    return timeout if remaining is None else max(1.0, min(timeout, remaining))
+
+
+def _wait_before_retry(attempt: int, error_msg: str) -> bool:
+    """
+    Back off before the next attempt.
+
+    Returns:
+        False (without sleeping) when no attempt is left, either because
+        MAX_RETRIES is reached or the run deadline would pass while waiting.
+    """
+    if attempt >= MAX_RETRIES - 1:
+        return False
+    delay = backoff_delay(attempt, RETRY_DELAY)
+    remaining = _run_deadline.remaining()
+    if remaining is not None and remaining <= delay:
+        return False
+    logger.warning(f"{error_msg} (retrying in {delay:.1f}s...)")
+    time.sleep(delay)
+    return True
+
+
+@dataclass(frozen=True)
+class LLMUsage:
+    """Token usage reported by a provider for one call."""
+
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+
+
+# Usage of the most recent provider call, per thread (callers may run concurrently)
+_usage_state = threading.local()
+
+
+def _record_usage(
+    input_tokens: int, output_tokens: int, cached_tokens: int = 0
+) -> None:
+    """Remember provider-reported token usage for the current thread."""
+    _usage_state.last = LLMUsage(
+        input_tokens=input_tokens or 0,
+        output_tokens=output_tokens or 0,
+        cached_tokens=cached_tokens or 0,
+    )
+
+
+def get_last_usage() -> Optional[LLMUsage]:
+    """Return usage of the last provider call made on this thread, if any."""
+    return getattr(_usage_state, "last", None)
+
+
+@dataclass(frozen=True)
+class LLMTiming:
+    """Latency of one provider call, in seconds from sending the request."""
+
+    time_to_first_token: Optional[float] = None
+    time_to_result: float = 0.0
+
+
+def _record_timing(time_to_first_token: Optional[float], time_to_result: float) -> None:
+    """Remember latency of the last provider call for the current thread."""
+    _usage_state.timing = LLMTiming(time_to_first_token, time_to_result)
+
+
+def get_last_timing() -> Optional[LLMTiming]:
+    """Return latency of the last provider call made on this thread, if any."""
+    return getattr(_usage_state, "timing", None)
+
+
+class _JsonObjectScanner:
+    """
+    Incrementally find the end of the first complete top-level JSON object.
+
+    Text before the first '{' (e.g. a ```json fence) is skipped; braces
+    inside strings are ignored.
+    """
+
+    def __init__(self) -> None:
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._offset = 0  # characters consumed so far
+
+    def feed(self, text: str) -> Optional[int]:
+        """Consume text; return the end offset (exclusive) once the object closes."""
+        for i, ch in enumerate(text):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"' and self._depth:
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}" and self._depth:
+                self._depth -= 1
+                if not self._depth:
+                    return self._offset + i + 1
+        self._offset += len(text)
+        return None
+
+
+def _read_ollama_stream(
+    lines: Iterable[bytes], start: float, stop_at_json: bool
+) -> Tuple[str, int, int, Optional[float], bool]:
+    """
+    Accumulate an Ollama NDJSON stream.
+
+    Returns:
+        (text, prompt_eval_count, eval_count, time_to_first_token, stopped_early)
+    """
+    parts = []
+    scanner = _JsonObjectScanner() if stop_at_json else None
+    first_token: Optional[float] = None
+    for line in lines:
+        if not line:
+            continue
+        chunk = json.loads(line)
+        if chunk.get("error"):
+            raise requests.RequestException(f"Ollama stream error: {chunk['error']}")
+        piece = chunk.get("response", "")
+        if piece:
+            if first_token is None:
+                first_token = time.monotonic() - start
+            if scanner is not None:
+                end = scanner.feed(piece)
+                if end is not None:
+                    parts.append(piece)
+                    return "".join(parts)[:end], 0, 0, first_token, True
+            parts.append(piece)
+        if chunk.get("done"):
+            return (
+                "".join(parts),
+                chunk.get("prompt_eval_count", 0),
+                chunk.get("eval_count", 0),
+                first_token,
+                False,
+            )
+    return "".join(parts), 0, 0, first_token, False
+
+
+@dataclass
+class CacheStats:
+    """Prompt-cache counters for one task, summed over its calls."""
+
+    calls: int = 0
+    input_tokens: int = 0
+    cached_tokens: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of input tokens served from the provider's prompt cache."""
+        return self.cached_tokens / self.input_tokens if self.input_tokens else 0.0
+
+
+_cache_stats: Dict[str, CacheStats] = {}
+_cache_stats_lock = threading.Lock()
+
+
+def _record_cache_stats(task: str, usage: Optional[LLMUsage]) -> None:
+    """Add one call's provider usage to the task's cache counters."""
+    with _cache_stats_lock:
+        stats = _cache_stats.setdefault(task, CacheStats())
+        stats.calls += 1
+        if usage is not None:
+            stats.input_tokens += usage.input_tokens
+            stats.cached_tokens += usage.cached_tokens
+
+
+def get_cache_stats() -> Dict[str, CacheStats]:
+    """Return a snapshot of prompt-cache counters per task."""
+    with _cache_stats_lock:
+        return {
+            task: CacheStats(s.calls, s.input_tokens, s.cached_tokens)
+            for task, s in _cache_stats.items()
+        }
+
+
+def reset_cache_stats() -> None:
+    """Clear prompt-cache counters (e.g., at the start of a run)."""
+    with _cache_stats_lock:
+        _cache_stats.clear()
+
+
+def log_cache_stats() -> None:
+    """Log the prompt-cache hit ratio of each task called so far."""
+    for task, stats in sorted(get_cache_stats().items()):
+        logger.info(
+            f"LLM prompt cache: task={task}, calls={stats.calls}, "
+            f"input_tokens={stats.input_tokens}, cached_tokens={stats.cached_tokens}, "
+            f"hit_ratio={stats.hit_ratio:.1%}"
+        )
+
 
 def _get_config_value(key: str, default: str) -> str:
     """Get configuration value from environment variable."""
@@ -142,20 +437,47 @@ def _get_model_for_task(task: str, explicit_model: Optional[str] = None) -> str:
     return default_model
 
 
+def get_model_for_task(task: str, explicit_model: Optional[str] = None) -> str:
+    """Public accessor for the model call_llm would use for a task."""
+    return _get_model_for_task(task, explicit_model)
+
+
+def get_provider_for_task(task: str) -> str:
+    """Public accessor for the provider call_llm would use first for a task."""
+    return _get_provider_for_task(task)
+
+
 def call_ollama(
     prompt: str,
     model: str = DEFAULT_OLLAMA_MODEL,
     base_url: str = DEFAULT_OLLAMA_URL,
     timeout: int = TIMEOUT,
+    system: Optional[str] = None,
+    stream: bool = False,
+    stop_at_json: bool = False,
+    schema: Optional[Dict[str, Any]] = None,
 ) -> str:
     """
     Call Ollama API (local LLM).
 
+    The model is kept loaded for OLLAMA_KEEP_ALIVE (default 30m) so that
+    consecutive calls sharing a system prefix reuse its KV cache.
+
+    With stream=True the NDJSON response is read chunk by chunk; with
+    stop_at_json=True as well, the request is closed as soon as the first
+    complete JSON object has been generated and only that object is returned.
+    Time-to-first-token and time-to-result are available via get_last_timing().
+
     Args:
         prompt: Input prompt text
         model: Model name (default: qwen2.5-coder:14b)
         base_url: Ollama API base URL (default: http://localhost:11434)
         timeout: Request timeout in seconds (default: 120)
+        system: Optional stable instructions sent as the system prompt
+        stream: Read the response as a stream of chunks
+        stop_at_json: Stop generation after the first complete JSON object
+                      (implies stream)
+        schema: Optional JSON schema; sent as Ollama's structured-output format
 
     Returns:
         LLM response text
@@ -166,60 +488,85 @@ def call_ollama(
         requests.RequestException: For other HTTP errors
     """
     url = f"{base_url}/api/generate"
+    stream = stream or stop_at_json
     payload = {
         "model": model,
         "prompt": prompt,
-        "stream": False,
+        "stream": stream,
+        "keep_alive": os.getenv("OLLAMA_KEEP_ALIVE", DEFAULT_OLLAMA_KEEP_ALIVE),
     }
+    if system:
+        payload["system"] = system
+    if schema:
+        payload["format"] = schema
 
     logger.info(f"Calling Ollama API: model={model}, prompt_length={len(prompt)}")
 
     for attempt in range(MAX_RETRIES):
         try:
-            response = requests.post(url, json=payload, timeout=timeout)
-            response.raise_for_status()
+            start = time.monotonic()
+            first_token: Optional[float] = None
+            stopped_early = False
+            if stream:
+                response = requests.post(
+                    url, json=payload, timeout=_attempt_timeout(timeout), stream=True
+                )
+                try:
+                    response.raise_for_status()
+                    (
+                        response_text,
+                        prompt_eval_count,
+                        eval_count,
+                        first_token,
+                        stopped_early,
+                    ) = _read_ollama_stream(response.iter_lines(), start, stop_at_json)
+                finally:
+                    # Closing the connection early makes Ollama stop generating
+                    response.close()
+            else:
+                response = requests.post(
+                    url, json=payload, timeout=_attempt_timeout(timeout)
+                )
+                response.raise_for_status()
 
-            result = response.json()
-            response_text = result.get("response", "")
+                result = response.json()
+                response_text = result.get("response", "")
 
-            # Extract token counts from Ollama response
-            prompt_eval_count = result.get("prompt_eval_count", 0)  # Input tokens
-            eval_count = result.get("eval_count", 0)  # Output tokens
+                # Extract token counts from Ollama response
+                prompt_eval_count = result.get("prompt_eval_count", 0)  # Input tokens
+                eval_count = result.get("eval_count", 0)  # Output tokens
+            time_to_result = time.monotonic() - start
             total_tokens = prompt_eval_count + eval_count
+            _record_usage(prompt_eval_count, eval_count)
+            _record_timing(first_token, time_to_result)
 
+            ttft = f"{first_token:.2f}s" if first_token is not None else "n/a"
             logger.info(
                 f"Ollama API call successful: model={model}, "
                 f"response_length={len(response_text)}, attempt={attempt + 1}, "
                 f"input_tokens={prompt_eval_count}, output_tokens={eval_count}, "
-                f"total_tokens={total_tokens}"
+                f"total_tokens={total_tokens}, time_to_first_token={ttft}, "
+                f"time_to_result={time_to_result:.2f}s, stopped_early={stopped_early}"
             )
 
             return response_text
 
         except requests.exceptions.ConnectionError as e:
             error_msg = f"Failed to connect to Ollama at {base_url}: {e}"
-            if attempt < MAX_RETRIES - 1:
-                logger.warning(f"{error_msg} (retrying in {RETRY_DELAY}s...)")
-                time.sleep(RETRY_DELAY * (attempt + 1))  # Exponential backoff
-            else:
+            if not _wait_before_retry(attempt, error_msg):
                 logger.error(error_msg)
                 raise ConnectionError(error_msg) from e
 
         except requests.exceptions.Timeout as e:
             error_msg = f"Ollama API request timed out after {timeout}s"
-            if attempt < MAX_RETRIES - 1:
-                logger.warning(f"{error_msg} (retrying in {RETRY_DELAY}s...)")
-                time.sleep(RETRY_DELAY * (attempt + 1))
-            else:
+            if not _wait_before_retry(attempt, error_msg):
                 logger.error(error_msg)
                 raise TimeoutError(error_msg) from e
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
+            # ValueError: malformed NDJSON chunk in a streamed response
             error_msg = f"Ollama API request failed: {e}"
-            if attempt < MAX_RETRIES - 1:
-                logger.warning(f"{error_msg} (retrying in {RETRY_DELAY}s...)")
-                time.sleep(RETRY_DELAY * (attempt + 1))
-            else:
+            if not _wait_before_retry(attempt, error_msg):
                 logger.error(error_msg)
                 raise requests.RequestException(error_msg) from e
 
@@ -227,20 +574,50 @@ def call_ollama(
     raise RuntimeError("Failed to call Ollama API after all retries")
 
 
+def _openai_response_format(
+    model: str, schema: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """
+    response_format for a schema'd OpenAI call, by model capability.
+
+    json_object for JSON-mode models, None for models that reject both (the
+    response is then parsed from plain text), json_schema for all others
+    (gpt-4o and newer, OpenAI-compatible servers).
+    """
+    name = model.lower().removeprefix("ft:").split(":", 1)[0]
+    if name.startswith(_OPENAI_JSON_MODE_MODELS):
+        return {"type": "json_object"}
+    if name in _OPENAI_NO_JSON_MODELS or name.startswith(_OPENAI_NO_JSON_MODELS[1:]):
+        return None
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": schema.get("title", "response"), "schema": schema},
+    }
+
+
 def call_openai(
     prompt: str,
     model: str = DEFAULT_OPENAI_MODEL,
     api_key: Optional[str] = None,
     timeout: int = TIMEOUT,
+    system: Optional[str] = None,
+    schema: Optional[Dict[str, Any]] = None,
 ) -> str:
     """
     Call OpenAI API.
 
+    OpenAI caches long prompt prefixes automatically; sending the stable
+    instructions as a leading system message keeps that prefix identical
+    across calls.
+
     Args:
         prompt: Input prompt text
-        model: Model name (default: gpt-4)
+        model: Model name (default: gpt-4o)
         api_key: OpenAI API key (default: from OPENAI_API_KEY env var)
         timeout: Request timeout in seconds (default: 120)
+        system: Optional stable instructions sent as the system message
+        schema: Optional JSON schema; sent as a json_schema response_format,
+                or as json_object for models without structured outputs
 
     Returns:
         LLM response text
@@ -257,23 +634,31 @@ def call_openai(
         logger.error(error_msg)
         raise ValueError(error_msg)
 
-    url = "https://api.openai.com/v1/chat/completions"
+    # OPENAI_BASE_URL allows OpenAI-compatible servers (e.g. scripts/mock_llm_server.py)
+    base_url = os.getenv("OPENAI_BASE_URL", DEFAULT_OPENAI_BASE_URL).rstrip("/")
+    url = f"{base_url}/chat/completions"
     headers = {
         "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json",
     }
+    messages = [{"role": "user", "content": prompt}]
+    if system:
+        messages.insert(0, {"role": "system", "content": system})
     payload = {
         "model": model,
-        "messages": [{"role": "user", "content": prompt}],
+        "messages": messages,
         "temperature": 0.7,
     }
+    response_format = _openai_response_format(model, schema) if schema else None
+    if response_format:
+        payload["response_format"] = response_format
 
     logger.info(f"Calling OpenAI API: model={model}, prompt_length={len(prompt)}")
 
     for attempt in range(MAX_RETRIES):
         try:
             response = requests.post(
-                url, json=payload, headers=headers, timeout=timeout
+                url, json=payload, headers=headers, timeout=_attempt_timeout(timeout)
             )
             response.raise_for_status()
 
@@ -285,8 +670,12 @@ def call_openai(
             prompt_tokens = usage.get("prompt_tokens", 0)  # Input tokens
             completion_tokens = usage.get("completion_tokens", 0)  # Output tokens
             total_tokens = usage.get("total_tokens", prompt_tokens + completion_tokens)
-            # OpenAI may include cached tokens in some models (e.g., GPT-4 with cache)
-            cached_tokens = usage.get("cached_tokens", 0)
+            # Prefix-cache hits are reported under prompt_tokens_details
+            details = usage.get("prompt_tokens_details") or {}
+            cached_tokens = (
+                details.get("cached_tokens", usage.get("cached_tokens", 0)) or 0
+            )
+            _record_usage(prompt_tokens, completion_tokens, cached_tokens)
 
             logger.info(
                 f"OpenAI API call successful: model={model}, "
@@ -317,10 +706,7 @@ def call_openai(
 
         except requests.exceptions.RequestException as e:
             error_msg = f"OpenAI API request failed: {e}"
-            if attempt < MAX_RETRIES - 1:
-                logger.warning(f"{error_msg} (retrying in {RETRY_DELAY}s...)")
-                time.sleep(RETRY_DELAY * (attempt + 1))
-            else:
+            if not _wait_before_retry(attempt, error_msg):
                 logger.error(error_msg)
                 raise requests.RequestException(error_msg) from e
 
@@ -333,6 +719,8 @@ def call_anthropic(
     model: str = DEFAULT_ANTHROPIC_MODEL,
     api_key: Optional[str] = None,
     timeout: int = TIMEOUT,
+    system: Optional[str] = None,
+    schema: Optional[Dict[str, Any]] = None,
 ) -> str:
     """
     Call Anthropic API (Claude).
@@ -342,6 +730,10 @@ def call_anthropic(
         model: Model name (default: claude-3-opus-20240229)
         api_key: Anthropic API key (default: from ANTHROPIC_API_KEY env var)
         timeout: Request timeout in seconds (default: 120)
+        system: Optional stable instructions, sent as a system block marked
+                with cache_control so repeated calls read it from the cache
+        schema: Optional JSON schema; the model is made to call a single tool
+                with this input schema and the tool input is returned as JSON
 
     Returns:
         LLM response text
@@ -358,7 +750,8 @@ def call_anthropic(
         logger.error(error_msg)
         raise ValueError(error_msg)
 
-    url = "https://api.anthropic.com/v1/messages"
+    base_url = os.getenv("ANTHROPIC_BASE_URL", DEFAULT_ANTHROPIC_BASE_URL).rstrip("/")
+    url = f"{base_url}/v1/messages"
     headers = {
         "x-api-key": api_key,
         "anthropic-version": "2023-06-01",
@@ -369,18 +762,43 @@ def call_anthropic(
         "max_tokens": 4096,
         "messages": [{"role": "user", "content": prompt}],
     }
+    if system:
+        payload["system"] = [
+            {"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}
+        ]
+    if schema:
+        tool_name = schema.get("title", "respond")
+        payload["tools"] = [
+            {
+                "name": tool_name,
+                "description": "Return the response in the required structure.",
+                "input_schema": schema,
+            }
+        ]
+        payload["tool_choice"] = {"type": "tool", "name": tool_name}
 
     logger.info(f"Calling Anthropic API: model={model}, prompt_length={len(prompt)}")
 
     for attempt in range(MAX_RETRIES):
         try:
             response = requests.post(
-                url, json=payload, headers=headers, timeout=timeout
+                url, json=payload, headers=headers, timeout=_attempt_timeout(timeout)
             )
             response.raise_for_status()
 
             result = response.json()
-            response_text = result["content"][0]["text"]
+            tool_input = next(
+                (
+                    block["input"]
+                    for block in result["content"]
+                    if block.get("type") == "tool_use"
+                ),
+                None,
+            )
+            if tool_input is not None:
+                response_text = json.dumps(tool_input)
+            else:
+                response_text = result["content"][0]["text"]
 
             # Extract token counts from Anthropic response
             usage = result.get("usage", {})
@@ -390,6 +808,10 @@ def call_anthropic(
             cache_creation_input_tokens = usage.get("cache_creation_input_tokens", 0)
             cache_read_input_tokens = usage.get("cache_read_input_tokens", 0)
             cached_tokens = cache_creation_input_tokens + cache_read_input_tokens
+            # Anthropic's input_tokens excludes cached prefix tokens; record the full prompt
+            _record_usage(
+                input_tokens + cached_tokens, output_tokens, cache_read_input_tokens
+            )
 
             logger.info(
                 f"Anthropic API call successful: model={model}, "
@@ -423,10 +845,7 @@ def call_anthropic(
 
         except requests.exceptions.RequestException as e:
             error_msg = f"Anthropic API request failed: {e}"
-            if attempt < MAX_RETRIES - 1:
-                logger.warning(f"{error_msg} (retrying in {RETRY_DELAY}s...)")
-                time.sleep(RETRY_DELAY * (attempt + 1))
-            else:
+            if not _wait_before_retry(attempt, error_msg):
                 logger.error(error_msg)
                 raise requests.RequestException(error_msg) from e
 
@@ -434,10 +853,229 @@ def call_anthropic(
     raise RuntimeError("Failed to call Anthropic API after all retries")
 
 
+def _get_provider_chain(provider: str) -> List[str]:
+    """
+    Providers to try, in order: the task's provider, then LLM_FAILOVER.
+
+    LLM_FAILOVER is a comma-separated list (e.g. "ollama,openai"); unknown
+    names are ignored and duplicates removed.
+    """
+    chain = [provider]
+    for name in os.getenv("LLM_FAILOVER", "").split(","):
+        name = name.strip().lower()
+        if not name:
+            continue
+        if name not in SUPPORTED_PROVIDERS:
+            logger.warning(f"Ignoring unknown provider in LLM_FAILOVER: {name}")
+        elif name not in chain:
+            chain.append(name)
+    return chain
+
+
+# API key each hosted provider needs; failover skips providers without one
+_PROVIDER_KEY_ENV = {"openai": "OPENAI_API_KEY", "anthropic": "ANTHROPIC_API_KEY"}
+
+
+def _provider_configured(provider: str) -> bool:
+    """True if provider has what it needs to be called (its API key)."""
+    key_env = _PROVIDER_KEY_ENV.get(provider)
+    return key_env is None or bool(os.getenv(key_env))
+
+
+def _get_failover_model(provider: str) -> str:
+    """Model for a failover provider: LLM_FAILOVER_MODEL_<PROVIDER> or its default."""
+    return (
+        os.getenv(f"LLM_FAILOVER_MODEL_{provider.upper()}")
+        or _PROVIDER_DEFAULT_MODELS[provider]
+    )
+
+
+def _call_provider(
+    provider: str,
+    prompt: str,
+    model: str,
+    extra: Dict[str, Any],
+    *,
+    stop_at_json: bool = False,
+) -> str:
+    """Dispatch one call to a provider function."""
+    if provider == "ollama":
+        # Use OLLAMA_BASE_URL from environment if set, otherwise use default
+        base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+        if stop_at_json:
+            extra["stop_at_json"] = True
+        return call_ollama(prompt, model=model, base_url=base_url, **extra)
+    if provider == "openai":
+        return call_openai(prompt, model=model, **extra)
+    return call_anthropic(prompt, model=model, **extra)
+
+
+def _http_status(error: BaseException) -> Optional[int]:
+    """HTTP status behind error (the provider functions wrap the HTTPError)."""
+    seen: Optional[BaseException] = error
+    while seen is not None:
+        response = getattr(seen, "response", None)
+        if response is not None and getattr(response, "status_code", None) is not None:
+            return response.status_code
+        seen = seen.__cause__
+    return None
+
+
+def _is_outage(error: Exception) -> bool:
+    """
+    True if error means the provider is unavailable (count it, fail over).
+
+    Connection errors, timeouts, 429 and 5xx are outages; any other HTTP
+    status (bad request, auth, unknown model) is a problem with the request.
+    """
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    if not isinstance(error, requests.RequestException):
+        return False
+    status = _http_status(error)
+    return status is None or status == 429 or status >= 500
+
+
+def _call_with_failover(
+    prompt: str,
+    task: str,
+    provider: str,
+    selected_model: str,
+    extra: Dict[str, Any],
+    stop_at_json: bool,
+    estimated_tokens: int,
+) -> str:
+    """Try the provider chain for one call (see call_llm)."""
+    start_time = time.time()
+    last_error: Optional[Exception] = None
+
+    for candidate in _get_provider_chain(provider):
+        if _run_deadline.expired():
+            last_error = LLMUnavailableError("LLM run deadline exceeded")
+            break
+        failover = candidate != provider
+        if failover and not _provider_configured(candidate):
+            logger.warning(
+                f"Skipping failover provider {candidate} for task={task}: "
+                f"{_PROVIDER_KEY_ENV[candidate]} is not set"
+            )
+            continue
+        breaker = get_circuit_breaker(candidate)
+        if not breaker.allow():
+            logger.warning(
+                f"Skipping provider {candidate} for task={task}: circuit open"
+            )
+            continue
+
+        candidate_model = _get_failover_model(candidate) if failover else selected_model
+        _usage_state.last = None
+        attempt_start = time.time()
+        try:
+            response = _call_provider(
+                candidate,
+                prompt,
+                candidate_model,
+                dict(extra),
+                stop_at_json=stop_at_json,
+            )
+        except Exception as e:
+            if _is_outage(e):
+                # Provider unavailable after its own retries: count it and fail over
+                breaker.record_failure()
+                get_ledger().record(
+                    task,
+                    candidate,
+                    candidate_model,
+                    latency=time.time() - attempt_start,
+                    ok=False,
+                )
+                last_error = e
+                logger.error(
+                    f"LLM call failed: provider={candidate}, task={task}, model={candidate_model}, "
+                    f"duration={time.time() - start_time:.2f}s, error={type(e).__name__}: {e}"
+                )
+                continue
+            # Bad configuration, request or response shape: not a provider outage,
+            # don't fail over
+            breaker.release()
+            elapsed_time = time.time() - start_time
+            logger.error(
+                f"LLM call failed: provider={candidate}, task={task}, model={candidate_model}, "
+                f"duration={elapsed_time:.2f}s, error={type(e).__name__}: {e}"
+            )
+            if failover:
+                # The outage that caused the failover stays the reported error
+                continue
+            raise
+        breaker.record_success()
+
+        elapsed_time = time.time() - start_time
+        # Token counts are already logged by individual provider functions;
+        # compare the prompt estimate against what the provider reported
+        usage = get_last_usage()
+        actual_tokens = usage.input_tokens if usage else 0
+        _record_cache_stats(task, usage)
+        # A stream cut short reports no counts; charge the estimate instead
+        get_ledger().record(
+            task,
+            candidate,
+            candidate_model,
+            input_tokens=actual_tokens or estimated_tokens,
+            output_tokens=usage.output_tokens if usage else 0,
+            cached_tokens=usage.cached_tokens if usage else 0,
+            latency=time.time() - attempt_start,
+        )
+        logger.info(
+            f"LLM call completed: provider={candidate}, task={task}, model={candidate_model}, "
+            f"response_length={len(response)}, duration={elapsed_time:.2f}s, "
+            f"estimated_input_tokens={estimated_tokens}, actual_input_tokens={actual_tokens}, "
+            f"cached_tokens={usage.cached_tokens if usage else 0}"
+        )
+
+        return response
+
+    if last_error is None:
+        last_error = LLMUnavailableError(
+            f"No LLM provider available for task={task}: all circuits open"
+        )
+    logger.error(
+        f"LLM call gave up: task={task}, error={type(last_error).__name__}: {last_error}"
+    )
+    raise last_error
+
+
+def _single_flight_key(
+    provider: str,
+    model: str,
+    task: str,
+    prompt: str,
+    system: Optional[str],
+    response_schema: Optional[Dict[str, Any]],
+    stop_at_json: bool,
+) -> str:
+    """Identity of a call for coalescing: everything that affects the response."""
+    digest = hashlib.sha256()
+    for part in (
+        provider,
+        model,
+        task,
+        system or "",
+        json.dumps(response_schema, sort_keys=True) if response_schema else "",
+        "1" if stop_at_json else "0",
+        prompt,
+    ):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
 def call_llm(
     prompt: str,
     task: str = "default",
     model: Optional[str] = None,
+    system: Optional[str] = None,
+    stop_at_json: bool = False,
+    response_schema: Optional[Dict[str, Any]] = None,
 ) -> str:
     """
     Unified LLM call function that routes to the appropriate provider.
@@ -456,12 +1094,36 @@ def call_llm(
               - LLM_PROVIDER_TAGGING, LLM_MODEL_TAGGING
               - LLM_PROVIDER_RULE_EXTRACTION, LLM_MODEL_RULE_EXTRACTION
         model: Explicit model name (overrides task-specific and default models)
+        system: Stable instruction prefix, sent through the provider's
+                system prompt so it can be served from the prompt cache.
+                Per-task cache hit ratios are available via get_cache_stats().
+        stop_at_json: The caller only needs the first JSON object of the
+                      response. Ollama streams and stops generating once it
+                      is complete; other providers ignore the hint.
+        response_schema: JSON schema of the expected response object. Each
+                         provider's native JSON mode is used, so the result
+                         parses with structured_output.parse_json_object.
 
     Returns:
         LLM response text
 
+    Failure handling: each provider has a circuit breaker, so a provider
+    that keeps failing is skipped until a probe call succeeds. If the
+    task's provider is unavailable, providers from LLM_FAILOVER are tried
+    in order. Once LLM_RUN_DEADLINE_SECONDS is spent, calls fail at once.
+    Calls are recorded in the run's usage ledger; once the task's token or
+    cost budget (LLM_BUDGET_TOKENS_<TASK>, LLM_BUDGET_USD_<TASK>) is spent,
+    calls raise LLMBudgetExceededError.
+
+    Concurrent calls with the same provider, model, task, prompt, system
+    prompt and schema are coalesced: one request is sent and every caller
+    gets its result (or exception).
+
     Raises:
         ValueError: If provider is invalid or API key is missing
+        LLMUnavailableError: If every provider is skipped (open circuits)
+                             or the run deadline is exceeded
+        LLMBudgetExceededError: If the task's usage budget is exhausted
         ConnectionError: If Ollama service is not available
         TimeoutError: If request times out
         requests.RequestException: For other HTTP errors
@@ -476,44 +1138,50 @@ def call_llm(
     """
     provider = _get_provider_for_task(task)
     selected_model = _get_model_for_task(task, model)
+    estimated_tokens = estimate_tokens(prompt, selected_model) + estimate_tokens(
+        system or "", selected_model
+    )
+    # Only pass system when set, so provider calls stay unchanged without one
+    extra: Dict[str, Any] = {"system": system} if system else {}
+    if response_schema:
+        extra["schema"] = response_schema
+
+    if provider not in SUPPORTED_PROVIDERS:
+        error_msg = (
+            f"Invalid LLM provider: {provider}. "
+            f"Must be one of: ollama, openai, anthropic"
+        )
+        logger.error(error_msg)
+        raise ValueError(error_msg)
 
     logger.info(
         f"LLM call: provider={provider}, task={task}, model={selected_model}, "
-        f"prompt_length={len(prompt)}"
+        f"prompt_length={len(prompt)}, estimated_input_tokens={estimated_tokens}"
     )
-
-    start_time = time.time()
-
     try:
-        if provider == "ollama":
-            # Use OLLAMA_BASE_URL from environment if set, otherwise use default
-            base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-            response = call_ollama(prompt, model=selected_model, base_url=base_url)
-        elif provider == "openai":
-            response = call_openai(prompt, model=selected_model)
-        elif provider == "anthropic":
-            response = call_anthropic(prompt, model=selected_model)
-        else:
-            error_msg = (
-                f"Invalid LLM provider: {provider}. "
-                f"Must be one of: ollama, openai, anthropic"
-            )
-            logger.error(error_msg)
-            raise ValueError(error_msg)
+        get_ledger().check_budget(task)
+    except LLMBudgetExceededError as e:
+        logger.warning(f"LLM call skipped: {e}")
+        raise
 
-        elapsed_time = time.time() - start_time
-        # Token counts are already logged by individual provider functions
+    key = _single_flight_key(
+        provider, selected_model, task, prompt, system, response_schema, stop_at_json
+    )
+    response, shared = _inflight.do(
+        key,
+        lambda: _call_with_failover(
+            prompt,
+            task,
+            provider,
+            selected_model,
+            extra,
+            stop_at_json,
+            estimated_tokens,
+        ),
+    )
+    if shared:
         logger.info(
-            f"LLM call completed: provider={provider}, task={task}, model={selected_model}, "
-            f"response_length={len(response)}, duration={elapsed_time:.2f}s"
-        )
-
-        return response
-
-    except Exception as e:
-        elapsed_time = time.time() - start_time
-        logger.error(
-            f"LLM call failed: provider={provider}, task={task}, model={selected_model}, "
-            f"duration={elapsed_time:.2f}s, error={type(e).__name__}: {e}"
+            f"LLM call coalesced: provider={provider}, task={task}, model={selected_model} "
+            f"(shared an identical in-flight request)"
         )
-        raise
+    return response
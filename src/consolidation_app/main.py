@@ -11,24 +11,57 @@ from __future__ import annotations
 
 import argparse
 import logging
+import os
+import signal
 import sys
+import threading
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass
+from itertools import chain
 from pathlib import Path
-from typing import List
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from src.consolidation_app.deduplicator import deduplicate_errors_exact
-from src.consolidation_app.discovery import discover_projects
+from src.consolidation_app.discovery import discover_projects, iter_projects
+from src.consolidation_app.instrumentation import (
+    Instrumentation,
+    count,
+    reset_instrumentation,
+    stage,
+)
+from src.consolidation_app.journal import (
+    STEP_CLEARED,
+    STEP_CODING_TIPS,
+    STEP_FIX_REPO,
+    RunJournal,
+)
+from src.consolidation_app.llm_client import log_cache_stats, start_run_deadline
+from src.consolidation_app.metrics import (
+    MetricsServer,
+    build_run_metrics,
+    set_latest_metrics,
+    write_textfile,
+)
 from src.consolidation_app.parser import (
     ErrorEntry,
+    ParseCache,
     parse_coding_tips,
-    parse_errors_and_fixes,
     parse_fix_repo,
+    parse_session_log,
 )
-from src.consolidation_app.tagger import apply_tags_to_entry
+from src.consolidation_app.pipeline import Pipeline, PipelineConfig, Stage
+from src.consolidation_app.scheduler import DEFAULT_SCHEDULE, CronSchedule, run_daemon
+from src.consolidation_app.tagger import apply_tags_to_entries
+from src.consolidation_app.usage_ledger import UsageLedger, reset_ledger
+from src.consolidation_app.watcher import ProjectWatcher
 from src.consolidation_app.writer import (
+    CODING_TIPS_FILE,
+    FIX_REPO_FILE,
+    LogSnapshot,
     clear_errors_and_fixes,
-    write_coding_tips,
-    write_fix_repo,
+    session_log_unchanged,
+    write_project_outputs,
 )
 
 logger = logging.getLogger(__name__)
@@ -36,6 +69,8 @@ logger = logging.getLogger(__name__)
 _ERRORS_FIXES = ".errors_fixes/errors_and_fixes.md"
 _FIX_REPO = ".errors_fixes/fix_repo.md"
 _CODING_TIPS = ".errors_fixes/coding_tips.md"
+# Errors from the discovery stream that fail the run instead of escaping it
+_DISCOVERY_ERRORS = (FileNotFoundError, NotADirectoryError, ValueError)
 
 
 @dataclass
@@ -44,6 +79,7 @@ class ConsolidationResult:
 
     ok_count: int
     fail_count: int
+    skipped_count: int = 0
 
     @property
     def all_ok(self) -> bool:
@@ -55,6 +91,16 @@ def consolidate_all_projects(
     extra_projects: list[str] | None = None,
     *,
     dry_run: bool = False,
+    usage_report: Optional[Path] = None,
+    profile_dir: Optional[Path] = None,
+    trace_file: Optional[Path] = None,
+    metrics_file: Optional[Path] = None,
+    parse_cache: Optional[ParseCache] = None,
+    projects: Optional[Iterable[Path]] = None,
+    rescan: bool = False,
+    pipeline: Optional[PipelineConfig] = None,
+    journal: Optional[RunJournal] = None,
+    resume: bool = False,
 ) -> ConsolidationResult:
     """
     Discover projects, consolidate each (parse, deduplicate, tag, write, clear).
@@ -67,41 +113,184 @@ def consolidate_all_projects(
 
     Continues on per-project failure; logs errors. Returns ok_count and fail_count.
 
+    Projects run through a staged pipeline (discovery -> parse -> dedup/tag
+    -> write) with bounded queues and PIPELINE_*_WORKERS threads per stage,
+    so reading, LLM calls and writing of different projects overlap. With
+    profile_dir, projects are consolidated one at a time instead.
+
+    LLM usage of the run (tokens, calls, latency, estimated cost per task and
+    provider) is collected in a fresh ledger and written as JSON to
+    usage_report (or LLM_USAGE_REPORT) at the end.
+
+    Stage timings (parse, dedup, tag, generate, write, clear) and counters
+    are logged per project and for the run. With profile_dir, a cProfile dump
+    per project is written there; with trace_file, Chrome trace JSON spans.
+
+    Run metrics (duration, project status, entries per stage, LLM calls,
+    bytes written) are published for the /metrics endpoint and written in
+    OpenMetrics format to metrics_file (or METRICS_TEXTFILE), also when
+    discovery fails.
+
+    With parse_cache (kept by the scheduler daemon across runs), fix_repo.md
+    and coding_tips.md files unchanged since the last run are not re-parsed.
+
+    With a run journal (journal, or RUN_JOURNAL), every write step of a
+    project is recorded durably. With resume, an interrupted run is
+    continued: finished projects are skipped and half-written ones only
+    repeat the steps they had not completed.
+
     Args:
         root_path: Root directory to search for projects.
         extra_projects: Optional list of project paths to include.
         dry_run: If True, do not write files; only log intended actions.
+        usage_report: Optional path for the JSON LLM usage report.
+        profile_dir: Optional directory for per-project cProfile output.
+        trace_file: Optional path for Chrome trace JSON.
+        metrics_file: Optional path for the OpenMetrics textfile.
+        parse_cache: Optional cache of parsed fix_repo/coding_tips files.
+        projects: Consolidate these project roots instead of discovering them
+            (used by watch mode for the projects that changed).
+        rescan: Ignore the discovery cache (DISCOVERY_CACHE_PATH) and walk
+            the whole root.
+        pipeline: Worker counts and queue bound of the staged pipeline
+            (default: PipelineConfig.from_env()).
+        journal: Run journal (default: RunJournal.from_env(); none in dry_run).
+        resume: Continue the unfinished run recorded in the journal.
 
     Returns:
-        ConsolidationResult(ok_count, fail_count).
+        ConsolidationResult(ok_count, fail_count, skipped_count).
     """
-    ok_count = 0
-    fail_count = 0
+    started = time.monotonic()
+    start_run_deadline()
+    ledger = reset_ledger()
+    instrumentation = reset_instrumentation(
+        profile_dir=profile_dir, trace_file=trace_file
+    )
+    if usage_report is None and os.getenv("LLM_USAGE_REPORT"):
+        usage_report = Path(os.getenv("LLM_USAGE_REPORT", ""))
+    if metrics_file is None and os.getenv("METRICS_TEXTFILE"):
+        metrics_file = Path(os.getenv("METRICS_TEXTFILE", ""))
 
+    # Projects stream in from discovery: consolidation starts before the walk ends
     try:
-        projects = discover_projects(root_path, extra_projects=extra_projects)
-    except (FileNotFoundError, NotADirectoryError, ValueError) as e:
+        stream = (
+            iter(projects)
+            if projects is not None
+            else iter_projects(root_path, extra_projects=extra_projects, rescan=rescan)
+        )
+        first = next(stream, None)
+    except _DISCOVERY_ERRORS as e:
         logger.error("Discovery failed: %s", e)
-        return ConsolidationResult(ok_count=0, fail_count=1)
+        result = ConsolidationResult(ok_count=0, fail_count=1)
+        _export_metrics(result, started, instrumentation, ledger, metrics_file)
+        return result
 
-    if not projects:
+    if first is None:
         logger.info("No projects found under %s", root_path)
-        return ConsolidationResult(ok_count=0, fail_count=0)
+        result = ConsolidationResult(ok_count=0, fail_count=0)
+        _export_metrics(result, started, instrumentation, ledger, metrics_file)
+        return result
+
+    logger.info("Consolidating projects under %s (dry_run=%s)", root_path, dry_run)
+
+    if dry_run:
+        journal = None
+    elif journal is None:
+        journal = RunJournal.from_env()
+    if journal is not None:
+        try:
+            journal.start(root_path, resume=resume)
+        except OSError as e:
+            logger.error("Could not open run journal %s: %s", journal.path, e)
+            journal = None
+    ok_count = skipped_count = 0
+    fail_count = 1
+    discovery_errors: List[Exception] = []
+    stream = _guard_discovery(chain([first], stream), discovery_errors)
+    try:
+        if profile_dir is not None:
+            # One thread per project keeps each cProfile dump to one project
+            ok_count, fail_count, skipped_count = _consolidate_sequential(
+                stream,
+                instrumentation,
+                dry_run=dry_run,
+                parse_cache=parse_cache,
+                journal=journal,
+            )
+        else:
+            ok_count, fail_count, skipped_count = _consolidate_pipelined(
+                stream,
+                instrumentation,
+                pipeline or PipelineConfig.from_env(),
+                dry_run=dry_run,
+                parse_cache=parse_cache,
+                journal=journal,
+            )
+        fail_count += len(discovery_errors)
+    finally:
+        # A crashed or partly failed run stays resumable
+        if journal is not None:
+            journal.finish(ok=fail_count == 0)
+
+    logger.info(
+        "Consolidation complete: %d ok, %d failed",
+        ok_count,
+        fail_count,
+    )
+    instrumentation.finish()
+    instrumentation.log_summary()
+    instrumentation.write_trace()
+    log_cache_stats()
+    if usage_report is not None:
+        try:
+            ledger.write_report(usage_report)
+            logger.info("LLM usage report written to %s", usage_report)
+        except OSError as e:
+            logger.error("Could not write LLM usage report %s: %s", usage_report, e)
+    result = ConsolidationResult(
+        ok_count=ok_count, fail_count=fail_count, skipped_count=skipped_count
+    )
+    _export_metrics(result, started, instrumentation, ledger, metrics_file)
+    return result
 
-    logger.info("Consolidating %d project(s) (dry_run=%s)", len(projects), dry_run)
 
+def _guard_discovery(stream: Iterator[Path], errors: List[Exception]) -> Iterator[Path]:
+    """Yield from stream; a discovery error ends it and is appended to errors."""
+    try:
+        yield from stream
+    except _DISCOVERY_ERRORS as e:
+        logger.error("Discovery failed: %s", e)
+        errors.append(e)
+
+
+def _consolidate_sequential(
+    projects: Iterable[Path],
+    instrumentation: Instrumentation,
+    *,
+    dry_run: bool,
+    parse_cache: Optional[ParseCache],
+    journal: Optional[RunJournal] = None,
+) -> Tuple[int, int, int]:
+    """Consolidate projects one after another; returns (ok, failed, skipped)."""
+    ok_count = fail_count = skipped_count = 0
     for project in projects:
+        if _already_completed(project, journal):
+            skipped_count += 1
+            continue
         # Optimize: Use is_file() instead of exists() - checks both existence and type in one call
         # Discovery already verified file exists, but check again in case it was deleted
-        err_file = project / ".errors_fixes" / "errors_and_fixes.md"
-        if not err_file.is_file():
+        if not (project / _ERRORS_FIXES).is_file():
             logger.warning(
                 "Missing %s for project %s (skipping)", _ERRORS_FIXES, project
             )
+            skipped_count += 1
             continue
 
         try:
-            _consolidate_one_project(project, dry_run=dry_run)
+            with instrumentation.project(str(project)):
+                _consolidate_one_project(
+                    project, dry_run=dry_run, parse_cache=parse_cache, journal=journal
+                )
             ok_count += 1
         except Exception as e:
             fail_count += 1
@@ -111,59 +300,285 @@ def consolidate_all_projects(
                 e,
                 exc_info=True,
             )
+    return ok_count, fail_count, skipped_count
+
+
+def _consolidate_pipelined(
+    projects: Iterable[Path],
+    instrumentation: Instrumentation,
+    config: PipelineConfig,
+    *,
+    dry_run: bool,
+    parse_cache: Optional[ParseCache],
+    journal: Optional[RunJournal] = None,
+) -> Tuple[int, int, int]:
+    """Consolidate projects through the staged pipeline; returns (ok, failed, skipped)."""
+
+    def _parse(project: Path) -> Optional[_ParsedProject]:
+        if _already_completed(project, journal):
+            return None
+        if not (project / _ERRORS_FIXES).is_file():
+            logger.warning(
+                "Missing %s for project %s (skipping)", _ERRORS_FIXES, project
+            )
+            return None
+        with instrumentation.project(str(project), log=False):
+            return _parse_project(project, parse_cache)
+
+    def _process(parsed: Optional[_ParsedProject]) -> Optional[_ConsolidatedProject]:
+        if parsed is None:
+            return None
+        with instrumentation.project(str(parsed.project), log=False):
+            return _process_project(parsed)
+
+    def _write(consolidated: Optional[_ConsolidatedProject]) -> Optional[Path]:
+        if consolidated is None:
+            return None
+        with instrumentation.project(str(consolidated.project)):
+            _write_project(consolidated, dry_run=dry_run, journal=journal)
+        return consolidated.project
+
+    stages = [
+        Stage("parse", _parse, config.parse_workers),
+        Stage("process", _process, config.process_workers),
+        Stage("write", _write, config.write_workers),
+    ]
+    ok_count = fail_count = skipped_count = 0
+    for result in Pipeline(stages, queue_size=config.queue_size).run(projects):
+        if not result.ok:
+            fail_count += 1
+            logger.error(
+                "Consolidation failed for project %s (%s stage): %s",
+                result.item,
+                result.failed_stage,
+                result.error,
+                exc_info=result.error,
+            )
+        elif result.value is None:
+            skipped_count += 1
+        else:
+            ok_count += 1
+    return ok_count, fail_count, skipped_count
+
+
+def _export_metrics(
+    result: ConsolidationResult,
+    started: float,
+    instrumentation: Instrumentation,
+    ledger: UsageLedger,
+    metrics_file: Optional[Path],
+) -> None:
+    """Publish the run's metrics and write them to metrics_file (if set)."""
+    text = build_run_metrics(
+        ok_count=result.ok_count,
+        fail_count=result.fail_count,
+        skipped_count=result.skipped_count,
+        duration=time.monotonic() - started,
+        finished_at=time.time(),
+        instrumentation=instrumentation,
+        ledger=ledger,
+    )
+    set_latest_metrics(text)
+    if metrics_file is None:
+        return
+    try:
+        write_textfile(metrics_file, text)
+        logger.info("Metrics written to %s", metrics_file)
+    except OSError as e:
+        logger.error("Could not write metrics %s: %s", metrics_file, e)
+
+
+@dataclass
+class _ParsedProject:
+    """Parse stage output: new entries and the project's existing registries."""
+
+    project: Path
+    new_errors: List[ErrorEntry]
+    new_process: List[ErrorEntry]
+    existing_errors: List[ErrorEntry]
+    existing_process: List[ErrorEntry]
+    # What was parsed from errors_and_fixes.md; clearing keeps later appends
+    errors_log: Optional[LogSnapshot] = None
+
+
+@dataclass
+class _ConsolidatedProject:
+    """Process stage output: deduplicated, tagged entries ready to write."""
 
+    project: Path
+    errors: List[ErrorEntry]
+    process_issues: List[ErrorEntry]
+    errors_log: Optional[LogSnapshot] = None
+
+
+def _already_completed(project: Path, journal: Optional[RunJournal]) -> bool:
+    """True if the resumed run already finished project."""
+    if journal is None or not journal.completed(project):
+        return False
     logger.info(
-        "Consolidation complete: %d ok, %d failed",
-        ok_count,
-        fail_count,
+        "Project %s already completed in run %s (skipping)", project, journal.run_id
     )
-    return ConsolidationResult(ok_count=ok_count, fail_count=fail_count)
+    return True
 
 
-def _consolidate_one_project(project: Path, *, dry_run: bool = False) -> None:
+def _consolidate_one_project(
+    project: Path,
+    *,
+    dry_run: bool = False,
+    parse_cache: Optional[ParseCache] = None,
+    journal: Optional[RunJournal] = None,
+) -> None:
     """Run full consolidate workflow for a single project."""
+    _write_project(
+        _process_project(_parse_project(project, parse_cache)),
+        dry_run=dry_run,
+        journal=journal,
+    )
+
+
+def _parse_project(
+    project: Path, parse_cache: Optional[ParseCache] = None
+) -> _ParsedProject:
+    """Parse stage: errors_and_fixes.md plus existing fix_repo/coding_tips."""
 
-    errors_file = project / ".errors_fixes" / "errors_and_fixes.md"
+    errors_file = project / _ERRORS_FIXES
     fix_repo_file = project / _FIX_REPO
     coding_tips_file = project / _CODING_TIPS
 
-    new_entries = parse_errors_and_fixes(errors_file)
-    new_errors = [e for e in new_entries if not e.is_process_issue]
-    new_process = [e for e in new_entries if e.is_process_issue]
-
-    # Optimize: Use is_file() instead of exists() to reduce file system calls
-    # is_file() checks both existence and type in one call (faster on Docker mounts)
-    existing_errors = parse_fix_repo(fix_repo_file) if fix_repo_file.is_file() else []
-    existing_process = (
-        parse_coding_tips(coding_tips_file) if coding_tips_file.is_file() else []
+    with stage("parse"):
+        new_entries, errors_log = _parse_session_log(errors_file)
+        new_errors = [e for e in new_entries if not e.is_process_issue]
+        new_process = [e for e in new_entries if e.is_process_issue]
+
+        # Optimize: Use is_file() instead of exists() to reduce file system calls
+        # is_file() checks both existence and type in one call (faster on Docker mounts)
+        existing_errors = (
+            _parse_existing(fix_repo_file, parse_fix_repo, parse_cache)
+            if fix_repo_file.is_file()
+            else []
+        )
+        existing_process = (
+            _parse_existing(coding_tips_file, parse_coding_tips, parse_cache)
+            if coding_tips_file.is_file()
+            else []
+        )
+    count("parse.new", len(new_entries))
+    count("parse.existing", len(existing_errors) + len(existing_process))
+    return _ParsedProject(
+        project, new_errors, new_process, existing_errors, existing_process, errors_log
     )
 
-    consolidated_errors = deduplicate_errors_exact(new_errors, existing_errors)
-    consolidated_process = deduplicate_errors_exact(new_process, existing_process)
 
-    consolidated_errors = [apply_tags_to_entry(e) for e in consolidated_errors]
-    consolidated_process = [apply_tags_to_entry(e) for e in consolidated_process]
+def _parse_session_log(
+    errors_file: Path,
+) -> Tuple[List[ErrorEntry], Optional[LogSnapshot]]:
+    """Parse errors_and_fixes.md and snapshot the exact bytes that were parsed."""
+    try:
+        data = errors_file.read_bytes()
+    except FileNotFoundError:
+        logger.debug("Missing errors_and_fixes log: %s", errors_file)
+        return [], None
+    return parse_session_log(data.decode("utf-8")), LogSnapshot.of(data)
+
+
+def _process_project(parsed: _ParsedProject) -> _ConsolidatedProject:
+    """Process stage: deduplicate against existing entries, then tag."""
+    with stage("dedup"):
+        consolidated_errors = deduplicate_errors_exact(
+            parsed.new_errors, parsed.existing_errors
+        )
+        consolidated_process = deduplicate_errors_exact(
+            parsed.new_process, parsed.existing_process
+        )
 
-    all_consolidated: List[ErrorEntry] = consolidated_errors + consolidated_process
+    with stage("tag"):
+        consolidated_errors = apply_tags_to_entries(consolidated_errors)
+        consolidated_process = apply_tags_to_entries(consolidated_process)
+    count("consolidated.errors", len(consolidated_errors))
+    count("consolidated.process_issues", len(consolidated_process))
 
     logger.info(
         "Project %s: %d error(s), %d process issue(s) consolidated",
-        project,
+        parsed.project,
         len(consolidated_errors),
         len(consolidated_process),
     )
+    return _ConsolidatedProject(
+        parsed.project, consolidated_errors, consolidated_process, parsed.errors_log
+    )
+
 
+def _write_project(
+    consolidated: _ConsolidatedProject,
+    *,
+    dry_run: bool = False,
+    journal: Optional[RunJournal] = None,
+) -> None:
+    """
+    Write stage: fix_repo.md, coding_tips.md, then clear errors_and_fixes.md
+    (entries appended to it since it was parsed are kept).
+
+    Each step is recorded in journal once done; steps a resumed run already
+    completed are not repeated (fix_repo.md already holds the merged entries).
+
+    If the parsed part of errors_and_fixes.md changed since it was parsed,
+    nothing is written: the log cannot be cleared, and merging its entries
+    now would merge them again next run. The project is consolidated then.
+    """
     if dry_run:
         logger.info(
             "[dry-run] Would write fix_repo (%d), coding_tips (%d), clear errors_and_fixes",
-            len(consolidated_errors),
-            len(consolidated_process),
+            len(consolidated.errors),
+            len(consolidated.process_issues),
+        )
+        return
+
+    project = consolidated.project
+    all_consolidated: List[ErrorEntry] = (
+        consolidated.errors + consolidated.process_issues
+    )
+    done = journal.steps(project) if journal is not None else set()
+    if done:
+        logger.info("Project %s: resuming after %s", project, ", ".join(sorted(done)))
+    if (
+        consolidated.errors_log is not None
+        and not {STEP_FIX_REPO, STEP_CODING_TIPS} <= done
+        and not session_log_unchanged(project, consolidated.errors_log)
+    ):
+        logger.warning(
+            "Project %s: %s changed since it was parsed; not writing (next run)",
+            project,
+            _ERRORS_FIXES,
         )
         return
+    steps = {FIX_REPO_FILE: STEP_FIX_REPO, CODING_TIPS_FILE: STEP_CODING_TIPS}
+    # One pass for both files; the writer times its own generate/write
+    # stages and skips files whose content did not change
+    write_project_outputs(
+        project,
+        all_consolidated,
+        fix_repo=STEP_FIX_REPO not in done,
+        coding_tips=STEP_CODING_TIPS not in done,
+        on_written=(
+            (lambda name: journal.record(project, steps[name]))
+            if journal is not None
+            else None
+        ),
+    )
+    with stage("clear"):
+        cleared = clear_errors_and_fixes(project, consolidated.errors_log)
+    if cleared and journal is not None:
+        journal.record(project, STEP_CLEARED)
 
-    write_fix_repo(project, all_consolidated)
-    write_coding_tips(project, all_consolidated)
-    clear_errors_and_fixes(project)
+
+def _parse_existing(
+    path: Path,
+    parse_fn: Callable[[Path], List[ErrorEntry]],
+    parse_cache: Optional[ParseCache],
+) -> List[ErrorEntry]:
+    if parse_cache is None:
+        return parse_fn(path)
+    return parse_cache.parse(path, parse_fn)
 
 
 def _parse_args() -> argparse.Namespace:
@@ -187,7 +602,231 @@ def _parse_args() -> argparse.Namespace:
         action="store_true",
         help="Do not write files; only log intended actions",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--usage-report",
+        type=Path,
+        default=None,
+        help="Write a JSON LLM usage/cost report here (default: LLM_USAGE_REPORT)",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        default=None,
+        metavar="DIR",
+        help="Write cProfile output per project to DIR (<project>-<hash>.prof/.txt)",
+    )
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        default=None,
+        metavar="FILE",
+        help="Write Chrome trace JSON of project and stage spans to FILE",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        type=Path,
+        default=None,
+        metavar="FILE",
+        help="Write run metrics in OpenMetrics format to FILE (default: METRICS_TEXTFILE)",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        metavar="PORT",
+        help="Serve run metrics on http://0.0.0.0:PORT/metrics (default: METRICS_PORT)",
+    )
+    parser.add_argument(
+        "--rescan",
+        action="store_true",
+        help="Ignore the discovery cache (DISCOVERY_CACHE_PATH) and walk the whole root",
+    )
+    parser.add_argument(
+        "--journal",
+        type=Path,
+        default=None,
+        metavar="FILE",
+        help="Record completed project steps in this run journal (default: RUN_JOURNAL)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the interrupted run in the journal, skipping completed projects",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Keep running and consolidate at every fire time of the cron schedule",
+    )
+    parser.add_argument(
+        "--schedule",
+        default=None,
+        metavar="CRON",
+        help=f"Cron schedule for --daemon (default: CONSOLIDATION_SCHEDULE or '{DEFAULT_SCHEDULE}')",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and consolidate each project when its errors_and_fixes.md changes",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="With --watch, wait until a file is quiet this long (default: WATCH_DEBOUNCE_SECONDS or 5)",
+    )
+    parser.add_argument(
+        "--run-now",
+        action="store_true",
+        help="With --daemon or --watch, also run once at startup",
+    )
+    args = parser.parse_args()
+    if args.daemon and args.watch:
+        parser.error("--daemon and --watch are mutually exclusive")
+    if args.resume and not (args.journal or os.getenv("RUN_JOURNAL")):
+        parser.error("--resume needs --journal or RUN_JOURNAL")
+    if args.resume and (args.daemon or args.watch) and not args.run_now:
+        parser.error("--resume with --daemon or --watch needs --run-now")
+    return args
+
+
+@contextmanager
+def _stop_on_signals() -> Iterator[threading.Event]:
+    """Yield an event that SIGTERM/SIGINT set (previous handlers restored after)."""
+    stop = threading.Event()
+
+    def _request_stop(signum: int, _frame: object) -> None:
+        logger.info("Received signal %d, stopping after the current run", signum)
+        stop.set()
+
+    previous = {
+        sig: signal.signal(sig, _request_stop)
+        for sig in (signal.SIGTERM, signal.SIGINT)
+    }
+    try:
+        yield stop
+    finally:
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+
+
+def _warm_run(
+    args: argparse.Namespace,
+    root: Path,
+    parse_cache: ParseCache,
+    projects: Optional[Sequence[Path]] = None,
+    *,
+    resume: bool = False,
+) -> ConsolidationResult:
+    """One consolidation of a long-running process (daemon or watch mode)."""
+    result = consolidate_all_projects(
+        root,
+        extra_projects=None,
+        dry_run=args.dry_run,
+        usage_report=args.usage_report,
+        profile_dir=args.profile,
+        trace_file=args.trace,
+        metrics_file=args.metrics_file,
+        parse_cache=parse_cache,
+        projects=projects,
+        journal=_journal(args),
+        resume=resume,
+    )
+    logger.info(
+        "Run finished: %d ok, %d failed (parse cache: %d hit(s), %d miss(es))",
+        result.ok_count,
+        result.fail_count,
+        parse_cache.hits,
+        parse_cache.misses,
+    )
+    return result
+
+
+def _get_int_env(key: str, default: Optional[int]) -> Optional[int]:
+    raw = os.getenv(key)
+    try:
+        return int(raw) if raw else default
+    except ValueError:
+        logger.warning("Invalid %s=%r, using %s", key, raw, default)
+        return default
+
+
+def _metrics_port(args: argparse.Namespace) -> Optional[int]:
+    """--metrics-port or METRICS_PORT; None (no server) if unset or out of range."""
+    port = args.metrics_port
+    if port is None:
+        port = _get_int_env("METRICS_PORT", None)
+    if port is not None and not 1 <= port <= 65535:
+        logger.warning(
+            "Invalid metrics port %d (must be 1-65535); not serving metrics", port
+        )
+        return None
+    return port
+
+
+def _journal(args: argparse.Namespace) -> Optional[RunJournal]:
+    """Run journal from --journal, else RUN_JOURNAL."""
+    return RunJournal(args.journal) if args.journal else RunJournal.from_env()
+
+
+def _refresh_discovery_cache(args: argparse.Namespace, root: Path) -> None:
+    """With --rescan, rebuild the discovery cache once (later runs reuse it)."""
+    if not args.rescan:
+        return
+    try:
+        discover_projects(root, rescan=True)
+    except (FileNotFoundError, NotADirectoryError, ValueError) as e:
+        logger.error("Discovery failed: %s", e)
+
+
+def _run_daemon(args: argparse.Namespace, root: Path) -> int:
+    """
+    Consolidate on the cron schedule until SIGTERM/SIGINT.
+
+    Between runs the process keeps a parse cache of fix_repo/coding_tips
+    files (unchanged files are not re-parsed) and the module-level caches:
+    the markdown codec memos, the rule cache and the circuit breakers.
+    """
+    expression = (
+        args.schedule or os.getenv("CONSOLIDATION_SCHEDULE") or DEFAULT_SCHEDULE
+    )
+    try:
+        schedule = CronSchedule.parse(expression)
+    except ValueError as e:
+        logger.error("Invalid schedule: %s", e)
+        return 1
+
+    _refresh_discovery_cache(args, root)
+    parse_cache = ParseCache()
+    logger.info("Scheduler started: %s", schedule.expression)
+    with _stop_on_signals() as stop:
+        if args.run_now:
+            _warm_run(args, root, parse_cache, resume=args.resume)
+        run_daemon(
+            schedule, lambda: _warm_run(args, root, parse_cache), stop_event=stop
+        )
+    return 0
+
+
+def _run_watch(args: argparse.Namespace, root: Path) -> int:
+    """Consolidate each project shortly after its errors_and_fixes.md changes."""
+    _refresh_discovery_cache(args, root)
+    parse_cache = ParseCache()
+    try:
+        watcher = ProjectWatcher(
+            lambda: discover_projects(root),
+            lambda projects: _warm_run(args, root, parse_cache, projects=projects),
+            debounce=args.debounce,
+        )
+    except ValueError as e:
+        logger.error("Invalid watch settings: %s", e)
+        return 1
+    with _stop_on_signals() as stop:
+        if args.run_now:
+            _warm_run(args, root, parse_cache, resume=args.resume)
+        watcher.run(stop)
+    return 0
 
 
 def main() -> int:
@@ -215,7 +854,34 @@ def main() -> int:
         logger.error("Root path is not a directory: %s", root)
         return 1
 
-    result = consolidate_all_projects(root, extra_projects=None, dry_run=args.dry_run)
+    metrics_port = _metrics_port(args)
+    metrics_server = None
+    if metrics_port is not None:
+        try:
+            metrics_server = MetricsServer(metrics_port).start()
+        except OSError as e:
+            logger.error("Could not serve metrics on port %d: %s", metrics_port, e)
+
+    try:
+        if args.daemon:
+            return _run_daemon(args, root)
+        if args.watch:
+            return _run_watch(args, root)
+        result = consolidate_all_projects(
+            root,
+            extra_projects=None,
+            dry_run=args.dry_run,
+            usage_report=args.usage_report,
+            profile_dir=args.profile,
+            trace_file=args.trace,
+            metrics_file=args.metrics_file,
+            rescan=args.rescan,
+            journal=_journal(args),
+            resume=args.resume,
+        )
+    finally:
+        if metrics_server is not None:
+            metrics_server.stop()
     return 0 if result.all_ok else 1
 
 
@@ -0,0 +1,170 @@
+# markdown_codec.py
+# Shared markdown encoding/decoding for fix_repo.md and coding_tips.md (Phase 3).
+# v1.0
+
+"""
+Encode entry fields into registry markdown and decode them back.
+
+The generator renders headers, tags and timestamps with the encoders and
+the parser reads them with the matching decoders, so a registry survives a
+render/parse round trip unchanged. The helpers run once per entry or fix of
+every registry on every run, so they are built for throughput:
+
+- Header escaping and unescaping (one compiled regex substitution, skipped
+  when there is no backslash) are memoized: signatures and categories
+  repeat across sections, projects and daemon runs.
+- Timestamp and tag formatting/decoding are memoized: registries repeat the
+  same timestamps, dates and tag sets across many entries and runs.
+- `**Key:** value` metadata is decoded with one regex scan per block
+  instead of a Python loop over its lines.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Characters that could break a markdown header (#, emphasis, links, HTML, code)
+HEADER_SPECIAL_CHARS = "#*[]()<>`_~"
+
+_CACHE_SIZE = 65536
+
+_ESCAPES = tuple((char, "\\" + char) for char in HEADER_SPECIAL_CHARS)
+_UNESCAPE_RE = re.compile(r"\\([" + re.escape(HEADER_SPECIAL_CHARS) + r"])")
+
+# One `**Key:** value` line; matched over a whole block instead of line by line
+_METADATA_LINE_RE = re.compile(
+    r"(?m)^[^\S\n]*\*\*(?P<key>[^:\n]+):\*\*(?P<value>[^\n]*)"
+)
+
+NO_TAGS = "None"
+_ESCAPED_BACKTICK = "\\`"
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def escape_header(text: str) -> str:
+    """Backslash-escape markdown special characters in header text.
+
+    Prevents markdown injection in error signatures and category names.
+    Escapes: #, *, [, ], (, ), <, >, `, _, ~
+    """
+    # Chained str.replace beats str.translate with string values in CPython
+    for char, escaped in _ESCAPES:
+        if char in text:
+            text = text.replace(char, escaped)
+    return text
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def unescape_header(text: str) -> str:
+    """Reverse escape_header: remove the backslash before special characters."""
+    if "\\" not in text:
+        return text
+    return _UNESCAPE_RE.sub(r"\1", text)
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def format_timestamp(dt: datetime) -> str:
+    """Serialize timestamps into UTC ISO8601 strings.
+
+    Assumes naive datetimes are UTC (v1 limitation).
+    """
+    if not dt.tzinfo:
+        logger.debug("Naive datetime encountered, assuming UTC: %s", dt)
+    aware = dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+    iso = aware.astimezone(timezone.utc).replace(microsecond=0).isoformat()
+    return iso.replace("+00:00", "Z")
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def format_date(dt: datetime) -> str:
+    """Return the YYYY-MM-DD portion of format_timestamp(dt)."""
+    return format_timestamp(dt).split("T")[0]
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def decode_timestamp(text: str) -> datetime:
+    """Parse an ISO8601 timestamp, accepting a Z suffix for UTC.
+
+    Raises:
+        ValueError: If text is not an ISO8601 timestamp.
+    """
+    normalized = text.strip()
+    if normalized.endswith("Z"):
+        normalized = f"{normalized[:-1]}+00:00"
+    return datetime.fromisoformat(normalized)
+
+
+def format_tags(tags: Iterable[str]) -> str:
+    """Return markdown-safe representation of tag collections.
+
+    Escapes backticks in tags to prevent markdown injection.
+    """
+    return _format_tags(tuple(tags))
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _format_tags(tags: Tuple[str, ...]) -> str:
+    if not tags:
+        return NO_TAGS
+    # Escape backticks in tags to prevent markdown breaking
+    return ", ".join(f"`{tag.replace('`', _ESCAPED_BACKTICK)}`" for tag in tags)
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def decode_tags(raw: str) -> Tuple[str, ...]:
+    """Reverse format_tags.
+
+    Code-spanned tags have their backticks unescaped; anything else (e.g.
+    hand-edited registries) is split on commas and stripped of spaces and
+    backticks, like parser.parse_tags.
+    """
+    raw = raw.strip()
+    if not raw or raw == NO_TAGS:
+        return ()
+    tags = []
+    for part in raw.split(", "):
+        part = part.strip()
+        if len(part) >= 2 and part[0] == "`" and part[-1] == "`":
+            tags.append(part[1:-1].replace(_ESCAPED_BACKTICK, "`"))
+        else:
+            tags.extend(t.strip(" `") for t in part.split(",") if t.strip(" `"))
+    return tuple(tags)
+
+
+def decode_metadata(block: str) -> Dict[str, str]:
+    """Return the `**Key:** value` pairs of a rendered block.
+
+    Keys are lower-cased with spaces replaced by underscores; values are
+    stripped of whitespace and surrounding backticks. Same result as
+    parser.extract_metadata for generator output, in one regex scan.
+    """
+    return {
+        _metadata_key(key): value.strip().strip("`")
+        for key, value in _METADATA_LINE_RE.findall(block)
+    }
+
+
+@lru_cache(maxsize=1024)
+def _metadata_key(raw: str) -> str:
+    return raw.strip().lower().replace(" ", "_")
+
+
+def clear_caches() -> None:
+    """Drop all memoized encodings/decodings (e.g. between benchmark rounds)."""
+    for cached in (
+        escape_header,
+        unescape_header,
+        format_timestamp,
+        format_date,
+        decode_timestamp,
+        _format_tags,
+        decode_tags,
+        _metadata_key,
+    ):
+        cached.cache_clear()
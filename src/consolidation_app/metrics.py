@@ -0,0 +1,362 @@
+# metrics.py
+# OpenMetrics export of consolidation run metrics (Phase 5).
+# v1.0
+
+"""
+Export the metrics of the last consolidation run in OpenMetrics text format.
+
+Two outputs, both optional:
+- a textfile (METRICS_TEXTFILE / --metrics-file), written atomically so the
+  node exporter textfile collector never reads a partial file;
+- a local HTTP endpoint serving /metrics (METRICS_PORT / --metrics-port).
+
+All values describe the most recent run, so they are exported as gauges
+(and one summary for LLM latency). Sources: ConsolidationResult, the run's
+Instrumentation (stage timings, entry counters, bytes written) and the
+UsageLedger (LLM calls, failures, tokens, latency).
+
+Health check: ``python -m src.consolidation_app.metrics --check FILE
+--max-age SECONDS`` exits 0 only if FILE is fresh and reports a successful run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.consolidation_app.instrumentation import Instrumentation
+from src.consolidation_app.usage_ledger import UsageLedger, percentile
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+PREFIX = "consolidation"
+
+# Instrumentation counter holding bytes written (other counters are entry counts)
+_BYTES_COUNTER = "write.bytes"
+
+Labels = Dict[str, str]
+Sample = Tuple[str, Labels, float]
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricsBuilder:
+    """Accumulates metric families and renders OpenMetrics text."""
+
+    def __init__(self) -> None:
+        self._families: List[Tuple[str, str, str, List[Sample]]] = []
+
+    def add(
+        self,
+        name: str,
+        metric_type: str,
+        help_text: str,
+        samples: Sequence[Tuple[Labels, float]] | float,
+    ) -> None:
+        """Add a gauge/summary family; samples is a value or (labels, value) pairs."""
+        if isinstance(samples, (int, float)):
+            samples = [({}, float(samples))]
+        family = f"{PREFIX}_{name}"
+        self._families.append(
+            (
+                family,
+                metric_type,
+                help_text,
+                [(family, labels, value) for labels, value in samples],
+            )
+        )
+
+    def add_summary(
+        self, name: str, help_text: str, series: Sequence[Tuple[Labels, List[float]]]
+    ) -> None:
+        """Add a summary (p50/p95 quantiles, _sum, _count) per label set."""
+        family = f"{PREFIX}_{name}"
+        samples: List[Sample] = []
+        for labels, values in series:
+            ordered = sorted(values)
+            for quantile, pct in (("0.5", 50), ("0.95", 95)):
+                samples.append(
+                    (family, {**labels, "quantile": quantile}, percentile(ordered, pct))
+                )
+            samples.append((f"{family}_sum", labels, sum(ordered)))
+            samples.append((f"{family}_count", labels, float(len(ordered))))
+        self._families.append((family, "summary", help_text, samples))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for family, metric_type, help_text, samples in self._families:
+            lines.append(f"# TYPE {family} {metric_type}")
+            if family.endswith("_seconds"):
+                lines.append(f"# UNIT {family} seconds")
+            elif family.endswith("_bytes"):
+                lines.append(f"# UNIT {family} bytes")
+            lines.append(f"# HELP {family} {help_text}")
+            for sample_name, labels, value in samples:
+                label_text = ",".join(
+                    f'{key}="{_escape_label(str(val))}"' for key, val in labels.items()
+                )
+                suffix = f"{{{label_text}}}" if label_text else ""
+                lines.append(f"{sample_name}{suffix} {_format_value(value)}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def build_run_metrics(
+    *,
+    ok_count: int,
+    fail_count: int,
+    skipped_count: int,
+    duration: float,
+    finished_at: float,
+    instrumentation: Instrumentation,
+    ledger: UsageLedger,
+) -> str:
+    """
+    Render the metrics of one consolidation run as OpenMetrics text.
+
+    Args:
+        ok_count: Projects consolidated successfully.
+        fail_count: Projects (or discovery) that failed.
+        skipped_count: Discovered projects skipped (log file missing).
+        duration: Run wall time in seconds.
+        finished_at: Unix time the run finished.
+        instrumentation: Instrumentation of the run.
+        ledger: LLM usage ledger of the run.
+
+    Returns:
+        OpenMetrics exposition text (ends with "# EOF").
+    """
+    builder = MetricsBuilder()
+    builder.add(
+        "last_run_timestamp_seconds",
+        "gauge",
+        "Unix time the last run finished.",
+        finished_at,
+    )
+    builder.add(
+        "last_run_duration_seconds", "gauge", "Wall time of the last run.", duration
+    )
+    builder.add(
+        "last_run_success",
+        "gauge",
+        "1 if the last run had no failed projects, else 0.",
+        1.0 if fail_count == 0 else 0.0,
+    )
+    builder.add(
+        "projects",
+        "gauge",
+        "Projects in the last run by status.",
+        [
+            ({"status": "ok"}, ok_count),
+            ({"status": "failed"}, fail_count),
+            ({"status": "skipped"}, skipped_count),
+        ],
+    )
+
+    run = instrumentation.run
+    builder.add(
+        "stage_duration_seconds",
+        "gauge",
+        "Time spent per pipeline stage in the last run.",
+        [
+            ({"stage": name}, stats.seconds)
+            for name, stats in sorted(run.stages.items())
+        ],
+    )
+    entry_samples = []
+    for name, value in sorted(run.counters.items()):
+        if name == _BYTES_COUNTER:
+            continue
+        stage, _, kind = name.partition(".")
+        entry_samples.append(({"stage": stage, "kind": kind or stage}, value))
+    builder.add(
+        "entries", "gauge", "Entries per stage and kind in the last run.", entry_samples
+    )
+    builder.add(
+        "written_bytes",
+        "gauge",
+        "Bytes of fix_repo.md/coding_tips.md written in the last run.",
+        run.counters.get(_BYTES_COUNTER, 0),
+    )
+
+    totals = sorted(ledger.snapshot().items())
+    builder.add(
+        "llm_calls",
+        "gauge",
+        "LLM provider calls in the last run.",
+        [({"task": t, "provider": p}, u.calls) for (t, p), u in totals],
+    )
+    builder.add(
+        "llm_failures",
+        "gauge",
+        "Failed LLM provider calls in the last run.",
+        [({"task": t, "provider": p}, u.failures) for (t, p), u in totals],
+    )
+    token_samples: List[Tuple[Labels, float]] = []
+    for (task, provider), usage in totals:
+        for direction, value in (
+            ("input", usage.input_tokens),
+            ("output", usage.output_tokens),
+            ("cached", usage.cached_tokens),
+        ):
+            token_samples.append(
+                ({"task": task, "provider": provider, "direction": direction}, value)
+            )
+    builder.add("llm_tokens", "gauge", "LLM tokens in the last run.", token_samples)
+    builder.add(
+        "llm_cost_usd",
+        "gauge",
+        "Estimated LLM cost of the last run in USD.",
+        [({"task": t, "provider": p}, u.cost_usd) for (t, p), u in totals],
+    )
+    builder.add_summary(
+        "llm_latency_seconds",
+        "LLM call latency in the last run.",
+        [({"task": t, "provider": p}, u.latencies) for (t, p), u in totals],
+    )
+    return builder.render()
+
+
+_UP_ONLY = f"# TYPE {PREFIX}_up gauge\n{PREFIX}_up 1\n# EOF\n"
+_latest = _UP_ONLY
+_latest_lock = threading.Lock()
+
+
+def set_latest_metrics(text: str) -> None:
+    """Publish the metrics of the run that just finished (served on /metrics)."""
+    global _latest
+    with _latest_lock:
+        _latest = text
+
+
+def latest_metrics() -> str:
+    """Metrics of the last finished run (only 'up' before the first run)."""
+    with _latest_lock:
+        return _latest
+
+
+def write_textfile(path: Path, text: str) -> None:
+    """Write metrics atomically (temp file + rename) for the textfile collector."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.with_name(f".{path.name}.tmp")
+    temp.write_text(text, encoding="utf-8", newline="\n")
+    temp.replace(path)
+
+
+class MetricsServer:
+    """Serves latest_metrics() on http://host:port/metrics."""
+
+    def __init__(
+        self, port: int, host: str = "0.0.0.0"
+    ) -> None:  # nosec B104 - scraped from outside the container
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 - stdlib naming
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = latest_metrics().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(
+                self, format: str, *args
+            ) -> None:  # noqa: A002 - stdlib signature
+                logger.debug("metrics: " + format, *args)
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="metrics", daemon=True
+        )
+
+    @property
+    def port(self) -> int:
+        return self._httpd.server_address[1]
+
+    def start(self) -> "MetricsServer":
+        self._thread.start()
+        logger.info("Serving metrics on port %d (/metrics)", self.port)
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join(timeout=5)
+
+
+_SAMPLE_RE = re.compile(
+    r"^(?P<name>[a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{[^}]*\})?\s+(?P<value>\S+)"
+)
+
+
+def check_textfile(
+    path: Path, max_age: float, now: Optional[float] = None
+) -> Tuple[bool, str]:
+    """
+    Health check: is the textfile fresh and did the last run succeed?
+
+    Returns:
+        (healthy, reason).
+    """
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError as e:
+        return False, f"cannot read {path}: {e}"
+    values: Dict[str, float] = {}
+    for line in text.splitlines():
+        match = _SAMPLE_RE.match(line)
+        if match:
+            values[match.group("name")] = float(match.group("value"))
+    finished = values.get(f"{PREFIX}_last_run_timestamp_seconds")
+    if finished is None:
+        return False, "no last_run_timestamp_seconds in metrics"
+    age = (time.time() if now is None else now) - finished
+    if age > max_age:
+        return False, f"last run finished {age:.0f}s ago (max {max_age:.0f}s)"
+    if values.get(f"{PREFIX}_last_run_success") != 1:
+        return False, "last run had failures"
+    return True, "ok"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Check consolidation metrics (health check)."
+    )
+    parser.add_argument(
+        "--check", type=Path, required=True, help="Metrics textfile to check"
+    )
+    parser.add_argument(
+        "--max-age",
+        type=float,
+        default=26 * 3600,
+        help="Maximum age of the last run in seconds (default: 26h)",
+    )
+    args = parser.parse_args(argv)
+    healthy, reason = check_textfile(args.check, args.max_age)
+    print(reason)
+    return 0 if healthy else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,12 +2,21 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import re
+import threading
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.consolidation_app.markdown_codec import (
+    decode_metadata,
+    decode_tags,
+    decode_timestamp,
+    unescape_header,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +25,8 @@ _ENTRY_HEADER = re.compile(
 )
 _METADATA_RE = re.compile(r"\*\*(?P<key>[^:]+):\*\*\s*(?P<value>.*)")
 
-DEFAULT_TIMESTAMP = datetime(1970, 1, 1)
+# Timezone-aware like parsed "...Z" timestamps, so the two can be compared
+DEFAULT_TIMESTAMP = datetime(1970, 1, 1, tzinfo=timezone.utc)
 
 
 @dataclass(frozen=True)
@@ -36,6 +46,32 @@ class ErrorEntry:
     is_process_issue: bool
 
 
+def entry_fingerprint(entry: ErrorEntry) -> str:
+    """Return a stable SHA-256 hex digest of all fields of an entry.
+
+    Equal entries always produce the same fingerprint, across processes and
+    runs, so it can key caches of work derived from entry content.
+    """
+
+    digest = hashlib.sha256()
+    for value in (
+        entry.error_signature,
+        entry.error_type,
+        entry.file,
+        str(entry.line),
+        entry.fix_code,
+        entry.explanation,
+        entry.result,
+        str(entry.success_count),
+        "\x1f".join(entry.tags),
+        entry.timestamp.isoformat(),
+        "process" if entry.is_process_issue else "error",
+    ):
+        digest.update(value.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
 def parse_errors_and_fixes(file_path: Path) -> List[ErrorEntry]:
     """Return parsed entries from a session log."""
 
@@ -45,7 +81,22 @@ def parse_errors_and_fixes(file_path: Path) -> List[ErrorEntry]:
         logger.debug("Missing errors_and_fixes log: %s", file_path)
         return []
 
-    text = file_path.read_text(encoding="utf-8")
+    return parse_session_log(file_path.read_text(encoding="utf-8"))
+
+
+def has_session_entries(file_path: Path) -> bool:
+    """True if the session log exists and holds at least one entry header."""
+
+    try:
+        text = file_path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return False
+    return _ENTRY_HEADER.search(text) is not None
+
+
+def parse_session_log(text: str) -> List[ErrorEntry]:
+    """Return parsed entries from the text of a session log."""
+
     if not text.strip():
         return []
 
@@ -211,14 +262,11 @@ def parse_tags(raw: str) -> List[str]:
 def parse_timestamp(timestamp_str: str) -> Optional[datetime]:
     """Parse ISO timestamps, accepting suffixed Z for UTC."""
 
-    normalized = timestamp_str.strip()
-    if not normalized:
+    if not timestamp_str.strip():
         return None
-    if normalized.endswith("Z"):
-        normalized = f"{normalized[:-1]}+00:00"
 
     try:
-        return datetime.fromisoformat(normalized)
+        return decode_timestamp(timestamp_str)
     except ValueError as exc:
         logger.warning("Unable to parse timestamp '%s': %s", timestamp_str, exc)
         raise
@@ -256,28 +304,6 @@ _FIX_REPO_FIX_BLOCK = re.compile(
 )
 
 
-def _unescape_markdown_header(text: str) -> str:
-    """Reverse _escape_markdown_header: remove backslash escapes."""
-
-    replacements = [
-        (r"\#", "#"),
-        (r"\*", "*"),
-        (r"\[", "["),
-        (r"\]", "]"),
-        (r"\(", "("),
-        (r"\)", ")"),
-        (r"\<", "<"),
-        (r"\>", ">"),
-        (r"\`", "`"),
-        (r"\_", "_"),
-        (r"\~", "~"),
-    ]
-    out = text
-    for escaped, char in replacements:
-        out = out.replace(escaped, char)
-    return out
-
-
 def parse_fix_repo(file_path: Path) -> List[ErrorEntry]:
     """
     Parse fix_repo.md (generator output) back into ErrorEntry list.
@@ -306,16 +332,16 @@ def parse_fix_repo(file_path: Path) -> List[ErrorEntry]:
     entries: List[ErrorEntry] = []
     for i, sig_match in enumerate(sections):
         signature_raw = sig_match.group(1).strip()
-        signature = _unescape_markdown_header(signature_raw)
+        signature = unescape_header(signature_raw)
         start = sig_match.end()
         end = sections[i + 1].start() if i + 1 < len(sections) else len(text)
         block = text[start:end].strip()
         if not block:
             continue
 
-        meta = extract_metadata(block)
+        meta = decode_metadata(block)
         raw_tags = meta.get("tags", "").strip()
-        section_tags = [] if raw_tags == "None" else parse_tags(raw_tags)
+        section_tags = list(decode_tags(raw_tags))
         fix_matches = list(_FIX_REPO_FIX_BLOCK.finditer(block))
         for j, fm in enumerate(fix_matches):
             error_type = fm.group(1).strip()
@@ -325,7 +351,7 @@ def parse_fix_repo(file_path: Path) -> List[ErrorEntry]:
                 fix_matches[j + 1].start() if j + 1 < len(fix_matches) else len(block)
             )
             fix_block = block[fix_start:fix_end].strip()
-            fix_meta = extract_metadata(fix_block)
+            fix_meta = decode_metadata(fix_block)
             fix_code = extract_code_block(fix_block, "Code")
             explanation = (
                 fix_meta.get("why this works") or fix_meta.get("why_this_works") or ""
@@ -393,7 +419,7 @@ def parse_coding_tips(file_path: Path) -> List[ErrorEntry]:
     sections = list(_CODING_TIPS_SECTION.finditer(text))
     entries: List[ErrorEntry] = []
     for i, cat_match in enumerate(sections):
-        category = _unescape_markdown_header(cat_match.group(1).strip())
+        category = unescape_header(cat_match.group(1).strip())
         start = cat_match.end()
         end = sections[i + 1].start() if i + 1 < len(sections) else len(text)
         block = text[start:end].strip()
@@ -402,13 +428,13 @@ def parse_coding_tips(file_path: Path) -> List[ErrorEntry]:
 
         rule_matches = list(_CODING_TIPS_RULE.finditer(block))
         for k, rm in enumerate(rule_matches):
-            rule_title = _unescape_markdown_header(rm.group(1).strip())
+            rule_title = unescape_header(rm.group(1).strip())
             rule_start = rm.end()
             rule_end = (
                 rule_matches[k + 1].start() if k + 1 < len(rule_matches) else len(block)
             )
             rule_block = block[rule_start:rule_end].strip()
-            meta = extract_metadata(rule_block)
+            meta = decode_metadata(rule_block)
             why = meta.get("why") or meta.get("explanation") or ""
             result = meta.get("result", "")
             related = meta.get("related errors") or meta.get("related_errors") or ""
@@ -433,3 +459,45 @@ def parse_coding_tips(file_path: Path) -> List[ErrorEntry]:
             entries.append(entry)
 
     return entries
+
+
+class ParseCache:
+    """
+    Parse results of registry files, reused while a file is unchanged.
+
+    Entries are keyed by resolved path and validated against the file's
+    mtime and size, so a rewritten file is parsed again. Meant for
+    long-running processes (the scheduler daemon) that consolidate the same
+    projects repeatedly.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[Path, Tuple[Tuple[int, int], List[ErrorEntry]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def parse(
+        self, file_path: Path, parse_fn: Callable[[Path], List[ErrorEntry]]
+    ) -> List[ErrorEntry]:
+        """Return parse_fn(file_path), reusing the last result if the file is unchanged."""
+        try:
+            st = file_path.stat()
+        except OSError:
+            return parse_fn(file_path)
+        key = file_path.resolve()
+        signature = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == signature:
+                self.hits += 1
+                return list(cached[1])
+            self.misses += 1
+        entries = parse_fn(file_path)
+        with self._lock:
+            self._entries[key] = (signature, list(entries))
+        return entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
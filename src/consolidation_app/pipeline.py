@@ -0,0 +1,236 @@
+# pipeline.py
+# Staged producer/consumer pipeline with bounded queues (Phase 4).
+# v1.0
+
+"""
+Run items through a chain of stages, each on its own worker threads, with a
+bounded queue in front of every stage.
+
+The source (e.g. the discovery stream) is consumed on a feeder thread, so
+discovery, parsing, processing and writing of different projects overlap:
+throughput approaches that of the slowest stage instead of the sum of all
+stages. Bounded queues give back-pressure, so a fast stage never runs far
+ahead of a slow one and memory stays flat on large fleets.
+
+An exception in a stage fails only that item; it skips the remaining stages
+and is reported in its PipelineResult. Results are yielded in completion
+order. A BaseException (e.g. SystemExit) is reported the same way but also
+ends its worker thread; the run still completes.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_QUEUE_SIZE = 16
+DEFAULT_WORKERS = 2
+
+_DONE = object()
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One pipeline stage: fn is applied to each item's current value."""
+
+    name: str
+    fn: Callable[[Any], Any]
+    workers: int = 1
+
+
+@dataclass
+class PipelineResult(Generic[T]):
+    """Outcome of one item: final value, or the error and the stage it failed in."""
+
+    item: T
+    value: Any = None
+    error: Optional[BaseException] = None
+    failed_stage: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class _Envelope:
+    item: Any
+    value: Any
+    error: Optional[BaseException] = None
+    failed_stage: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class PipelineConfig:
+    """Worker counts per stage and the queue bound (see from_env)."""
+
+    parse_workers: int = DEFAULT_WORKERS
+    process_workers: int = DEFAULT_WORKERS
+    write_workers: int = DEFAULT_WORKERS
+    queue_size: int = DEFAULT_QUEUE_SIZE
+
+    @classmethod
+    def from_env(cls) -> "PipelineConfig":
+        """Read PIPELINE_PARSE_WORKERS, PIPELINE_PROCESS_WORKERS,
+        PIPELINE_WRITE_WORKERS and PIPELINE_QUEUE_SIZE (all min 1)."""
+        return cls(
+            parse_workers=_get_int_env("PIPELINE_PARSE_WORKERS", DEFAULT_WORKERS),
+            process_workers=_get_int_env("PIPELINE_PROCESS_WORKERS", DEFAULT_WORKERS),
+            write_workers=_get_int_env("PIPELINE_WRITE_WORKERS", DEFAULT_WORKERS),
+            queue_size=_get_int_env("PIPELINE_QUEUE_SIZE", DEFAULT_QUEUE_SIZE),
+        )
+
+
+def _get_int_env(key: str, default: int) -> int:
+    raw = os.getenv(key)
+    try:
+        return max(1, int(raw)) if raw else default
+    except ValueError:
+        logger.warning("Invalid %s=%r, using %d", key, raw, default)
+        return default
+
+
+class Pipeline:
+    """Bounded-queue, multi-threaded chain of stages."""
+
+    def __init__(
+        self, stages: Sequence[Stage], queue_size: int = DEFAULT_QUEUE_SIZE
+    ) -> None:
+        if not stages:
+            raise ValueError("Pipeline needs at least one stage")
+        self.stages = [Stage(s.name, s.fn, max(1, s.workers)) for s in stages]
+        self.queue_size = max(1, queue_size)
+
+    def run(self, source: Iterable[T]) -> Iterator[PipelineResult[T]]:
+        """
+        Feed source through all stages; yield one result per item.
+
+        Raises:
+            Exception: Re-raises an exception from iterating source, after
+                the items produced before it have been yielded.
+        """
+        queues: List[queue.Queue] = [
+            queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)
+        ]
+        cancel = threading.Event()
+        source_error: List[BaseException] = []
+        threads: List[threading.Thread] = []
+
+        def _put(q: queue.Queue, value: Any) -> bool:
+            """Blocking put that gives up when the run is cancelled."""
+            while not cancel.is_set():
+                try:
+                    q.put(value, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def _get(q: queue.Queue) -> Any:
+            """Blocking get that returns _DONE when the run is cancelled."""
+            while not cancel.is_set():
+                try:
+                    return q.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            return _DONE
+
+        def _feed() -> None:
+            try:
+                for item in source:
+                    if not _put(queues[0], _Envelope(item=item, value=item)):
+                        return
+            except BaseException as e:  # surfaced to the caller by run()
+                source_error.append(e)
+            finally:
+                for _ in range(self.stages[0].workers):
+                    _put(queues[0], _DONE)
+
+        def _stage_worker(
+            index: int, remaining: List[int], lock: threading.Lock
+        ) -> None:
+            stage = self.stages[index]
+            inbox, outbox = queues[index], queues[index + 1]
+            try:
+                while True:
+                    envelope = _get(inbox)
+                    if envelope is _DONE:
+                        break
+                    if envelope.error is None:
+                        try:
+                            envelope.value = stage.fn(envelope.value)
+                        except BaseException as e:
+                            envelope.error = e
+                            envelope.failed_stage = stage.name
+                            if not isinstance(e, Exception):
+                                _put(outbox, envelope)
+                                raise
+                    if not _put(outbox, envelope):
+                        return
+            finally:
+                # Also when the worker dies, so the next stage is not left waiting
+                with lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    following = (
+                        self.stages[index + 1].workers
+                        if index + 1 < len(self.stages)
+                        else 1
+                    )
+                    for _ in range(following):
+                        _put(outbox, _DONE)
+
+        feeder = threading.Thread(target=_feed, name="pipeline-source", daemon=True)
+        threads.append(feeder)
+        for index, stage in enumerate(self.stages):
+            remaining = [stage.workers]
+            lock = threading.Lock()
+            for n in range(remaining[0]):
+                threads.append(
+                    threading.Thread(
+                        target=_stage_worker,
+                        args=(index, remaining, lock),
+                        name=f"pipeline-{stage.name}-{n}",
+                        daemon=True,
+                    )
+                )
+        for thread in threads:
+            thread.start()
+
+        try:
+            outbox = queues[-1]
+            while True:
+                envelope = outbox.get()
+                if envelope is _DONE:
+                    break
+                yield PipelineResult(
+                    item=envelope.item,
+                    value=envelope.value if envelope.error is None else None,
+                    error=envelope.error,
+                    failed_stage=envelope.failed_stage,
+                )
+        finally:
+            cancel.set()
+            for thread in threads:
+                thread.join(timeout=5)
+        if source_error:
+            raise source_error[0]
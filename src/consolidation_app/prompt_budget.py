@@ -0,0 +1,259 @@
+# prompt_budget.py
+# Token-budget-aware prompt packing shared by the AI modules (Phase 4).
+# v1.0
+
+"""
+Fit prompt fields into a per-task/per-model token budget.
+
+Replaces fixed character slices ([:500], [:300], ...) in the prompt builders:
+fields are kept whole when the prompt fits and are truncated by priority
+(with a guaranteed minimum share each) only when it does not.
+
+Token counts come from tiktoken when it is installed (optional dependency)
+and from a fast character heuristic otherwise.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Heuristic: average characters per token for mixed prose/code
+CHARS_PER_TOKEN = 4.0
+
+# Default prompt budget (tokens). Ollama's default context window is 4096
+# tokens shared by prompt and response, so leave room for the reply.
+DEFAULT_TOKEN_BUDGET = 3072
+
+# Prompt budgets for hosted models with larger context windows (prefix match)
+_MODEL_TOKEN_BUDGETS: Dict[str, int] = {
+    "gpt-4o": 16000,
+    "gpt-4-turbo": 16000,
+    "gpt-4": 6144,
+    "gpt-3.5": 12000,
+    "claude": 16000,
+}
+
+# Marker appended to truncated field text
+TRUNCATION_MARKER = "…"
+
+
+@dataclass(frozen=True)
+class PromptField:
+    """
+    One variable piece of a prompt.
+
+    Attributes:
+        name: Key used by the prompt's render function.
+        text: Full field text.
+        priority: Higher priority fields are filled first when space is short.
+        min_tokens: Share reserved for the field before priority filling.
+    """
+
+    name: str
+    text: str
+    priority: int = 0
+    min_tokens: int = 0
+
+
+# Set once tiktoken failed to load an encoding (logged only the first time)
+_encoding_failed = False
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: Optional[str]) -> Any:
+    """Return a tiktoken encoding for model, or None if tiktoken is unavailable."""
+    global _encoding_failed
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    try:
+        try:
+            return (
+                tiktoken.encoding_for_model(model)
+                if model
+                else tiktoken.get_encoding("cl100k_base")
+            )
+        except (KeyError, ValueError):
+            # Non-OpenAI model: cl100k_base is a close enough approximation
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # tiktoken downloads its BPE files on first use, which fails offline
+        if not _encoding_failed:
+            _encoding_failed = True
+            logger.warning(
+                "tiktoken encoding unavailable (%s); estimating tokens from length", e
+            )
+        return None
+
+
+def estimate_tokens(text: str, model: Optional[str] = None) -> int:
+    """
+    Estimate the number of tokens in text.
+
+    Uses tiktoken when installed, otherwise ~CHARS_PER_TOKEN characters per token.
+
+    Args:
+        text: Text to measure.
+        model: Model name, used to pick a tokenizer when one is available.
+
+    Returns:
+        Estimated token count (0 for empty text).
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: Optional[str] = None) -> str:
+    """
+    Return text cut to at most max_tokens tokens (marker included).
+
+    Args:
+        text: Text to truncate.
+        max_tokens: Token limit.
+        model: Model name for tokenizer selection.
+
+    Returns:
+        Original text if it fits, otherwise a prefix ending in TRUNCATION_MARKER.
+    """
+    if max_tokens <= 0:
+        return ""
+    if estimate_tokens(text, model) <= max_tokens:
+        return text
+    keep = max_tokens - 1  # room for the marker
+    if keep <= 0:
+        return TRUNCATION_MARKER
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        tokens = encoding.encode(text, disallowed_special=())
+        return encoding.decode(tokens[:keep]).rstrip() + TRUNCATION_MARKER
+    return text[: int(keep * CHARS_PER_TOKEN)].rstrip() + TRUNCATION_MARKER
+
+
+def get_token_budget(task: str, model: Optional[str] = None) -> int:
+    """
+    Return the prompt token budget for a task/model.
+
+    Priority:
+    1. Task-specific budget from ENV (e.g., LLM_TOKEN_BUDGET_DEDUPLICATION)
+    2. Default budget from ENV (LLM_TOKEN_BUDGET)
+    3. Built-in budget for known hosted models (prefix match on model name)
+    4. DEFAULT_TOKEN_BUDGET
+
+    Args:
+        task: Task name (e.g., 'deduplication', 'tagging', 'rule_extraction').
+        model: Model name.
+
+    Returns:
+        Budget in tokens (at least 1).
+    """
+    for key in (f"LLM_TOKEN_BUDGET_{task.upper()}", "LLM_TOKEN_BUDGET"):
+        raw = os.getenv(key)
+        if not raw:
+            continue
+        try:
+            return max(1, int(raw))
+        except ValueError:
+            logger.warning("Invalid %s=%r, ignoring", key, raw)
+
+    name = (model or "").lower()
+    for prefix, budget in _MODEL_TOKEN_BUDGETS.items():
+        if name.startswith(prefix):
+            return budget
+    return DEFAULT_TOKEN_BUDGET
+
+
+def pack_fields(
+    fields: List[PromptField], budget: int, model: Optional[str] = None
+) -> Dict[str, str]:
+    """
+    Fit field texts into a token budget.
+
+    If everything fits, texts are returned unchanged. Otherwise each field
+    first gets up to its min_tokens, then the remaining budget is handed out
+    by descending priority; fields of equal priority share it evenly.
+
+    Args:
+        fields: Fields to pack.
+        budget: Total tokens available to the fields.
+        model: Model name for tokenizer selection.
+
+    Returns:
+        Mapping of field name to (possibly truncated) text.
+    """
+    costs = {f.name: estimate_tokens(f.text, model) for f in fields}
+    if sum(costs.values()) <= budget:
+        return {f.name: f.text for f in fields}
+
+    alloc = {f.name: min(f.min_tokens, costs[f.name]) for f in fields}
+    remaining = max(0, budget - sum(alloc.values()))
+
+    for priority in sorted({f.priority for f in fields}, reverse=True):
+        pending = [f.name for f in fields if f.priority == priority]
+        while remaining > 0:
+            pending = [name for name in pending if alloc[name] < costs[name]]
+            if not pending:
+                break
+            share = max(1, remaining // len(pending))
+            for name in pending:
+                extra = min(costs[name] - alloc[name], share, remaining)
+                alloc[name] += extra
+                remaining -= extra
+                if not remaining:
+                    break
+
+    return {
+        f.name: (
+            f.text
+            if alloc[f.name] >= costs[f.name]
+            else truncate_to_tokens(f.text, alloc[f.name], model)
+        )
+        for f in fields
+    }
+
+
+def build_prompt(
+    render: Callable[[Dict[str, str]], str],
+    fields: List[PromptField],
+    *,
+    task: str,
+    model: Optional[str] = None,
+    budget: Optional[int] = None,
+    system: str = "",
+) -> str:
+    """
+    Render a prompt whose variable fields are packed into the token budget.
+
+    The system prompt sent alongside it and the fixed part of the prompt
+    (render output with all fields empty) are charged against the budget
+    first; fields share what is left.
+
+    Args:
+        render: Function mapping field name -> text to the final prompt.
+        fields: Variable prompt fields.
+        task: Task name for budget lookup.
+        model: Model name for budget lookup and tokenizer selection.
+        budget: Explicit budget (overrides get_token_budget).
+        system: System prompt that will accompany the rendered prompt.
+
+    Returns:
+        Prompt string.
+    """
+    total = budget if budget is not None else get_token_budget(task, model)
+    fixed = estimate_tokens(system, model) + estimate_tokens(
+        render({f.name: "" for f in fields}), model
+    )
+    packed = pack_fields(fields, max(0, total - fixed), model)
+    return render(packed)
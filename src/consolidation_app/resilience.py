@@ -0,0 +1,160 @@
+# resilience.py
+# Circuit breaker, backoff and run deadline for LLM provider calls (Phase 4).
+# v1.0
+
+"""
+Failure handling shared by the LLM provider calls.
+
+- CircuitBreaker: after N consecutive failures a provider is skipped for a
+  cool-down period, then a single probe call decides whether it recovered.
+- backoff_delay: jittered exponential backoff between retry attempts.
+- RunDeadline: wall-clock budget for all LLM calls of one run; once spent,
+  calls fail immediately so callers use their non-LLM fallbacks.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Consecutive failures that open a circuit
+DEFAULT_FAILURE_THRESHOLD = 5
+
+# Seconds an open circuit waits before allowing a probe call
+DEFAULT_RESET_TIMEOUT = 30.0
+
+# Upper bound for a single backoff delay (seconds)
+DEFAULT_MAX_BACKOFF = 30.0
+
+
+class LLMUnavailableError(ConnectionError):
+    """No LLM provider can be called (circuits open or run deadline spent)."""
+
+
+def backoff_delay(
+    attempt: int, base: float = 1.0, cap: float = DEFAULT_MAX_BACKOFF
+) -> float:
+    """
+    Delay before retry number attempt + 1 (exponential, with jitter).
+
+    Half of the exponential delay is fixed and half is random ("equal
+    jitter"), so concurrent callers do not retry in lockstep.
+
+    Args:
+        attempt: Zero-based index of the attempt that just failed.
+        base: Delay for the first retry before jitter (seconds).
+        cap: Maximum delay (seconds).
+
+    Returns:
+        Delay in seconds.
+    """
+    delay = min(cap, base * (2**attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class CircuitBreaker:
+    """
+    Per-provider circuit breaker (closed -> open -> half-open -> closed).
+
+    Thread-safe: calls from concurrent workers share one breaker per provider.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        """Return True if a call may go to the provider now."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+                logger.info("Circuit %s half-open: allowing a probe call", self.name)
+            # Half-open: one probe at a time
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info("Circuit %s closed: provider recovered", self.name)
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def release(self) -> None:
+        """End a call that says nothing about provider health (e.g. bad config)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if (
+                self._state == self.HALF_OPEN
+                or self._failures >= self.failure_threshold
+            ):
+                if self._state != self.OPEN:
+                    logger.warning(
+                        "Circuit %s open after %d consecutive failure(s); skipping for %.0fs",
+                        self.name,
+                        self._failures,
+                        self.reset_timeout,
+                    )
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class RunDeadline:
+    """Wall-clock budget shared by all LLM calls of one run."""
+
+    def __init__(self, seconds: Optional[float] = None) -> None:
+        self._expires_at: Optional[float] = None
+        self.start(seconds)
+
+    def start(self, seconds: Optional[float]) -> None:
+        """(Re)start the budget; None or <= 0 disables it."""
+        self._expires_at = (
+            time.monotonic() + seconds if seconds and seconds > 0 else None
+        )
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left (never negative), or None when no deadline is set."""
+        if self._expires_at is None:
+            return None
+        return max(0.0, self._expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
@@ -8,21 +8,51 @@ Extract general process rules from Agent Process Issue entries using LLM.
 Filters entries with is_process_issue=True only, groups by issue type,
 and uses LLM to extract actionable rules (title, rule, why, examples, related errors).
 Falls back to basic rule extraction (one rule per entry) on LLM failure.
+Groups are extracted concurrently; LLM results are memoized per group
+content in a RuleCache (by default the process-wide one, persisted at
+RULE_CACHE_PATH) so unchanged groups skip the model call, also across runs.
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
+import os
+import threading
 from collections import defaultdict
-from dataclasses import dataclass
-from typing import List
-
-from src.consolidation_app.llm_client import call_llm
-from src.consolidation_app.parser import ErrorEntry
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple, TypeVar
+
+from src.consolidation_app.llm_client import (
+    call_llm,
+    get_model_for_task,
+    get_provider_for_task,
+)
+from src.consolidation_app.parser import ErrorEntry, entry_fingerprint
+from src.consolidation_app.prompt_budget import (
+    PromptField,
+    build_prompt,
+    estimate_tokens,
+    get_token_budget,
+)
+from src.consolidation_app.structured_output import parse_json_object
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Default bounded worker pool size for concurrent group extraction
+DEFAULT_MAX_WORKERS = 4
+
+# Default cap on rule groups kept in the rule cache (least recently used go first)
+DEFAULT_RULE_CACHE_ENTRIES = 1024
+
+# Upper bound on reduce levels so a model that never shrinks its input can't loop
+MAX_REDUCE_LEVELS = 4
+
 
 @dataclass
 class ProcessRule:
@@ -36,6 +66,159 @@ class ProcessRule:
     related_errors: List[str]
 
 
+class RuleCache:
+    """
+    Thread-safe memo of LLM-extracted rules, keyed by group content.
+
+    Keys come from group_cache_key(), so a group maps to the same key for as
+    long as its entries (and the provider and model) are unchanged. When a
+    path is given, the cache is loaded from that JSON file and written back
+    by save(), which lets unchanged groups skip the LLM across runs. At most
+    max_entries groups are kept; the least recently used are dropped first,
+    so groups that no longer occur age out of the file.
+    """
+
+    def __init__(
+        self, path: Optional[Path] = None, max_entries: int = DEFAULT_RULE_CACHE_ENTRIES
+    ) -> None:
+        self.path = path
+        self.max_entries = max(1, max_entries)
+        # Insertion order is recency order: oldest first
+        self._rules: dict[str, List[ProcessRule]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if path is not None:
+            self._load(path)
+
+    @classmethod
+    def from_env(cls) -> "RuleCache":
+        """Build a cache persisted at RULE_CACHE_PATH (in-memory if unset),
+        capped at RULE_CACHE_MAX_ENTRIES groups (default 1024)."""
+        path = os.getenv("RULE_CACHE_PATH")
+        raw = os.getenv("RULE_CACHE_MAX_ENTRIES")
+        try:
+            max_entries = int(raw) if raw else DEFAULT_RULE_CACHE_ENTRIES
+        except ValueError:
+            logger.warning(
+                "Invalid RULE_CACHE_MAX_ENTRIES=%r, using %d",
+                raw,
+                DEFAULT_RULE_CACHE_ENTRIES,
+            )
+            max_entries = DEFAULT_RULE_CACHE_ENTRIES
+        return cls(Path(path).expanduser() if path else None, max_entries)
+
+    def get(self, key: str) -> Optional[List[ProcessRule]]:
+        with self._lock:
+            rules = self._rules.get(key)
+            if rules is None:
+                return None
+            if next(reversed(self._rules)) != key:
+                # Move to the most recently used end
+                del self._rules[key]
+                self._rules[key] = rules
+                self._dirty = True
+            return list(rules)
+
+    def put(self, key: str, rules: List[ProcessRule]) -> None:
+        with self._lock:
+            self._rules.pop(key, None)
+            self._rules[key] = list(rules)
+            while len(self._rules) > self.max_entries:
+                del self._rules[next(iter(self._rules))]
+            self._dirty = True
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._rules)
+
+    def save(self) -> None:
+        """Write the cache to its JSON file (no-op if in-memory or unchanged)."""
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            data = {
+                key: [asdict(rule) for rule in rules]
+                for key, rules in self._rules.items()
+            }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.path.with_suffix(".tmp")
+        temp_file.write_text(json.dumps(data), encoding="utf-8")
+        temp_file.replace(self.path)
+        logger.debug("Saved %d cached rule group(s) to %s", len(data), self.path)
+
+    def _load(self, path: Path) -> None:
+        if not path.is_file():
+            return
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            # The file is in recency order; keep the most recent max_entries
+            items = list(data.items())[-self.max_entries :]
+            self._rules = {
+                key: [ProcessRule(**rule) for rule in rules] for key, rules in items
+            }
+            logger.debug(
+                "Loaded %d cached rule group(s) from %s", len(self._rules), path
+            )
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning("Ignoring unreadable rule cache %s: %s", path, e)
+            self._rules = {}
+
+
+_rule_cache: Optional[RuleCache] = None
+_rule_cache_lock = threading.Lock()
+
+
+def get_rule_cache() -> RuleCache:
+    """Return the process-wide rule cache (RULE_CACHE_PATH, kept across runs)."""
+    global _rule_cache
+    with _rule_cache_lock:
+        if _rule_cache is None:
+            _rule_cache = RuleCache.from_env()
+        return _rule_cache
+
+
+def reset_rule_cache() -> RuleCache:
+    """Reload the process-wide rule cache from RULE_CACHE_PATH and return it."""
+    global _rule_cache
+    with _rule_cache_lock:
+        _rule_cache = RuleCache.from_env()
+        return _rule_cache
+
+
+def group_cache_key(
+    group: List[ErrorEntry], provider: Optional[str] = None, model: Optional[str] = None
+) -> str:
+    """
+    Return a cache key for a group: hash of the provider, the model and the
+    group's sorted entry fingerprints, so switching either re-extracts.
+
+    provider and model default to those configured for rule_extraction.
+    """
+    if provider is None:
+        provider = get_provider_for_task("rule_extraction")
+    if model is None:
+        model = get_model_for_task("rule_extraction")
+    digest = hashlib.sha256(f"{provider}\0{model}\0".encode("utf-8"))
+    for fingerprint in sorted(entry_fingerprint(entry) for entry in group):
+        digest.update(fingerprint.encode("ascii"))
+    return digest.hexdigest()
+
+
+def _get_max_workers() -> int:
+    """Worker pool size from RULE_EXTRACTION_MAX_WORKERS (default 4, min 1)."""
+    raw = os.getenv("RULE_EXTRACTION_MAX_WORKERS")
+    try:
+        return max(1, int(raw)) if raw else DEFAULT_MAX_WORKERS
+    except ValueError:
+        logger.warning(
+            "Invalid RULE_EXTRACTION_MAX_WORKERS=%r, using %d", raw, DEFAULT_MAX_WORKERS
+        )
+        return DEFAULT_MAX_WORKERS
+
+
 def _group_by_issue_type(entries: List[ErrorEntry]) -> dict[str, List[ErrorEntry]]:
     """Group process-issue entries by error_type (issue type)."""
     grouped: dict[str, List[ErrorEntry]] = defaultdict(list)
@@ -45,58 +228,161 @@ def _group_by_issue_type(entries: List[ErrorEntry]) -> dict[str, List[ErrorEntry
     return grouped
 
 
-def _build_rule_extraction_prompt(group: List[ErrorEntry]) -> str:
+# Shared response-format instructions for extraction and merge prompts
+_RULES_RESPONSE_FORMAT = [
+    'Respond with a JSON object containing a single key "rules" whose value is an array of rule objects.',
+    "Each rule object must have:",
+    '  - "title": short rule title (string)',
+    '  - "rule": the rule statement (string)',
+    '  - "why": why this rule is needed (string)',
+    '  - "examples_good": array of 1–3 good example strings',
+    '  - "examples_bad": array of 1–3 bad example strings',
+    '  - "related_errors": array of related error signatures or types (strings)',
+    "",
+    "Example format:",
+    '{"rules": [{"title": "Use pathlib for paths", "rule": "Always use pathlib.Path for file paths.", '
+    '"why": "Avoids string concat and OS differences.", '
+    "\"examples_good\": [\"Path('config') / 'app.yaml'\"], "
+    "\"examples_bad\": [\"'config' + '/' + 'app.yaml'\"], "
+    '"related_errors": ["FileNotFoundError", "path-concatenation"]}]}',
+    "",
+    "Only respond with the JSON object, no additional text.",
+]
+
+# Response schema passed to the provider's native JSON mode
+_RULES_SCHEMA = {
+    "title": "rules",
+    "type": "object",
+    "properties": {
+        "rules": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "title": {"type": "string"},
+                    "rule": {"type": "string"},
+                    "why": {"type": "string"},
+                    "examples_good": {"type": "array", "items": {"type": "string"}},
+                    "examples_bad": {"type": "array", "items": {"type": "string"}},
+                    "related_errors": {"type": "array", "items": {"type": "string"}},
+                },
+                "required": ["title", "rule"],
+            },
+        }
+    },
+    "required": ["rules"],
+}
+
+# System prompts: stable across calls so providers can serve them from
+# their prompt cache; only the issue/rule listing varies per call
+_RULE_EXTRACTION_SYSTEM = "\n".join(
+    [
+        "You are given a set of Agent Process Issues (workflow/process problems encountered during coding).",
+        "Extract 1–3 general, actionable rules that would prevent or address these issues.",
+        "Each rule should have: a short title, a clear rule statement, why it matters, "
+        "good/bad examples, and related error signatures.",
+        "",
+    ]
+    + _RULES_RESPONSE_FORMAT
+)
+
+_RULE_MERGE_SYSTEM = "\n".join(
+    [
+        "You are given process rules that were extracted separately from chunks of one group "
+        "of Agent Process Issues. Many of them overlap.",
+        "Merge them into 1–5 general, actionable rules: combine duplicates and near-duplicates, "
+        "keep the clearest wording, and union their examples and related errors.",
+        "",
+    ]
+    + _RULES_RESPONSE_FORMAT
+)
+
+_RULE_EXTRACTION_INTRO = ["Process issues in this group:", ""]
+
+
+def _issue_budget(model: Optional[str]) -> int:
+    """Most tokens one issue may take: a whole prompt minus the fixed text."""
+    overhead = estimate_tokens(_RULE_EXTRACTION_SYSTEM, model) + estimate_tokens(
+        "\n".join(_RULE_EXTRACTION_INTRO), model
+    )
+    return max(1, get_token_budget("rule_extraction", model) - overhead)
+
+
+def _format_issue(index: int, entry: ErrorEntry, model: Optional[str] = None) -> str:
+    """
+    Return the prompt text describing one process issue.
+
+    Fields are kept whole unless the issue alone would overflow a prompt;
+    then description and rule are truncated before the summary.
+    """
+
+    def render(f: dict[str, str]) -> str:
+        lines = [
+            f"--- Issue {index} ---",
+            f"Summary: {f['summary']}",
+            f"Issue Type: {entry.error_type or 'N/A'}",
+            f"Description: {f['description']}",
+            f"Rule Established: {f['rule']}",
+        ]
+        if entry.result:
+            lines.append(f"Result: {f['result']}")
+        return "\n".join(lines)
+
+    fields = [
+        PromptField(
+            "summary",
+            entry.error_signature or entry.error_type or "N/A",
+            priority=2,
+            min_tokens=16,
+        ),
+        PromptField("description", entry.explanation or "", priority=1, min_tokens=48),
+        PromptField("rule", entry.fix_code or "", priority=1, min_tokens=48),
+        PromptField("result", entry.result or "", priority=0),
+    ]
+    return build_prompt(
+        render, fields, task="rule_extraction", model=model, budget=_issue_budget(model)
+    )
+
+
+def _build_rule_extraction_prompt(
+    group: List[ErrorEntry], model: Optional[str] = None
+) -> str:
     """
-    Build LLM prompt for extracting general rules from a group of process issues.
+    Build the issue listing sent with _RULE_EXTRACTION_SYSTEM for one group.
 
     Args:
         group: List of process-issue ErrorEntry objects (same issue type).
+        model: Model name used for token estimates (defaults to the
+               configured rule_extraction model).
 
     Returns:
         Formatted prompt string for LLM.
     """
-    parts = [
-        "You are given a set of Agent Process Issues (workflow/process problems encountered during coding).",
-        "Extract 1–3 general, actionable rules that would prevent or address these issues.",
-        "Each rule should have: a short title, a clear rule statement, why it matters, "
-        "good/bad examples, and related error signatures.",
-        "",
-        "Process issues in this group:",
-        "",
-    ]
+    if model is None:
+        model = get_model_for_task("rule_extraction")
+    parts = list(_RULE_EXTRACTION_INTRO)
     for i, entry in enumerate(group, 1):
-        desc = (entry.explanation or "")[:600]
-        rule_est = (entry.fix_code or "")[:400]
-        sig = (entry.error_signature or entry.error_type or "N/A")[:200]
-        parts.append(f"--- Issue {i} ---")
-        parts.append(f"Summary: {sig}")
-        parts.append(f"Issue Type: {entry.error_type or 'N/A'}")
-        parts.append(f"Description: {desc}")
-        parts.append(f"Rule Established: {rule_est}")
-        if entry.result:
-            parts.append(f"Result: {entry.result}")
+        parts.append(_format_issue(i, entry, model))
         parts.append("")
+    return "\n".join(parts).rstrip("\n")
 
-    parts.extend([
-        "Respond with a JSON object containing a single key \"rules\" whose value is an array of rule objects.",
-        "Each rule object must have:",
-        "  - \"title\": short rule title (string)",
-        "  - \"rule\": the rule statement (string)",
-        "  - \"why\": why this rule is needed (string)",
-        "  - \"examples_good\": array of 1–3 good example strings",
-        "  - \"examples_bad\": array of 1–3 bad example strings",
-        "  - \"related_errors\": array of related error signatures or types (strings)",
-        "",
-        "Example format:",
-        "{\"rules\": [{\"title\": \"Use pathlib for paths\", \"rule\": \"Always use pathlib.Path for file paths.\", "
-        "\"why\": \"Avoids string concat and OS differences.\", "
-        "\"examples_good\": [\"Path('config') / 'app.yaml'\"], "
-        "\"examples_bad\": [\"'config' + '/' + 'app.yaml'\"], "
-        "\"related_errors\": [\"FileNotFoundError\", \"path-concatenation\"]}]}",
-        "",
-        "Only respond with the JSON object, no additional text.",
-    ])
-    return "\n".join(parts)
+
+def _build_rule_merge_prompt(rules: List[ProcessRule]) -> str:
+    """
+    Build the rule listing sent with _RULE_MERGE_SYSTEM (reduce step).
+
+    Args:
+        rules: Rules extracted from separate chunks of one issue group.
+
+    Returns:
+        Formatted prompt string for LLM.
+    """
+    parts = ["Rules to merge:", ""]
+    for i, rule in enumerate(rules, 1):
+        parts.append(f"--- Rule {i} ---")
+        parts.append(_render_rule(rule))
+        parts.append("")
+    return "\n".join(parts).rstrip("\n")
 
 
 def _basic_rule_extraction(group: List[ErrorEntry]) -> List[ProcessRule]:
@@ -135,18 +421,9 @@ def _parse_llm_rules_response(response: str) -> List[ProcessRule]:
     """
     Parse LLM JSON response into List[ProcessRule].
 
-    Handles markdown code fences. Expects {"rules": [ {...}, ... ]}.
+    Expects {"rules": [ {...}, ... ]}; see structured_output.parse_json_object.
     """
-    text = response.strip()
-    if text.startswith("```"):
-        lines = text.split("\n")
-        text = "\n".join(lines[1:-1]) if len(lines) > 2 else text
-    text = text.strip()
-
-    try:
-        data = json.loads(text)
-    except json.JSONDecodeError as e:
-        raise ValueError(f"Could not parse JSON from LLM response: {text[:300]}") from e
+    data = parse_json_object(response, _RULES_SCHEMA)
 
     raw_rules = data.get("rules", [])
     if not isinstance(raw_rules, list):
@@ -183,21 +460,242 @@ def _parse_llm_rules_response(response: str) -> List[ProcessRule]:
     return result
 
 
+def _chunk_by_budget(
+    items: List[T],
+    render: Callable[[T], str],
+    overhead: int,
+    budget: int,
+    model: Optional[str] = None,
+) -> List[List[T]]:
+    """
+    Split items into consecutive chunks whose rendered size fits the budget.
+
+    Each chunk holds at least one item, so an item larger than the budget on
+    its own still gets a (single-item) chunk.
+    """
+    chunks: List[List[T]] = []
+    current: List[T] = []
+    used = overhead
+    for item in items:
+        cost = estimate_tokens(render(item), model)
+        if current and used + cost > budget:
+            chunks.append(current)
+            current, used = [], overhead
+        current.append(item)
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _render_rule(rule: ProcessRule) -> str:
+    """Serialize a rule the way the merge prompt embeds it."""
+    return json.dumps(asdict(rule), ensure_ascii=False)
+
+
+def _rule_key(rule: ProcessRule) -> str:
+    """Normalized title used to spot duplicate rules."""
+    return " ".join(rule.title.casefold().split())
+
+
+def _dedupe_rules(rules: List[ProcessRule]) -> List[ProcessRule]:
+    """
+    Merge rules with the same normalized title without an LLM.
+
+    Keeps the first rule's wording and unions examples and related errors.
+    Used as the reduce step when the merge call fails.
+    """
+    merged: dict[str, ProcessRule] = {}
+    for rule in rules:
+        key = _rule_key(rule)
+        seen = merged.get(key)
+        if seen is None:
+            merged[key] = ProcessRule(
+                title=rule.title,
+                rule=rule.rule,
+                why=rule.why,
+                examples_good=list(rule.examples_good),
+                examples_bad=list(rule.examples_bad),
+                related_errors=list(rule.related_errors),
+            )
+            continue
+        for target, extra, limit in (
+            (seen.examples_good, rule.examples_good, 5),
+            (seen.examples_bad, rule.examples_bad, 5),
+            (seen.related_errors, rule.related_errors, 10),
+        ):
+            for value in extra:
+                if value not in target and len(target) < limit:
+                    target.append(value)
+    return list(merged.values())
+
+
+def _map_extract_chunk(
+    chunk: List[ErrorEntry], fallback_to_basic: bool, model: Optional[str] = None
+) -> Tuple[List[ProcessRule], bool]:
+    """
+    Map step: extract rules from one chunk of a group.
+
+    Returns (rules, from_llm); from_llm is False when the LLM failed or
+    returned nothing and the rules are a basic-extraction fallback.
+    """
+    try:
+        response = call_llm(
+            _build_rule_extraction_prompt(chunk, model),
+            task="rule_extraction",
+            system=_RULE_EXTRACTION_SYSTEM,
+            response_schema=_RULES_SCHEMA,
+        )
+        rules = _parse_llm_rules_response(response)
+        if rules:
+            return rules, True
+        logger.warning("LLM returned no rules for chunk of %d issue(s)", len(chunk))
+    except Exception as e:
+        if not fallback_to_basic:
+            raise
+        logger.warning(
+            "Map extraction failed for chunk of %d issue(s): %s: %s; using basic extraction",
+            len(chunk),
+            type(e).__name__,
+            e,
+        )
+    return (_basic_rule_extraction(chunk) if fallback_to_basic else []), False
+
+
+def _reduce_rules(
+    rules: List[ProcessRule], budget: int, model: Optional[str] = None
+) -> Tuple[List[ProcessRule], bool]:
+    """
+    Reduce step: merge partial rule sets with the LLM, hierarchically.
+
+    Rules are merged in batches that fit the budget; the merged output is
+    merged again until a single batch remains. A failed merge call keeps the
+    locally deduplicated batch instead.
+
+    Returns (rules, from_llm); from_llm is False if any merge call failed.
+    """
+    from_llm = True
+    overhead = estimate_tokens(_RULE_MERGE_SYSTEM, model) + estimate_tokens(
+        _build_rule_merge_prompt([]), model
+    )
+    current = _dedupe_rules(rules)
+    for level in range(MAX_REDUCE_LEVELS):
+        if len(current) <= 1:
+            return current, from_llm
+        batches = _chunk_by_budget(current, _render_rule, overhead, budget, model)
+        reduced: List[ProcessRule] = []
+        for batch in batches:
+            if len(batch) == 1:
+                reduced.extend(batch)
+                continue
+            try:
+                response = call_llm(
+                    _build_rule_merge_prompt(batch),
+                    task="rule_extraction",
+                    system=_RULE_MERGE_SYSTEM,
+                    response_schema=_RULES_SCHEMA,
+                )
+                merged = _parse_llm_rules_response(response)
+            except Exception as e:
+                logger.warning(
+                    "Rule merge call failed: %s: %s; keeping deduplicated rules",
+                    type(e).__name__,
+                    e,
+                )
+                merged = []
+            if not merged:
+                from_llm = False
+            reduced.extend(merged or batch)
+        reduced = _dedupe_rules(reduced)
+        logger.debug(
+            "Reduce level %d: %d rule(s) in %d batch(es) -> %d rule(s)",
+            level + 1,
+            len(current),
+            len(batches),
+            len(reduced),
+        )
+        if len(batches) == 1 or len(reduced) >= len(current):
+            return reduced, from_llm
+        current = reduced
+    return current, from_llm
+
+
+def _extract_rules_map_reduce(
+    group: List[ErrorEntry],
+    budget: int,
+    fallback_to_basic: bool,
+    model: Optional[str] = None,
+    map_workers: Optional[int] = None,
+) -> Tuple[List[ProcessRule], bool]:
+    """
+    Extract rules from a group too large for one prompt.
+
+    Map: split the group into chunks whose prompt fits the budget and extract
+    rules from each chunk, on up to map_workers threads (default:
+    RULE_EXTRACTION_MAX_WORKERS; 1 runs them serially). Reduce: merge and
+    deduplicate the partial rule sets (see _reduce_rules).
+
+    Returns (rules, from_llm); from_llm is False if any chunk or merge fell
+    back to basic extraction or local deduplication.
+    """
+    overhead = estimate_tokens(_RULE_EXTRACTION_SYSTEM, model) + estimate_tokens(
+        _build_rule_extraction_prompt([], model), model
+    )
+    chunks = _chunk_by_budget(
+        group,
+        lambda entry: _format_issue(0, entry, model) + "\n",
+        overhead,
+        budget,
+        model,
+    )
+    logger.info(
+        "Group of %d issue(s) exceeds %d-token budget; map-reduce over %d chunk(s)",
+        len(group),
+        budget,
+        len(chunks),
+    )
+
+    def _map(chunk: List[ErrorEntry]) -> Tuple[List[ProcessRule], bool]:
+        return _map_extract_chunk(chunk, fallback_to_basic, model)
+
+    workers = min(map_workers or _get_max_workers(), len(chunks))
+    if workers <= 1:
+        partials = [_map(chunk) for chunk in chunks]
+    else:
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="rule-map"
+        ) as pool:
+            partials = list(pool.map(_map, chunks))
+    rules, merged_by_llm = _reduce_rules(
+        [rule for rules, _ in partials for rule in rules], budget, model
+    )
+    return rules, merged_by_llm and all(from_llm for _, from_llm in partials)
+
+
 def extract_rules_from_group(
     group: List[ErrorEntry],
     use_llm: bool = True,
     fallback_to_basic: bool = True,
+    cache: Optional[RuleCache] = None,
+    map_workers: Optional[int] = None,
 ) -> List[ProcessRule]:
     """
     Extract ProcessRules from a group of process-issue entries.
 
     Uses LLM when use_llm=True; on failure and fallback_to_basic=True,
-    uses basic rule extraction (one rule per entry).
+    uses basic rule extraction (one rule per entry). Groups whose prompt would
+    exceed the rule_extraction token budget (see prompt_budget) are extracted map-reduce style
+    (chunked extraction, then a merge/deduplicate pass).
 
     Args:
         group: List of process-issue ErrorEntry objects.
         use_llm: Whether to call LLM for rule extraction.
         fallback_to_basic: If True, use basic extraction on LLM failure.
+        cache: Optional RuleCache. A hit skips the LLM call; successful LLM
+               extractions are stored (basic fallbacks, including partial
+               ones from map-reduce, are not, so the LLM is retried next time).
+        map_workers: Threads for the map step of oversized groups (default:
+               RULE_EXTRACTION_MAX_WORKERS); pass 1 when already on a pool.
 
     Returns:
         List of ProcessRule objects.
@@ -206,12 +704,42 @@ def extract_rules_from_group(
         return []
 
     if use_llm:
+        key = group_cache_key(group) if cache is not None else ""
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                logger.debug("Rule cache hit for group of %d issue(s)", len(group))
+                return cached
         try:
-            prompt = _build_rule_extraction_prompt(group)
-            response = call_llm(prompt, task="rule_extraction")
-            rules = _parse_llm_rules_response(response)
+            model = get_model_for_task("rule_extraction")
+            prompt = _build_rule_extraction_prompt(group, model)
+            budget = get_token_budget("rule_extraction", model)
+            prompt_tokens = estimate_tokens(
+                _RULE_EXTRACTION_SYSTEM, model
+            ) + estimate_tokens(prompt, model)
+            from_llm = True
+            if len(group) > 1 and prompt_tokens > budget:
+                rules, from_llm = _extract_rules_map_reduce(
+                    group, budget, fallback_to_basic, model, map_workers
+                )
+            else:
+                response = call_llm(
+                    prompt,
+                    task="rule_extraction",
+                    system=_RULE_EXTRACTION_SYSTEM,
+                    response_schema=_RULES_SCHEMA,
+                )
+                rules = _parse_llm_rules_response(response)
             if rules:
                 logger.debug("Extracted %d rule(s) from group of %d issue(s) via LLM", len(rules), len(group))
+                if cache is not None and from_llm:
+                    cache.put(key, rules)
+                elif cache is not None:
+                    # Some chunk or merge fell back; retry the LLM next run
+                    logger.debug(
+                        "Not caching partial fallback rules for group of %d issue(s)",
+                        len(group),
+                    )
                 return rules
             logger.warning("LLM returned no valid rules, falling back to basic extraction")
         except Exception as e:
@@ -235,17 +763,24 @@ def extract_process_rules(
     entries: List[ErrorEntry],
     use_llm: bool = True,
     fallback_to_basic: bool = True,
+    cache: Optional[RuleCache] = None,
+    max_workers: Optional[int] = None,
 ) -> List[ProcessRule]:
     """
     Extract process rules from entries, using only those with is_process_issue=True.
 
     Groups by issue type (error_type), then extracts rules per group via LLM
-    (or basic extraction on failure).
+    (or basic extraction on failure). With use_llm=True, groups are extracted
+    concurrently on a bounded thread pool so one slow group does not serialize
+    the rest; results keep the sorted group order.
 
     Args:
         entries: All parsed ErrorEntry objects.
         use_llm: Whether to use LLM for rule extraction.
         fallback_to_basic: If True, fall back to basic extraction on LLM failure.
+        cache: RuleCache; groups with unchanged content reuse cached rules
+               (default: get_rule_cache()). New rules are saved to its file.
+        max_workers: Worker pool size (default: RULE_EXTRACTION_MAX_WORKERS or 4).
 
     Returns:
         List of ProcessRule objects from all groups.
@@ -256,14 +791,37 @@ def extract_process_rules(
         return []
 
     grouped = _group_by_issue_type(process_only)
-    all_rules: List[ProcessRule] = []
-    for issue_type, group in sorted(grouped.items(), key=lambda x: x[0]):
-        rules = extract_rules_from_group(
+    groups = [group for _, group in sorted(grouped.items(), key=lambda x: x[0])]
+    if use_llm and cache is None:
+        cache = get_rule_cache()
+
+    workers = min(max_workers or _get_max_workers(), len(groups))
+    concurrent = use_llm and workers > 1
+
+    def _extract(group: List[ErrorEntry]) -> List[ProcessRule]:
+        # On the group pool, map steps run serially so LLM calls stay bounded by workers
+        return extract_rules_from_group(
             group,
             use_llm=use_llm,
             fallback_to_basic=fallback_to_basic,
+            cache=cache,
+            map_workers=1 if concurrent else None,
         )
-        all_rules.extend(rules)
+
+    if not concurrent:
+        results = [_extract(group) for group in groups]
+    else:
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="rule-extract"
+        ) as pool:
+            results = list(pool.map(_extract, groups))
+
+    all_rules: List[ProcessRule] = [rule for rules in results for rule in rules]
+    if cache is not None:
+        try:
+            cache.save()
+        except OSError as e:
+            logger.warning("Could not save rule cache %s: %s", cache.path, e)
 
     logger.info(
         "Extracted %d process rule(s) from %d process issue(s) in %d group(s)",
@@ -0,0 +1,255 @@
+# scheduler.py
+# Cron schedule parsing and the consolidation daemon loop (Phase 5.3).
+# v1.0
+
+"""
+Run consolidation on a cron schedule (CONSOLIDATION_SCHEDULE) in one
+long-lived process.
+
+CronSchedule parses standard 5-field expressions (minute hour day-of-month
+month day-of-week) with *, lists, ranges, steps and month/day names, plus
+the @hourly/@daily/@weekly/@monthly/@yearly macros. As in cron, when both
+day fields are restricted a time matches if either does. Times are local
+wall-clock times.
+
+run_daemon() sleeps until the next fire time and calls the run function,
+until its stop event is set. The wait is done in short slices against the
+wall clock, so clock adjustments and DST changes are picked up.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, FrozenSet, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Default CONSOLIDATION_SCHEDULE: daily at 02:00
+DEFAULT_SCHEDULE = "0 2 * * *"
+
+_MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+_MONTH_NAMES = {
+    name: number
+    for number, name in enumerate(
+        (
+            "jan",
+            "feb",
+            "mar",
+            "apr",
+            "may",
+            "jun",
+            "jul",
+            "aug",
+            "sep",
+            "oct",
+            "nov",
+            "dec",
+        ),
+        start=1,
+    )
+}
+_DAY_NAMES = {
+    name: number
+    for number, name in enumerate(("sun", "mon", "tue", "wed", "thu", "fri", "sat"))
+}
+
+# (name, minimum, maximum, names) per field; day-of-week 7 is Sunday as well
+_FIELDS: Tuple[Tuple[str, int, int, Dict[str, int]], ...] = (
+    ("minute", 0, 59, {}),
+    ("hour", 0, 23, {}),
+    ("day of month", 1, 31, {}),
+    ("month", 1, 12, _MONTH_NAMES),
+    ("day of week", 0, 7, _DAY_NAMES),
+)
+
+# Longest gap between two fire times is below 5 years (e.g. "0 0 29 2 1")
+_SEARCH_LIMIT = timedelta(days=5 * 366)
+
+# Longest single sleep; the remaining time is recomputed after each slice
+_MAX_SLEEP_SECONDS = 60.0
+
+
+def _parse_value(token: str, field: str, names: Dict[str, int]) -> int:
+    value = names.get(token.lower())
+    if value is not None:
+        return value
+    if not token.isdigit():
+        raise ValueError(f"invalid {field} value {token!r}")
+    return int(token)
+
+
+def _parse_field(
+    text: str, field: str, low: int, high: int, names: Dict[str, int]
+) -> FrozenSet[int]:
+    values = set()
+    for part in text.split(","):
+        base, _, step_text = part.partition("/")
+        step = 1
+        if step_text:
+            if not step_text.isdigit() or int(step_text) == 0:
+                raise ValueError(f"invalid {field} step {step_text!r}")
+            step = int(step_text)
+        if base == "*":
+            start, end = low, high
+        elif "-" in base:
+            first, _, last = base.partition("-")
+            start = _parse_value(first, field, names)
+            end = _parse_value(last, field, names)
+        else:
+            start = _parse_value(base, field, names)
+            # "5/15" means every 15 starting at 5
+            end = high if step_text else start
+        if not (low <= start <= high and low <= end <= high) or start > end:
+            raise ValueError(f"{field} {part!r} out of range {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+@dataclass(frozen=True)
+class CronSchedule:
+    """A parsed 5-field cron expression."""
+
+    expression: str
+    minutes: FrozenSet[int]
+    hours: FrozenSet[int]
+    days: FrozenSet[int]
+    months: FrozenSet[int]
+    weekdays: FrozenSet[int]  # 0 = Sunday
+    days_restricted: bool
+    weekdays_restricted: bool
+
+    @classmethod
+    def parse(cls, expression: str) -> "CronSchedule":
+        """
+        Parse a cron expression.
+
+        Raises:
+            ValueError: If the expression is not a valid 5-field cron string.
+        """
+        text = _MACROS.get(expression.strip().lower(), expression)
+        parts = text.split()
+        if len(parts) != 5:
+            raise ValueError(
+                f"cron expression needs 5 fields (minute hour dom month dow); got {expression!r}"
+            )
+        try:
+            minutes, hours, days, months, weekdays = (
+                _parse_field(part, *spec)
+                for part, spec in zip(parts, _FIELDS, strict=True)
+            )
+        except ValueError as e:
+            raise ValueError(f"invalid cron expression {expression!r}: {e}") from None
+        return cls(
+            expression=expression.strip(),
+            minutes=minutes,
+            hours=hours,
+            days=days,
+            months=months,
+            weekdays=frozenset(day % 7 for day in weekdays),
+            days_restricted=not parts[2].startswith("*"),
+            weekdays_restricted=not parts[4].startswith("*"),
+        )
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.days_restricted and self.weekdays_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def matches(self, moment: datetime) -> bool:
+        """True if the schedule fires in the minute of `moment`."""
+        return (
+            moment.minute in self.minutes
+            and moment.hour in self.hours
+            and moment.month in self.months
+            and self._day_matches(moment)
+        )
+
+    def next_fire(self, after: datetime) -> datetime:
+        """
+        Return the first fire time strictly after `after` (seconds zeroed).
+
+        Raises:
+            ValueError: If the schedule never fires (e.g. "0 0 31 2 *").
+        """
+        moment = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + _SEARCH_LIMIT
+        while moment <= limit:
+            if moment.month not in self.months:
+                year, month = (
+                    (moment.year + 1, 1)
+                    if moment.month == 12
+                    else (moment.year, moment.month + 1)
+                )
+                moment = moment.replace(year=year, month=month, day=1, hour=0, minute=0)
+            elif not self._day_matches(moment):
+                moment = moment.replace(hour=0, minute=0) + timedelta(days=1)
+            elif moment.hour not in self.hours:
+                moment = moment.replace(minute=0) + timedelta(hours=1)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment
+        raise ValueError(f"cron expression {self.expression!r} never fires")
+
+
+def run_daemon(
+    schedule: CronSchedule,
+    run: Callable[[], object],
+    *,
+    stop_event: Optional[threading.Event] = None,
+    now: Callable[[], datetime] = datetime.now,
+    max_runs: Optional[int] = None,
+) -> int:
+    """
+    Call run() at every fire time of schedule until stop_event is set.
+
+    Exceptions from run() are logged and the daemon keeps going, so one bad
+    run does not stop later ones.
+
+    Args:
+        schedule: Parsed cron schedule.
+        run: Function running one consolidation.
+        stop_event: Set to stop the daemon (checked while sleeping).
+        now: Clock returning local time (for tests).
+        max_runs: Stop after this many runs (default: run forever).
+
+    Returns:
+        Number of runs started.
+    """
+    stop = stop_event if stop_event is not None else threading.Event()
+    runs = 0
+    while not stop.is_set() and (max_runs is None or runs < max_runs):
+        fire_at = schedule.next_fire(now())
+        logger.info(
+            "Next consolidation run at %s (%s)",
+            fire_at.isoformat(sep=" "),
+            schedule.expression,
+        )
+        while not stop.is_set():
+            remaining = (fire_at - now()).total_seconds()
+            if remaining <= 0:
+                break
+            stop.wait(min(remaining, _MAX_SLEEP_SECONDS))
+        if stop.is_set():
+            break
+        runs += 1
+        try:
+            run()
+        except Exception as e:
+            logger.error("Scheduled consolidation run failed: %s", e, exc_info=True)
+    logger.info("Scheduler stopped after %d run(s)", runs)
+    return runs
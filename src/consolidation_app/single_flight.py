@@ -0,0 +1,92 @@
+# single_flight.py
+# Coalesce concurrent identical calls into one (Phase 4).
+# v1.0
+
+"""
+Single-flight call coalescing.
+
+When several threads ask for the same key at the same time, only the first
+(the leader) runs the function; the others wait and receive its result or
+exception. Nothing is cached: once the call finishes, the next request for
+the key runs again.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Callable, Dict, Generic, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _InFlight(Generic[T]):
+    """State of one running call shared by its leader and waiters."""
+
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Optional[T] = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight(Generic[T]):
+    """Thread-safe group of in-flight calls, keyed by string."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _InFlight[T]] = {}
+
+    def do(self, key: str, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """
+        Run fn once for all concurrent callers with the same key.
+
+        Args:
+            key: Identity of the call.
+            fn: Function producing the result.
+
+        Returns:
+            (result, shared): shared is True when this caller received the
+            result of another caller's in-flight call.
+
+        Raises:
+            Whatever fn raised (in the leader and in every waiter).
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _InFlight()
+                self._calls[key] = call
+            else:
+                call.waiters += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True  # type: ignore[return-value]
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            if call.waiters:
+                logger.debug(
+                    "Single-flight call shared with %d waiter(s)", call.waiters
+                )
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        """Number of distinct calls currently running."""
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,155 @@
+# structured_output.py
+# Shared JSON parsing for structured LLM responses (Phase 4).
+# v1.0
+
+"""
+Parse the JSON object an LLM was asked to return.
+
+With a response schema, providers return bare JSON (Ollama ``format``,
+OpenAI ``response_format``, Anthropic tool use), so the common case is a
+single json.loads. Models without native JSON mode may still wrap the
+object in a code fence or surrounding prose; those are handled by
+stripping the fence, then scanning for the first decodable object.
+
+Given the response schema, the parsed object is also validated against it
+(required keys and JSON types, recursively), so callers get the shape they
+asked for or a ValueError, never a half-filled dict.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_decoder = json.JSONDecoder()
+
+# JSON schema "type" -> accepted Python types (bool is not a number here)
+_JSON_TYPES: Dict[str, tuple] = {
+    "object": (dict,),
+    "array": (list,),
+    "string": (str,),
+    "number": (int, float),
+    "integer": (int,),
+    "boolean": (bool,),
+    "null": (type(None),),
+}
+
+
+def _type_matches(value: Any, expected: str) -> bool:
+    if expected in ("number", "integer") and isinstance(value, bool):
+        return False
+    return isinstance(value, _JSON_TYPES.get(expected, (object,)))
+
+
+def validate_json(value: Any, schema: Dict[str, Any], path: str = "$") -> None:
+    """
+    Check value against the subset of JSON schema used for LLM responses.
+
+    Supports "type" (a name or list of names), "required", "properties" and
+    "items"; other keywords (e.g. minimum) are left to the caller.
+
+    Raises:
+        ValueError: Naming the first path that does not match.
+    """
+    expected = schema.get("type")
+    if expected is not None:
+        names = [expected] if isinstance(expected, str) else list(expected)
+        if not any(_type_matches(value, name) for name in names):
+            raise ValueError(
+                f"LLM response does not match schema: {path} is "
+                f"{type(value).__name__}, expected {'/'.join(names)}"
+            )
+    if isinstance(value, dict):
+        for key in schema.get("required", ()):
+            if key not in value:
+                raise ValueError(
+                    f"LLM response does not match schema: {path}.{key} is missing"
+                )
+        for key, subschema in schema.get("properties", {}).items():
+            if key in value:
+                validate_json(value[key], subschema, f"{path}.{key}")
+    elif isinstance(value, list) and "items" in schema:
+        for index, item in enumerate(value):
+            validate_json(item, schema["items"], f"{path}[{index}]")
+
+
+def _strip_code_fence(text: str) -> str:
+    """Remove a surrounding ```/```json fence, if present."""
+    if not text.startswith("```"):
+        return text
+    lines = text.split("\n")
+    if len(lines) > 2:
+        body = lines[1:-1] if lines[-1].strip().startswith("```") else lines[1:]
+        return "\n".join(body).strip()
+    return text
+
+
+def _scan_for_object(text: str) -> Dict[str, Any] | None:
+    """Return the first JSON object that decodes at any '{' in text."""
+    start = text.find("{")
+    while start != -1:
+        try:
+            value, _ = _decoder.raw_decode(text, start)
+        except json.JSONDecodeError:
+            pass
+        else:
+            if isinstance(value, dict):
+                return value
+        start = text.find("{", start + 1)
+    return None
+
+
+def parse_json_object(
+    text: str, schema: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Parse a JSON object from an LLM response.
+
+    Tries, in order: the whole response, the response without a code fence,
+    and the first decodable object embedded in surrounding text.
+
+    Args:
+        text: Raw LLM response.
+        schema: Optional response schema the object must match (see
+                validate_json).
+
+    Returns:
+        Parsed JSON object.
+
+    Raises:
+        ValueError: If no JSON object can be parsed, or it does not match
+            schema.
+    """
+    value = _parse_object(text)
+    if schema is not None:
+        validate_json(value, schema)
+    return value
+
+
+def _parse_object(text: str) -> Dict[str, Any]:
+    text = text.strip()
+    try:
+        value = json.loads(text)
+    except json.JSONDecodeError:
+        value = None
+    if isinstance(value, dict):
+        return value
+
+    unfenced = _strip_code_fence(text)
+    if unfenced != text:
+        try:
+            value = json.loads(unfenced)
+        except json.JSONDecodeError:
+            value = None
+        if isinstance(value, dict):
+            return value
+
+    value = _scan_for_object(unfenced)
+    if value is not None:
+        logger.debug("Recovered JSON object embedded in LLM response text")
+        return value
+
+    raise ValueError(f"Could not parse JSON from LLM response: {text[:300]}")
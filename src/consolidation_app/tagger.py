@@ -10,7 +10,9 @@ domain, and platform tags from ErrorEntry fields.
 from __future__ import annotations
 
 import logging
-from typing import List
+from bisect import bisect_right
+from dataclasses import replace
+from typing import Iterable, List, Sequence
 
 from src.consolidation_app.parser import ErrorEntry
 
@@ -162,6 +164,140 @@ def apply_tags_to_entry(entry: ErrorEntry) -> ErrorEntry:
     )
 
 
+def generate_tags_batch(entries: Sequence[ErrorEntry]) -> List[List[str]]:
+    """
+    Generate rule-based tags for many entries at once.
+
+    Produces exactly the same tags as calling generate_tags_rule_based on each
+    entry, but evaluates every pattern across a whole text column in one pass
+    instead of re-joining, re-lowercasing and re-scanning each entry's fields
+    once per category. Use this when (re)tagging a full registry, e.g. after a
+    pattern table changes.
+
+    Args:
+        entries: Entries to generate tags for.
+
+    Returns:
+        One sorted tag list per entry, in input order.
+    """
+    count = len(entries)
+    if not count:
+        return []
+
+    # Columnar view of the text fields; the two columns mirror the field order
+    # used by the per-entry extractors so substring matches are identical.
+    context_column = _TextColumn(
+        " ".join([e.file, e.explanation, e.error_signature]).lower() for e in entries
+    )
+    platform_column = _TextColumn(
+        " ".join([e.file, e.error_signature, e.explanation]).lower() for e in entries
+    )
+
+    frameworks = context_column.first_match(_FRAMEWORK_PATTERNS)
+    domains = context_column.first_match(_DOMAIN_PATTERNS)
+    platforms = platform_column.first_match(_PLATFORM_PATTERNS)
+
+    # Error types repeat heavily across a registry: resolve each distinct value once
+    type_tags: dict[str, str | None] = {}
+    results: List[List[str]] = []
+    for row, entry in enumerate(entries):
+        error_type = entry.error_type
+        if error_type not in type_tags:
+            type_tags[error_type] = _extract_error_type_tag(error_type)
+        domain = domains[row]
+        if domain is None and error_type:
+            domain = _ERROR_TYPE_TO_DOMAIN.get(error_type)
+        tags = {type_tags[error_type], frameworks[row], domain, platforms[row]}
+        tags.discard(None)
+        results.append(sorted(tags))  # type: ignore[arg-type]
+
+    logger.debug("Generated rule-based tags for %d entr(ies) in batch", count)
+    return results
+
+
+def apply_tags_to_entries(entries: Sequence[ErrorEntry]) -> List[ErrorEntry]:
+    """
+    Batch counterpart of apply_tags_to_entry.
+
+    Tags are computed with generate_tags_batch and merged with each entry's
+    existing tags. Entries whose tag set is unchanged are returned as-is
+    instead of being rebuilt.
+
+    Args:
+        entries: Entries to enhance with generated tags.
+
+    Returns:
+        List of entries (same order) with tags = sorted(set(entry.tags) | set(generated)).
+    """
+    generated = generate_tags_batch(entries)
+    result: List[ErrorEntry] = []
+    for entry, tags in zip(entries, generated, strict=True):
+        merged = sorted(set(entry.tags) | set(tags))
+        result.append(entry if merged == entry.tags else replace(entry, tags=merged))
+    return result
+
+
+class _TextColumn:
+    """
+    Lowercased text fields of many entries packed into one searchable string.
+
+    Rows are joined with a separator that never occurs in a pattern, so each
+    pattern is located with repeated str.find over the whole column (a single
+    C-level scan) and hits are mapped back to rows by offset.
+    """
+
+    _SEPARATOR = "\x00"
+
+    def __init__(self, rows: Iterable[str]) -> None:
+        starts: List[int] = []
+        parts: List[str] = []
+        offset = 0
+        for text in rows:
+            # Strip the separator from the data so it can't fake a row boundary
+            text = text.replace(self._SEPARATOR, " ")
+            starts.append(offset)
+            parts.append(text)
+            offset += len(text) + 1
+        self._starts = starts
+        self._text = self._SEPARATOR.join(parts)
+
+    def rows_containing(self, pattern: str) -> List[int]:
+        """Return the indexes of rows whose text contains pattern."""
+
+        text = self._text
+        starts = self._starts
+        rows: List[int] = []
+        pos = text.find(pattern)
+        while pos != -1:
+            row = bisect_right(starts, pos) - 1
+            rows.append(row)
+            if row + 1 >= len(starts):
+                break
+            # Only presence matters; resume at the next row
+            pos = text.find(pattern, starts[row + 1])
+        return rows
+
+    def first_match(self, table: dict[str, List[str]]) -> List[str | None]:
+        """
+        Return, per row, the first key of table whose patterns match the row.
+
+        Keys and patterns are tried in table order, exactly like the per-entry
+        extractors, so the earliest matching key wins for each row.
+        """
+
+        assigned: List[str | None] = [None] * len(self._starts)
+        remaining = len(assigned)
+        for key, patterns in table.items():
+            for pattern in patterns:
+                for row in self.rows_containing(pattern.lower()):
+                    if assigned[row] is None:
+                        assigned[row] = key
+                        remaining -= 1
+                if not remaining:
+                    return assigned
+        return assigned
+
+
 def _extract_error_type_tag(error_type: str) -> str | None:
     """
     Extract error type tag from error_type field.
@@ -11,13 +11,14 @@ Optionally combines AI tags with rule-based tags for comprehensive coverage.
 
 from __future__ import annotations
 
-import json
 import logging
 import re
 from typing import List
 
-from src.consolidation_app.llm_client import call_llm
+from src.consolidation_app.llm_client import call_llm, get_model_for_task
 from src.consolidation_app.parser import ErrorEntry
+from src.consolidation_app.prompt_budget import PromptField, build_prompt
+from src.consolidation_app.structured_output import parse_json_object
 from src.consolidation_app.tagger import generate_tags_rule_based
 
 logger = logging.getLogger(__name__)
@@ -27,29 +28,9 @@ MIN_TAGS = 3
 MAX_TAGS = 5
 
 
-def _build_tagging_prompt(entry: ErrorEntry) -> str:
-    """
-    Build LLM prompt for generating tags for an error entry.
-
-    Args:
-        entry: ErrorEntry to generate tags for.
-
-    Returns:
-        Formatted prompt string for LLM.
-    """
-    # Truncate long fields for prompt efficiency
-    error_context = entry.explanation[:500] if entry.explanation else "N/A"
-    fix_code = entry.fix_code[:300] if entry.fix_code else "N/A"
-
-    prompt = f"""Generate context tags for this error entry. Tags should help categorize and find this error in a registry.
-
-Error Entry Details:
-- Error Signature: {entry.error_signature}
-- Error Type: {entry.error_type}
-- File: {entry.file}
-- Line: {entry.line}
-- Error Context: {error_context}
-- Fix Code: {fix_code[:300] if fix_code else "N/A"}
+# Stable instructions sent as the system prompt; identical for every entry so
+# providers can serve them from their prompt cache
+_TAGGING_SYSTEM = """Generate context tags for an error entry. Tags should help categorize and find this error in a registry.
 
 Generate 3-5 tags that categorize this error. Tags should include:
 1. Error type category (e.g., "file-io", "type-conversion", "networking", "syntax")
@@ -65,12 +46,59 @@ Tag Guidelines:
 - Avoid redundant tags (e.g., don't include both "file-io" and "file-system")
 
 Respond with a JSON object in this exact format:
-{{
+{
     "tags": ["file-io", "docker", "configuration", "cross-platform"]
-}}
+}
 
 Only respond with the JSON object, no additional text."""
-    return prompt
+
+# Response schema passed to the provider's native JSON mode
+_TAGS_SCHEMA = {
+    "title": "tags",
+    "type": "object",
+    "properties": {"tags": {"type": "array", "items": {"type": "string"}}},
+    "required": ["tags"],
+}
+
+
+def _build_tagging_prompt(entry: ErrorEntry) -> str:
+    """
+    Build the variable part of the LLM prompt for tagging an error entry.
+
+    Instructions live in _TAGGING_SYSTEM. Entry fields are packed into the
+    tagging token budget (see prompt_budget) instead of being cut at fixed
+    lengths.
+
+    Args:
+        entry: ErrorEntry to generate tags for.
+
+    Returns:
+        Formatted prompt string for LLM.
+    """
+
+    def render(f: dict[str, str]) -> str:
+        return f"""Error Entry Details:
+- Error Signature: {f["signature"]}
+- Error Type: {f["error_type"]}
+- File: {f["file"]}
+- Line: {entry.line}
+- Error Context: {f["context"]}
+- Fix Code: {f["fix"]}"""
+
+    fields = [
+        PromptField("signature", entry.error_signature, priority=3, min_tokens=32),
+        PromptField("error_type", entry.error_type, priority=3, min_tokens=16),
+        PromptField("file", entry.file, priority=2, min_tokens=16),
+        PromptField("context", entry.explanation or "N/A", priority=1, min_tokens=64),
+        PromptField("fix", entry.fix_code or "N/A", priority=0, min_tokens=32),
+    ]
+    return build_prompt(
+        render,
+        fields,
+        task="tagging",
+        model=get_model_for_task("tagging"),
+        system=_TAGGING_SYSTEM,
+    )
 
 
 def generate_tags_ai(
@@ -101,27 +129,14 @@ def generate_tags_ai(
 
     try:
         # Call LLM with task="tagging" to use task-specific model if configured
-        response = call_llm(prompt, task="tagging")
-
-        # Parse JSON response
-        response = response.strip()
-        # Remove markdown code blocks if present
-        if response.startswith("```"):
-            lines = response.split("\n")
-            response = "\n".join(lines[1:-1]) if len(lines) > 2 else response
-        response = response.strip()
-
-        try:
-            result = json.loads(response)
-        except json.JSONDecodeError as e:
-            # Try to extract JSON from response if wrapped in text
-            json_match = re.search(r'\{[^{}]*"tags"[^{}]*\}', response)
-            if json_match:
-                result = json.loads(json_match.group(0))
-            else:
-                raise ValueError(
-                    f"Could not parse JSON from LLM response: {response[:200]}"
-                ) from e
+        response = call_llm(
+            prompt,
+            task="tagging",
+            system=_TAGGING_SYSTEM,
+            stop_at_json=True,
+            response_schema=_TAGS_SCHEMA,
+        )
+        result = parse_json_object(response, _TAGS_SCHEMA)
 
         tags = result.get("tags", [])
         if not isinstance(tags, list):
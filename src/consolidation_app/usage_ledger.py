@@ -0,0 +1,287 @@
+# usage_ledger.py
+# Run-level LLM token, latency and cost accounting with budgets (Phase 4).
+# v1.0
+
+"""
+Aggregate LLM usage over one consolidation run.
+
+call_llm records every provider call here (tokens, latency, success) and
+checks the task's budget before calling. Budgets come from ENV:
+
+- LLM_BUDGET_TOKENS_<TASK> / LLM_BUDGET_TOKENS: input + output tokens
+- LLM_BUDGET_USD_<TASK> / LLM_BUDGET_USD: estimated cost in USD
+
+Once a task's budget is spent, its calls raise LLMBudgetExceededError,
+which the AI modules treat like any LLM failure (non-LLM fallback).
+Costs are estimates from a built-in per-model price table, overridable
+with LLM_PRICES (JSON: {"model-prefix": [input_usd, output_usd]} per 1M tokens).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.consolidation_app.resilience import LLMUnavailableError
+
+logger = logging.getLogger(__name__)
+
+# USD per 1M tokens (input, output); matched by longest model-name prefix.
+# Local models (Ollama) are not listed and cost 0.
+_DEFAULT_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4-turbo": (10.00, 30.00),
+    "gpt-4": (30.00, 60.00),
+    "gpt-3.5-turbo": (0.50, 1.50),
+    "claude-3-opus": (15.00, 75.00),
+    "claude-3-5-sonnet": (3.00, 15.00),
+    "claude-3-sonnet": (3.00, 15.00),
+    "claude-3-5-haiku": (0.80, 4.00),
+    "claude-3-haiku": (0.25, 1.25),
+}
+
+# Share of the input price charged for prompt-cache hits, per provider
+_CACHED_INPUT_RATE = {"openai": 0.5, "anthropic": 0.1}
+
+
+class LLMBudgetExceededError(LLMUnavailableError):
+    """A task's LLM token or cost budget for this run is exhausted."""
+
+
+def _load_prices() -> Dict[str, Tuple[float, float]]:
+    """Built-in price table merged with LLM_PRICES overrides."""
+    prices = dict(_DEFAULT_PRICES)
+    raw = os.getenv("LLM_PRICES")
+    if raw:
+        try:
+            for prefix, (input_usd, output_usd) in json.loads(raw).items():
+                prices[prefix] = (float(input_usd), float(output_usd))
+        except (ValueError, TypeError) as e:
+            logger.warning("Invalid LLM_PRICES, using built-in prices: %s", e)
+    return prices
+
+
+def estimate_cost(
+    provider: str,
+    model: str,
+    input_tokens: int,
+    output_tokens: int,
+    cached_tokens: int = 0,
+    prices: Optional[Dict[str, Tuple[float, float]]] = None,
+) -> float:
+    """
+    Estimated USD cost of one call.
+
+    Args:
+        provider: Provider name (selects the cached-input discount).
+        model: Model name, matched by longest prefix in the price table.
+        input_tokens: Prompt tokens, including cached ones.
+        output_tokens: Completion tokens.
+        cached_tokens: Prompt tokens served from the provider's cache.
+        prices: Price table (defaults to built-in prices plus LLM_PRICES).
+
+    Returns:
+        Cost in USD (0.0 for unknown/local models).
+    """
+    table = prices if prices is not None else _load_prices()
+    name = model.lower()
+    matches = [prefix for prefix in table if name.startswith(prefix)]
+    if not matches:
+        return 0.0
+    input_usd, output_usd = table[max(matches, key=len)]
+    cached = min(cached_tokens, input_tokens)
+    cached_rate = _CACHED_INPUT_RATE.get(provider, 1.0)
+    billed_input = (input_tokens - cached) + cached * cached_rate
+    return (billed_input * input_usd + output_tokens * output_usd) / 1_000_000
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list (0.0 if empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+@dataclass
+class UsageTotals:
+    """Counters for one (task, provider) pair."""
+
+    calls: int = 0
+    failures: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    cost_usd: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+
+    def add(self, other: "UsageTotals") -> None:
+        self.calls += other.calls
+        self.failures += other.failures
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.cached_tokens += other.cached_tokens
+        self.cost_usd += other.cost_usd
+        self.latencies.extend(other.latencies)
+
+    def to_dict(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cached_tokens": self.cached_tokens,
+            "cache_hit_ratio": (
+                round(self.cached_tokens / self.input_tokens, 4)
+                if self.input_tokens
+                else 0.0
+            ),
+            "estimated_cost_usd": round(self.cost_usd, 6),
+            "latency_p50_s": round(percentile(latencies, 50), 3),
+            "latency_p95_s": round(percentile(latencies, 95), 3),
+        }
+
+
+class UsageLedger:
+    """Thread-safe per-run usage ledger."""
+
+    def __init__(self) -> None:
+        self._totals: Dict[Tuple[str, str], UsageTotals] = {}
+        self._lock = threading.Lock()
+        self._prices = _load_prices()
+
+    def record(
+        self,
+        task: str,
+        provider: str,
+        model: str,
+        *,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        cached_tokens: int = 0,
+        latency: float = 0.0,
+        ok: bool = True,
+    ) -> None:
+        """Add one provider call to the ledger."""
+        cost = estimate_cost(
+            provider, model, input_tokens, output_tokens, cached_tokens, self._prices
+        )
+        with self._lock:
+            totals = self._totals.setdefault((task, provider), UsageTotals())
+            totals.calls += 1
+            totals.failures += 0 if ok else 1
+            totals.input_tokens += input_tokens
+            totals.output_tokens += output_tokens
+            totals.cached_tokens += cached_tokens
+            totals.cost_usd += cost
+            totals.latencies.append(latency)
+
+    def task_totals(self, task: str) -> UsageTotals:
+        """Totals of one task across providers."""
+        result = UsageTotals()
+        with self._lock:
+            for (t, _), totals in self._totals.items():
+                if t == task:
+                    result.add(totals)
+        return result
+
+    def check_budget(self, task: str) -> None:
+        """
+        Raise if the task's token or cost budget is exhausted.
+
+        Raises:
+            LLMBudgetExceededError: If a configured budget has been reached.
+        """
+        token_budget = _get_budget("LLM_BUDGET_TOKENS", task)
+        cost_budget = _get_budget("LLM_BUDGET_USD", task)
+        if token_budget is None and cost_budget is None:
+            return
+        totals = self.task_totals(task)
+        used_tokens = totals.input_tokens + totals.output_tokens
+        if token_budget is not None and used_tokens >= token_budget:
+            raise LLMBudgetExceededError(
+                f"LLM token budget for task={task} exhausted ({used_tokens}/{token_budget:.0f})"
+            )
+        if cost_budget is not None and totals.cost_usd >= cost_budget:
+            raise LLMBudgetExceededError(
+                f"LLM cost budget for task={task} exhausted "
+                f"(${totals.cost_usd:.4f}/${cost_budget:.4f})"
+            )
+
+    def snapshot(self) -> Dict[Tuple[str, str], UsageTotals]:
+        """Copy of the totals per (task, provider)."""
+        with self._lock:
+            result: Dict[Tuple[str, str], UsageTotals] = {}
+            for key, totals in self._totals.items():
+                result[key] = UsageTotals()
+                result[key].add(totals)
+            return result
+
+    def report(self) -> Dict[str, Any]:
+        """Usage summary: totals, per task, per provider and per (task, provider)."""
+        with self._lock:
+            items = [(key, totals) for key, totals in sorted(self._totals.items())]
+        overall = UsageTotals()
+        by_task: Dict[str, UsageTotals] = {}
+        by_provider: Dict[str, UsageTotals] = {}
+        for (task, provider), totals in items:
+            overall.add(totals)
+            by_task.setdefault(task, UsageTotals()).add(totals)
+            by_provider.setdefault(provider, UsageTotals()).add(totals)
+        return {
+            "total": overall.to_dict(),
+            "by_task": {task: t.to_dict() for task, t in by_task.items()},
+            "by_provider": {
+                provider: t.to_dict() for provider, t in by_provider.items()
+            },
+            "by_task_provider": [
+                {"task": task, "provider": provider, **totals.to_dict()}
+                for (task, provider), totals in items
+            ],
+        }
+
+    def write_report(self, path: Path) -> None:
+        """Write report() as JSON (atomically, via a temp file)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_suffix(".tmp")
+        temp.write_text(json.dumps(self.report(), indent=2) + "\n", encoding="utf-8")
+        temp.replace(path)
+
+
+def _get_budget(prefix: str, task: str) -> Optional[float]:
+    """Budget from <prefix>_<TASK>, falling back to <prefix>; None if unset."""
+    for key in (f"{prefix}_{task.upper()}", prefix):
+        raw = os.getenv(key)
+        if not raw:
+            continue
+        try:
+            return float(raw)
+        except ValueError:
+            logger.warning("Invalid %s=%r, ignoring", key, raw)
+    return None
+
+
+_ledger = UsageLedger()
+_ledger_lock = threading.Lock()
+
+
+def get_ledger() -> UsageLedger:
+    """Return the ledger of the current run."""
+    with _ledger_lock:
+        return _ledger
+
+
+def reset_ledger() -> UsageLedger:
+    """Start a new run's ledger (re-reads LLM_PRICES) and return it."""
+    global _ledger
+    with _ledger_lock:
+        _ledger = UsageLedger()
+        return _ledger
@@ -0,0 +1,308 @@
+# watcher.py
+# Near-real-time consolidation on errors_and_fixes.md changes (Phase 5.3).
+# v1.0
+
+"""
+Watch every project's .errors_fixes/errors_and_fixes.md and consolidate a
+project shortly after its file changes.
+
+Change events come from watchdog (inotify on Linux, FSEvents/ReadDirectoryChanges
+elsewhere) when it is installed, else from polling the files' mtime and size.
+Docker Desktop bind mounts do not forward native events, so WATCH_BACKEND=polling
+forces polling there.
+
+Events are debounced per project: a project is consolidated once its file
+has been quiet for `debounce` seconds (or, for a file that keeps changing,
+at most max_delay seconds after the first change). A change only counts if
+the file's (mtime, size) differs from what the watcher last saw, so the
+watcher's own clearing of errors_and_fixes.md does not trigger another run.
+Entries appended while a project is being consolidated are kept by the
+clear; if the file changed during the run and still holds entries, the
+project is queued again.
+The project list is re-discovered every rescan_interval seconds; projects
+that appear later are consolidated once when found.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.consolidation_app.parser import has_session_entries
+
+logger = logging.getLogger(__name__)
+
+ERRORS_FILE = Path(".errors_fixes") / "errors_and_fixes.md"
+
+DEFAULT_DEBOUNCE_SECONDS = 5.0
+DEFAULT_POLL_SECONDS = 2.0
+DEFAULT_RESCAN_SECONDS = 60.0
+
+# A file that keeps changing is consolidated at most this many debounce
+# periods after its first change
+_MAX_DELAY_FACTOR = 6
+
+BACKENDS = ("auto", "watchdog", "polling")
+
+Signature = Optional[Tuple[int, int]]
+
+
+def _signature(path: Path) -> Signature:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _get_float_env(key: str, default: float) -> float:
+    raw = os.getenv(key)
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        logger.warning("Ignoring invalid %s=%r (using %s)", key, raw, default)
+        return default
+
+
+def watchdog_available() -> bool:
+    """True if the optional watchdog package can be imported."""
+    try:
+        import watchdog.observers  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class ProjectWatcher:
+    """Debounced change detection for errors_and_fixes.md across projects."""
+
+    def __init__(
+        self,
+        discover: Callable[[], Sequence[Path]],
+        consolidate: Callable[[List[Path]], object],
+        *,
+        debounce: Optional[float] = None,
+        poll_interval: Optional[float] = None,
+        rescan_interval: Optional[float] = None,
+        backend: Optional[str] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            discover: Returns the current project roots.
+            consolidate: Consolidates a batch of projects.
+            debounce: Quiet period before consolidating (default: WATCH_DEBOUNCE_SECONDS or 5).
+            poll_interval: Loop tick and polling period (default: WATCH_POLL_SECONDS or 2).
+            rescan_interval: Project re-discovery period (default: 60).
+            backend: auto, watchdog or polling (default: WATCH_BACKEND or auto).
+            clock: Monotonic clock (for tests).
+        """
+        self.discover = discover
+        self.consolidate = consolidate
+        self.debounce = (
+            debounce
+            if debounce is not None
+            else _get_float_env("WATCH_DEBOUNCE_SECONDS", DEFAULT_DEBOUNCE_SECONDS)
+        )
+        self.poll_interval = (
+            poll_interval
+            if poll_interval is not None
+            else _get_float_env("WATCH_POLL_SECONDS", DEFAULT_POLL_SECONDS)
+        )
+        self.rescan_interval = (
+            rescan_interval if rescan_interval is not None else DEFAULT_RESCAN_SECONDS
+        )
+        backend = (backend or os.getenv("WATCH_BACKEND") or "auto").lower()
+        if backend not in BACKENDS:
+            raise ValueError(
+                f"WATCH_BACKEND must be one of {', '.join(BACKENDS)}; got {backend!r}"
+            )
+        if backend == "auto":
+            backend = "watchdog" if watchdog_available() else "polling"
+        self.backend = backend
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._signatures: Dict[Path, Signature] = {}
+        # project -> (first change, last change)
+        self._pending: Dict[Path, Tuple[float, float]] = {}
+        self._observer = None
+        self._watched_dirs: set[Path] = set()
+        self._last_rescan: Optional[float] = None
+
+    @property
+    def projects(self) -> List[Path]:
+        with self._lock:
+            return list(self._signatures)
+
+    def refresh_projects(self, *, initial: bool = False) -> List[Path]:
+        """
+        Re-discover projects; returns the newly found ones.
+
+        New projects are marked pending, except on the initial scan.
+        """
+        try:
+            found = list(self.discover())
+        except Exception as e:
+            logger.error("Watch: project discovery failed: %s", e)
+            return []
+        now = self._clock()
+        added = []
+        with self._lock:
+            for project in found:
+                if project in self._signatures:
+                    continue
+                self._signatures[project] = _signature(project / ERRORS_FILE)
+                added.append(project)
+                if not initial:
+                    self._pending[project] = (now, now)
+        self._last_rescan = now
+        if added:
+            logger.info(
+                "Watching %d new project(s) (%d total)",
+                len(added),
+                len(self._signatures),
+            )
+        if self._observer is not None:
+            self._schedule_watches(added)
+        return added
+
+    def notify(self, project: Path) -> bool:
+        """Record a possible change of project's errors file; True if it changed."""
+        current = _signature(project / ERRORS_FILE)
+        now = self._clock()
+        with self._lock:
+            if project not in self._signatures or self._signatures[project] == current:
+                return False
+            self._signatures[project] = current
+            first, _ = self._pending.get(project, (now, now))
+            self._pending[project] = (first, now)
+        logger.debug("Change detected: %s", project)
+        return True
+
+    def poll(self) -> List[Path]:
+        """Stat every watched file; returns the projects whose file changed."""
+        return [project for project in self.projects if self.notify(project)]
+
+    def due(self) -> List[Path]:
+        """Pending projects that are quiet for debounce seconds (or waited max_delay)."""
+        now = self._clock()
+        max_delay = self.debounce * _MAX_DELAY_FACTOR
+        with self._lock:
+            return [
+                project
+                for project, (first, last) in self._pending.items()
+                if now - last >= self.debounce or now - first >= max_delay
+            ]
+
+    def consolidate_due(self) -> List[Path]:
+        """Consolidate due projects as one batch; returns them."""
+        projects = self.due()
+        if not projects:
+            return []
+        logger.info("Consolidating %d changed project(s)", len(projects))
+        # Taken before the run parses the files: anything appended later
+        # shows up as a difference below
+        before = {project: _signature(project / ERRORS_FILE) for project in projects}
+        try:
+            self.consolidate(projects)
+        except Exception as e:
+            logger.error("Watch-triggered consolidation failed: %s", e, exc_info=True)
+        requeued = [
+            project
+            for project in projects
+            if _signature(project / ERRORS_FILE) != before[project]
+            and has_session_entries(project / ERRORS_FILE)
+        ]
+        now = self._clock()
+        with self._lock:
+            for project in projects:
+                self._signatures[project] = _signature(project / ERRORS_FILE)
+                if project in requeued:
+                    # Appended to during the run; the clear kept those entries
+                    self._pending[project] = (now, now)
+                else:
+                    # The run cleared errors_and_fixes.md; that is not a new change
+                    self._pending.pop(project, None)
+        if requeued:
+            logger.info(
+                "Re-queued %d project(s) appended to during the run", len(requeued)
+            )
+        return projects
+
+    def tick(self) -> List[Path]:
+        """One loop iteration: rescan if due, poll (polling backend), consolidate."""
+        if (
+            self._last_rescan is None
+            or self._clock() - self._last_rescan >= self.rescan_interval
+        ):
+            self.refresh_projects(initial=self._last_rescan is None)
+        if self._observer is None:
+            self.poll()
+        return self.consolidate_due()
+
+    def run(self, stop_event: Optional[threading.Event] = None) -> None:
+        """Watch and consolidate until stop_event is set."""
+        stop = stop_event if stop_event is not None else threading.Event()
+        if self.backend == "watchdog":
+            self._start_observer()
+        self.refresh_projects(initial=True)
+        logger.info(
+            "Watching %d project(s) (backend=%s, debounce=%.1fs)",
+            len(self.projects),
+            self.backend,
+            self.debounce,
+        )
+        try:
+            while not stop.is_set():
+                self.tick()
+                stop.wait(self.poll_interval)
+        finally:
+            self._stop_observer()
+        logger.info("Watcher stopped")
+
+    def _start_observer(self) -> None:
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            logger.warning("watchdog is not installed; falling back to polling")
+            self.backend = "polling"
+            return
+
+        watcher = self
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event) -> None:
+                for raw in (event.src_path, getattr(event, "dest_path", "")):
+                    path = Path(os.fsdecode(raw)) if raw else None
+                    if path is not None and path.name == ERRORS_FILE.name:
+                        watcher.notify(path.parent.parent)
+
+        self._handler = Handler()
+        self._observer = Observer()
+        self._observer.start()
+
+    def _schedule_watches(self, projects: Sequence[Path]) -> None:
+        assert self._observer is not None
+        for project in projects:
+            directory = project / ERRORS_FILE.parent
+            if directory in self._watched_dirs:
+                continue
+            try:
+                self._observer.schedule(self._handler, str(directory), recursive=False)
+                self._watched_dirs.add(directory)
+            except OSError as e:
+                logger.warning("Cannot watch %s: %s", directory, e)
+
+    def _stop_observer(self) -> None:
+        if self._observer is None:
+            return
+        self._observer.stop()
+        self._observer.join(timeout=5)
+        self._observer = None
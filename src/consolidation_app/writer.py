@@ -2,22 +2,43 @@
 # Description: Writer module for consolidation app - writes fix_repo.md, coding_tips.md, and clears errors_and_fixes.md
 # Version: 1.0
 
-"""Write consolidated markdown files and clear session logs."""
+"""Write consolidated markdown files and clear session logs.
+
+Documents are streamed from the generator into a temp file chunk by chunk,
+so peak memory does not grow with the size of the registry. Outputs are
+only replaced when their content changed: the SHA-256 of the streamed
+content is compared with the existing file's, so unchanged files keep their
+mtime and do not wake file watchers or backups. With fsync (WRITER_FSYNC=1)
+the temp file and the directory are also flushed to disk.
+
+errors_and_fixes.md may still be appended to by agents while it is being
+consolidated (watch mode). Given a LogSnapshot of the bytes that were
+parsed, clearing keeps whatever was appended after them instead of
+discarding it.
+"""
 
 from __future__ import annotations
 
+import hashlib
 import logging
+import os
+from contextlib import nullcontext
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import Callable, ContextManager, Dict, Iterable, Iterator, List, Optional
 
 from src.consolidation_app.generator import (
-    generate_coding_tips_markdown,
-    generate_fix_repo_markdown,
+    iter_coding_tips_markdown,
+    iter_fix_repo_markdown,
 )
+from src.consolidation_app.instrumentation import count, stage
 from src.consolidation_app.parser import ErrorEntry
 
 logger = logging.getLogger(__name__)
 
+FIX_REPO_FILE = "fix_repo.md"
+CODING_TIPS_FILE = "coding_tips.md"
+
 _ERRORS_AND_FIXES_HEADER = """# Errors and Fixes Log
 
 > **Note**: This file is processed daily by the consolidation app at 2 AM.
@@ -25,133 +46,367 @@ _ERRORS_AND_FIXES_HEADER = """# Errors and Fixes Log
 
 """
 
+_HASH_CHUNK = 1 << 16
 
-def write_fix_repo(project_path: Path, consolidated_entries: List[ErrorEntry]) -> None:
-    """Write fix_repo.md with consolidated error entries.
+# Re-reads of errors_and_fixes.md when it grows while being cleared
+_CLEAR_ATTEMPTS = 3
 
-    Filters entries where is_process_issue=False, generates markdown using
-    generator, and writes to project_path/.errors_fixes/fix_repo.md.
 
-    Creates directory if missing. Uses UTF-8 encoding and LF line endings.
+@dataclass(frozen=True)
+class LogSnapshot:
+    """Size and SHA-256 of the errors_and_fixes.md bytes a run parsed."""
 
-    Args:
-        project_path: Path to project root directory.
-        consolidated_entries: List of consolidated ErrorEntry objects.
+    size: int
+    sha256: str
+
+    @classmethod
+    def of(cls, data: bytes) -> "LogSnapshot":
+        return cls(len(data), hashlib.sha256(data).hexdigest())
+
+
+def fsync_enabled() -> bool:
+    """True if WRITER_FSYNC asks for durable (fsync'd) writes."""
+    return os.getenv("WRITER_FSYNC", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
 
-    Raises:
-        PermissionError: If file cannot be written due to permissions.
-        OSError: If file operations fail for other reasons.
-    """
-    errors_fixes_dir = project_path / ".errors_fixes"
-    output_file = errors_fixes_dir / "fix_repo.md"
 
+def _fsync_dir(directory: Path) -> None:
+    """Persist a rename in directory (not supported on Windows)."""
     try:
-        # Create directory if missing
-        errors_fixes_dir.mkdir(parents=True, exist_ok=True)
-        logger.debug("Ensured directory exists: %s", errors_fixes_dir)
-
-        # Filter entries (only non-process-issue entries)
-        error_entries = [e for e in consolidated_entries if not e.is_process_issue]
-        logger.info(
-            "Writing fix_repo.md for project %s with %d error entry(ies)",
-            project_path,
-            len(error_entries),
-        )
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
 
-        # Generate markdown
-        markdown_content = generate_fix_repo_markdown(error_entries)
 
-        # Atomic write: write to temp file, then rename (prevents partial writes)
-        temp_file = output_file.with_suffix(".tmp")
-        try:
-            temp_file.write_text(markdown_content, encoding="utf-8", newline="\n")
+def _stage(name: str, timed: bool) -> ContextManager[None]:
+    return stage(name) if timed else nullcontext()
+
+
+def _same_content(path: Path, size: int, sha256: str) -> bool:
+    """True if path holds size bytes with the given SHA-256."""
+    try:
+        # Size differs -> changed, no need to hash the existing file
+        return path.stat().st_size == size and _file_sha256(path) == sha256
+    except FileNotFoundError:
+        return False
+
+
+def _stream_if_changed(
+    output_file: Path, chunks: Iterable[str], *, fsync: bool, timed: bool = True
+) -> Optional[int]:
+    """Atomically write chunks to output_file unless it already holds them.
+
+    Chunks are encoded and streamed into a temp file while their SHA-256 is
+    computed, so the document is never held in memory as a whole. The temp
+    file then replaces output_file, or is discarded if the content is
+    unchanged. With timed, streaming counts as the "generate" stage and the
+    compare/replace as "write".
+
+    Returns the number of bytes written, or None if the file was unchanged.
+    Content is written as UTF-8 bytes, so LF line endings are kept.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    # Atomic write: write to temp file, then rename (prevents partial writes)
+    temp_file = output_file.with_suffix(".tmp")
+    try:
+        with temp_file.open("wb") as f:
+            with _stage("generate", timed):
+                for chunk in chunks:
+                    data = chunk.encode("utf-8")
+                    digest.update(data)
+                    f.write(data)
+                    size += len(data)
+            with _stage("write", timed):
+                changed = not _same_content(output_file, size, digest.hexdigest())
+                if changed and fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+        if not changed:
+            temp_file.unlink()
+            return None
+        with _stage("write", timed):
             temp_file.replace(output_file)  # Atomic on most filesystems
-            logger.info("Successfully wrote fix_repo.md: %s", output_file)
-        except Exception:
-            # Clean up temp file on error
-            if temp_file.exists():
-                try:
-                    temp_file.unlink()
-                except Exception:
-                    pass  # Ignore cleanup errors
-            raise
+            if fsync:
+                _fsync_dir(output_file.parent)
+    except Exception:
+        # Clean up temp file on error
+        if temp_file.exists():
+            try:
+                temp_file.unlink()
+            except Exception:
+                pass  # Ignore cleanup errors
+        raise
+    return size
+
 
+def _write_output(
+    project_path: Path, file_name: str, chunks: Iterable[str], *, fsync: Optional[bool]
+) -> bool:
+    """Stream one .errors_fixes output to disk if changed; returns True if written."""
+    errors_fixes_dir = project_path / ".errors_fixes"
+    output_file = errors_fixes_dir / file_name
+    try:
+        # Create directory if missing
+        errors_fixes_dir.mkdir(parents=True, exist_ok=True)
+        written = _stream_if_changed(
+            output_file, chunks, fsync=fsync_enabled() if fsync is None else fsync
+        )
     except PermissionError:
-        logger.error("Permission denied writing fix_repo.md: %s", output_file)
+        logger.error("Permission denied writing %s: %s", file_name, output_file)
         raise
     except OSError as e:
-        logger.error("Failed to write fix_repo.md: %s - %s", output_file, e)
+        logger.error("Failed to write %s: %s - %s", file_name, output_file, e)
         raise
+    if written is None:
+        count("write.unchanged")
+        logger.info("%s unchanged, not rewritten: %s", file_name, output_file)
+        return False
+    count("write.bytes", written)
+    logger.info("Successfully wrote %s: %s", file_name, output_file)
+    return True
+
+
+def write_fix_repo(
+    project_path: Path,
+    consolidated_entries: List[ErrorEntry],
+    *,
+    fsync: Optional[bool] = None,
+) -> bool:
+    """Write fix_repo.md with consolidated error entries.
+
+    Filters entries where is_process_issue=False, generates markdown using
+    generator, and writes to project_path/.errors_fixes/fix_repo.md unless
+    the file already has that content.
+
+    Creates directory if missing. Uses UTF-8 encoding and LF line endings.
+
+    Args:
+        project_path: Path to project root directory.
+        consolidated_entries: List of consolidated ErrorEntry objects.
+        fsync: fsync the written file (default: WRITER_FSYNC).
 
+    Returns:
+        True if the file was written, False if it was unchanged.
 
-def write_coding_tips(project_path: Path, process_entries: List[ErrorEntry]) -> None:
+    Raises:
+        PermissionError: If file cannot be written due to permissions.
+        OSError: If file operations fail for other reasons.
+    """
+    # Filter entries (only non-process-issue entries)
+    error_entries = [e for e in consolidated_entries if not e.is_process_issue]
+    logger.info(
+        "Writing fix_repo.md for project %s with %d error entry(ies)",
+        project_path,
+        len(error_entries),
+    )
+    return _write_output(
+        project_path, FIX_REPO_FILE, iter_fix_repo_markdown(error_entries), fsync=fsync
+    )
+
+
+def write_coding_tips(
+    project_path: Path,
+    process_entries: List[ErrorEntry],
+    *,
+    fsync: Optional[bool] = None,
+) -> bool:
     """Write coding_tips.md with consolidated process issue entries.
 
     Filters entries where is_process_issue=True, generates markdown using
-    generator, and writes to project_path/.errors_fixes/coding_tips.md.
+    generator, and writes to project_path/.errors_fixes/coding_tips.md unless
+    the file already has that content.
 
     Creates directory if missing. Uses UTF-8 encoding and LF line endings.
 
     Args:
         project_path: Path to project root directory.
         process_entries: List of ErrorEntry objects (should be process issues).
+        fsync: fsync the written file (default: WRITER_FSYNC).
+
+    Returns:
+        True if the file was written, False if it was unchanged.
 
     Raises:
         PermissionError: If file cannot be written due to permissions.
         OSError: If file operations fail for other reasons.
     """
-    errors_fixes_dir = project_path / ".errors_fixes"
-    output_file = errors_fixes_dir / "coding_tips.md"
+    # Filter entries (only process-issue entries)
+    process_list = [e for e in process_entries if e.is_process_issue]
+    logger.info(
+        "Writing coding_tips.md for project %s with %d process issue(s)",
+        project_path,
+        len(process_list),
+    )
+    return _write_output(
+        project_path,
+        CODING_TIPS_FILE,
+        iter_coding_tips_markdown(process_list),
+        fsync=fsync,
+    )
+
+
+def write_project_outputs(
+    project_path: Path,
+    consolidated_entries: List[ErrorEntry],
+    *,
+    fix_repo: bool = True,
+    coding_tips: bool = True,
+    fsync: Optional[bool] = None,
+    on_written: Optional[Callable[[str], None]] = None,
+) -> Dict[str, bool]:
+    """Write fix_repo.md and coding_tips.md from one pass over the entries.
+
+    Entries are partitioned into errors and process issues once, both
+    documents are generated, then each file is written unless unchanged.
 
-    try:
-        # Create directory if missing
-        errors_fixes_dir.mkdir(parents=True, exist_ok=True)
-        logger.debug("Ensured directory exists: %s", errors_fixes_dir)
-
-        # Filter entries (only process-issue entries)
-        process_list = [e for e in process_entries if e.is_process_issue]
-        logger.info(
-            "Writing coding_tips.md for project %s with %d process issue(s)",
-            project_path,
-            len(process_list),
-        )
+    Args:
+        project_path: Path to project root directory.
+        consolidated_entries: Consolidated errors and process issues.
+        fix_repo: Write fix_repo.md.
+        coding_tips: Write coding_tips.md.
+        fsync: fsync the written files (default: WRITER_FSYNC).
+        on_written: Called with the file name once each file is on disk
+            (also when unchanged), e.g. to journal the step.
 
-        # Generate markdown
-        markdown_content = generate_coding_tips_markdown(process_list)
+    Returns:
+        File name -> True if written, False if unchanged.
 
-        # Atomic write: write to temp file, then rename (prevents partial writes)
-        temp_file = output_file.with_suffix(".tmp")
+    Raises:
+        PermissionError: If a file cannot be written due to permissions.
+        OSError: If file operations fail for other reasons.
+    """
+    error_entries: List[ErrorEntry] = []
+    process_list: List[ErrorEntry] = []
+    for entry in consolidated_entries:
+        (process_list if entry.is_process_issue else error_entries).append(entry)
+    logger.info(
+        "Writing outputs for project %s: %d error entry(ies), %d process issue(s)",
+        project_path,
+        len(error_entries),
+        len(process_list),
+    )
+
+    documents: Dict[str, Iterator[str]] = {}
+    if fix_repo:
+        documents[FIX_REPO_FILE] = iter_fix_repo_markdown(error_entries)
+    if coding_tips:
+        documents[CODING_TIPS_FILE] = iter_coding_tips_markdown(process_list)
+
+    written: Dict[str, bool] = {}
+    for file_name, chunks in documents.items():
+        written[file_name] = _write_output(project_path, file_name, chunks, fsync=fsync)
+        if on_written is not None:
+            on_written(file_name)
+    return written
+
+
+def _unparsed_tail(data: bytes, parsed: LogSnapshot) -> Optional[bytes]:
+    """Bytes appended after the parsed content, or None if that content changed."""
+    if len(data) < parsed.size or LogSnapshot.of(data[: parsed.size]) != parsed:
+        return None
+    tail = data[parsed.size :]
+    return tail if tail.strip() else b""
+
+
+def _clear_keeping_tail(errors_file: Path, parsed: LogSnapshot) -> Optional[int]:
+    """Replace the parsed part of errors_file with the header, keeping appends.
+
+    The file is re-read right before the temp file replaces it; if it grew
+    in between, clearing is retried. Returns the bytes written, None if the
+    file was already clear; raises RuntimeError if it changed in another way
+    or kept growing (its entries then stay for the next run).
+    """
+    header = _ERRORS_AND_FIXES_HEADER.encode("utf-8")
+    for _ in range(_CLEAR_ATTEMPTS):
+        data = errors_file.read_bytes()
+        tail = _unparsed_tail(data, parsed)
+        if tail is None:
+            raise RuntimeError("file changed since it was parsed")
+        if tail:
+            logger.info(
+                "Keeping %d byte(s) appended to %s during consolidation",
+                len(tail),
+                errors_file,
+            )
+        content = header + tail.lstrip(b"\n")
+        if content == data:
+            return None
+        temp_file = errors_file.with_suffix(".tmp")
         try:
-            temp_file.write_text(markdown_content, encoding="utf-8", newline="\n")
-            temp_file.replace(output_file)  # Atomic on most filesystems
-            logger.info("Successfully wrote coding_tips.md: %s", output_file)
+            with temp_file.open("wb") as f:
+                f.write(content)
+                if fsync_enabled():
+                    f.flush()
+                    os.fsync(f.fileno())
+            if errors_file.stat().st_size != len(data):
+                # Appended to while we wrote; re-read so it is kept
+                temp_file.unlink()
+                continue
+            temp_file.replace(errors_file)
         except Exception:
-            # Clean up temp file on error
             if temp_file.exists():
                 try:
                     temp_file.unlink()
                 except Exception:
                     pass  # Ignore cleanup errors
             raise
+        if fsync_enabled():
+            _fsync_dir(errors_file.parent)
+        return len(content)
+    raise RuntimeError("file kept growing while being cleared")
 
-    except PermissionError:
-        logger.error("Permission denied writing coding_tips.md: %s", output_file)
-        raise
-    except OSError as e:
-        logger.error("Failed to write coding_tips.md: %s - %s", output_file, e)
-        raise
+
+def session_log_unchanged(project_path: Path, parsed: LogSnapshot) -> bool:
+    """True if errors_and_fixes.md still starts with the parsed bytes.
+
+    Entries appended after the parsed content do not count as a change; a
+    missing file does.
+    """
+    try:
+        data = (project_path / ".errors_fixes" / "errors_and_fixes.md").read_bytes()
+    except FileNotFoundError:
+        return False
+    return _unparsed_tail(data, parsed) is not None
 
 
-def clear_errors_and_fixes(project_path: Path) -> None:
+def clear_errors_and_fixes(
+    project_path: Path, parsed: Optional[LogSnapshot] = None
+) -> bool:
     """Clear errors_and_fixes.md but keep the file with header only.
 
     Reads current errors_and_fixes.md, replaces contents with header only,
-    and writes back. Keeps the file (doesn't delete it).
+    and writes back (unless it is already header only). Keeps the file
+    (doesn't delete it).
+
+    With parsed (the snapshot of what was consolidated), only that content
+    is cleared: entries appended since are kept after the header. If the
+    parsed content itself changed, the file is left alone (with a warning)
+    so nothing unconsolidated is lost.
 
     Uses UTF-8 encoding and LF line endings.
 
     Args:
         project_path: Path to project root directory.
+        parsed: LogSnapshot of the bytes that were parsed (default: clear
+            everything).
+
+    Returns:
+        True if the file is now clear (or does not exist), False if it was
+        left alone because the parsed content changed.
 
     Raises:
         PermissionError: If file cannot be read/written due to permissions.
@@ -167,26 +422,31 @@ def clear_errors_and_fixes(project_path: Path) -> None:
                 "errors_and_fixes.md does not exist: %s (skipping clear)",
                 errors_file,
             )
-            return
+            return True
 
         logger.info("Clearing errors_and_fixes.md for project %s", project_path)
-
-        # Atomic write: write to temp file, then rename (prevents partial writes)
-        temp_file = errors_file.with_suffix(".tmp")
-        try:
-            temp_file.write_text(
-                _ERRORS_AND_FIXES_HEADER, encoding="utf-8", newline="\n"
+        if parsed is not None:
+            try:
+                written = _clear_keeping_tail(errors_file, parsed)
+            except RuntimeError as e:
+                logger.warning(
+                    "Not clearing %s: %s; its entries stay for the next run",
+                    errors_file,
+                    e,
+                )
+                return False
+        else:
+            written = _stream_if_changed(
+                errors_file,
+                [_ERRORS_AND_FIXES_HEADER],
+                fsync=fsync_enabled(),
+                timed=False,
             )
-            temp_file.replace(errors_file)  # Atomic on most filesystems
+        if written is None:
+            logger.info("errors_and_fixes.md already clear: %s", errors_file)
+        else:
             logger.info("Successfully cleared errors_and_fixes.md: %s", errors_file)
-        except Exception:
-            # Clean up temp file on error
-            if temp_file.exists():
-                try:
-                    temp_file.unlink()
-                except Exception:
-                    pass  # Ignore cleanup errors
-            raise
+        return True
 
     except PermissionError:
         logger.error("Permission denied clearing errors_and_fixes.md: %s", errors_file)
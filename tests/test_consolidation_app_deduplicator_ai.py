@@ -140,15 +140,23 @@ def test_calculate_similarity_clamps_invalid_scores(mock_call_llm):
 
 @patch("src.consolidation_app.deduplicator_ai.call_llm")
 def test_calculate_similarity_handles_missing_similarity_field(mock_call_llm):
-    """Test that calculate_similarity handles missing similarity field."""
+    """Test that a response without the similarity field fails schema validation."""
     entry1 = _create_entry()
     entry2 = _create_entry()
 
     mock_response = json.dumps({"reason": "No similarity field"})
     mock_call_llm.return_value = mock_response
 
-    similarity = calculate_similarity(entry1, entry2)
-    assert similarity == 0.0
+    with pytest.raises(RuntimeError, match=r"\$\.similarity is missing"):
+        calculate_similarity(entry1, entry2)
+
+
+@patch("src.consolidation_app.deduplicator_ai.call_llm")
+def test_calculate_similarity_accepts_reply_without_reason(mock_call_llm):
+    """Test that a reply carrying only the similarity score still parses."""
+    mock_call_llm.return_value = json.dumps({"similarity": 0.9})
+
+    assert calculate_similarity(_create_entry(), _create_entry()) == 0.9
 
 
 @patch("src.consolidation_app.deduplicator_ai.call_llm")
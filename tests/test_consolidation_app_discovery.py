@@ -1,5 +1,7 @@
 """Tests for the consolidation app discovery module."""
 
+import json
+import os
 from pathlib import Path
 
 import pytest
@@ -208,19 +210,19 @@ def test_permission_error_handling(tmp_path, monkeypatch):
     root_path = tmp_path / "root"
     root_path.mkdir()
 
-    real_iterdir = Path.iterdir
+    real_scandir = discovery.os.scandir
 
-    def mock_iterdir(self):
-        if self.resolve() == root_path.resolve():
+    def mock_scandir(path):
+        if Path(path).resolve() == root_path.resolve():
             raise PermissionError("Permission denied")
-        return real_iterdir(self)
+        return real_scandir(path)
 
-    monkeypatch.setattr(Path, "iterdir", mock_iterdir)
+    monkeypatch.setattr(discovery.os, "scandir", mock_scandir)
 
     # Should not raise, but should return empty list
     projects = discovery.discover_projects(root_path)
 
-    # Should return empty list (iterdir failed, no extra_projects)
+    # Should return empty list (scandir failed, no extra_projects)
     assert len(projects) == 0
 
 
@@ -338,3 +340,166 @@ def test_extra_projects_accepts_valid_paths(tmp_path):
         root_path, extra_projects=[str(valid_project.resolve())]
     )
     assert valid_project.resolve() in projects
+
+
+def _make_project(path: Path) -> Path:
+    (path / ".errors_fixes").mkdir(parents=True)
+    (path / ".errors_fixes" / "errors_and_fixes.md").write_text(
+        "# Errors\n", encoding="utf-8"
+    )
+    return path
+
+
+def test_nested_projects_found_with_max_depth(tmp_path):
+    """Test root/org/repo layouts are found with max_depth=2 (not with the default 1)."""
+    nested = _make_project(tmp_path / "org" / "repo")
+    top = _make_project(tmp_path / "top")
+
+    assert discovery.discover_projects(tmp_path) == [top.resolve()]
+    assert discovery.discover_projects(tmp_path, max_depth=2) == [
+        nested.resolve(),
+        top.resolve(),
+    ]
+
+
+def test_max_depth_from_env(tmp_path, monkeypatch):
+    """Test DISCOVERY_MAX_DEPTH sets the default depth."""
+    nested = _make_project(tmp_path / "a" / "b" / "c")
+    monkeypatch.setenv("DISCOVERY_MAX_DEPTH", "3")
+
+    assert discovery.discover_projects(tmp_path) == [nested.resolve()]
+
+
+def test_ignored_directories_and_project_subtrees_are_pruned(tmp_path):
+    """Test ignore globs skip directories and projects are not searched further."""
+    outer = _make_project(tmp_path / "org" / "outer")
+    _make_project(tmp_path / "org" / "outer" / "vendored")
+    _make_project(tmp_path / "org" / "node_modules" / "pkg")
+    _make_project(tmp_path / "archive-2023" / "old")
+
+    projects = discovery.discover_projects(tmp_path, max_depth=3, ignore=["archive-*"])
+
+    assert projects == [outer.resolve()]
+
+
+def test_ignore_globs_from_env(tmp_path, monkeypatch):
+    """Test DISCOVERY_IGNORE adds comma-separated globs."""
+    kept = _make_project(tmp_path / "kept")
+    _make_project(tmp_path / "tmp-scratch")
+    monkeypatch.setenv("DISCOVERY_IGNORE", "tmp-*, other")
+
+    assert discovery.discover_projects(tmp_path) == [kept.resolve()]
+
+
+def test_parallel_walk_matches_sequential(tmp_path):
+    """Test the threaded walk returns the same projects in the same order."""
+    for org in ("a", "b", "c"):
+        for repo in ("x", "y"):
+            _make_project(tmp_path / org / repo)
+
+    sequential = discovery.discover_projects(tmp_path, max_depth=2, workers=1)
+    parallel = discovery.discover_projects(tmp_path, max_depth=2, workers=4)
+
+    assert len(sequential) == 6
+    assert parallel == sequential
+
+
+def test_iter_projects_validates_eagerly_and_streams(tmp_path):
+    """Test iter_projects raises on a bad root at call time and yields lazily."""
+    with pytest.raises(FileNotFoundError):
+        discovery.iter_projects(tmp_path / "missing")
+
+    project = _make_project(tmp_path / "p")
+    stream = discovery.iter_projects(tmp_path)
+    assert next(stream) == project.resolve()
+    assert list(stream) == []
+
+
+def _age(*paths: Path) -> None:
+    """Backdate directory mtimes so the cache trusts them."""
+    for path in paths:
+        os.utime(path, (1_600_000_000, 1_600_000_000))
+
+
+def _count_scandir(monkeypatch) -> list:
+    calls: list = []
+    real_scandir = discovery.os.scandir
+
+    def counting_scandir(path):
+        calls.append(Path(path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(discovery.os, "scandir", counting_scandir)
+    return calls
+
+
+def test_discovery_cache_skips_unchanged_directories(tmp_path, monkeypatch):
+    """Test a second walk with the cache lists no unchanged directory."""
+    root = tmp_path / "root"
+    a = _make_project(root / "org" / "a")
+    (root / "org" / "empty").mkdir()
+    _age(root, root / "org", root / "org" / "empty")
+    cache = discovery.DiscoveryCache(tmp_path / "discovery.json")
+
+    first = discovery.discover_projects(root, max_depth=2, cache=cache)
+    calls = _count_scandir(monkeypatch)
+    second = discovery.discover_projects(root, max_depth=2, cache=cache)
+
+    assert first == second == [a.resolve()]
+    assert calls == []
+
+
+def test_discovery_cache_picks_up_new_projects(tmp_path):
+    """Test a directory whose mtime changed is listed again."""
+    root = tmp_path / "root"
+    a = _make_project(root / "org" / "a")
+    _age(root, root / "org")
+    cache = discovery.DiscoveryCache(tmp_path / "discovery.json")
+    discovery.discover_projects(root, max_depth=2, cache=cache)
+
+    b = _make_project(root / "org" / "b")
+
+    assert discovery.discover_projects(root, max_depth=2, cache=cache) == [
+        a.resolve(),
+        b.resolve(),
+    ]
+
+
+def test_discovery_cache_detects_errors_file_in_existing_folder(tmp_path):
+    """Test errors_and_fixes.md created inside an existing .errors_fixes/ is found."""
+    root = tmp_path / "root"
+    (root / "p" / ".errors_fixes").mkdir(parents=True)
+    _age(root, root / "p")
+    cache = discovery.DiscoveryCache(tmp_path / "discovery.json")
+    assert discovery.discover_projects(root, cache=cache) == []
+
+    (root / "p" / ".errors_fixes" / "errors_and_fixes.md").write_text("# Errors\n")
+
+    assert discovery.discover_projects(root, cache=cache) == [(root / "p").resolve()]
+
+
+def test_rescan_and_changed_settings_ignore_cache(tmp_path, monkeypatch):
+    """Test rescan=True and a different max_depth walk everything again."""
+    root = tmp_path / "root"
+    _make_project(root / "org" / "a")
+    _age(root, root / "org")
+    cache = discovery.DiscoveryCache(tmp_path / "discovery.json")
+    discovery.discover_projects(root, max_depth=2, cache=cache)
+    calls = _count_scandir(monkeypatch)
+
+    discovery.discover_projects(root, max_depth=2, cache=cache, rescan=True)
+    assert root in calls
+    calls.clear()
+    discovery.discover_projects(root, max_depth=3, cache=cache)
+    assert root in calls
+
+
+def test_discovery_cache_from_env(tmp_path, monkeypatch):
+    """Test DISCOVERY_CACHE_PATH enables the cache by default."""
+    _make_project(tmp_path / "root" / "p")
+    cache_path = tmp_path / "cache" / "discovery.json"
+    monkeypatch.setenv("DISCOVERY_CACHE_PATH", str(cache_path))
+
+    discovery.discover_projects(tmp_path / "root")
+
+    assert "p" in json.loads(cache_path.read_text(encoding="utf-8"))["dirs"]
@@ -207,3 +207,96 @@ def test_format_code_block_with_content():
     assert "```python" in result
     assert code in result
     assert result.endswith("```")
+
+
+def test_section_cache_rerenders_only_changed_sections(monkeypatch):
+    timestamp = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+    entries = [
+        _build_entry(signature=f"Error{i}", timestamp=timestamp) for i in range(5)
+    ]
+    cache = generator.SectionCache()
+    uncached = generator.generate_fix_repo_markdown(
+        entries, cache=generator.SectionCache(0)
+    )
+    assert generator.generate_fix_repo_markdown(entries, cache=cache) == uncached
+
+    rendered = []
+    real_render = generator._render_fix_repo_section
+
+    def _render(signature, group):
+        rendered.append(signature)
+        return real_render(signature, group)
+
+    monkeypatch.setattr(generator, "_render_fix_repo_section", _render)
+    entries[2] = _build_entry(signature="Error2", timestamp=timestamp, success_count=3)
+    markdown = generator.generate_fix_repo_markdown(entries, cache=cache)
+
+    assert rendered == ["Error2"]
+    assert "Success Count: 3" in markdown
+    assert markdown == generator.generate_fix_repo_markdown(
+        entries, cache=generator.SectionCache(0)
+    )
+
+
+def test_section_cache_is_bounded():
+    cache = generator.SectionCache(max_size=2)
+    for key in ("a", "b", "c"):
+        cache.put((key, (), ()), key)
+
+    assert len(cache) == 2
+    assert cache.get(("a", (), ())) is None
+    assert cache.get(("c", (), ())) == "c"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_section_cache_size_from_env(monkeypatch):
+    monkeypatch.setenv("RENDER_CACHE_SIZE", "0")
+    cache = generator.reset_section_cache()
+    cache.put(("a", (), ()), "a")
+    assert len(cache) == 0
+
+    monkeypatch.delenv("RENDER_CACHE_SIZE")
+    assert (
+        generator.reset_section_cache().max_size == generator.DEFAULT_RENDER_CACHE_SIZE
+    )
+
+
+def test_render_streams_same_markdown_in_chunks():
+    import io
+
+    timestamp = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+    entries = [
+        _build_entry(signature=f"Error{i}", timestamp=timestamp) for i in range(3)
+    ] + [
+        _build_entry(
+            signature=f"Rule{i}",
+            timestamp=timestamp,
+            is_process_issue=True,
+            tags=[f"cat{i}"],
+        )
+        for i in range(3)
+    ]
+
+    chunks = list(generator.iter_fix_repo_markdown(entries))
+    fp = io.StringIO()
+    written = generator.render_fix_repo(entries, fp)
+
+    assert len(chunks) > 3
+    assert (
+        fp.getvalue()
+        == "".join(chunks)
+        == generator.generate_fix_repo_markdown(entries)
+    )
+    assert written == len(fp.getvalue())
+    assert not fp.getvalue().endswith("\n")
+
+    fp = io.StringIO()
+    generator.render_coding_tips(entries, fp)
+    assert fp.getvalue() == generator.generate_coding_tips_markdown(entries)
+    assert fp.getvalue().count("## cat") == 3
+
+
+def test_rstrip_chunks_matches_rstrip_of_joined_text():
+    cases = [["a  ", "\n", "b\n\n"], ["a", "\n\n", " "], ["x\n", "", "y"], ["  "], []]
+    for chunks in cases:
+        assert "".join(generator._rstrip_chunks(chunks)) == "".join(chunks).rstrip()
@@ -0,0 +1,127 @@
+"""Tests for instrumentation.py (stage timers, counters, profiles, trace)."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+from src.consolidation_app.instrumentation import (
+    Instrumentation,
+    count,
+    get_instrumentation,
+    reset_instrumentation,
+    stage,
+)
+
+
+class TestInstrumentation:
+    def test_stages_attributed_to_project_and_run(self):
+        inst = Instrumentation()
+        with inst.project("/p/a"):
+            with inst.stage("parse"):
+                pass
+            with inst.stage("parse"):
+                pass
+            inst.count("entries", 3)
+        with inst.stage("discover"):
+            pass
+
+        report = inst.report()
+        project = report["projects"]["/p/a"]
+        assert project["stages"]["parse"]["calls"] == 2
+        assert project["counters"] == {"entries": 3}
+        assert "discover" not in project["stages"]
+        assert set(report["run"]["stages"]) == {"parse", "discover"}
+        assert report["run"]["counters"] == {"entries": 3}
+
+    def test_stage_recorded_when_block_raises(self):
+        inst = Instrumentation()
+        try:
+            with inst.project("/p/a"), inst.stage("write"):
+                raise OSError("disk full")
+        except OSError:
+            pass
+
+        assert inst.report()["projects"]["/p/a"]["stages"]["write"]["calls"] == 1
+
+    def test_projects_are_per_thread(self):
+        inst = Instrumentation()
+
+        def work(name):
+            with inst.project(name), inst.stage("tag"):
+                inst.count("n")
+
+        threads = [threading.Thread(target=work, args=(f"/p/{i}",)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        report = inst.report()
+        assert len(report["projects"]) == 4
+        assert all(p["counters"] == {"n": 1} for p in report["projects"].values())
+        assert report["run"]["stages"]["tag"]["calls"] == 4
+
+    def test_run_total_is_wall_clock_not_project_sum(self):
+        inst = Instrumentation()
+        barrier = threading.Barrier(4)
+
+        def work(name):
+            with inst.project(name, log=False):
+                barrier.wait()
+                time.sleep(0.05)
+
+        threads = [threading.Thread(target=work, args=(f"/p/{i}",)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = inst.finish()
+
+        run = inst.report()["run"]
+        assert run["seconds"] == round(wall, 6)
+        assert run["project_seconds"] >= 0.2
+        assert run["seconds"] < run["project_seconds"]
+
+    def test_trace_file(self, tmp_path):
+        trace = tmp_path / "out" / "trace.json"
+        inst = Instrumentation(trace_file=trace)
+        with inst.project("/p/a"), inst.stage("parse"):
+            pass
+        inst.write_trace()
+
+        events = json.loads(trace.read_text(encoding="utf-8"))["traceEvents"]
+        names = {e["name"] for e in events}
+        assert names == {"a", "parse"}
+        assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+
+    def test_no_trace_without_file(self):
+        inst = Instrumentation()
+        with inst.project("/p/a"), inst.stage("parse"):
+            pass
+        inst.write_trace()  # no-op
+
+        assert inst._events == []
+
+    def test_profile_per_project(self, tmp_path):
+        inst = Instrumentation(profile_dir=tmp_path)
+        for name in ("/x/my.project", "/y/my.project"):
+            with inst.project(name):
+                sum(range(1000))
+
+        assert len(list(tmp_path.glob("my.project-*.prof"))) == 2
+        assert len(list(tmp_path.glob("my.project-*.txt"))) == 2
+
+
+class TestModuleHelpers:
+    def test_stage_and_count_use_current_run(self):
+        inst = reset_instrumentation()
+        with inst.project("/p/a"):
+            with stage("dedup"):
+                count("merged", 2)
+
+        assert get_instrumentation() is inst
+        project = inst.report()["projects"]["/p/a"]
+        assert "dedup" in project["stages"]
+        assert project["counters"] == {"merged": 2}
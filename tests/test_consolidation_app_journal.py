@@ -0,0 +1,110 @@
+"""Tests for journal.py (crash-safe run journal)."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src.consolidation_app.journal import (
+    STEP_CLEARED,
+    STEP_CODING_TIPS,
+    STEP_FIX_REPO,
+    RunJournal,
+)
+
+
+def _records(path: Path) -> list:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_steps_are_appended_as_jsonl(tmp_path):
+    path = tmp_path / "state" / "journal.jsonl"
+    journal = RunJournal(path).start(tmp_path)
+    journal.record(tmp_path / "a", STEP_FIX_REPO)
+    journal.record(tmp_path / "a", STEP_CODING_TIPS)
+
+    records = _records(path)
+    assert [r["event"] for r in records] == ["run_started", "step", "step"]
+    assert records[0]["root"] == str(tmp_path.resolve())
+    assert {r["run"] for r in records} == {journal.run_id}
+    assert records[2] == {
+        **records[2],
+        "project": str(tmp_path / "a"),
+        "step": STEP_CODING_TIPS,
+    }
+    assert journal.steps(tmp_path / "a") == {STEP_FIX_REPO, STEP_CODING_TIPS}
+    assert not journal.completed(tmp_path / "a")
+
+
+def test_resume_loads_steps_of_interrupted_run(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    first = RunJournal(path).start(tmp_path)
+    first.record(tmp_path / "a", STEP_FIX_REPO)
+    first.record(tmp_path / "a", STEP_CODING_TIPS)
+    first.record(tmp_path / "a", STEP_CLEARED)
+    first.record(tmp_path / "b", STEP_FIX_REPO)
+    first.finish(ok=False)
+    with path.open("a", encoding="utf-8") as f:
+        f.write('{"event": "step", "proj')  # torn write of the crash
+
+    resumed = RunJournal(path).start(tmp_path, resume=True)
+
+    assert resumed.resumed
+    assert resumed.run_id == first.run_id
+    assert resumed.completed(tmp_path / "a")
+    assert resumed.steps(tmp_path / "b") == {STEP_FIX_REPO}
+    assert not resumed.completed(tmp_path / "c")
+
+
+def test_finished_run_is_not_resumed(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    first = RunJournal(path).start(tmp_path)
+    first.record(tmp_path / "a", STEP_CLEARED)
+    first.finish(ok=True)
+
+    second = RunJournal(path).start(tmp_path, resume=True)
+
+    assert not second.resumed
+    assert second.run_id != first.run_id
+    assert not second.completed(tmp_path / "a")
+    assert [r["event"] for r in _records(path)] == ["run_started"]
+
+
+def test_journal_of_other_root_is_not_resumed(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    first = RunJournal(path).start(tmp_path / "one")
+    first.record(tmp_path / "one" / "a", STEP_CLEARED)
+    first.finish(ok=False)
+
+    second = RunJournal(path).start(tmp_path / "two", resume=True)
+
+    assert not second.resumed
+    assert not second.completed(tmp_path / "one" / "a")
+
+
+def test_without_resume_journal_is_truncated(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    first = RunJournal(path).start(tmp_path)
+    first.record(tmp_path / "a", STEP_CLEARED)
+    first.finish(ok=False)
+
+    second = RunJournal(path).start(tmp_path)
+
+    assert not second.completed(tmp_path / "a")
+    assert len(_records(path)) == 1
+
+
+def test_record_rejects_unknown_step(tmp_path):
+    journal = RunJournal(tmp_path / "journal.jsonl").start(tmp_path)
+    with pytest.raises(ValueError, match="Unknown journal step"):
+        journal.record(tmp_path, "written")
+
+
+def test_from_env(monkeypatch, tmp_path):
+    monkeypatch.delenv("RUN_JOURNAL", raising=False)
+    assert RunJournal.from_env() is None
+
+    monkeypatch.setenv("RUN_JOURNAL", str(tmp_path / "j.jsonl"))
+    assert RunJournal.from_env().path == tmp_path / "j.jsonl"
@@ -1,12 +1,28 @@
 """Tests for the consolidation app LLM client module."""
 
+import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, patch
 
 import pytest
 import requests
 
 from src.consolidation_app import llm_client
+from src.consolidation_app.resilience import LLMUnavailableError
+from src.consolidation_app.usage_ledger import LLMBudgetExceededError, reset_ledger
+
+
+@pytest.fixture(autouse=True)
+def _fresh_failure_state():
+    """Isolate circuit breaker and deadline state between tests."""
+    llm_client.reset_circuit_breakers()
+    llm_client.start_run_deadline(0)
+    yield
+    llm_client.reset_circuit_breakers()
+    llm_client.start_run_deadline(0)
 
 
 class TestOllamaClient:
@@ -100,6 +116,91 @@ class TestOllamaClient:
             llm_client.call_ollama("Test")
 
 
+class TestOllamaStreaming:
+    """Tests for streamed Ollama responses and early JSON termination."""
+
+    @staticmethod
+    def _stream(chunks):
+        response = Mock()
+        response.raise_for_status = Mock()
+        response.iter_lines.return_value = [json.dumps(c).encode() for c in chunks]
+        return response
+
+    def test_json_scanner_ignores_braces_in_strings(self):
+        scanner = llm_client._JsonObjectScanner()
+        assert scanner.feed('```json\n{"reason": "a } b \\" {", ') is None
+        text = '```json\n{"reason": "a } b \\" {", "n": {"x": 1}} trailing'
+        end = llm_client._JsonObjectScanner().feed(text)
+        assert json.loads(text[text.index("{") : end]) == {
+            "reason": 'a } b " {',
+            "n": {"x": 1},
+        }
+
+    @patch("src.consolidation_app.llm_client.requests.post")
+    def test_stop_at_json_closes_stream_early(self, mock_post):
+        response = self._stream(
+            [
+                {"response": '{"similarity": '},
+                {"response": '0.9, "reason": "same"}'},
+                {"response": " Here is why I think so..."},
+                {"response": " more prose", "done": True},
+            ]
+        )
+        response.iter_lines.return_value = iter(response.iter_lines.return_value)
+        mock_post.return_value = response
+
+        result = llm_client.call_ollama("Compare", stop_at_json=True)
+
+        assert result == '{"similarity": 0.9, "reason": "same"}'
+        assert mock_post.call_args[1]["stream"] is True
+        assert mock_post.call_args[1]["json"]["stream"] is True
+        response.close.assert_called_once()
+        # The rest of the stream was never consumed
+        assert next(response.iter_lines.return_value) is not None
+        timing = llm_client.get_last_timing()
+        assert timing.time_to_first_token is not None
+        assert timing.time_to_result >= timing.time_to_first_token
+
+    @patch("src.consolidation_app.llm_client.requests.post")
+    def test_stream_reads_until_done_and_records_usage(self, mock_post):
+        mock_post.return_value = self._stream(
+            [
+                {"response": "Hello"},
+                {
+                    "response": ", world",
+                    "done": True,
+                    "prompt_eval_count": 12,
+                    "eval_count": 3,
+                },
+            ]
+        )
+
+        result = llm_client.call_ollama("Hi", stream=True)
+
+        assert result == "Hello, world"
+        assert llm_client.get_last_usage() == llm_client.LLMUsage(12, 3)
+
+    @patch("src.consolidation_app.llm_client.call_ollama")
+    @patch.dict(os.environ, {"LLM_PROVIDER": "ollama"}, clear=False)
+    def test_call_llm_forwards_stop_at_json_to_ollama(self, mock_call_ollama):
+        mock_call_ollama.return_value = "{}"
+
+        llm_client.call_llm("Test", task="default", stop_at_json=True)
+
+        assert mock_call_ollama.call_args[1]["stop_at_json"] is True
+
+    @patch("src.consolidation_app.llm_client.call_openai")
+    @patch.dict(
+        os.environ, {"LLM_PROVIDER": "openai", "OPENAI_API_KEY": "k"}, clear=False
+    )
+    def test_call_llm_stop_at_json_ignored_for_openai(self, mock_call_openai):
+        mock_call_openai.return_value = "{}"
+
+        llm_client.call_llm("Test", task="default", stop_at_json=True)
+
+        assert "stop_at_json" not in mock_call_openai.call_args[1]
+
+
 class TestOpenAIClient:
     """Tests for OpenAI API client."""
 
@@ -412,6 +513,446 @@ class TestUnifiedLLMClient:
         )
 
 
+class TestUsageTracking:
+    """Tests for provider usage capture and estimated-token reporting."""
+
+    @patch("src.consolidation_app.llm_client.requests.post")
+    def test_ollama_usage_recorded(self, mock_post):
+        """Ollama prompt_eval_count/eval_count become the last usage."""
+        mock_response = Mock()
+        mock_response.json.return_value = {
+            "response": "ok",
+            "prompt_eval_count": 42,
+            "eval_count": 7,
+        }
+        mock_response.raise_for_status = Mock()
+        mock_post.return_value = mock_response
+
+        llm_client.call_ollama("Test prompt")
+
+        usage = llm_client.get_last_usage()
+        assert usage == llm_client.LLMUsage(input_tokens=42, output_tokens=7)
+
+    @patch("src.consolidation_app.llm_client.call_ollama")
+    @patch("src.consolidation_app.llm_client.logger")
+    @patch.dict(os.environ, {"LLM_PROVIDER": "ollama"}, clear=False)
+    def test_call_llm_logs_estimated_and_actual_tokens(
+        self, mock_logger, mock_call_ollama
+    ):
+        """call_llm logs its estimate next to the provider-reported count."""
+
+        def fake_call(prompt, **kwargs):
+            llm_client._record_usage(123, 4)
+            return "ok"
+
+        mock_call_ollama.side_effect = fake_call
+
+        llm_client.call_llm("x" * 400, task="default")
+
+        logged = " ".join(call.args[0] for call in mock_logger.info.call_args_list)
+        assert "estimated_input_tokens=100" in logged
+        assert "actual_input_tokens=123" in logged
+
+    @patch.dict(os.environ, {"LLM_MODEL_TAGGING": "gpt-4o-mini"}, clear=False)
+    def test_get_model_for_task_uses_task_override(self):
+        """get_model_for_task follows the LLM_MODEL_<TASK> convention."""
+        assert llm_client.get_model_for_task("tagging") == "gpt-4o-mini"
+        assert llm_client.get_model_for_task("tagging", "explicit") == "explicit"
+
+
+class TestPromptCaching:
+    """Tests for stable system prefixes and per-task cache statistics."""
+
+    @staticmethod
+    def _ok(json_body):
+        response = Mock()
+        response.json.return_value = json_body
+        response.raise_for_status = Mock()
+        return response
+
+    @patch("src.consolidation_app.llm_client.requests.post")
+    @patch.dict(os.environ, {"OLLAMA_KEEP_ALIVE": "1h"}, clear=False)
+    def test_ollama_sends_system_and_keep_alive(self, mock_post):
+        mock_post.return_value = self._ok({"response": "ok"})
+
+        llm_client.call_ollama("Entry", system="Instructions")
+
+        payload = mock_post.call_args[1]["json"]
+        assert payload["system"] == "Instructions"
+        assert payload["prompt"] == "Entry"
+        assert payload["keep_alive"] == "1h"
+
+    @patch("src.consolidation_app.llm_client.requests.post")
+    def test_openai_system_message_and_cached_tokens(self, mock_post):
+        mock_post.return_value = self._ok(
+            {
+                "choices": [{"message": {"content": "ok"}}],
+                "usage": {
+                    "prompt_tokens": 2000,
+                    "completion_tokens": 5,
+                    "prompt_tokens_details": {"cached_tokens": 1536},
+                },
+            }
+        )
+
+        llm_client.call_openai("Entry", api_key="k", system="Instructions")
+
+        messages = mock_post.call_args[1]["json"]["messages"]
+        assert messages == [
+            {"role": "system", "content": "Instructions"},
+            {"role": "user", "content": "Entry"},
+        ]
+        assert llm_client.get_last_usage().cached_tokens == 1536
+
+    @patch("src.consolidation_app.llm_client.requests.post")
+    def test_anthropic_system_block_has_cache_control(self, mock_post):
+        mock_post.return_value = self._ok(
+            {
+                "content": [{"text": "ok"}],
+                "usage": {
+                    "input_tokens": 100,
+                    "output_tokens": 5,
+                    "cache_read_input_tokens": 900,
+                },
+            }
+        )
+
+        llm_client.call_anthropic("Entry", api_key="k", system="Instructions")
+
+        payload = mock_post.call_args[1]["json"]
+        assert payload["system"] == [
+            {
+                "type": "text",
+                "text": "Instructions",
+                "cache_control": {"type": "ephemeral"},
+            }
+        ]
+        assert payload["messages"] == [{"role": "user", "content": "Entry"}]
+        usage = llm_client.get_last_usage()
+        assert (usage.input_tokens, usage.cached_tokens) == (1000, 900)
+
+    @patch("src.consolidation_app.llm_client.call_ollama")
+    @patch.dict(os.environ, {"LLM_PROVIDER": "ollama"}, clear=False)
+    def test_call_llm_passes_system_and_tracks_hit_ratio(self, mock_call_ollama):
+        def fake_call(prompt, **kwargs):
+            assert kwargs["system"] == "Instructions"
+            llm_client._record_usage(1000, 5, 750)
+            return "ok"
+
+        mock_call_ollama.side_effect = fake_call
+        llm_client.reset_cache_stats()
+
+        llm_client.call_llm("Entry", task="tagging", system="Instructions")
+        llm_client.call_llm("Entry", task="tagging", system="Instructions")
+
+        stats = llm_client.get_cache_stats()["tagging"]
+        assert stats.calls == 2
+        assert stats.input_tokens == 2000
+        assert stats.hit_ratio == pytest.approx(0.75)
+
+
+class TestResponseSchema:
+    """Tests for native JSON modes driven by call_llm's response_schema."""
+
+    SCHEMA = {
+        "title": "tags",
+        "type": "object",
+        "properties": {"tags": {"type": "array", "items": {"type": "string"}}},
+        "required": ["tags"],
+    }
+
+    @staticmethod
+    def _ok(json_body):
+        response = Mock()
+        response.json.return_value = json_body
+        response.raise_for_status = Mock()
+        return response
+
+    @patch("src.consolidation_app.llm_client.requests.post")
+    def test_ollama_schema_sent_as_format(self, mock_post):
+        mock_post.return_value = self._ok({"response": '{"tags": []}'})
+
+        llm_client.call_ollama("Entry", schema=self.SCHEMA)
+
+        assert mock_post.call_args[1]["json"]["format"] == self.SCHEMA
+
+    @patch("src.consolidation_app.llm_client.requests.post")
+    def test_openai_schema_sent_as_response_format(self, mock_post):
+        mock_post.return_value = self._ok({"choices": [{"message": {"content": "{}"}}]})
+
+        llm_client.call_openai("Entry", api_key="k", schema=self.SCHEMA)
+
+        response_format = mock_post.call_args[1]["json"]["response_format"]
+        assert response_format == {
+            "type": "json_schema",
+            "json_schema": {"name": "tags", "schema": self.SCHEMA},
+        }
+
+    @patch("src.consolidation_app.llm_client.requests.post")
+    def test_openai_default_model_gets_supported_response_format(self, mock_post):
+        mock_post.return_value = self._ok({"choices": [{"message": {"content": "{}"}}]})
+
+        llm_client.call_openai("Entry", api_key="k", schema=self.SCHEMA)
+
+        payload = mock_post.call_args[1]["json"]
+        assert payload["model"] == llm_client.DEFAULT_OPENAI_MODEL
+        assert payload["response_format"]["type"] == "json_schema"
+
+    @pytest.mark.parametrize(
+        "model, expected",
+        [
+            ("gpt-4o-mini", "json_schema"),
+            ("gpt-4-turbo", "json_object"),
+            ("gpt-3.5-turbo-0125", "json_object"),
+            ("gpt-4", None),
+            ("gpt-4-0613", None),
+        ],
+    )
+    @patch("src.consolidation_app.llm_client.requests.post")
+    def test_openai_response_format_follows_model(self, mock_post, model, expected):
+        mock_post.return_value = self._ok({"choices": [{"message": {"content": "{}"}}]})
+
+        llm_client.call_openai("Entry", model=model, api_key="k", schema=self.SCHEMA)
+
+        response_format = mock_post.call_args[1]["json"].get("response_format")
+        assert (response_format or {}).get("type") == expected
+
+    @patch("src.consolidation_app.llm_client.requests.post")
+    def test_anthropic_schema_uses_forced_tool(self, mock_post):
+        mock_post.return_value = self._ok(
+            {
+                "content": [
+                    {"type": "tool_use", "name": "tags", "input": {"tags": ["docker"]}}
+                ]
+            }
+        )
+
+        result = llm_client.call_anthropic("Entry", api_key="k", schema=self.SCHEMA)
+
+        payload = mock_post.call_args[1]["json"]
+        assert payload["tools"][0]["input_schema"] == self.SCHEMA
+        assert payload["tool_choice"] == {"type": "tool", "name": "tags"}
+        assert json.loads(result) == {"tags": ["docker"]}
+
+    @patch("src.consolidation_app.llm_client.call_openai")
+    @patch.dict(
+        os.environ, {"LLM_PROVIDER": "openai", "OPENAI_API_KEY": "k"}, clear=False
+    )
+    def test_call_llm_forwards_schema(self, mock_call_openai):
+        mock_call_openai.return_value = "{}"
+
+        llm_client.call_llm("Test", task="tagging", response_schema=self.SCHEMA)
+
+        assert mock_call_openai.call_args[1]["schema"] == self.SCHEMA
+
+
+class TestFailureHandling:
+    """Tests for circuit breakers, failover and the run deadline in call_llm."""
+
+    @patch("src.consolidation_app.llm_client.call_ollama")
+    @patch.dict(
+        os.environ,
+        {"LLM_PROVIDER": "ollama", "LLM_CIRCUIT_FAILURE_THRESHOLD": "2"},
+        clear=False,
+    )
+    def test_open_circuit_skips_provider(self, mock_call_ollama):
+        mock_call_ollama.side_effect = ConnectionError("down")
+
+        for _ in range(2):
+            with pytest.raises(ConnectionError, match="down"):
+                llm_client.call_llm("Test")
+        with pytest.raises(LLMUnavailableError, match="circuits open"):
+            llm_client.call_llm("Test")
+
+        assert mock_call_ollama.call_count == 2
+        assert llm_client.get_circuit_breaker("ollama").state == "open"
+
+    @patch("src.consolidation_app.llm_client.call_openai")
+    @patch("src.consolidation_app.llm_client.call_ollama")
+    @patch.dict(
+        os.environ,
+        {
+            "LLM_PROVIDER": "ollama",
+            "LLM_FAILOVER": "ollama, openai, bogus",
+            "LLM_FAILOVER_MODEL_OPENAI": "gpt-4o-mini",
+            "OPENAI_API_KEY": "k",
+        },
+        clear=False,
+    )
+    def test_failover_to_next_provider(self, mock_call_ollama, mock_call_openai):
+        mock_call_ollama.side_effect = requests.exceptions.Timeout("slow")
+        mock_call_openai.return_value = "from openai"
+
+        result = llm_client.call_llm("Test", task="tagging")
+
+        assert result == "from openai"
+        mock_call_openai.assert_called_once_with("Test", model="gpt-4o-mini")
+
+    @patch("src.consolidation_app.llm_client.call_openai")
+    @patch("src.consolidation_app.llm_client.call_ollama")
+    @patch.dict(
+        os.environ, {"LLM_PROVIDER": "ollama", "LLM_FAILOVER": "openai"}, clear=False
+    )
+    def test_no_failover_on_configuration_error(
+        self, mock_call_ollama, mock_call_openai
+    ):
+        mock_call_ollama.side_effect = ValueError("bad config")
+
+        with pytest.raises(ValueError, match="bad config"):
+            llm_client.call_llm("Test")
+
+        mock_call_openai.assert_not_called()
+
+    @patch("src.consolidation_app.llm_client.call_openai")
+    @patch("src.consolidation_app.llm_client.call_ollama")
+    @patch.dict(
+        os.environ, {"LLM_PROVIDER": "ollama", "LLM_FAILOVER": "openai"}, clear=False
+    )
+    def test_unconfigured_failover_is_skipped(self, mock_call_ollama, mock_call_openai):
+        os.environ.pop("OPENAI_API_KEY", None)
+        mock_call_ollama.side_effect = ConnectionError("ollama down")
+
+        with pytest.raises(ConnectionError, match="ollama down"):
+            llm_client.call_llm("Test")
+
+        mock_call_openai.assert_not_called()
+
+    @patch("src.consolidation_app.llm_client.call_openai")
+    @patch("src.consolidation_app.llm_client.call_ollama")
+    @patch.dict(
+        os.environ,
+        {"LLM_PROVIDER": "ollama", "LLM_FAILOVER": "openai", "OPENAI_API_KEY": "k"},
+        clear=False,
+    )
+    def test_failover_error_does_not_mask_primary_outage(
+        self, mock_call_ollama, mock_call_openai
+    ):
+        mock_call_ollama.side_effect = ConnectionError("ollama down")
+        mock_call_openai.side_effect = ValueError("bad response")
+
+        with pytest.raises(ConnectionError, match="ollama down"):
+            llm_client.call_llm("Test")
+
+        mock_call_openai.assert_called_once()
+
+    @pytest.mark.parametrize("status, state", [(400, "closed"), (503, "open")])
+    @patch("src.consolidation_app.llm_client.requests.post")
+    @patch.dict(
+        os.environ,
+        {
+            "LLM_PROVIDER": "openai",
+            "OPENAI_API_KEY": "k",
+            "LLM_CIRCUIT_FAILURE_THRESHOLD": "1",
+        },
+        clear=False,
+    )
+    def test_only_server_errors_count_as_outages(self, mock_post, status, state):
+        response = requests.Response()
+        response.status_code = status
+        response.url = "https://api.openai.com/v1/chat/completions"
+        mock_post.return_value = response
+
+        with pytest.raises(requests.RequestException, match=f"status {status}"):
+            llm_client.call_llm("Test")
+
+        assert llm_client.get_circuit_breaker("openai").state == state
+
+    @patch("src.consolidation_app.llm_client.call_ollama")
+    @patch.dict(os.environ, {"LLM_PROVIDER": "ollama"}, clear=False)
+    def test_expired_run_deadline_fails_fast(self, mock_call_ollama):
+        llm_client.start_run_deadline(0.001)
+        time.sleep(0.01)
+
+        with pytest.raises(LLMUnavailableError, match="deadline"):
+            llm_client.call_llm("Test")
+
+        mock_call_ollama.assert_not_called()
+
+    @patch("src.consolidation_app.llm_client.requests.post")
+    @patch("src.consolidation_app.llm_client.time.sleep")
+    def test_retry_stops_when_deadline_would_pass(self, mock_sleep, mock_post):
+        mock_post.side_effect = requests.exceptions.ConnectionError("refused")
+        llm_client.start_run_deadline(0.5)
+
+        with pytest.raises(ConnectionError):
+            llm_client.call_ollama("Test")
+
+        assert mock_post.call_count == 1
+        mock_sleep.assert_not_called()
+
+
+class TestSingleFlight:
+    """Tests for coalescing identical concurrent call_llm requests."""
+
+    @patch("src.consolidation_app.llm_client.call_ollama")
+    @patch.dict(os.environ, {"LLM_PROVIDER": "ollama"}, clear=False)
+    def test_identical_concurrent_calls_share_one_request(self, mock_call_ollama):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_call(prompt, **kwargs):
+            started.set()
+            release.wait(timeout=5)
+            return f"answer to {prompt}"
+
+        mock_call_ollama.side_effect = slow_call
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            first = pool.submit(llm_client.call_llm, "Same", task="tagging")
+            started.wait(timeout=5)
+            followers = [
+                pool.submit(llm_client.call_llm, "Same", task="tagging")
+                for _ in range(2)
+            ]
+            while (
+                llm_client._inflight._calls
+                and next(iter(llm_client._inflight._calls.values())).waiters < 2
+            ):
+                time.sleep(0.001)
+            release.set()
+            results = [first.result()] + [f.result() for f in followers]
+
+        assert results == ["answer to Same"] * 3
+        assert mock_call_ollama.call_count == 1
+
+    def test_key_depends_on_every_input(self):
+        base = ("ollama", "m", "tagging", "p", "s", {"type": "object"}, False)
+        key = llm_client._single_flight_key(*base)
+        assert key == llm_client._single_flight_key(*base)
+        for index, value in enumerate(
+            ["openai", "m2", "dedup", "p2", None, None, True]
+        ):
+            changed = list(base)
+            changed[index] = value
+            assert llm_client._single_flight_key(*changed) != key
+
+
+class TestUsageBudgets:
+    """Tests for ledger recording and per-task budgets in call_llm."""
+
+    @patch("src.consolidation_app.llm_client.call_ollama")
+    @patch.dict(
+        os.environ,
+        {"LLM_PROVIDER": "ollama", "LLM_BUDGET_TOKENS_TAGGING": "100"},
+        clear=False,
+    )
+    def test_budget_exhaustion_stops_calls(self, mock_call_ollama):
+        def fake_call(prompt, **kwargs):
+            llm_client._record_usage(80, 30)
+            return "ok"
+
+        mock_call_ollama.side_effect = fake_call
+        ledger = reset_ledger()
+
+        assert llm_client.call_llm("Test", task="tagging") == "ok"
+        with pytest.raises(LLMBudgetExceededError):
+            llm_client.call_llm("Test", task="tagging")
+
+        assert mock_call_ollama.call_count == 1
+        assert ledger.task_totals("tagging").input_tokens == 80
+        assert ledger.task_totals("tagging").output_tokens == 30
+
+
 class TestConfiguration:
     """Tests for configuration functions."""
 
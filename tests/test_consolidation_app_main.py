@@ -2,16 +2,24 @@
 
 from __future__ import annotations
 
+import sys
 import tempfile
 from pathlib import Path
 from textwrap import dedent
 from unittest.mock import patch
 
+import pytest
+
+from src.consolidation_app.discovery import iter_projects
 from src.consolidation_app.main import (
     ConsolidationResult,
     _consolidate_one_project,
+    _parse_project,
     consolidate_all_projects,
+    main,
 )
+from src.consolidation_app.parser import ParseCache
+from src.consolidation_app.writer import write_project_outputs
 
 
 def _mk_project_with_errors_fixes(root: Path, content: str) -> Path:
@@ -81,6 +89,24 @@ def test_full_consolidation_workflow():
         assert "**Timestamp:**" not in text, "Entry blocks should be cleared"
 
 
+def test_second_run_merges_with_existing_coding_tips():
+    """Test a run with existing coding_tips.md (undated rules) and new dated issues."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        proj = _mk_project_with_errors_fixes(root, _MINIMAL_PROCESS)
+        assert consolidate_all_projects(root).ok_count == 1
+
+        _mk_project_with_errors_fixes(
+            root, _MINIMAL_PROCESS.replace("Rule X", "Rule Y")
+        )
+        result = consolidate_all_projects(root)
+
+        assert result.fail_count == 0
+        text = (proj / ".errors_fixes" / "coding_tips.md").read_text(encoding="utf-8")
+        assert "Rule X" in text
+        assert "Rule Y" in text
+
+
 def test_dry_run_mode():
     """Test dry-run: no files written, errors_and_fixes not cleared."""
     with tempfile.TemporaryDirectory() as tmp:
@@ -116,15 +142,15 @@ def test_error_handling_one_fails_others_continue():
             bad_proj, _MINIMAL_ERROR.strip() + "\n\n" + _MINIMAL_PROCESS.strip()
         )
 
-        orig = _consolidate_one_project
+        orig = _parse_project
 
-        def wrap(project: Path, *, dry_run: bool = False) -> None:
-            if project == bad_proj:
+        def wrap(project: Path, *args, **kwargs):
+            if project.resolve() == bad_proj.resolve():
                 raise RuntimeError("simulated failure")
-            orig(project, dry_run=dry_run)
+            return orig(project, *args, **kwargs)
 
         with patch(
-            "src.consolidation_app.main._consolidate_one_project",
+            "src.consolidation_app.main._parse_project",
             side_effect=wrap,
         ):
             result = consolidate_all_projects(root, dry_run=False)
@@ -157,3 +183,334 @@ def test_consolidate_one_project_dry_run():
         assert "### Error:" in (
             proj / ".errors_fixes" / "errors_and_fixes.md"
         ).read_text(encoding="utf-8")
+
+
+def test_usage_report_written():
+    """Test the LLM usage report is written at the end of a run."""
+    import json
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _mk_project_with_errors_fixes(root, _MINIMAL_ERROR)
+        report = root / "reports" / "llm_usage.json"
+
+        result = consolidate_all_projects(root, dry_run=True, usage_report=report)
+
+        assert result.ok_count == 1
+        data = json.loads(report.read_text(encoding="utf-8"))
+        assert data["total"]["calls"] == 0
+        assert data["by_task"] == {}
+
+
+def test_profile_and_trace_written():
+    """Test per-project stage timings, cProfile dumps and Chrome trace output."""
+    import json
+    import pstats
+
+    from src.consolidation_app.instrumentation import get_instrumentation
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "root"
+        root.mkdir()
+        _mk_project_with_errors_fixes(
+            root, _MINIMAL_ERROR.strip() + "\n\n" + _MINIMAL_PROCESS.strip()
+        )
+        profile_dir = Path(tmp) / "profiles"
+        trace_file = Path(tmp) / "trace.json"
+
+        result = consolidate_all_projects(
+            root, profile_dir=profile_dir, trace_file=trace_file
+        )
+
+        assert result.ok_count == 1
+        project = get_instrumentation().report()["projects"][str(root)]
+        assert {"parse", "dedup", "tag", "generate", "write", "clear"} <= set(
+            project["stages"]
+        )
+        assert project["counters"]["parse.new"] == 2
+        profiles = list(profile_dir.glob("*.prof"))
+        assert len(profiles) == 1
+        pstats.Stats(str(profiles[0]))
+        events = json.loads(trace_file.read_text(encoding="utf-8"))["traceEvents"]
+        assert {e["cat"] for e in events} == {"project", "stage"}
+        assert all(e["ph"] == "X" for e in events)
+
+
+def test_metrics_textfile_written(monkeypatch):
+    """Test run metrics are written in OpenMetrics format (METRICS_TEXTFILE)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "root"
+        root.mkdir()
+        _mk_project_with_errors_fixes(root, _MINIMAL_ERROR)
+        metrics_file = Path(tmp) / "consolidation.prom"
+        monkeypatch.setenv("METRICS_TEXTFILE", str(metrics_file))
+
+        result = consolidate_all_projects(root)
+
+        assert result.ok_count == 1
+        text = metrics_file.read_text(encoding="utf-8")
+        assert 'consolidation_projects{status="ok"} 1' in text
+        assert 'consolidation_entries{stage="dedup",kind="new"} 1' in text
+        assert text.endswith("# EOF\n")
+
+
+def test_metrics_written_when_discovery_fails():
+    """Test a failed discovery still produces metrics (last_run_success 0)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        metrics_file = Path(tmp) / "consolidation.prom"
+
+        result = consolidate_all_projects(
+            Path(tmp) / "missing", metrics_file=metrics_file
+        )
+
+        assert result.fail_count == 1
+        assert "consolidation_last_run_success 0" in metrics_file.read_text(
+            encoding="utf-8"
+        )
+
+
+@pytest.mark.parametrize("profile", [False, True])
+def test_discovery_error_mid_stream_fails_the_run(tmp_path, profile):
+    """Test a discovery error after the first project is counted, not raised."""
+    proj = _mk_project_with_errors_fixes(tmp_path / "a", _MINIMAL_ERROR)
+
+    def _projects():
+        yield proj
+        raise NotADirectoryError("walk failed")
+
+    result = consolidate_all_projects(
+        tmp_path,
+        projects=_projects(),
+        profile_dir=tmp_path / "prof" if profile else None,
+    )
+
+    assert (result.ok_count, result.fail_count) == (1, 1)
+    assert (proj / ".errors_fixes" / "fix_repo.md").is_file()
+
+
+def test_parse_cache_reuses_unchanged_registries():
+    """Test a ParseCache skips re-parsing fix_repo/coding_tips that did not change."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _mk_project_with_errors_fixes(root, _MINIMAL_ERROR + "\n" + _MINIMAL_PROCESS)
+        consolidate_all_projects(root)
+        _mk_project_with_errors_fixes(root, _MINIMAL_ERROR)
+        cache = ParseCache()
+
+        _consolidate_one_project(root, dry_run=True, parse_cache=cache)
+        _consolidate_one_project(root, dry_run=True, parse_cache=cache)
+
+        assert (cache.misses, cache.hits) == (2, 2)
+
+
+@pytest.fixture
+def _no_log_setup():
+    """Keep main() from installing log handlers (and ./logs) during tests."""
+    with patch("config.logging.setup_logging"):
+        yield
+
+
+@pytest.mark.usefixtures("_no_log_setup")
+def test_main_daemon_uses_schedule(monkeypatch):
+    """Test --daemon parses CONSOLIDATION_SCHEDULE and runs with a shared parse cache."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _mk_project_with_errors_fixes(root, _MINIMAL_ERROR)
+        monkeypatch.setenv("CONSOLIDATION_SCHEDULE", "30 4 * * *")
+        monkeypatch.setattr(sys, "argv", ["main", "--root", str(root), "--daemon"])
+        seen = {}
+
+        def _fake_daemon(schedule, run, *, stop_event):
+            seen["expression"] = schedule.expression
+            run()
+            return 1
+
+        with patch("src.consolidation_app.main.run_daemon", side_effect=_fake_daemon):
+            assert main() == 0
+
+        assert seen["expression"] == "30 4 * * *"
+        assert (root / ".errors_fixes" / "fix_repo.md").is_file()
+
+
+@pytest.mark.usefixtures("_no_log_setup")
+def test_main_daemon_rejects_invalid_schedule(monkeypatch):
+    """Test --daemon exits 1 on an invalid --schedule."""
+    with tempfile.TemporaryDirectory() as tmp:
+        monkeypatch.setattr(
+            sys, "argv", ["main", "--root", tmp, "--daemon", "--schedule", "61 * * * *"]
+        )
+        assert main() == 1
+
+
+def test_consolidate_given_projects_only():
+    """Test projects= consolidates just those projects (watch mode) without discovery."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        changed = _mk_project_with_errors_fixes(root / "changed", _MINIMAL_ERROR)
+        other = _mk_project_with_errors_fixes(root / "other", _MINIMAL_ERROR)
+
+        result = consolidate_all_projects(root, projects=[changed])
+
+        assert result.ok_count == 1
+        assert (changed / ".errors_fixes" / "fix_repo.md").is_file()
+        assert not (other / ".errors_fixes" / "fix_repo.md").exists()
+
+
+def test_rescan_ignores_discovery_cache(monkeypatch):
+    """Test rescan=True reaches discovery."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _mk_project_with_errors_fixes(root, _MINIMAL_ERROR)
+        seen = {}
+        real_iter_projects = iter_projects
+
+        def _spy(*args, **kwargs):
+            seen.update(kwargs)
+            return real_iter_projects(*args, **kwargs)
+
+        monkeypatch.setattr("src.consolidation_app.main.iter_projects", _spy)
+
+        consolidate_all_projects(root, dry_run=True, rescan=True)
+
+        assert seen["rescan"] is True
+
+
+def test_resume_after_crash_repeats_only_missing_steps(tmp_path):
+    """Test a resumed run skips finished projects and does not re-merge fix_repo.md."""
+    from src.consolidation_app import writer
+    from src.consolidation_app.journal import RunJournal
+
+    root = tmp_path / "root"
+    done = _mk_project_with_errors_fixes(root / "done", _MINIMAL_ERROR)
+    crashed = _mk_project_with_errors_fixes(
+        root / "crashed", _MINIMAL_ERROR.strip() + "\n\n" + _MINIMAL_PROCESS.strip()
+    )
+    journal_path = tmp_path / "journal.jsonl"
+
+    real_write_output = writer._write_output
+
+    def _crash_on(project, file_name, content, **kwargs):
+        if project == crashed and file_name == writer.CODING_TIPS_FILE:
+            raise OSError("disk full")
+        return real_write_output(project, file_name, content, **kwargs)
+
+    with patch("src.consolidation_app.writer._write_output", side_effect=_crash_on):
+        first = consolidate_all_projects(root, journal=RunJournal(journal_path))
+    assert (first.ok_count, first.fail_count) == (1, 1)
+    fix_repo = crashed / ".errors_fixes" / "fix_repo.md"
+    merged = fix_repo.read_text(encoding="utf-8")
+
+    with patch(
+        "src.consolidation_app.main._parse_project", wraps=_parse_project
+    ) as parse:
+        result = consolidate_all_projects(
+            root, journal=RunJournal(journal_path), resume=True
+        )
+
+    assert (result.ok_count, result.fail_count, result.skipped_count) == (1, 0, 1)
+    assert [call.args[0] for call in parse.call_args_list] == [crashed]
+    assert fix_repo.read_text(encoding="utf-8") == merged
+    assert "Rule X" in (crashed / ".errors_fixes" / "coding_tips.md").read_text(
+        encoding="utf-8"
+    )
+    errors_file = crashed / ".errors_fixes" / "errors_and_fixes.md"
+    assert "**Timestamp:**" not in errors_file.read_text(encoding="utf-8")
+    assert (done / ".errors_fixes" / "fix_repo.md").is_file()
+
+
+def test_main_resume_requires_journal(monkeypatch, capsys):
+    """Test --resume without --journal or RUN_JOURNAL is a usage error."""
+    monkeypatch.delenv("RUN_JOURNAL", raising=False)
+    monkeypatch.setattr(sys, "argv", ["main", "--root", ".", "--resume"])
+    with pytest.raises(SystemExit):
+        main()
+    assert "--resume needs --journal" in capsys.readouterr().err
+
+
+def test_entries_appended_during_run_are_kept(tmp_path):
+    """Test an entry appended after parsing survives the clear for the next run."""
+    proj = _mk_project_with_errors_fixes(tmp_path, _MINIMAL_ERROR)
+    errors_file = proj / ".errors_fixes" / "errors_and_fixes.md"
+    real_write = write_project_outputs
+
+    def append_then_write(*args, **kwargs):
+        with errors_file.open("a", encoding="utf-8") as f:
+            f.write("\n" + dedent(_MINIMAL_PROCESS).strip() + "\n")
+        return real_write(*args, **kwargs)
+
+    with patch("src.consolidation_app.main.write_project_outputs", append_then_write):
+        assert consolidate_all_projects(tmp_path).ok_count == 1
+
+    content = errors_file.read_text(encoding="utf-8")
+    assert "TypeError: test" not in content
+    assert "### Agent Process Issue: Rule X" in content
+
+
+def test_log_rewritten_after_parse_is_not_merged_twice(tmp_path):
+    """Test a log whose parsed part changed is neither merged nor cleared this run."""
+    proj = _mk_project_with_errors_fixes(tmp_path, _MINIMAL_ERROR)
+    errors_file = proj / ".errors_fixes" / "errors_and_fixes.md"
+    fix_repo = proj / ".errors_fixes" / "fix_repo.md"
+    rewritten = _MINIMAL_ERROR.replace("TypeError: test", "TypeError: edited")
+
+    def parse_then_rewrite(*args, **kwargs):
+        parsed = _parse_project(*args, **kwargs)
+        _mk_project_with_errors_fixes(proj, rewritten)
+        return parsed
+
+    with patch("src.consolidation_app.main._parse_project", parse_then_rewrite):
+        consolidate_all_projects(tmp_path)
+
+    assert not fix_repo.exists()
+    assert "TypeError: edited" in errors_file.read_text(encoding="utf-8")
+
+    consolidate_all_projects(tmp_path)
+
+    merged = fix_repo.read_text(encoding="utf-8")
+    assert "TypeError: edited" in merged
+    assert "TypeError: test" not in merged
+    assert "(Success Count: 1)" in merged
+
+
+def test_skipped_clear_is_not_journaled(tmp_path):
+    """Test a clear skipped because the log changed mid-write is not journaled."""
+    from src.consolidation_app.journal import STEP_CLEARED, STEP_FIX_REPO, RunJournal
+
+    proj = _mk_project_with_errors_fixes(tmp_path / "root", _MINIMAL_ERROR)
+    errors_file = proj / ".errors_fixes" / "errors_and_fixes.md"
+    real_write = write_project_outputs
+
+    def write_then_rewrite(*args, **kwargs):
+        written = real_write(*args, **kwargs)
+        errors_file.write_text("### Error: rewritten\n", encoding="utf-8")
+        return written
+
+    journal = RunJournal(tmp_path / "journal.jsonl")
+    with patch("src.consolidation_app.main.write_project_outputs", write_then_rewrite):
+        consolidate_all_projects(proj, journal=journal)
+
+    steps = journal.steps(proj)
+    assert STEP_FIX_REPO in steps
+    assert STEP_CLEARED not in steps
+    assert errors_file.read_text(encoding="utf-8") == "### Error: rewritten\n"
+
+
+@pytest.mark.usefixtures("_no_log_setup")
+@pytest.mark.parametrize("value", ["abc", "70000", "0"])
+def test_main_ignores_invalid_metrics_port(monkeypatch, tmp_path, value):
+    """Test a bad METRICS_PORT is warned about instead of crashing the CLI."""
+    monkeypatch.setenv("METRICS_PORT", value)
+    monkeypatch.setattr(sys, "argv", ["main", "--root", str(tmp_path), "--dry-run"])
+    with patch("src.consolidation_app.main.MetricsServer") as server:
+        assert main() == 0
+    server.assert_not_called()
+
+
+@pytest.mark.usefixtures("_no_log_setup")
+def test_main_serves_metrics_on_env_port(monkeypatch, tmp_path):
+    """Test METRICS_PORT starts the metrics server on that port."""
+    monkeypatch.setenv("METRICS_PORT", "9105")
+    monkeypatch.setattr(sys, "argv", ["main", "--root", str(tmp_path), "--dry-run"])
+    with patch("src.consolidation_app.main.MetricsServer") as server:
+        assert main() == 0
+    server.assert_called_once_with(9105)
@@ -0,0 +1,93 @@
+"""Tests for markdown_codec.py (shared generator/parser encoding)."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.consolidation_app.markdown_codec import (
+    clear_caches,
+    decode_metadata,
+    decode_tags,
+    decode_timestamp,
+    escape_header,
+    format_date,
+    format_tags,
+    format_timestamp,
+    unescape_header,
+)
+from src.consolidation_app.parser import extract_metadata
+
+
+@pytest.mark.parametrize(
+    "text, escaped",
+    [
+        ("plain text", "plain text"),
+        ("# heading", "\\# heading"),
+        ("a*b_c~d", "a\\*b\\_c\\~d"),
+        ("[link](url)", "\\[link\\]\\(url\\)"),
+        ("<b>`code`</b>", "\\<b\\>\\`code\\`\\</b\\>"),
+    ],
+)
+def test_escape_header_round_trip(text, escaped):
+    assert escape_header(text) == escaped
+    assert unescape_header(escaped) == text
+
+
+def test_unescape_keeps_other_backslashes():
+    assert unescape_header("C:\\path\\n \\# x") == "C:\\path\\n # x"
+
+
+def test_format_timestamp_normalizes_to_utc():
+    aware = datetime(2025, 1, 2, 5, 4, 5, 123456, tzinfo=timezone(timedelta(hours=2)))
+    assert format_timestamp(aware) == "2025-01-02T03:04:05Z"
+    assert format_timestamp(datetime(2025, 1, 2, 3, 4, 5)) == "2025-01-02T03:04:05Z"
+    assert format_date(aware) == "2025-01-02"
+
+
+def test_decode_timestamp_accepts_z_suffix():
+    expected = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    assert decode_timestamp(" 2025-01-02T03:04:05Z ") == expected
+    with pytest.raises(ValueError):
+        decode_timestamp("yesterday")
+
+
+@pytest.mark.parametrize(
+    "tags",
+    [(), ("python",), ("python", "import-error"), ("back`tick", "a,b")],
+)
+def test_tags_round_trip(tags):
+    assert decode_tags(format_tags(tags)) == tags
+
+
+def test_format_tags_accepts_any_iterable():
+    assert format_tags([]) == "None"
+    assert format_tags(iter(["a", "b"])) == "`a`, `b`"
+
+
+def test_decode_tags_of_hand_edited_list():
+    assert decode_tags("python, `docker`,ci ,") == ("python", "docker", "ci")
+
+
+def test_decode_metadata_matches_extract_metadata():
+    block = (
+        "### Error: ImportError\n"
+        "**Project:** `demo`\n"
+        "  **First Seen:** 2025-01-02T03:04:05Z\n"
+        "**Tags:** `python`, `import`\n"
+        "Not metadata: **Bold** text\n"
+        "**Empty:**\n"
+        "**Project:** `overridden`\n"
+    )
+    assert decode_metadata(block) == extract_metadata(block)
+    assert decode_metadata(block)["first_seen"] == "2025-01-02T03:04:05Z"
+    assert decode_metadata(block)["project"] == "overridden"
+
+
+def test_clear_caches():
+    escape_header("cached #")
+    assert escape_header.cache_info().currsize > 0
+    clear_caches()
+    assert escape_header.cache_info().currsize == 0
+    assert decode_tags.cache_info().currsize == 0
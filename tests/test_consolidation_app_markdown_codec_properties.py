@@ -0,0 +1,54 @@
+"""Property-based round-trip tests for markdown_codec.py (needs hypothesis)."""
+
+from __future__ import annotations
+
+from datetime import timezone
+
+import pytest
+
+from src.consolidation_app.markdown_codec import (
+    HEADER_SPECIAL_CHARS,
+    decode_tags,
+    decode_timestamp,
+    escape_header,
+    format_tags,
+    format_timestamp,
+    unescape_header,
+)
+
+hypothesis = pytest.importorskip("hypothesis")
+from hypothesis import given  # noqa: E402
+from hypothesis import strategies as st  # noqa: E402
+
+# Header text as the parser sees it: one line, no surrounding whitespace
+_header_text = st.text(
+    alphabet=st.sampled_from(HEADER_SPECIAL_CHARS + "\\ abcXYZ09:.-'\"é"),
+).map(str.strip)
+
+# Tags as the tagger produces them: no ", " separator or outer spaces
+_tag = st.text(alphabet=st.sampled_from("`, abc-_.09"), min_size=1).filter(
+    lambda t: ", " not in t and t == t.strip() and t != "None"
+)
+
+
+@given(_header_text)
+def test_header_round_trip(text):
+    assert unescape_header(escape_header(text)) == text
+
+
+@given(_header_text)
+def test_escaped_header_has_no_bare_special_chars(text):
+    escaped = escape_header(text)
+    for i, char in enumerate(escaped):
+        if char in HEADER_SPECIAL_CHARS:
+            assert i > 0 and escaped[i - 1] == "\\"
+
+
+@given(st.lists(_tag, max_size=6).map(tuple))
+def test_tags_round_trip(tags):
+    assert decode_tags(format_tags(tags)) == tags
+
+
+@given(st.datetimes(timezones=st.just(timezone.utc)))
+def test_timestamp_round_trip(dt):
+    assert decode_timestamp(format_timestamp(dt)) == dt.replace(microsecond=0)
@@ -0,0 +1,136 @@
+"""Tests for metrics.py (OpenMetrics export, /metrics endpoint, health check)."""
+
+from __future__ import annotations
+
+import time
+import urllib.request
+
+from src.consolidation_app.instrumentation import Instrumentation
+from src.consolidation_app.metrics import (
+    CONTENT_TYPE,
+    MetricsBuilder,
+    MetricsServer,
+    build_run_metrics,
+    check_textfile,
+    latest_metrics,
+    main,
+    set_latest_metrics,
+    write_textfile,
+)
+from src.consolidation_app.usage_ledger import UsageLedger
+
+
+def _run_metrics(fail_count=0, finished_at=1_700_000_000.0):
+    inst = Instrumentation()
+    with inst.project("/p/a"):
+        with inst.stage("parse"):
+            pass
+        inst.count("parse.new", 4)
+        inst.count("dedup.merged", 1)
+        inst.count("write.bytes", 2048)
+    ledger = UsageLedger()
+    ledger.record(
+        "tagging", "ollama", "qwen3:8b", input_tokens=100, output_tokens=10, latency=0.5
+    )
+    ledger.record("tagging", "ollama", "qwen3:8b", latency=1.5, ok=False)
+    return build_run_metrics(
+        ok_count=2,
+        fail_count=fail_count,
+        skipped_count=1,
+        duration=12.5,
+        finished_at=finished_at,
+        instrumentation=inst,
+        ledger=ledger,
+    )
+
+
+class TestBuildRunMetrics:
+    def test_run_and_project_metrics(self):
+        text = _run_metrics()
+
+        assert text.endswith("# EOF\n")
+        assert "consolidation_last_run_duration_seconds 12.5" in text
+        assert "consolidation_last_run_success 1" in text
+        assert 'consolidation_projects{status="skipped"} 1' in text
+        assert 'consolidation_entries{stage="parse",kind="new"} 4' in text
+        assert 'consolidation_entries{stage="dedup",kind="merged"} 1' in text
+        assert "consolidation_written_bytes 2048" in text
+        assert 'consolidation_stage_duration_seconds{stage="parse"}' in text
+
+    def test_llm_metrics(self):
+        text = _run_metrics()
+
+        labels = 'task="tagging",provider="ollama"'
+        assert f"consolidation_llm_calls{{{labels}}} 2" in text
+        assert f"consolidation_llm_failures{{{labels}}} 1" in text
+        assert f'consolidation_llm_tokens{{{labels},direction="input"}} 100' in text
+        assert f"consolidation_llm_latency_seconds_count{{{labels}}} 2" in text
+        assert f"consolidation_llm_latency_seconds_sum{{{labels}}} 2" in text
+        assert (
+            f'consolidation_llm_latency_seconds{{{labels},quantile="0.95"}} 1.5' in text
+        )
+
+    def test_every_sample_has_type(self):
+        text = _run_metrics()
+        typed = {
+            line.split()[2] for line in text.splitlines() if line.startswith("# TYPE")
+        }
+
+        for line in text.splitlines():
+            if line.startswith("#"):
+                continue
+            name = line.split("{")[0].split()[0]
+            assert any(
+                name == t or name in (f"{t}_sum", f"{t}_count") for t in typed
+            ), name
+
+    def test_label_escaping(self):
+        builder = MetricsBuilder()
+        builder.add("x", "gauge", "X.", [({"path": 'a"b\\c'}, 1)])
+
+        assert 'consolidation_x{path="a\\"b\\\\c"} 1' in builder.render()
+
+
+class TestTextfileAndHealthCheck:
+    def test_write_and_check_healthy(self, tmp_path):
+        path = tmp_path / "metrics" / "consolidation.prom"
+        write_textfile(path, _run_metrics(finished_at=time.time()))
+
+        assert check_textfile(path, max_age=60) == (True, "ok")
+        assert main(["--check", str(path), "--max-age", "60"]) == 0
+
+    def test_stale_file_unhealthy(self, tmp_path):
+        path = tmp_path / "consolidation.prom"
+        write_textfile(path, _run_metrics(finished_at=time.time() - 3600))
+
+        healthy, reason = check_textfile(path, max_age=60)
+        assert not healthy
+        assert "ago" in reason
+
+    def test_failed_run_unhealthy(self, tmp_path):
+        path = tmp_path / "consolidation.prom"
+        write_textfile(path, _run_metrics(fail_count=1, finished_at=time.time()))
+
+        assert check_textfile(path, max_age=60) == (False, "last run had failures")
+
+    def test_missing_file_unhealthy(self, tmp_path):
+        assert main(["--check", str(tmp_path / "none.prom")]) == 1
+
+
+class TestMetricsServer:
+    def test_serves_latest_metrics(self):
+        previous = latest_metrics()
+        server = MetricsServer(0, host="127.0.0.1").start()
+        try:
+            set_latest_metrics("consolidation_up 1\n# EOF\n")
+            with urllib.request.urlopen(
+                f"http://127.0.0.1:{server.port}/metrics", timeout=5
+            ) as response:
+                body = response.read().decode("utf-8")
+                content_type = response.headers["Content-Type"]
+        finally:
+            server.stop()
+            set_latest_metrics(previous)
+
+        assert body == "consolidation_up 1\n# EOF\n"
+        assert content_type == CONTENT_TYPE
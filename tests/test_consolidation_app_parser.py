@@ -211,6 +211,13 @@ def test_parse_fix_repo_roundtrip(tmp_path):
     assert not e.is_process_issue
 
 
+def test_default_timestamp_compares_with_parsed_timestamps():
+    """Undated entries (DEFAULT_TIMESTAMP) order before parsed UTC timestamps."""
+    parsed = parser.parse_timestamp("2025-01-01T12:00:00Z")
+    assert parser.DEFAULT_TIMESTAMP < parsed
+    assert max(parser.DEFAULT_TIMESTAMP, parsed) == parsed
+
+
 def test_parse_coding_tips_roundtrip(tmp_path):
     """Parse coding_tips.md produced by generator; round-trip preserves key fields."""
     from src.consolidation_app.generator import generate_coding_tips_markdown
@@ -239,3 +246,44 @@ def test_parse_coding_tips_roundtrip(tmp_path):
     assert e.error_signature == "Rule title"
     assert e.is_process_issue
     assert "category" in e.tags
+
+
+def test_entry_fingerprint_stable_and_content_sensitive():
+    entry = parser.ErrorEntry(
+        error_signature="Sig",
+        error_type="TypeError",
+        file="a.py",
+        line=1,
+        fix_code="x = 1",
+        explanation="e",
+        result="r",
+        success_count=1,
+        tags=["a"],
+        timestamp=datetime(2025, 1, 1),
+        is_process_issue=False,
+    )
+    same = parser.ErrorEntry(**{**entry.__dict__, "tags": ["a"]})
+    changed = parser.ErrorEntry(**{**entry.__dict__, "fix_code": "x = 2"})
+
+    assert parser.entry_fingerprint(entry) == parser.entry_fingerprint(same)
+    assert parser.entry_fingerprint(entry) != parser.entry_fingerprint(changed)
+    assert len(parser.entry_fingerprint(entry)) == 64
+
+
+def test_parse_cache_reparses_changed_file(tmp_path):
+    path = tmp_path / "fix_repo.md"
+    path.write_text("# Fix Repo\n", encoding="utf-8")
+    calls = []
+
+    def _parse(p):
+        calls.append(p)
+        return []
+
+    cache = parser.ParseCache()
+    cache.parse(path, _parse)
+    cache.parse(path, _parse)
+    path.write_text("# Fix Repo\n\nchanged\n", encoding="utf-8")
+    cache.parse(path, _parse)
+
+    assert len(calls) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
@@ -0,0 +1,147 @@
+"""Tests for pipeline.py (staged bounded-queue pipeline)."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from src.consolidation_app.pipeline import Pipeline, PipelineConfig, Stage
+
+
+def test_all_items_pass_through_all_stages():
+    pipeline = Pipeline(
+        [Stage("double", lambda x: x * 2, 3), Stage("inc", lambda x: x + 1, 2)],
+        queue_size=2,
+    )
+
+    results = list(pipeline.run(range(50)))
+
+    assert sorted(r.value for r in results) == [x * 2 + 1 for x in range(50)]
+    assert all(r.ok for r in results)
+    assert {r.item for r in results} == set(range(50))
+
+
+def test_failure_is_isolated_to_its_item():
+    def _parse(x):
+        if x == 3:
+            raise ValueError("bad item")
+        return x
+
+    calls = []
+    pipeline = Pipeline([Stage("parse", _parse, 2), Stage("write", calls.append, 1)])
+
+    results = {r.item: r for r in pipeline.run(range(6))}
+
+    failed = results[3]
+    assert not failed.ok
+    assert failed.failed_stage == "parse"
+    assert isinstance(failed.error, ValueError)
+    assert sorted(calls) == [0, 1, 2, 4, 5]
+
+
+def test_stages_overlap():
+    """Test throughput follows the slowest stage, not the sum of stages."""
+
+    def _slow(x):
+        time.sleep(0.05)
+        return x
+
+    pipeline = Pipeline([Stage("a", _slow), Stage("b", _slow), Stage("c", _slow)])
+    started = time.perf_counter()
+    assert len(list(pipeline.run(range(10)))) == 10
+    elapsed = time.perf_counter() - started
+
+    # Sequential would take 10 * 3 * 0.05 = 1.5s; pipelined about (10 + 2) * 0.05
+    assert elapsed < 1.2
+
+
+def test_bounded_queues_apply_back_pressure():
+    """Test the source is not drained far ahead of a blocked stage."""
+    release = threading.Event()
+    consumed = []
+
+    def _source():
+        for i in range(100):
+            consumed.append(i)
+            yield i
+
+    def _blocked(x):
+        release.wait(timeout=5)
+        return x
+
+    pipeline = Pipeline([Stage("blocked", _blocked, 1)], queue_size=2)
+    results = pipeline.run(_source())
+    thread = threading.Thread(target=lambda: list(results))
+    thread.start()
+    time.sleep(0.2)
+
+    # One item in the stage, two queued, at most one blocked in put()
+    assert len(consumed) <= 4
+    release.set()
+    thread.join(timeout=5)
+    assert len(consumed) == 100
+
+
+def test_source_error_is_raised_after_results():
+    def _source():
+        yield 1
+        yield 2
+        raise OSError("walk failed")
+
+    results = []
+    with pytest.raises(OSError, match="walk failed"):
+        for result in Pipeline([Stage("id", lambda x: x)]).run(_source()):
+            results.append(result.value)
+
+    assert sorted(results) == [1, 2]
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_base_exception_in_stage_does_not_hang_the_run():
+    class _Abort(BaseException):
+        pass
+
+    def _parse(x):
+        if x == 0:
+            raise _Abort()
+        return x
+
+    results = []
+    runner = threading.Thread(
+        target=lambda: results.extend(
+            Pipeline([Stage("parse", _parse, 1)]).run(range(3))
+        ),
+        daemon=True,
+    )
+    runner.start()
+    runner.join(timeout=5)
+
+    assert not runner.is_alive()
+    assert [(r.item, type(r.error), r.failed_stage) for r in results] == [
+        (0, _Abort, "parse")
+    ]
+
+
+def test_closing_early_stops_workers():
+    pipeline = Pipeline([Stage("id", lambda x: x, 2)], queue_size=1)
+    stream = pipeline.run(iter(range(1000)))
+    next(stream)
+    stream.close()
+
+    time.sleep(0.3)
+    assert not [t for t in threading.enumerate() if t.name.startswith("pipeline-")]
+
+
+def test_config_from_env(monkeypatch):
+    monkeypatch.setenv("PIPELINE_PARSE_WORKERS", "4")
+    monkeypatch.setenv("PIPELINE_WRITE_WORKERS", "0")
+    monkeypatch.setenv("PIPELINE_QUEUE_SIZE", "x")
+
+    config = PipelineConfig.from_env()
+
+    assert config.parse_workers == 4
+    assert config.process_workers == 2
+    assert config.write_workers == 1
+    assert config.queue_size == 16
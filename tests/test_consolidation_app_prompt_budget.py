@@ -0,0 +1,122 @@
+"""Tests for the consolidation app prompt budget module."""
+
+import logging
+import sys
+import types
+
+import pytest
+
+from src.consolidation_app import prompt_budget
+from src.consolidation_app.prompt_budget import (
+    TRUNCATION_MARKER,
+    PromptField,
+    _get_encoding,
+    build_prompt,
+    estimate_tokens,
+    get_token_budget,
+    pack_fields,
+    truncate_to_tokens,
+)
+
+
+@pytest.fixture(autouse=True)
+def _heuristic_tokens(monkeypatch):
+    """Use the character heuristic so counts don't depend on tiktoken being installed."""
+    monkeypatch.setattr(prompt_budget, "_get_encoding", lambda model: None)
+    monkeypatch.delenv("LLM_TOKEN_BUDGET", raising=False)
+    monkeypatch.delenv("LLM_TOKEN_BUDGET_TAGGING", raising=False)
+
+
+def test_estimate_tokens_heuristic():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+
+
+def test_truncate_to_tokens_keeps_fitting_text():
+    assert truncate_to_tokens("short", 10) == "short"
+
+
+def test_truncate_to_tokens_marks_cut():
+    text = "x" * 400
+    cut = truncate_to_tokens(text, 10)
+    assert cut.endswith(TRUNCATION_MARKER)
+    assert estimate_tokens(cut) <= 10
+    assert truncate_to_tokens(text, 0) == ""
+
+
+def test_get_token_budget_precedence(monkeypatch):
+    assert get_token_budget("tagging") == prompt_budget.DEFAULT_TOKEN_BUDGET
+    assert get_token_budget("tagging", "gpt-4o-mini") == 16000
+    monkeypatch.setenv("LLM_TOKEN_BUDGET", "500")
+    assert get_token_budget("tagging", "gpt-4o-mini") == 500
+    monkeypatch.setenv("LLM_TOKEN_BUDGET_TAGGING", "200")
+    assert get_token_budget("tagging") == 200
+
+
+def test_get_token_budget_invalid_env_ignored(monkeypatch):
+    monkeypatch.setenv("LLM_TOKEN_BUDGET_TAGGING", "lots")
+    assert get_token_budget("tagging") == prompt_budget.DEFAULT_TOKEN_BUDGET
+
+
+def test_pack_fields_returns_whole_texts_when_they_fit():
+    fields = [PromptField("a", "x" * 40), PromptField("b", "y" * 40)]
+    assert pack_fields(fields, budget=100) == {"a": "x" * 40, "b": "y" * 40}
+
+
+def test_pack_fields_truncates_low_priority_first():
+    fields = [
+        PromptField("sig", "s" * 200, priority=2),
+        PromptField("fix", "f" * 2000, priority=0, min_tokens=10),
+    ]
+    packed = pack_fields(fields, budget=100)
+    assert packed["sig"] == "s" * 200
+    assert packed["fix"].endswith(TRUNCATION_MARKER)
+    assert estimate_tokens(packed["fix"]) <= 50
+
+
+def test_pack_fields_reserves_min_tokens():
+    fields = [
+        PromptField("high", "h" * 4000, priority=5),
+        PromptField("low", "l" * 4000, priority=0, min_tokens=20),
+    ]
+    packed = pack_fields(fields, budget=100)
+    assert estimate_tokens(packed["low"]) == 20
+    assert estimate_tokens(packed["high"]) <= 80
+
+
+def test_pack_fields_shares_equal_priority():
+    fields = [PromptField("a", "a" * 4000), PromptField("b", "b" * 4000)]
+    packed = pack_fields(fields, budget=100)
+    assert abs(estimate_tokens(packed["a"]) - estimate_tokens(packed["b"])) <= 1
+
+
+def test_build_prompt_charges_fixed_text():
+    def render(f):
+        return "Header " * 20 + f["body"]
+
+    prompt = build_prompt(
+        render, [PromptField("body", "b" * 4000)], task="tagging", budget=100
+    )
+    assert estimate_tokens(prompt) <= 100
+    assert prompt.startswith("Header ")
+
+
+def test_unloadable_encoding_falls_back_to_heuristic(monkeypatch, caplog):
+    """Test a tiktoken that cannot fetch its BPE files (offline) is not fatal."""
+
+    def _offline(name):
+        raise OSError("could not download cl100k_base")
+
+    fake = types.SimpleNamespace(encoding_for_model=_offline, get_encoding=_offline)
+    monkeypatch.setitem(sys.modules, "tiktoken", fake)
+    monkeypatch.setattr(prompt_budget, "_get_encoding", _get_encoding)
+    monkeypatch.setattr(prompt_budget, "_encoding_failed", False)
+    _get_encoding.cache_clear()
+
+    with caplog.at_level(logging.WARNING, logger=prompt_budget.__name__):
+        assert estimate_tokens("abcde", "gpt-4o") == 2
+        assert estimate_tokens("abcde", "llama3") == 2
+    _get_encoding.cache_clear()
+
+    assert len([r for r in caplog.records if "tiktoken" in r.getMessage()]) == 1
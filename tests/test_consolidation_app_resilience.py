@@ -0,0 +1,61 @@
+"""Tests for the consolidation app resilience module."""
+
+from unittest.mock import patch
+
+from src.consolidation_app.resilience import CircuitBreaker, RunDeadline, backoff_delay
+
+
+def test_backoff_delay_grows_exponentially_with_jitter():
+    for attempt in range(4):
+        delay = backoff_delay(attempt, base=1.0, cap=100.0)
+        assert 2**attempt / 2 <= delay <= 2**attempt
+
+
+def test_backoff_delay_capped():
+    assert backoff_delay(20, base=1.0, cap=5.0) <= 5.0
+
+
+def test_circuit_opens_after_threshold():
+    breaker = CircuitBreaker("ollama", failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        breaker.record_failure()
+        assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker("ollama", failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_allows_single_probe():
+    breaker = CircuitBreaker("ollama", failure_threshold=1, reset_timeout=10)
+    with patch("src.consolidation_app.resilience.time.monotonic", return_value=100.0):
+        breaker.record_failure()
+    with patch("src.consolidation_app.resilience.time.monotonic", return_value=111.0):
+        assert breaker.allow()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert not breaker.allow()  # probe already in flight
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+    with patch("src.consolidation_app.resilience.time.monotonic", return_value=122.0):
+        assert breaker.allow()
+        breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+
+def test_run_deadline():
+    assert RunDeadline().remaining() is None
+    assert not RunDeadline(0).expired()
+    with patch("src.consolidation_app.resilience.time.monotonic", return_value=0.0):
+        deadline = RunDeadline(5)
+    with patch("src.consolidation_app.resilience.time.monotonic", return_value=3.0):
+        assert deadline.remaining() == 2.0
+    with patch("src.consolidation_app.resilience.time.monotonic", return_value=6.0):
+        assert deadline.expired()
@@ -1,6 +1,7 @@
 """Tests for the consolidation app rule extractor (Phase 4.5)."""
 
 import json
+import threading
 from datetime import datetime
 from unittest.mock import patch
 
@@ -9,14 +10,27 @@ import pytest
 from src.consolidation_app.parser import ErrorEntry
 from src.consolidation_app.rule_extractor import (
     ProcessRule,
+    RuleCache,
     _basic_rule_extraction,
+    _dedupe_rules,
     _group_by_issue_type,
     _parse_llm_rules_response,
     extract_process_rules,
     extract_rules_from_group,
+    group_cache_key,
+    reset_rule_cache,
 )
 
 
+@pytest.fixture(autouse=True)
+def _fresh_rule_cache(monkeypatch):
+    """Each test starts with an empty, in-memory process-wide rule cache."""
+    monkeypatch.delenv("RULE_CACHE_PATH", raising=False)
+    reset_rule_cache()
+    yield
+    reset_rule_cache()
+
+
 def _process_issue(
     signature: str = "Use pathlib for paths",
     issue_type: str = "agent-process",
@@ -110,7 +124,8 @@ def test_extract_process_rules_groups_and_extracts():
     g1b = _process_issue(issue_type="paths", signature="Path B")
     g2 = _process_issue(issue_type="docker", signature="Docker rule")
     with patch("src.consolidation_app.rule_extractor.call_llm") as mock_llm:
-        def side_effect(prompt, task):
+
+        def side_effect(prompt, task, system=None, **kwargs):
             # Discriminate by "Issue Type: X" (unique per group). Avoid "path"/"paths":
             # the shared template contains "pathlib.Path" and "file paths".
             if "Issue Type: paths" in prompt:
@@ -308,6 +323,25 @@ def test_parse_llm_rules_response_defaults():
     assert rules[0].examples_bad == ["Rule violation observed."]
 
 
+def test_parse_llm_rules_response_partial_reply():
+    """Test a reply with only title and rule passes the schema and gets defaults."""
+    raw = json.dumps({"rules": [{"title": "T", "rule": "R"}]})
+    rules = _parse_llm_rules_response(raw)
+    assert len(rules) == 1
+    assert rules[0].title == "T"
+    assert rules[0].rule == "R"
+    assert rules[0].why == "Rationale pending."
+    assert rules[0].examples_good == ["Follows the rule."]
+    assert rules[0].related_errors == []
+
+
+def test_parse_llm_rules_response_missing_core_key_raises():
+    """Test a rule without its statement fails schema validation."""
+    raw = json.dumps({"rules": [{"title": "T"}]})
+    with pytest.raises(ValueError, match=r"\$\.rules\[0\]\.rule is missing"):
+        _parse_llm_rules_response(raw)
+
+
 def test_parse_llm_rules_response_invalid_json_raises():
     """Test _parse_llm_rules_response raises on invalid JSON."""
     with pytest.raises(ValueError, match="Could not parse JSON"):
@@ -346,3 +380,329 @@ def test_extract_rules_from_group_no_llm_uses_basic(mock_call_llm):
     assert len(rules) == 1
     assert rules[0].title == "S"
     mock_call_llm.assert_not_called()
+
+
+def _rules_response(title: str) -> str:
+    """Return a minimal valid LLM rules response."""
+    return json.dumps(
+        {
+            "rules": [
+                {
+                    "title": title,
+                    "rule": "R",
+                    "why": "W",
+                    "examples_good": ["g"],
+                    "examples_bad": ["b"],
+                    "related_errors": [],
+                }
+            ],
+        }
+    )
+
+
+def test_group_cache_key_ignores_order_and_tracks_content():
+    """Test cache key is order-independent but changes with entry content."""
+    a = _process_issue(signature="A")
+    b = _process_issue(signature="B")
+    assert group_cache_key([a, b]) == group_cache_key([b, a])
+    assert group_cache_key([a, b]) != group_cache_key(
+        [a, _process_issue(signature="C")]
+    )
+
+
+def test_group_cache_key_tracks_provider_and_model(monkeypatch):
+    """Test the cache key changes with the configured provider or model."""
+    monkeypatch.setenv("LLM_PROVIDER_RULE_EXTRACTION", "ollama")
+    monkeypatch.setenv("LLM_MODEL_RULE_EXTRACTION", "m1")
+    group = [_process_issue(signature="A")]
+    key = group_cache_key(group)
+
+    assert key == group_cache_key(group, "ollama", "m1")
+    assert key != group_cache_key(group, "openai", "m1")
+    monkeypatch.setenv("LLM_MODEL_RULE_EXTRACTION", "m2")
+    assert key != group_cache_key(group)
+
+
+@patch("src.consolidation_app.rule_extractor.call_llm")
+def test_extract_rules_from_group_cache_hit_skips_llm(mock_call_llm):
+    """Test unchanged group reuses cached rules without an LLM call."""
+    mock_call_llm.return_value = _rules_response("Cached")
+    cache = RuleCache()
+    group = [_process_issue(signature="S1")]
+
+    first = extract_rules_from_group(group, cache=cache)
+    second = extract_rules_from_group(list(group), cache=cache)
+
+    assert [r.title for r in first] == ["Cached"]
+    assert second == first
+    mock_call_llm.assert_called_once()
+
+
+@patch("src.consolidation_app.rule_extractor.call_llm")
+def test_extract_rules_from_group_fallback_not_cached(mock_call_llm):
+    """Test basic-extraction fallbacks are not cached so the LLM is retried."""
+    mock_call_llm.side_effect = RuntimeError("LLM unavailable")
+    cache = RuleCache()
+    group = [_process_issue(signature="S1")]
+
+    extract_rules_from_group(group, cache=cache)
+    extract_rules_from_group(group, cache=cache)
+
+    assert len(cache) == 0
+    assert mock_call_llm.call_count == 2
+
+
+@patch("src.consolidation_app.rule_extractor.call_llm")
+def test_rule_cache_persists_across_instances(mock_call_llm, tmp_path):
+    """Test a saved cache lets a later run skip unchanged groups."""
+    mock_call_llm.return_value = _rules_response("Persisted")
+    path = tmp_path / "rule_cache.json"
+    group = [_process_issue(signature="S1")]
+
+    cache = RuleCache(path)
+    extract_rules_from_group(group, cache=cache)
+    cache.save()
+
+    rules = extract_rules_from_group(group, cache=RuleCache(path))
+
+    assert [r.title for r in rules] == ["Persisted"]
+    mock_call_llm.assert_called_once()
+
+
+def test_rule_cache_drops_least_recently_used(tmp_path):
+    """Test the cache keeps at most max_entries groups, saved and reloaded."""
+    path = tmp_path / "rule_cache.json"
+    rule = [ProcessRule("T", "R", "W", ["g"], ["b"], [])]
+    cache = RuleCache(path, max_entries=2)
+    cache.put("a", rule)
+    cache.put("b", rule)
+    cache.get("a")
+    cache.put("c", rule)
+    cache.save()
+
+    reloaded = RuleCache(path, max_entries=2)
+    assert reloaded.get("b") is None
+    assert reloaded.get("a") == rule
+    assert reloaded.get("c") == rule
+    assert len(RuleCache(path, max_entries=1)) == 1
+
+
+def test_rule_cache_ignores_corrupt_file(tmp_path):
+    """Test an unreadable cache file starts an empty cache."""
+    path = tmp_path / "rule_cache.json"
+    path.write_text("{not json", encoding="utf-8")
+    assert len(RuleCache(path)) == 0
+
+
+def test_extract_process_rules_concurrent_keeps_group_order():
+    """Test concurrent extraction returns rules in sorted group order."""
+    entries = [
+        _process_issue(issue_type=name, signature=f"Sig {name}")
+        for name in ["delta", "alpha", "charlie", "bravo"]
+    ]
+    with patch("src.consolidation_app.rule_extractor.call_llm") as mock_llm:
+        mock_llm.side_effect = (
+            lambda prompt, task, system=None, **kwargs: _rules_response(
+                prompt.split("Issue Type: ", 1)[1].split("\n", 1)[0]
+            )
+        )
+        rules = extract_process_rules(entries, max_workers=4)
+
+    assert [r.title for r in rules] == ["alpha", "bravo", "charlie", "delta"]
+    assert mock_llm.call_count == 4
+
+
+def test_extract_process_rules_only_changed_groups_call_llm():
+    """Test a second run with one changed group makes exactly one LLM call."""
+    cache = RuleCache()
+    paths = _process_issue(issue_type="paths", signature="Path A")
+    docker = _process_issue(issue_type="docker", signature="Docker A")
+    with patch("src.consolidation_app.rule_extractor.call_llm") as mock_llm:
+        mock_llm.return_value = _rules_response("R")
+        extract_process_rules([paths, docker], cache=cache)
+        changed = _process_issue(issue_type="docker", signature="Docker B")
+        extract_process_rules([paths, docker, changed], cache=cache)
+
+    assert mock_llm.call_count == 3
+
+
+def _large_group(count: int) -> list[ErrorEntry]:
+    """Create a group of process issues with long descriptions."""
+    return [
+        _process_issue(signature=f"Issue {i}", description="x" * 500)
+        for i in range(count)
+    ]
+
+
+def test_extract_rules_from_group_small_group_single_call(monkeypatch):
+    """Test groups within the token budget use one extraction call."""
+    monkeypatch.setenv("LLM_TOKEN_BUDGET_RULE_EXTRACTION", "100000")
+    with patch("src.consolidation_app.rule_extractor.call_llm") as mock_llm:
+        mock_llm.return_value = _rules_response("Single")
+        rules = extract_rules_from_group(_large_group(20))
+
+    assert [r.title for r in rules] == ["Single"]
+    mock_llm.assert_called_once()
+
+
+def test_extract_rules_from_group_map_reduce_for_large_group(monkeypatch):
+    """Test oversized groups are chunked (map) then merged (reduce)."""
+    monkeypatch.setenv("LLM_TOKEN_BUDGET_RULE_EXTRACTION", "1000")
+    prompts: list[str] = []
+
+    def side_effect(prompt, task, system=None, **kwargs):
+        prompts.append(system + "\n" + prompt)
+        if system.startswith("You are given process rules"):
+            return _rules_response("Merged rule")
+        first = prompt.split("Summary: ", 1)[1].split("\n", 1)[0]
+        return _rules_response(f"Partial {first}")
+
+    with patch("src.consolidation_app.rule_extractor.call_llm") as mock_llm:
+        mock_llm.side_effect = side_effect
+        rules = extract_rules_from_group(_large_group(20), fallback_to_basic=False)
+
+    map_prompts = [p for p in prompts if p.startswith("You are given a set")]
+    reduce_prompts = [p for p in prompts if p.startswith("You are given process rules")]
+    assert len(map_prompts) > 1
+    assert all(len(p) // 4 <= 1000 for p in map_prompts)
+    # Every issue is covered by exactly one map chunk
+    assert sum(p.count("--- Issue ") for p in map_prompts) == 20
+    assert reduce_prompts
+    assert [r.title for r in rules] == ["Merged rule"]
+
+
+def test_extract_rules_from_group_map_failure_uses_basic_per_chunk(monkeypatch):
+    """Test a failed chunk falls back to basic rules without losing other chunks."""
+    monkeypatch.setenv("LLM_TOKEN_BUDGET_RULE_EXTRACTION", "1000")
+
+    def side_effect(prompt, task, system=None, **kwargs):
+        if "Summary: Issue 0\n" in prompt:
+            raise RuntimeError("LLM unavailable")
+        if system.startswith("You are given process rules"):
+            raise RuntimeError("merge unavailable")
+        return _rules_response("From LLM")
+
+    with patch("src.consolidation_app.rule_extractor.call_llm") as mock_llm:
+        mock_llm.side_effect = side_effect
+        rules = extract_rules_from_group(_large_group(20))
+
+    titles = [r.title for r in rules]
+    assert "From LLM" in titles
+    assert "Issue 0" in titles  # basic extraction for the failed chunk
+    assert titles.count("From LLM") == 1  # deduplicated locally
+
+
+def test_dedupe_rules_merges_same_title():
+    """Test local dedupe merges rules whose titles differ only in case/spacing."""
+    a = ProcessRule("Use  Pathlib", "R", "W", ["g1"], ["b1"], ["e1"])
+    b = ProcessRule("use pathlib", "R2", "W2", ["g2"], ["b1"], ["e2"])
+    merged = _dedupe_rules([a, b])
+    assert len(merged) == 1
+    assert merged[0].rule == "R"
+    assert merged[0].examples_good == ["g1", "g2"]
+    assert merged[0].related_errors == ["e1", "e2"]
+
+
+def test_extract_rules_from_group_map_fallback_not_cached(monkeypatch):
+    """Test map-reduce results with a fallen-back chunk are not cached."""
+    monkeypatch.setenv("LLM_TOKEN_BUDGET_RULE_EXTRACTION", "1000")
+    cache = RuleCache()
+
+    def side_effect(prompt, task, system=None, **kwargs):
+        if "Summary: Issue 0\n" in prompt:
+            raise RuntimeError("LLM unavailable")
+        return _rules_response("From LLM")
+
+    with patch("src.consolidation_app.rule_extractor.call_llm") as mock_llm:
+        mock_llm.side_effect = side_effect
+        rules = extract_rules_from_group(_large_group(20), cache=cache)
+
+    assert rules
+    assert len(cache) == 0
+
+
+def test_extract_rules_from_group_merge_fallback_not_cached(monkeypatch):
+    """Test map-reduce results are not cached when the merge call fails."""
+    monkeypatch.setenv("LLM_TOKEN_BUDGET_RULE_EXTRACTION", "1000")
+    cache = RuleCache()
+
+    def side_effect(prompt, task, system=None, **kwargs):
+        if system.startswith("You are given process rules"):
+            raise RuntimeError("merge unavailable")
+        first = prompt.split("Summary: ", 1)[1].split("\n", 1)[0]
+        return _rules_response(f"Partial {first}")
+
+    with patch("src.consolidation_app.rule_extractor.call_llm") as mock_llm:
+        mock_llm.side_effect = side_effect
+        extract_rules_from_group(_large_group(20), cache=cache)
+
+    assert len(cache) == 0
+
+
+def test_extract_rules_from_group_map_reduce_cached_when_all_from_llm(monkeypatch):
+    """Test a fully LLM-produced map-reduce result is cached."""
+    monkeypatch.setenv("LLM_TOKEN_BUDGET_RULE_EXTRACTION", "1000")
+    cache = RuleCache()
+    with patch("src.consolidation_app.rule_extractor.call_llm") as mock_llm:
+        mock_llm.return_value = _rules_response("Merged rule")
+        extract_rules_from_group(_large_group(20), cache=cache)
+
+    assert len(cache) == 1
+
+
+def test_extract_process_rules_concurrent_groups_map_serially(monkeypatch):
+    """Test oversized groups on the group pool do not open their own map pool."""
+    monkeypatch.setenv("LLM_TOKEN_BUDGET_RULE_EXTRACTION", "1000")
+    entries = [
+        _process_issue(issue_type=name, signature=f"{name} {i}", description="x" * 500)
+        for name in ("alpha", "bravo")
+        for i in range(10)
+    ]
+    threads: set[str] = set()
+
+    def side_effect(prompt, task, system=None, **kwargs):
+        threads.add(threading.current_thread().name)
+        return _rules_response("R")
+
+    with patch("src.consolidation_app.rule_extractor.call_llm") as mock_llm:
+        mock_llm.side_effect = side_effect
+        extract_process_rules(entries, max_workers=2)
+
+    assert threads
+    assert all(name.startswith("rule-extract") for name in threads)
+
+
+def test_extract_process_rules_second_run_reuses_persisted_cache(monkeypatch, tmp_path):
+    """Test a new process with RULE_CACHE_PATH makes no LLM calls for unchanged groups."""
+    monkeypatch.setenv("RULE_CACHE_PATH", str(tmp_path / "rule_cache.json"))
+    entries = [
+        _process_issue(issue_type="paths", signature="Path A"),
+        _process_issue(issue_type="docker", signature="Docker A"),
+    ]
+    with patch("src.consolidation_app.rule_extractor.call_llm") as mock_llm:
+        mock_llm.return_value = _rules_response("R")
+        reset_rule_cache()
+        first = extract_process_rules(entries)
+        assert mock_llm.call_count == 2
+
+        reset_rule_cache()  # next run: cache reloaded from RULE_CACHE_PATH
+        second = extract_process_rules(entries)
+
+    assert mock_llm.call_count == 2
+    assert second == first
+
+
+def test_rule_cache_save_skips_unchanged(tmp_path):
+    """Test save() does not rewrite a cache file without new rules."""
+    path = tmp_path / "rule_cache.json"
+    cache = RuleCache(path)
+    cache.save()
+    assert not path.exists()
+
+    cache.put("k", [ProcessRule("T", "R", "W", [], [], [])])
+    cache.save()
+    before = path.stat().st_mtime_ns
+    RuleCache(path).save()
+    cache.save()
+
+    assert path.stat().st_mtime_ns == before
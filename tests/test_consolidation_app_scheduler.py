@@ -0,0 +1,157 @@
+"""Tests for scheduler.py (cron parsing, next fire time, daemon loop)."""
+
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.consolidation_app.scheduler import CronSchedule, run_daemon
+
+
+def test_parse_fields():
+    """Test *, lists, ranges, steps and names."""
+    schedule = CronSchedule.parse("*/15 9-17/4 1,15 jan-mar mon-fri")
+    assert schedule.minutes == {0, 15, 30, 45}
+    assert schedule.hours == {9, 13, 17}
+    assert schedule.days == {1, 15}
+    assert schedule.months == {1, 2, 3}
+    assert schedule.weekdays == {1, 2, 3, 4, 5}
+
+
+def test_parse_sunday_as_seven_and_macros():
+    """Test day-of-week 7 is Sunday and @daily expands to midnight."""
+    assert CronSchedule.parse("0 0 * * 7").weekdays == {0}
+    daily = CronSchedule.parse("@daily")
+    assert daily.minutes == {0} and daily.hours == {0}
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "0 2 * *",
+        "60 * * * *",
+        "* 24 * * *",
+        "0 0 0 * *",
+        "*/0 * * * *",
+        "5-1 * * * *",
+        "x * * * *",
+    ],
+)
+def test_parse_rejects_invalid(expression):
+    """Test malformed or out-of-range expressions raise ValueError."""
+    with pytest.raises(ValueError):
+        CronSchedule.parse(expression)
+
+
+def test_next_fire_daily():
+    """Test the default schedule fires at the next 02:00."""
+    schedule = CronSchedule.parse("0 2 * * *")
+    assert schedule.next_fire(datetime(2025, 3, 1, 1, 59, 30)) == datetime(
+        2025, 3, 1, 2, 0
+    )
+    assert schedule.next_fire(datetime(2025, 3, 1, 2, 0)) == datetime(2025, 3, 2, 2, 0)
+
+
+def test_next_fire_rolls_over_year():
+    """Test month and year rollover."""
+    schedule = CronSchedule.parse("30 6 1 jan *")
+    assert schedule.next_fire(datetime(2025, 6, 15)) == datetime(2026, 1, 1, 6, 30)
+
+
+def test_next_fire_day_fields_are_ored_when_both_restricted():
+    """Test cron semantics: day-of-month OR day-of-week when both are set."""
+    schedule = CronSchedule.parse("0 0 13 * fri")
+    # 2025-06-06 is a Friday, earlier than the 13th
+    assert schedule.next_fire(datetime(2025, 6, 1)) == datetime(2025, 6, 6)
+    only_weekday = CronSchedule.parse("0 0 * * fri")
+    assert only_weekday.next_fire(datetime(2025, 6, 7)) == datetime(2025, 6, 13)
+
+
+def test_next_fire_leap_day():
+    """Test a schedule that only fires on 29 February."""
+    schedule = CronSchedule.parse("0 0 29 2 *")
+    assert schedule.next_fire(datetime(2025, 3, 1)) == datetime(2028, 2, 29)
+
+
+def test_next_fire_never():
+    """Test an impossible date raises instead of looping forever."""
+    with pytest.raises(ValueError, match="never fires"):
+        CronSchedule.parse("0 0 31 2 *").next_fire(datetime(2025, 1, 1))
+
+
+def test_matches():
+    schedule = CronSchedule.parse("0 2 * * *")
+    assert schedule.matches(datetime(2025, 1, 1, 2, 0, 45))
+    assert not schedule.matches(datetime(2025, 1, 1, 2, 1))
+
+
+class _FakeClock:
+    """Clock whose time advances when the stop event is waited on."""
+
+    def __init__(self, start: datetime) -> None:
+        self.current = start
+        self.waits: list[float] = []
+
+    def now(self) -> datetime:
+        return self.current
+
+
+class _ClockEvent(threading.Event):
+    def __init__(self, clock: _FakeClock) -> None:
+        super().__init__()
+        self.clock = clock
+
+    def wait(self, timeout=None):
+        self.clock.waits.append(timeout)
+        self.clock.current += timedelta(seconds=timeout)
+        return self.is_set()
+
+
+def test_run_daemon_runs_at_fire_times():
+    """Test the daemon sleeps until each fire time and then runs."""
+    clock = _FakeClock(datetime(2025, 1, 1, 1, 58))
+    stop = _ClockEvent(clock)
+    fired: list[datetime] = []
+
+    runs = run_daemon(
+        CronSchedule.parse("0 2 * * *"),
+        lambda: fired.append(clock.now()),
+        stop_event=stop,
+        now=clock.now,
+        max_runs=2,
+    )
+
+    assert runs == 2
+    assert fired == [datetime(2025, 1, 1, 2, 0), datetime(2025, 1, 2, 2, 0)]
+    assert max(clock.waits) <= 60
+
+
+def test_run_daemon_survives_failing_run():
+    """Test an exception in one run does not stop the daemon."""
+    clock = _FakeClock(datetime(2025, 1, 1, 0, 0))
+    calls = []
+
+    def _run():
+        calls.append(1)
+        raise RuntimeError("boom")
+
+    runs = run_daemon(
+        CronSchedule.parse("* * * * *"),
+        _run,
+        stop_event=_ClockEvent(clock),
+        now=clock.now,
+        max_runs=3,
+    )
+
+    assert runs == 3 and len(calls) == 3
+
+
+def test_run_daemon_stops_on_event():
+    """Test setting the stop event ends the loop without running."""
+    stop = threading.Event()
+    stop.set()
+    assert (
+        run_daemon(CronSchedule.parse("* * * * *"), lambda: None, stop_event=stop) == 0
+    )
@@ -0,0 +1,94 @@
+"""Tests for the consolidation app single-flight module."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.consolidation_app.single_flight import SingleFlight
+
+
+def _run_concurrently(group, key, fn, callers):
+    """Run callers that all call group.do(key, fn) while fn is still running.
+
+    fn must block on the returned release event; it is set once every caller
+    has had time to join the call. Returns each caller's result or exception.
+    """
+    started = threading.Barrier(callers + 1)
+    release = threading.Event()
+
+    def call():
+        started.wait(timeout=5)
+        try:
+            return group.do(key, lambda: fn(release))
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        futures = [pool.submit(call) for _ in range(callers)]
+        started.wait(timeout=5)
+        time.sleep(0.2)
+        release.set()
+        return [f.result() for f in futures]
+
+
+def test_concurrent_identical_calls_share_one_execution():
+    group = SingleFlight()
+    calls = []
+
+    def fn(release):
+        calls.append(1)
+        release.wait(timeout=5)
+        return "result"
+
+    results = _run_concurrently(group, "k", fn, callers=4)
+
+    assert len(calls) == 1
+    assert (
+        sorted(results, key=lambda r: r[1])
+        == [("result", False)] + [("result", True)] * 3
+    )
+    assert group.in_flight() == 0
+
+
+def test_concurrent_callers_share_the_exception():
+    group = SingleFlight()
+    calls = []
+
+    def fn(release):
+        calls.append(1)
+        release.wait(timeout=5)
+        raise ConnectionError("down")
+
+    results = _run_concurrently(group, "k", fn, callers=4)
+
+    assert len(calls) == 1
+    assert all(isinstance(r, ConnectionError) for r in results)
+    assert len({id(r) for r in results}) == 1
+    assert group.in_flight() == 0
+
+
+def test_sequential_calls_are_not_cached():
+    group = SingleFlight()
+    counter = iter(range(10))
+    assert group.do("k", lambda: next(counter)) == (0, False)
+    assert group.do("k", lambda: next(counter)) == (1, False)
+
+
+def test_different_keys_run_independently():
+    group = SingleFlight()
+    assert group.do("a", lambda: 1) == (1, False)
+    assert group.do("b", lambda: 2) == (2, False)
+
+
+def test_exception_propagates_and_key_is_released():
+    group = SingleFlight()
+
+    def boom():
+        raise ConnectionError("down")
+
+    with pytest.raises(ConnectionError, match="down"):
+        group.do("k", boom)
+    assert group.in_flight() == 0
+    assert group.do("k", lambda: "ok") == ("ok", False)
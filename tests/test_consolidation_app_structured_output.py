@@ -0,0 +1,82 @@
+"""Tests for the consolidation app structured output module."""
+
+import pytest
+
+from src.consolidation_app.structured_output import parse_json_object, validate_json
+
+
+def test_parse_json_object_plain():
+    assert parse_json_object('{"similarity": 0.9}') == {"similarity": 0.9}
+
+
+def test_parse_json_object_code_fence():
+    text = '```json\n{"tags": ["docker"]}\n```'
+    assert parse_json_object(text) == {"tags": ["docker"]}
+
+
+def test_parse_json_object_unterminated_fence():
+    text = '```json\n{"tags": ["docker"]}'
+    assert parse_json_object(text) == {"tags": ["docker"]}
+
+
+def test_parse_json_object_embedded_in_prose():
+    text = 'Sure! Here is the result: {"rules": [{"title": "A {b}"}]} Hope this helps.'
+    assert parse_json_object(text) == {"rules": [{"title": "A {b}"}]}
+
+
+def test_parse_json_object_skips_undecodable_braces():
+    text = 'Using {placeholders} then {"similarity": 0.5}'
+    assert parse_json_object(text) == {"similarity": 0.5}
+
+
+@pytest.mark.parametrize("text", ["not json", '{"tags": ["a"', "[1, 2]", ""])
+def test_parse_json_object_raises(text):
+    with pytest.raises(ValueError, match="Could not parse JSON"):
+        parse_json_object(text)
+
+
+_RULES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "rules": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "title": {"type": "string"},
+                    "score": {"type": "number"},
+                },
+                "required": ["title"],
+            },
+        }
+    },
+    "required": ["rules"],
+}
+
+
+def test_parse_json_object_validates_against_schema():
+    text = '```json\n{"rules": [{"title": "T", "score": 1}]}\n```'
+    assert parse_json_object(text, _RULES_SCHEMA) == {
+        "rules": [{"title": "T", "score": 1}]
+    }
+
+
+@pytest.mark.parametrize(
+    "value, message",
+    [
+        ({}, r"\$\.rules is missing"),
+        ({"rules": {}}, r"\$\.rules is dict, expected array"),
+        ({"rules": [{"score": 1}]}, r"\$\.rules\[0\]\.title is missing"),
+        ({"rules": [{"title": 3}]}, r"\$\.rules\[0\]\.title is int, expected string"),
+        ({"rules": [{"title": "T", "score": True}]}, r"score is bool, expected number"),
+    ],
+)
+def test_validate_json_rejects_mismatches(value, message):
+    with pytest.raises(ValueError, match=message):
+        validate_json(value, _RULES_SCHEMA)
+
+
+def test_validate_json_accepts_type_lists():
+    validate_json(None, {"type": ["string", "null"]})
+    with pytest.raises(ValueError, match="expected string/null"):
+        validate_json(1, {"type": ["string", "null"]})
@@ -3,7 +3,12 @@
 from datetime import datetime
 
 from src.consolidation_app.parser import ErrorEntry
-from src.consolidation_app.tagger import generate_tags_rule_based
+from src.consolidation_app.tagger import (
+    apply_tags_to_entries,
+    apply_tags_to_entry,
+    generate_tags_batch,
+    generate_tags_rule_based,
+)
 
 
 def _create_entry(
@@ -331,3 +336,54 @@ def test_minimal_entry_still_generates_tags():
     # Should at least have error type tag
     assert len(tags) >= 1
     assert "file-io" in tags
+
+
+def test_generate_tags_batch_matches_per_entry_tagging():
+    """Test batch tagging yields exactly the per-entry tags, in order."""
+    entries = [
+        _create_entry(error_type="FileNotFoundError", file="docker-compose.yml"),
+        _create_entry(error_type="KeyError", file="models.py", explanation="query"),
+        _create_entry(
+            error_type="CustomError",
+            file="C:\\app\\main.py",
+            error_signature="[WinError 5] Access denied",
+        ),
+        _create_entry(
+            error_type="ValueError", file="/usr/lib/app.py", explanation="token"
+        ),
+        _create_entry(error_type="", file="", explanation="", error_signature=""),
+        _create_entry(error_type="ImportError", explanation="uvicorn startup"),
+    ]
+
+    assert generate_tags_batch(entries) == [
+        generate_tags_rule_based(e) for e in entries
+    ]
+
+
+def test_generate_tags_batch_first_pattern_wins_per_row():
+    """Test earlier categories win even when a later one matches first in text."""
+    entry = _create_entry(
+        file="", explanation="fastapi then docker", error_signature=""
+    )
+    assert generate_tags_batch([entry]) == [generate_tags_rule_based(entry)]
+    assert "docker" in generate_tags_batch([entry])[0]
+
+
+def test_generate_tags_batch_empty():
+    """Test batch tagging of no entries."""
+    assert generate_tags_batch([]) == []
+
+
+def test_apply_tags_to_entries_matches_apply_tags_to_entry():
+    """Test batch apply merges tags like the single-entry path."""
+    entries = [
+        _create_entry(error_type="TypeError", file="app.py"),
+        _create_entry(error_type="OSError", file="/var/log/x", explanation="log"),
+    ]
+    assert apply_tags_to_entries(entries) == [apply_tags_to_entry(e) for e in entries]
+
+
+def test_apply_tags_to_entries_reuses_unchanged_entries():
+    """Test entries whose tags don't change are not rebuilt."""
+    entry = apply_tags_to_entry(_create_entry(error_type="KeyError"))
+    assert apply_tags_to_entries([entry])[0] is entry
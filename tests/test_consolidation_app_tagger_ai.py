@@ -196,33 +196,28 @@ def test_generate_tags_ai_handles_empty_tags_list(mock_call_llm):
 
 @patch("src.consolidation_app.tagger_ai.call_llm")
 def test_generate_tags_ai_handles_missing_tags_field(mock_call_llm):
-    """Test that generate_tags_ai handles missing tags field."""
+    """Test that a response without the tags field fails schema validation."""
     entry = _create_entry()
 
     # Mock LLM response without tags field
     mock_response = json.dumps({"error": "No tags provided"})
     mock_call_llm.return_value = mock_response
 
-    tags = generate_tags_ai(entry, fallback_to_rule_based=False)
-
-    assert isinstance(tags, list)
-    assert len(tags) == 0
+    with pytest.raises(RuntimeError, match=r"\$\.tags is missing"):
+        generate_tags_ai(entry, fallback_to_rule_based=False)
 
 
 @patch("src.consolidation_app.tagger_ai.call_llm")
 def test_generate_tags_ai_handles_non_list_tags(mock_call_llm):
-    """Test that generate_tags_ai handles non-list tags field."""
+    """Test that a non-list tags field fails schema validation."""
     entry = _create_entry()
 
     # Mock LLM response with string instead of list
     mock_response = json.dumps({"tags": "file-io,docker,testing"})
     mock_call_llm.return_value = mock_response
 
-    tags = generate_tags_ai(entry, fallback_to_rule_based=False)
-
-    # Should convert to list
-    assert isinstance(tags, list)
-    assert len(tags) >= 0
+    with pytest.raises(RuntimeError, match=r"\$\.tags is str, expected array"):
+        generate_tags_ai(entry, fallback_to_rule_based=False)
 
 
 @patch("src.consolidation_app.tagger_ai.call_llm")
@@ -375,13 +370,13 @@ def test_apply_tags_ai_to_entry_preserves_other_fields(mock_generate_tags_ai):
 
 @patch("src.consolidation_app.tagger_ai.call_llm")
 def test_generate_tags_ai_filters_empty_tags(mock_call_llm):
-    """Test that generate_tags_ai filters out empty or None tags."""
+    """Test that generate_tags_ai filters out empty or blank tags."""
     entry = _create_entry()
 
-    # Mock LLM response with empty/None tags
+    # Mock LLM response with empty/blank tags
     mock_response = json.dumps(
         {
-            "tags": ["valid-tag", "", None, "   ", "another-valid"],
+            "tags": ["valid-tag", "", "   ", "another-valid"],
         }
     )
     mock_call_llm.return_value = mock_response
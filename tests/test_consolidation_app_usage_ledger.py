@@ -0,0 +1,122 @@
+"""Tests for the consolidation app usage ledger module."""
+
+import json
+
+import pytest
+
+from src.consolidation_app.usage_ledger import (
+    LLMBudgetExceededError,
+    UsageLedger,
+    estimate_cost,
+    get_ledger,
+    reset_ledger,
+)
+
+
+@pytest.fixture(autouse=True)
+def _no_budget_env(monkeypatch):
+    for key in (
+        "LLM_BUDGET_TOKENS",
+        "LLM_BUDGET_USD",
+        "LLM_BUDGET_TOKENS_TAGGING",
+        "LLM_PRICES",
+    ):
+        monkeypatch.delenv(key, raising=False)
+
+
+def test_estimate_cost_longest_prefix_and_cache_discount():
+    # gpt-4o-mini must not be priced as gpt-4o
+    assert estimate_cost("openai", "gpt-4o-mini", 1_000_000, 0) == pytest.approx(0.15)
+    assert estimate_cost("openai", "gpt-4o", 1_000_000, 1_000_000) == pytest.approx(
+        12.5
+    )
+    # Half of the prompt from OpenAI's cache at 50%
+    assert estimate_cost("openai", "gpt-4o", 1_000_000, 0, 500_000) == pytest.approx(
+        1.875
+    )
+    assert estimate_cost("ollama", "qwen2.5-coder:14b", 1_000_000, 1_000_000) == 0.0
+
+
+def test_estimate_cost_price_override(monkeypatch):
+    monkeypatch.setenv("LLM_PRICES", json.dumps({"qwen": [1.0, 2.0]}))
+    assert estimate_cost(
+        "ollama", "qwen2.5-coder:14b", 1_000_000, 1_000_000
+    ) == pytest.approx(3.0)
+
+
+def test_report_aggregates_by_task_and_provider():
+    ledger = UsageLedger()
+    for latency in (0.1, 0.2, 0.3, 0.4):
+        ledger.record(
+            "tagging",
+            "ollama",
+            "qwen",
+            input_tokens=100,
+            output_tokens=10,
+            latency=latency,
+        )
+    ledger.record(
+        "tagging",
+        "openai",
+        "gpt-4o",
+        input_tokens=1000,
+        output_tokens=100,
+        cached_tokens=500,
+    )
+    ledger.record("deduplication", "ollama", "qwen", latency=2.0, ok=False)
+
+    report = ledger.report()
+
+    assert report["total"]["calls"] == 6
+    assert report["total"]["failures"] == 1
+    tagging = report["by_task"]["tagging"]
+    assert tagging["input_tokens"] == 1400
+    assert tagging["cache_hit_ratio"] == pytest.approx(500 / 1400, abs=1e-4)
+    assert tagging["estimated_cost_usd"] > 0
+    assert report["by_provider"]["ollama"]["calls"] == 5
+    assert report["by_provider"]["ollama"]["latency_p50_s"] == 0.3
+    assert report["by_provider"]["ollama"]["latency_p95_s"] == 2.0
+    assert {(row["task"], row["provider"]) for row in report["by_task_provider"]} == {
+        ("deduplication", "ollama"),
+        ("tagging", "ollama"),
+        ("tagging", "openai"),
+    }
+
+
+def test_token_budget_per_task(monkeypatch):
+    monkeypatch.setenv("LLM_BUDGET_TOKENS_TAGGING", "150")
+    ledger = UsageLedger()
+    ledger.check_budget("tagging")
+    ledger.record("tagging", "ollama", "qwen", input_tokens=100, output_tokens=50)
+
+    with pytest.raises(LLMBudgetExceededError, match="task=tagging"):
+        ledger.check_budget("tagging")
+    ledger.check_budget("deduplication")  # other tasks unaffected
+
+
+def test_cost_budget_default_for_all_tasks(monkeypatch):
+    monkeypatch.setenv("LLM_BUDGET_USD", "0.01")
+    ledger = UsageLedger()
+    ledger.record(
+        "rule_extraction", "openai", "gpt-4", input_tokens=1000, output_tokens=0
+    )
+
+    with pytest.raises(LLMBudgetExceededError, match="cost budget"):
+        ledger.check_budget("rule_extraction")
+
+
+def test_write_report(tmp_path):
+    ledger = UsageLedger()
+    ledger.record("tagging", "ollama", "qwen", input_tokens=5)
+    path = tmp_path / "out" / "usage.json"
+
+    ledger.write_report(path)
+
+    assert json.loads(path.read_text(encoding="utf-8"))["total"]["input_tokens"] == 5
+
+
+def test_reset_ledger_starts_fresh_run():
+    get_ledger().record("tagging", "ollama", "qwen", input_tokens=5)
+    ledger = reset_ledger()
+    assert ledger is get_ledger()
+    assert ledger.report()["total"]["calls"] == 0
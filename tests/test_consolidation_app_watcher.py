@@ -0,0 +1,178 @@
+"""Tests for watcher.py (debounced per-project change detection)."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from src.consolidation_app.watcher import ERRORS_FILE, ProjectWatcher
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _project(root: Path, name: str) -> Path:
+    project = root / name
+    (project / ".errors_fixes").mkdir(parents=True)
+    (project / ERRORS_FILE).write_text("# Errors and Fixes\n", encoding="utf-8")
+    return project
+
+
+def _append(project: Path, text: str) -> None:
+    path = project / ERRORS_FILE
+    with path.open("a", encoding="utf-8") as f:
+        f.write(text)
+    # Distinct mtime even on coarse-grained file systems
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+def _watcher(tmp_path, projects, batches, clock, **kwargs):
+    return ProjectWatcher(
+        lambda: list(projects),
+        batches.append,
+        debounce=5.0,
+        poll_interval=1.0,
+        rescan_interval=60.0,
+        backend="polling",
+        clock=clock,
+        **kwargs,
+    )
+
+
+def test_change_is_debounced_and_only_affected_project_runs(tmp_path):
+    a, b = _project(tmp_path, "a"), _project(tmp_path, "b")
+    batches: list = []
+    clock = _Clock()
+    watcher = _watcher(tmp_path, [a, b], batches, clock)
+    watcher.tick()  # initial scan: nothing pending
+    assert batches == []
+
+    _append(a, "### Error: one\n")
+    watcher.tick()
+    clock.now += 3
+    _append(a, "### Error: two\n")
+    watcher.tick()
+    assert batches == []  # still within the debounce window
+
+    clock.now += 5
+    watcher.tick()
+    assert batches == [[a]]
+
+
+def test_own_clear_does_not_retrigger(tmp_path):
+    a = _project(tmp_path, "a")
+    batches: list = []
+    clock = _Clock()
+
+    def _consolidate(projects):
+        batches.append(projects)
+        for project in projects:
+            (project / ERRORS_FILE).write_text("# cleared\n", encoding="utf-8")
+
+    watcher = ProjectWatcher(
+        lambda: [a],
+        _consolidate,
+        debounce=1.0,
+        rescan_interval=60.0,
+        backend="polling",
+        clock=clock,
+    )
+    watcher.tick()
+    _append(a, "### Error: one\n")
+    watcher.tick()
+    clock.now += 2
+    watcher.tick()
+    clock.now += 2
+    watcher.tick()
+
+    assert batches == [[a]]
+
+
+def test_append_during_run_is_consolidated_again(tmp_path):
+    a = _project(tmp_path, "a")
+    batches: list = []
+    clock = _Clock()
+
+    def _consolidate(projects):
+        batches.append(projects)
+        for project in projects:
+            # Cleared, but an agent appended while the run was in progress
+            (project / ERRORS_FILE).write_text("# cleared\n", encoding="utf-8")
+            if len(batches) == 1:
+                _append(project, "### Error: late\n")
+
+    watcher = ProjectWatcher(
+        lambda: [a],
+        _consolidate,
+        debounce=1.0,
+        rescan_interval=60.0,
+        backend="polling",
+        clock=clock,
+    )
+    watcher.tick()
+    _append(a, "### Error: one\n")
+    watcher.tick()
+    clock.now += 2
+    watcher.tick()
+    clock.now += 2
+    watcher.tick()
+    clock.now += 2
+    watcher.tick()
+
+    assert batches == [[a], [a]]
+
+
+def test_continuous_changes_flush_after_max_delay(tmp_path):
+    a = _project(tmp_path, "a")
+    batches: list = []
+    clock = _Clock()
+    watcher = _watcher(tmp_path, [a], batches, clock)
+    watcher.tick()
+    for i in range(40):
+        _append(a, f"### Error: {i}\n")
+        watcher.tick()
+        if batches:
+            break
+        clock.now += 1
+
+    assert batches == [[a]]
+    assert clock.now - 1000.0 <= 31
+
+
+def test_new_project_found_on_rescan_is_consolidated(tmp_path):
+    a = _project(tmp_path, "a")
+    projects = [a]
+    batches: list = []
+    clock = _Clock()
+    watcher = _watcher(tmp_path, projects, batches, clock)
+    watcher.tick()
+
+    b = _project(tmp_path, "b")
+    projects.append(b)
+    clock.now += 60
+    watcher.tick()
+    clock.now += 5
+    watcher.tick()
+
+    assert batches == [[b]]
+
+
+def test_invalid_backend_rejected():
+    with pytest.raises(ValueError, match="WATCH_BACKEND"):
+        ProjectWatcher(lambda: [], lambda projects: None, backend="inotify")
+
+
+def test_auto_backend_falls_back_to_polling(monkeypatch):
+    monkeypatch.setattr(
+        "src.consolidation_app.watcher.watchdog_available", lambda: False
+    )
+    watcher = ProjectWatcher(lambda: [], lambda projects: None)
+    assert watcher.backend == "polling"
@@ -9,9 +9,13 @@ import pytest
 
 from src.consolidation_app.parser import ErrorEntry
 from src.consolidation_app.writer import (
+    CODING_TIPS_FILE,
+    FIX_REPO_FILE,
+    LogSnapshot,
     clear_errors_and_fixes,
     write_coding_tips,
     write_fix_repo,
+    write_project_outputs,
 )
 
 
@@ -416,3 +420,136 @@ def test_clear_errors_and_fixes_atomic_write(tmp_path):
     assert errors_file.exists()
     # Temp file should not exist after successful write
     assert not temp_file.exists()
+
+
+def test_unchanged_output_is_not_rewritten(tmp_path):
+    """Test an identical fix_repo.md keeps its mtime (write-if-changed)."""
+    entry = _build_entry(
+        signature="ExampleError",
+        timestamp=datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc),
+    )
+    assert write_fix_repo(tmp_path, [entry]) is True
+    output_file = tmp_path / ".errors_fixes" / "fix_repo.md"
+    before = output_file.stat().st_mtime_ns
+
+    assert write_fix_repo(tmp_path, [entry]) is False
+    assert output_file.stat().st_mtime_ns == before
+
+    updated = _build_entry(
+        signature="ExampleError",
+        timestamp=datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc),
+        success_count=2,
+    )
+    assert write_fix_repo(tmp_path, [updated]) is True
+    assert "Success Count: 2" in output_file.read_text(encoding="utf-8")
+
+
+def test_write_project_outputs_writes_both_files(tmp_path):
+    """Test one call writes fix_repo.md and coding_tips.md from mixed entries."""
+    timestamp = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+    entries = [
+        _build_entry(signature="ExampleError", timestamp=timestamp),
+        _build_entry(
+            signature="ProcessRule", timestamp=timestamp, is_process_issue=True
+        ),
+    ]
+    done = []
+
+    written = write_project_outputs(
+        tmp_path, entries, fsync=True, on_written=done.append
+    )
+
+    assert written == {FIX_REPO_FILE: True, CODING_TIPS_FILE: True}
+    assert done == [FIX_REPO_FILE, CODING_TIPS_FILE]
+    fix_repo = (tmp_path / ".errors_fixes" / FIX_REPO_FILE).read_text(encoding="utf-8")
+    coding_tips = (tmp_path / ".errors_fixes" / CODING_TIPS_FILE).read_text(
+        encoding="utf-8"
+    )
+    assert "ExampleError" in fix_repo and "ProcessRule" not in fix_repo
+    assert "ProcessRule" in coding_tips and "ExampleError" not in coding_tips
+
+    again = write_project_outputs(tmp_path, entries, coding_tips=False)
+    assert again == {FIX_REPO_FILE: False}
+
+
+def test_clear_errors_and_fixes_skips_cleared_file(tmp_path):
+    """Test clearing an already cleared errors_and_fixes.md leaves it untouched."""
+    errors_file = tmp_path / ".errors_fixes" / "errors_and_fixes.md"
+    errors_file.parent.mkdir()
+    errors_file.write_text("### Error: test\n", encoding="utf-8")
+    clear_errors_and_fixes(tmp_path)
+    before = errors_file.stat().st_mtime_ns
+
+    clear_errors_and_fixes(tmp_path)
+
+    assert errors_file.stat().st_mtime_ns == before
+
+
+def test_failed_stream_keeps_existing_file(tmp_path, monkeypatch):
+    """Test an error while streaming leaves the old file and no temp file."""
+    from src.consolidation_app import writer
+
+    entry = _build_entry(
+        signature="ExampleError",
+        timestamp=datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc),
+    )
+    write_fix_repo(tmp_path, [entry])
+    output_file = tmp_path / ".errors_fixes" / FIX_REPO_FILE
+    before = output_file.read_text(encoding="utf-8")
+
+    def _broken(entries):
+        yield "# Fix Repository\n"
+        raise RuntimeError("render failed")
+
+    monkeypatch.setattr(writer, "iter_fix_repo_markdown", _broken)
+    with pytest.raises(RuntimeError):
+        write_fix_repo(tmp_path, [entry])
+
+    assert output_file.read_text(encoding="utf-8") == before
+    assert not output_file.with_suffix(".tmp").exists()
+
+
+def test_clear_keeps_entries_appended_after_parse(tmp_path):
+    """Test clearing with a parse snapshot keeps entries appended since."""
+    errors_file = tmp_path / ".errors_fixes" / "errors_and_fixes.md"
+    errors_file.parent.mkdir()
+    errors_file.write_text("# Log\n\n### Error: parsed\n", encoding="utf-8")
+    parsed = LogSnapshot.of(errors_file.read_bytes())
+    with errors_file.open("a", encoding="utf-8") as f:
+        f.write("\n### Error: appended\n")
+
+    assert clear_errors_and_fixes(tmp_path, parsed) is True
+
+    content = errors_file.read_text(encoding="utf-8")
+    assert content.startswith("# Errors and Fixes Log")
+    assert "parsed" not in content
+    assert content.endswith("### Error: appended\n")
+
+
+def test_clear_with_unchanged_snapshot_clears_everything(tmp_path):
+    """Test clearing with a snapshot of the whole file leaves the header only."""
+    errors_file = tmp_path / ".errors_fixes" / "errors_and_fixes.md"
+    errors_file.parent.mkdir()
+    errors_file.write_text("### Error: parsed\n", encoding="utf-8")
+
+    clear_errors_and_fixes(tmp_path, LogSnapshot.of(errors_file.read_bytes()))
+
+    content = errors_file.read_text(encoding="utf-8")
+    assert content.startswith("# Errors and Fixes Log")
+    assert "parsed" not in content
+
+
+def test_clear_skips_file_rewritten_since_parse(tmp_path):
+    """Test a file whose parsed content changed is not cleared."""
+    errors_file = tmp_path / ".errors_fixes" / "errors_and_fixes.md"
+    errors_file.parent.mkdir()
+    errors_file.write_text("### Error: parsed\n", encoding="utf-8")
+    parsed = LogSnapshot.of(errors_file.read_bytes())
+    errors_file.write_text("### Error: rewritten by an agent\n", encoding="utf-8")
+
+    assert clear_errors_and_fixes(tmp_path, parsed) is False
+
+    assert (
+        errors_file.read_text(encoding="utf-8") == "### Error: rewritten by an agent\n"
+    )
+    assert not errors_file.with_suffix(".tmp").exists()
@@ -0,0 +1,137 @@
+# File: tests/test_scripts_generate_synthetic_corpus.py
+# Description: Unit tests for generate_synthetic_corpus.py script
+# Version: 1.0
+
+
+import json
+
+import pytest
+
+from scripts.generate_synthetic_corpus import CorpusConfig, generate_corpus, main
+from src.consolidation_app.discovery import discover_projects
+from src.consolidation_app.parser import (
+    parse_coding_tips,
+    parse_errors_and_fixes,
+    parse_fix_repo,
+)
+
+
+def _read_tree(root):
+    return {
+        str(path.relative_to(root)): path.read_bytes()
+        for path in sorted(root.rglob("*"))
+        if path.is_file()
+    }
+
+
+class TestGenerateCorpus:
+    """Test generate_corpus function."""
+
+    def test_same_seed_is_byte_identical(self, tmp_path):
+        config = CorpusConfig(projects=3, entries=20, fix_repo_entries=10, seed=7)
+        generate_corpus(tmp_path / "a", config)
+        generate_corpus(tmp_path / "b", config)
+
+        assert _read_tree(tmp_path / "a") == _read_tree(tmp_path / "b")
+
+    def test_different_seed_differs(self, tmp_path):
+        generate_corpus(tmp_path / "a", CorpusConfig(projects=1, seed=1))
+        generate_corpus(tmp_path / "b", CorpusConfig(projects=1, seed=2))
+
+        assert _read_tree(tmp_path / "a") != _read_tree(tmp_path / "b")
+
+    def test_files_parse_and_are_discovered(self, tmp_path):
+        config = CorpusConfig(
+            projects=2,
+            entries=40,
+            entries_jitter=0.0,
+            fix_repo_entries=15,
+            coding_tips_entries=5,
+        )
+        manifest = generate_corpus(tmp_path, config)
+
+        projects = discover_projects(tmp_path)
+        assert len(projects) == 2
+        session = parse_errors_and_fixes(
+            projects[0] / ".errors_fixes" / "errors_and_fixes.md"
+        )
+        assert len(session) == 40
+        fix_repo = parse_fix_repo(projects[0] / ".errors_fixes" / "fix_repo.md")
+        assert len(fix_repo) == 15
+        assert parse_coding_tips(projects[0] / ".errors_fixes" / "coding_tips.md")
+        assert manifest["counts"]["session_entries"] == 80
+
+    def test_rates_control_mix(self, tmp_path):
+        config = CorpusConfig(
+            projects=1,
+            entries=1000,
+            entries_jitter=0.0,
+            fix_repo_entries=0,
+            duplicate_rate=0.5,
+            near_duplicate_rate=0.0,
+            process_ratio=0.2,
+        )
+        manifest = generate_corpus(tmp_path, config)
+        counts = manifest["counts"]
+
+        entries = parse_errors_and_fixes(
+            tmp_path / "project-0000" / ".errors_fixes" / "errors_and_fixes.md"
+        )
+        process = [e for e in entries if e.is_process_issue]
+        errors = [e for e in entries if not e.is_process_issue]
+        assert len(process) == counts["process_issues"]
+        assert 150 < len(process) < 250
+        assert counts["near_duplicates"] == 0
+        keys = {(e.error_signature, e.error_type, e.file, e.fix_code) for e in errors}
+        assert len(errors) - len(keys) == counts["duplicates"]
+
+    def test_fix_code_size(self, tmp_path):
+        config = CorpusConfig(
+            projects=1,
+            entries=30,
+            process_ratio=0.0,
+            duplicate_rate=0.0,
+            near_duplicate_rate=0.0,
+            fix_lines_min=5,
+            fix_lines_max=5,
+        )
+        generate_corpus(tmp_path, config)
+
+        entries = parse_errors_and_fixes(
+            tmp_path / "project-0000" / ".errors_fixes" / "errors_and_fixes.md"
+        )
+        assert entries
+        assert all(len(e.fix_code.splitlines()) == 5 for e in entries)
+
+    def test_empty_history_is_reproducible(self, tmp_path):
+        config = CorpusConfig(projects=1, fix_repo_entries=0, coding_tips_entries=0)
+        generate_corpus(tmp_path / "a", config)
+        generate_corpus(tmp_path / "b", config)
+
+        assert _read_tree(tmp_path / "a") == _read_tree(tmp_path / "b")
+
+
+class TestMain:
+    """Test CLI entry point."""
+
+    def test_writes_manifest(self, tmp_path):
+        assert (
+            main([str(tmp_path), "--projects", "2", "--entries", "5", "--seed", "3"])
+            == 0
+        )
+
+        manifest = json.loads((tmp_path / "manifest.json").read_text(encoding="utf-8"))
+        assert manifest["config"]["seed"] == 3
+        assert manifest["config"]["projects"] == 2
+
+    def test_rejects_rates_over_one(self, tmp_path):
+        with pytest.raises(SystemExit):
+            main(
+                [
+                    str(tmp_path),
+                    "--duplicate-rate",
+                    "0.7",
+                    "--near-duplicate-rate",
+                    "0.5",
+                ]
+            )
@@ -0,0 +1,190 @@
+# File: tests/test_scripts_mock_llm_server.py
+# Description: Unit tests for mock_llm_server.py script
+# Version: 1.0
+
+
+import json
+
+import pytest
+import requests
+
+from scripts.mock_llm_server import (
+    OLLAMA_PATH,
+    LatencyModel,
+    MockConfig,
+    MockLLMServer,
+    deterministic_response,
+    request_key,
+)
+from src.consolidation_app import llm_client
+from src.consolidation_app.llm_client import (
+    call_anthropic,
+    call_ollama,
+    call_openai,
+    get_last_timing,
+)
+
+_SIMILARITY_PROMPT = """Error Entry 1:
+- Error Type: KeyError
+- Error Signature: KeyError missing key user_id
+
+Error Entry 2:
+- Error Type: KeyError
+- Error Signature: KeyError missing key user_id
+"""
+
+_SCHEMA = {
+    "title": "similarity",
+    "type": "object",
+    "properties": {"similarity": {"type": "number"}, "reason": {"type": "string"}},
+    "required": ["similarity", "reason"],
+}
+
+
+@pytest.fixture
+def server():
+    with MockLLMServer(MockConfig()) as srv:
+        yield srv
+
+
+class TestDeterministicResponse:
+    """Test deterministic_response function."""
+
+    def test_identical_signatures_are_fully_similar(self):
+        result = deterministic_response("", _SIMILARITY_PROMPT)
+        assert result["similarity"] == 1.0
+
+    def test_different_signatures_score_lower(self):
+        prompt = _SIMILARITY_PROMPT.replace(
+            "Error Entry 2:\n- Error Type: KeyError\n- Error Signature: KeyError missing key user_id",
+            "Error Entry 2:\n- Error Type: TimeoutError\n- Error Signature: request timed out",
+        )
+        assert deterministic_response("", prompt)["similarity"] < 0.5
+
+    def test_rules_from_issue_type(self):
+        result = deterministic_response(
+            "", "Process issues in this group:\n- Issue Type: Config\n"
+        )
+        assert result["rules"][0]["title"] == "Avoid Config issues"
+
+    def test_unknown_prompt_returns_text(self):
+        assert deterministic_response("", "hello").startswith("Mock response ")
+
+
+class TestLatencyModel:
+    """Test LatencyModel class."""
+
+    def test_seeded_samples_repeat(self):
+        a = LatencyModel("uniform:0.1,0.2", seed=7)
+        b = LatencyModel("uniform:0.1,0.2", seed=7)
+        samples = [a.sample() for _ in range(5)]
+        assert samples == [b.sample() for _ in range(5)]
+        assert all(0.1 <= s <= 0.2 for s in samples)
+
+    def test_invalid_spec_raises(self):
+        with pytest.raises(ValueError):
+            LatencyModel("uniform:1")
+
+
+class TestProviderEndpoints:
+    """Test llm_client provider calls against the mock server."""
+
+    def test_ollama_streaming_with_schema(self, server):
+        text = call_ollama(
+            _SIMILARITY_PROMPT,
+            model="mock",
+            base_url=server.url,
+            stream=True,
+            schema=_SCHEMA,
+        )
+        assert json.loads(text)["similarity"] == 1.0
+
+    def test_ollama_stream_splits_latency_around_first_token(self):
+        with MockLLMServer(MockConfig(latency="fixed:0.6")) as srv:
+            call_ollama(_SIMILARITY_PROMPT, model="mock", base_url=srv.url, stream=True)
+        timing = get_last_timing()
+        # A third of the latency before the first token, the rest while generating
+        assert 0.15 <= timing.time_to_first_token < 0.4
+        assert timing.time_to_result >= 0.55
+
+    def test_ollama_first_token_timeout(self, monkeypatch):
+        monkeypatch.setattr(llm_client, "MAX_RETRIES", 1)
+        with MockLLMServer(MockConfig(latency="fixed:0.9")) as srv:
+            # First token only after 0.3s
+            with pytest.raises(TimeoutError, match="timed out"):
+                call_ollama(
+                    "hello", model="mock", base_url=srv.url, stream=True, timeout=0.1
+                )
+
+    def test_ollama_non_streaming(self, server):
+        text = call_ollama("hello", model="mock", base_url=server.url)
+        assert text.startswith("Mock response ")
+
+    def test_openai(self, server, monkeypatch):
+        monkeypatch.setenv("OPENAI_BASE_URL", f"{server.url}/v1")
+        text = call_openai(
+            _SIMILARITY_PROMPT, model="gpt-4o-mini", api_key="test", schema=_SCHEMA
+        )
+        assert json.loads(text)["similarity"] == 1.0
+
+    def test_anthropic_tool_use(self, server, monkeypatch):
+        monkeypatch.setenv("ANTHROPIC_BASE_URL", server.url)
+        text = call_anthropic(
+            _SIMILARITY_PROMPT, model="claude-3-haiku", api_key="test", schema=_SCHEMA
+        )
+        assert json.loads(text)["similarity"] == 1.0
+
+
+class TestFailureInjection:
+    """Test injected failures."""
+
+    def test_all_requests_fail(self):
+        with MockLLMServer(MockConfig(failure_rate=1.0, failure_status=503)) as srv:
+            response = requests.post(
+                f"{srv.url}{OLLAMA_PATH}", json={"prompt": "x"}, timeout=5
+            )
+        assert response.status_code == 503
+
+    def test_unknown_endpoint(self, server):
+        response = requests.post(f"{server.url}/nope", json={}, timeout=5)
+        assert response.status_code == 404
+
+
+class TestRecordReplay:
+    """Test record and replay modes."""
+
+    def test_round_trip(self, server, tmp_path):
+        session = tmp_path / "session.jsonl"
+        body = {"model": "mock", "prompt": "hello", "stream": False}
+
+        with MockLLMServer(
+            MockConfig(record_path=session, upstream=server.url)
+        ) as recorder:
+            recorded = requests.post(
+                f"{recorder.url}{OLLAMA_PATH}", json=body, timeout=5
+            ).json()
+
+        lines = session.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0])["key"] == request_key(OLLAMA_PATH, body)
+
+        with MockLLMServer(MockConfig(replay_path=session)) as replayer:
+            # Streaming flag is not part of the key; replayed as an NDJSON stream
+            text = call_ollama(
+                "hello", model="mock", base_url=replayer.url, stream=True
+            )
+            missing = requests.post(
+                f"{replayer.url}{OLLAMA_PATH}",
+                json={"model": "mock", "prompt": "other"},
+                timeout=5,
+            )
+
+        assert text == recorded["response"]
+        assert missing.status_code == 404
+
+    def test_request_key_ignores_volatile_fields(self):
+        a = request_key(
+            OLLAMA_PATH, {"prompt": "x", "stream": True, "keep_alive": "5m"}
+        )
+        b = request_key(OLLAMA_PATH, {"prompt": "x", "stream": False})
+        assert a == b
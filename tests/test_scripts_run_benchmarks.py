@@ -0,0 +1,53 @@
+# File: tests/test_scripts_run_benchmarks.py
+# Description: Unit tests for run_benchmarks.py script
+# Version: 1.0
+
+
+import sys
+
+import pytest
+
+from scripts.run_benchmarks import BASELINES_DIR, build_pytest_command, parse_args
+
+
+class TestBuildPytestCommand:
+    """Test build_pytest_command function."""
+
+    def test_plain_run(self):
+        command = build_pytest_command(parse_args([]))
+
+        assert command[:3] == [sys.executable, "-m", "pytest"]
+        assert f"--benchmark-storage=file://{BASELINES_DIR.resolve()}" in command
+        assert not any(arg.startswith("--benchmark-compare") for arg in command)
+
+    def test_save(self):
+        command = build_pytest_command(parse_args(["--save", "main"]))
+
+        assert "--benchmark-save=main" in command
+
+    def test_compare_latest_with_threshold(self):
+        command = build_pytest_command(parse_args(["--compare", "--threshold", "15"]))
+
+        assert "--benchmark-compare" in command
+        assert "--benchmark-compare-fail=median:15%" in command
+
+    def test_compare_specific_baseline_and_stat(self):
+        command = build_pytest_command(
+            parse_args(["--compare", "0003", "--stat", "min"])
+        )
+
+        assert "--benchmark-compare=0003" in command
+        assert "--benchmark-compare-fail=min:10%" in command
+
+    def test_passthrough_args(self):
+        command = build_pytest_command(parse_args(["--save", "x", "--", "-k", "parse"]))
+
+        assert command[-2:] == ["-k", "parse"]
+
+
+class TestParseArgs:
+    """Test parse_args validation."""
+
+    def test_rejects_non_positive_threshold(self):
+        with pytest.raises(SystemExit):
+            parse_args(["--compare", "--threshold", "0"])